@@ -0,0 +1,78 @@
+"""
+Micro-benchmark of the crane lift polygon test in CraneGeometry.
+
+Compares the vectorized crossing number test in
+CraneGeometry.points_in_polygons against the original point by point,
+edge by edge loop, for crane catalogs of 50 to 800 crane and boom system
+combinations, each tested against the components of a turbine in the
+base, top and offload operations. Run from the root of the repository
+with landbosse installed:
+
+    python benchmarks/bench_crane_geometry.py
+"""
+
+import timeit
+
+import numpy as np
+
+from landbosse.model import CraneGeometry
+from landbosse.tests.model.test_CraneGeometry import point_in_polygon_by_loop
+
+# Components of a turbine with a 3 section tower, lifted in 3 operations
+components = 8
+operations = 3
+
+
+def make_crane_polygons(cranes, seed=101):
+    """
+    Makes the lift polygons of a catalog of cranes. Each crane and boom
+    system has a load chart of 4 to 12 rows, with capacities of 50 to
+    1600 tonnes and hub heights of 60 to 170 m.
+    """
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(cranes):
+        rows = rng.integers(4, 13)
+        capacity = rng.uniform(50, 1600)
+        polygons.append(
+            CraneGeometry.lift_polygon(
+                np.round(capacity * rng.uniform(0.4, 1, rows)), np.round(rng.uniform(60, 170, rows), 1)
+            )
+        )
+    return np.stack(polygons)
+
+
+def make_lifts(seed=102):
+    """
+    Makes the (mass, height) points of the lifts, one per component and
+    operation.
+    """
+    rng = np.random.default_rng(seed)
+    points = components * operations
+    return rng.uniform(5, 400, points), rng.uniform(20, 160, points)
+
+
+def by_loop(x, y, polygons):
+    vertices = [[tuple(vertex) for vertex in polygon] for polygon in polygons.tolist()]
+    return [[point_in_polygon_by_loop(x_i, y_i, polygon) for x_i, y_i in zip(x, y)] for polygon in vertices]
+
+
+def main():
+    x, y = make_lifts()
+    print(f'{"Cranes":>7} {"Pairs":>7} {"Loop ms":>10} {"NumPy ms":>10} {"Speedup":>8}')
+    for cranes in [50, 200, 400, 800]:
+        polygons = make_crane_polygons(cranes)
+        expected = by_loop(x.tolist(), y.tolist(), polygons)
+        actual = CraneGeometry.points_in_polygons(x, y, polygons)
+        assert (actual == np.array(expected)).all(), 'Crossing number test does not match the loop'
+
+        repeats = 5
+        loop_s = min(timeit.repeat(lambda: by_loop(x.tolist(), y.tolist(), polygons), number=1, repeat=repeats))
+        numpy_s = min(timeit.repeat(lambda: CraneGeometry.points_in_polygons(x, y, polygons), number=1,
+                                    repeat=repeats))
+        print(f'{cranes:>7} {cranes * len(x):>7} {loop_s * 1e3:>10.2f} {numpy_s * 1e3:>10.3f} '
+              f'{loop_s / numpy_s:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of the crane selection of ErectionCost for each project of the
+template project list.
+
+Compares CraneCostTensor, which sums the costs of the cranes into arrays
+and chooses the least cost cranes with a vectorized minimum, against the
+original merges, groupbys and loop over operations, and checks that the
+same cranes are chosen at the same costs. Run from the root of the
+repository with landbosse installed:
+
+    python benchmarks/bench_crane_selection.py
+"""
+
+import timeit
+
+import pandas as pd
+
+from landbosse.model import CraneCostTensor
+from landbosse.tests.model.test_CraneCostTensor import aggregate_by_merges, minimum_cost_cranes_by_loop, \
+    possible_crane_cost_of_project
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_project_list
+
+
+def by_merges(possible_crane_cost, crane_specs, allow_same_flag):
+    separate_basetop, same_basetop = aggregate_by_merges(possible_crane_cost, crane_specs)
+    return minimum_cost_cranes_by_loop(separate_basetop, same_basetop, allow_same_flag)
+
+
+def by_tensor(possible_crane_cost, crane_specs, allow_same_flag):
+    tensor = CraneCostTensor(possible_crane_cost, crane_specs)
+    return CraneCostTensor.minimum_cost_cranes(tensor.separate_basetop(), tensor.same_basetop(), allow_same_flag)
+
+
+def main():
+    project_ids = template_project_list()['Project ID']
+    print(f'{"Project":<34} {"Rows":>5} {"Merges ms":>10} {"Tensor ms":>10} {"Speedup":>8}')
+    for project_index, project_id in enumerate(project_ids):
+        input_dict = generate_input_dict(project_index)
+        crane_specs = input_dict['project_data']['crane_specs']
+        allow_same_flag = input_dict['allow_same_flag']
+        possible_crane_cost = possible_crane_cost_of_project(input_dict)
+
+        expected = by_merges(possible_crane_cost, crane_specs, allow_same_flag)
+        actual = by_tensor(possible_crane_cost, crane_specs, allow_same_flag)
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+        repeats = 20
+        merges_s = min(timeit.repeat(lambda: by_merges(possible_crane_cost, crane_specs, allow_same_flag),
+                                     number=1, repeat=repeats))
+        tensor_s = min(timeit.repeat(lambda: by_tensor(possible_crane_cost, crane_specs, allow_same_flag),
+                                     number=1, repeat=repeats))
+        print(f'{project_id:<34} {len(possible_crane_cost):>5} {merges_s * 1e3:>10.2f} {tensor_s * 1e3:>10.2f} '
+              f'{merges_s / tensor_s:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
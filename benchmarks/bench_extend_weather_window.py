@@ -0,0 +1,54 @@
+"""
+Benchmark of extend_weather_window in the WeatherWindowCSVReader module.
+
+Compares the tiled implementation against the original implementation
+that rebuilt the dataframe from a list of row dictionaries. Reports the
+time and the peak memory allocated (measured with tracemalloc) to extend
+a one year weather window to 2, 10 and 30 years. Run from the root of the
+repository with landbosse installed:
+
+    python benchmarks/bench_extend_weather_window.py
+"""
+
+import timeit
+import tracemalloc
+
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio.WeatherWindowCSVReader import read_weather_window, extend_weather_window
+from landbosse.tests.excelio.test_WeatherWindowCache import generate_weather_sheet
+from landbosse.tests.excelio.test_WeatherWindowCSVReader import extend_weather_window_by_records
+
+hours_per_year = 8760
+
+
+def peak_memory_mb(function):
+    """
+    Runs a function and returns the peak memory it allocated in MB.
+    """
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    weather_window = read_weather_window(generate_weather_sheet(hours=hours_per_year))
+    print(f'{"Years":>6} {"Rows":>8} {"Records ms":>11} {"Tiled ms":>9} {"Records MB":>11} {"Tiled MB":>9}')
+    for years in [2, 10, 30]:
+        months = years * 12
+        expected = extend_weather_window_by_records(weather_window, months)
+        actual = extend_weather_window(weather_window, months)
+        assert_frame_equal(expected, actual)
+
+        records_s = min(timeit.repeat(lambda: extend_weather_window_by_records(weather_window, months), number=1, repeat=3))
+        tiled_s = min(timeit.repeat(lambda: extend_weather_window(weather_window, months), number=1, repeat=3))
+        records_mb = peak_memory_mb(lambda: extend_weather_window_by_records(weather_window, months))
+        tiled_mb = peak_memory_mb(lambda: extend_weather_window(weather_window, months))
+        print(f'{years:>6} {len(actual):>8} {records_s * 1e3:>11.1f} {tiled_s * 1e3:>9.1f} '
+              f'{records_mb:>11.1f} {tiled_mb:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
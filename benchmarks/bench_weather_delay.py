@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of the wind delay calculation in WeatherDelay.
+
+Compares the NumPy run-length encoding in WeatherDelay.delay_durations
+against the original hour-by-hour loop over 1, 5 and 30 year weather
+windows. Run from the root of the repository with landbosse installed:
+
+    python benchmarks/bench_weather_delay.py
+"""
+
+import timeit
+
+import numpy as np
+
+from landbosse.model import WeatherDelay
+from landbosse.tests.model.test_WeatherDelay import delay_durations_by_loop
+
+hours_per_year = 8760
+
+
+def make_wind_delays(years, seed=101):
+    """
+    Makes an hourly array of wind delays with a realistic amount of
+    clustering. Wind speeds are a random walk so that delays come in
+    blocks of several hours rather than isolated hours.
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.5, years * hours_per_year)
+    speeds = np.clip(8 + np.cumsum(steps) % 8, 0, None)
+    return speeds > 13
+
+
+def main():
+    print(f'{"Years":>6} {"Hours":>8} {"Delays":>8} {"Loop ms":>10} {"RLE ms":>10} {"Speedup":>8}')
+    for years in [1, 5, 30]:
+        wind_delays = make_wind_delays(years)
+        expected = delay_durations_by_loop(wind_delays)
+        actual = WeatherDelay.delay_durations(wind_delays)
+        assert expected == actual, 'Run-length encoding does not match the loop'
+
+        repeats = 5
+        loop_s = min(timeit.repeat(lambda: delay_durations_by_loop(wind_delays), number=1, repeat=repeats))
+        rle_s = min(timeit.repeat(lambda: WeatherDelay.delay_durations(wind_delays), number=1, repeat=repeats))
+        print(f'{years:>6} {len(wind_delays):>8} {len(actual):>8} {loop_s * 1e3:>10.2f} {rle_s * 1e3:>10.3f} '
+              f'{loop_s / rle_s:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+import os
+import shutil
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from .CsvGenerator import CsvGenerator
+from .ResultSink import ResultSink, CsvResultSink
+
+
+class ArrowResultSink(ResultSink):
+    """
+    This sink writes the cost and detail rows of each project to Parquet
+    or Arrow IPC (Feather) files as the project finishes. The files have
+    the same columns as the costs and details .csv files. They are much
+    smaller and faster to read, which matters for the details of large
+    parametric runs.
+
+    The rows of each project are written as one row group of a Parquet
+    file, or one record batch of a Feather file, so the rows of the
+    projects are never held in memory together. The columns of names
+    (Project ID with serial, Module, Type of cost, Variable name and Unit)
+    are dictionary encoded: in Parquet files each row group has its own
+    dictionaries, and in Feather files the dictionaries grow with deltas as
+    new names are written. In the details, values that are not numbers,
+    such as the labels at the end of some dataframe rows, are null in the
+    Numeric value column.
+
+    The files can be partitioned by project or by module. Then the costs
+    and details are each a directory with a subdirectory for each project
+    or module, named like 'Module=ErectionCost', as read by
+    pyarrow.dataset with hive partitioning. The partition column is in the
+    name of the subdirectory, not in the files.
+
+    This sink needs pyarrow, which is installed with the parquet extra:
+
+        pip install NREL-landbosse[parquet]
+    """
+
+    # The output formats and the extensions of their files
+    formats = {
+        'parquet': '.parquet',
+        'feather': '.feather',
+    }
+
+    # The columns the files can be partitioned by
+    partitions = {
+        'none': None,
+        'project': 'Project ID with serial',
+        'module': 'Module',
+    }
+
+    # Columns of names that are dictionary encoded
+    dictionary_columns = ['Project ID with serial', 'Module', 'Type of cost', 'Variable name', 'Unit']
+
+    # Compression of the files
+    compression = 'zstd'
+
+    def __init__(self, costs_path, details_path, output_format='parquet', partition_by='none'):
+        """
+        Parameters
+        ----------
+        costs_path : str
+            The pathname of the costs file, or of its directory if the files
+            are partitioned. It is overwritten.
+
+        details_path : str
+            The pathname of the details file, or of its directory if the
+            files are partitioned. It is overwritten.
+
+        output_format : str
+            'parquet' or 'feather'.
+
+        partition_by : str
+            'none', 'project' or 'module'.
+
+        Raises
+        ------
+        ValueError
+            If the format or partitioning is unknown.
+
+        ImportError
+            If pyarrow is not installed.
+        """
+        if output_format not in self.formats:
+            raise ValueError(f'The output format must be one of {", ".join(self.formats)}, not {output_format}.')
+        if partition_by not in self.partitions:
+            raise ValueError(f'The partitioning must be one of {", ".join(self.partitions)}, not {partition_by}.')
+        self.require_pyarrow()
+        self.output_format = output_format
+        self.partition_column = self.partitions[partition_by]
+        self.csv_generator = CsvGenerator(file_ops=None)
+        self.schemas = {
+            costs_path: self.schema(CsvResultSink.costs_columns),
+            details_path: self.schema(CsvResultSink.details_columns),
+        }
+        self.costs_path = costs_path
+        self.details_path = details_path
+
+        # The open writers and, for Feather files, the dictionaries of the
+        # dictionary encoded columns written with them, by pathname.
+        self.writers = dict()
+        self.dictionaries = dict()
+
+        for path in [costs_path, details_path]:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+            if self.partition_column is not None:
+                os.makedirs(path)
+
+    @staticmethod
+    def require_pyarrow():
+        """
+        Raises
+        ------
+        ImportError
+            If pyarrow is not installed.
+        """
+        if pa is None:
+            raise ImportError('Parquet and Feather outputs need pyarrow. '
+                              'Install it with: pip install NREL-landbosse[parquet]')
+
+    @classmethod
+    def schema(cls, columns):
+        """
+        Makes the schema of the costs or details files.
+
+        Parameters
+        ----------
+        columns : list
+            The columns of the costs or details .csv.
+
+        Returns
+        -------
+        pyarrow.Schema
+            The schema.
+        """
+        types = {
+            'Number of turbines': pa.int64(),
+            'Non-numeric value': pa.string(),
+        }
+        fields = []
+        for column in columns:
+            if column in cls.dictionary_columns:
+                fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(column, types.get(column, pa.float64())))
+        return pa.schema(fields)
+
+    def add(self, project_id_with_serial, reduced_output_dict):
+        costs = self.csv_generator.create_costs_dataframe(self.cost_rows(reduced_output_dict))
+        details = self.csv_generator.create_details_dataframe(self.detail_rows(reduced_output_dict))
+        self.write(costs.reindex(columns=CsvResultSink.costs_columns), self.costs_path)
+        self.write(details.reindex(columns=CsvResultSink.details_columns), self.details_path)
+
+    def write(self, df, path):
+        """
+        Writes the rows of one project to the costs or details.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The rows, with the columns of the .csv.
+
+        path : str
+            The costs_path or details_path.
+        """
+        if len(df) == 0:
+            return
+        schema = self.schemas[path]
+        if self.partition_column is None:
+            self.writer(path, schema).write_table(self.arrow_table(df, schema, path))
+            return
+
+        schema = schema.remove(schema.get_field_index(self.partition_column))
+        for value, partition_df in df.groupby(self.partition_column, sort=False):
+            partition_path = os.path.join(path, f'{self.partition_column}={quote(str(value), safe="")}',
+                                          f'part-0{self.formats[self.output_format]}')
+            self.writer(partition_path, schema).write_table(self.arrow_table(partition_df, schema, partition_path))
+
+        # Each project is added once, so the files of a project are done.
+        if self.partition_column == 'Project ID with serial':
+            self.close_writers()
+
+    def writer(self, path, schema):
+        """
+        Opens a file for writing, if it is not open already.
+
+        Parameters
+        ----------
+        path : str
+            The pathname of the file.
+
+        schema : pyarrow.Schema
+            The schema of the file.
+
+        Returns
+        -------
+        pyarrow.parquet.ParquetWriter or pyarrow.ipc.RecordBatchFileWriter
+            The writer of the file.
+        """
+        if path not in self.writers:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            if self.output_format == 'parquet':
+                self.writers[path] = pq.ParquetWriter(path, schema, compression=self.compression)
+            else:
+                # Deltas let the dictionaries grow as projects are written,
+                # which the IPC file format requires.
+                options = pa.ipc.IpcWriteOptions(compression=self.compression, emit_dictionary_deltas=True)
+                self.writers[path] = pa.ipc.new_file(path, schema, options=options)
+            self.dictionaries[path] = dict()
+        return self.writers[path]
+
+    def arrow_table(self, df, schema, path):
+        """
+        Converts rows to a table with the schema of a file.
+
+        The columns of names are dictionary encoded. For Parquet, each table
+        has its own dictionaries, as each row group of a Parquet file has
+        its own. For Feather, there is one dictionary for each column of the
+        file, which grows as new names are written. Each table has the
+        dictionary so far, so later tables extend the dictionaries of
+        earlier tables, which the IPC writer emits as deltas.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The rows.
+
+        schema : pyarrow.Schema
+            The schema of the file.
+
+        path : str
+            The pathname of the file.
+
+        Returns
+        -------
+        pyarrow.Table
+            The rows as a table.
+        """
+        arrays = []
+        for field in schema:
+            values = df[field.name]
+            if pa.types.is_dictionary(field.type) and self.output_format == 'parquet':
+                arrays.append(self.string_array(values).dictionary_encode())
+            elif pa.types.is_dictionary(field.type):
+                arrays.append(self.growing_dictionary_array(values, field.name, path))
+            elif pa.types.is_string(field.type):
+                arrays.append(self.string_array(values))
+            else:
+                numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+                arrays.append(pa.array(numbers, from_pandas=True).cast(field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def string_array(values):
+        """
+        Parameters
+        ----------
+        values : pd.Series
+            The values of a column.
+
+        Returns
+        -------
+        pyarrow.StringArray
+            The values as strings, with nulls for missing values.
+        """
+        return pa.array([None if pd.isnull(value) else str(value) for value in values], type=pa.string())
+
+    def growing_dictionary_array(self, values, name, path):
+        """
+        Dictionary encodes a column of a Feather file with the dictionary of
+        the column so far, extended with the new values.
+
+        Parameters
+        ----------
+        values : pd.Series
+            The values of the column.
+
+        name : str
+            The name of the column.
+
+        path : str
+            The pathname of the file.
+
+        Returns
+        -------
+        pyarrow.DictionaryArray
+            The encoded values.
+        """
+        codes_by_value, dictionary = self.dictionaries[path].get(name, (dict(), None))
+        codes, uniques = pd.factorize(values)
+        size = len(codes_by_value)
+        unique_codes = np.array([codes_by_value.setdefault(str(unique), len(codes_by_value)) for unique in uniques],
+                                dtype=np.int32)
+
+        # The arrow dictionary is only made again when there are new values.
+        if dictionary is None or len(codes_by_value) > size:
+            dictionary = pa.array(list(codes_by_value), type=pa.string())
+            self.dictionaries[path][name] = codes_by_value, dictionary
+        indices = pa.array(unique_codes[codes] if len(unique_codes) else codes.astype(np.int32),
+                           type=pa.int32(), mask=codes < 0)
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    @classmethod
+    def write_dataframe(cls, df, path, output_format='parquet'):
+        """
+        Writes a dataframe, such as the extended project list, to one
+        Parquet or Feather file. Columns of mixed types that pyarrow cannot
+        convert are written as strings.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe.
+
+        path : str
+            The pathname of the file. It is overwritten.
+
+        output_format : str
+            'parquet' or 'feather'.
+        """
+        cls.require_pyarrow()
+        arrays = []
+        for column in df.columns:
+            try:
+                arrays.append(pa.array(df[column], from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrays.append(cls.string_array(df[column]))
+        table = pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+        if output_format == 'parquet':
+            pq.write_table(table, path, compression=cls.compression)
+        else:
+            pa.feather.write_feather(table, path, compression=cls.compression)
+
+    def close_writers(self):
+        """
+        Closes the open files.
+        """
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = dict()
+        self.dictionaries = dict()
+
+    def close(self):
+        # Files that are not partitioned are written even if they have no
+        # rows, so that they have their schema.
+        if self.partition_column is None:
+            for path, schema in self.schemas.items():
+                self.writer(path, schema)
+        self.close_writers()
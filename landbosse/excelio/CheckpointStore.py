@@ -0,0 +1,211 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+
+from .. import __version__
+from .ResultSink import ResultSink
+
+
+class CheckpointStore(ResultSink):
+    """
+    This class records the results of projects in an SQLite database as
+    they finish, so that a run that stops part way through can be resumed
+    without calculating the finished projects again.
+
+    Each project is stored under its Project ID with serial, with a hash of
+    its inputs and its output dictionary reduced by ResultSink.reduce().
+    The inputs that are hashed are:
+
+    - The project parameters, after the parametric and scaling
+      modifications.
+
+    - The contents of the unmodified project data .xlsx file.
+
+    - The parametric modifications of the project data.
+
+    - The detail level of the run, if it is given.
+
+    - Whether the detail rows are kept, if they are not. See
+      ResultSink.sinks_need_details().
+
+    - The version of LandBOSSE and the format_version of this class.
+
+    A result is only used to resume a project if the hash of the inputs of
+    the project is the same as the hash stored with the result. Otherwise,
+    the project is calculated again and its result replaced.
+
+    The runners call expect() with the input hash of each project before it
+    runs, and add() when it finishes without errors. Each result is
+    committed as soon as it is added. Projects that fail are not added, so
+    they are calculated again when the run is resumed.
+    """
+
+    # Changing what is hashed or stored must change this version so that
+    # results in existing checkpoints are not used.
+    format_version = 1
+
+    def __init__(self, filename):
+        """
+        Parameters
+        ----------
+        filename : str
+            The pathname of the SQLite database. It is created if it does not
+            exist, along with its directory.
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.filename = filename
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS projects ('
+            'project_id_with_serial TEXT PRIMARY KEY, '
+            'input_hash TEXT NOT NULL, '
+            'result BLOB NOT NULL)'
+        )
+        self.connection.commit()
+        self.input_hashes = dict()
+        self.file_hashes = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def file_hash(self, pathname):
+        """
+        Hashes the contents of a file. Each file is only read once.
+
+        Parameters
+        ----------
+        pathname : str
+            The pathname of the file.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the contents of the file.
+        """
+        if pathname not in self.file_hashes:
+            digest = hashlib.blake2b(digest_size=20)
+            with open(pathname, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self.file_hashes[pathname] = digest.hexdigest()
+        return self.file_hashes[pathname]
+
+    def input_hash(self, project_parameters, project_data_xlsx, project_data_edits, detail_level=None,
+                   keep_details=True):
+        """
+        Hashes the inputs of a project. See the class docstring.
+
+        Parameters
+        ----------
+        project_parameters : pd.Series
+            The row of the extended project list for the project, after the
+            parametric and scaling modifications.
+
+        project_data_xlsx : str
+            The pathname of the unmodified project data .xlsx file.
+
+        project_data_edits : list
+            The parametric modifications of the project data, as made by
+            XlsxReader.cell_edits().
+
+        detail_level : str
+            The detail level of the run, which sets the detail rows that are
+            checkpointed. See DetailRows.
+
+        keep_details : bool
+            False if the detail rows are dropped from the checkpointed
+            results, so that they are not used by runs that need them.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the inputs.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'v{self.format_version}|{__version__}|'.encode())
+        digest.update(self.file_hash(project_data_xlsx).encode())
+        digest.update(repr(list(project_parameters.items())).encode())
+        digest.update(repr(list(project_data_edits)).encode())
+        if detail_level is not None:
+            digest.update(f'|detail_level={detail_level}'.encode())
+        if not keep_details:
+            digest.update(b'|no details')
+        return digest.hexdigest()
+
+    def completed(self, project_id_with_serial, input_hash):
+        """
+        Finds the result of a project that finished with the same inputs.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        input_hash : str
+            The hash made by input_hash().
+
+        Returns
+        -------
+        dict or None
+            The reduced output dictionary of the project, or None if the
+            project has not finished with these inputs.
+        """
+        row = self.connection.execute(
+            'SELECT result FROM projects WHERE project_id_with_serial = ? AND input_hash = ?',
+            (project_id_with_serial, input_hash)
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0])
+
+    def expect(self, project_id_with_serial, input_hash):
+        """
+        Records the input hash of a project that is about to run, so that
+        add() can store it with the result.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        input_hash : str
+            The hash made by input_hash().
+        """
+        self.input_hashes[project_id_with_serial] = input_hash
+
+    def add(self, project_id_with_serial, reduced_output_dict):
+        """
+        Stores and commits the result of a project. expect() must have been
+        called for the project first.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        reduced_output_dict : dict
+            The output dictionary of the project, reduced by
+            ResultSink.reduce().
+        """
+        input_hash = self.input_hashes.pop(project_id_with_serial)
+        result = pickle.dumps(reduced_output_dict, protocol=pickle.HIGHEST_PROTOCOL)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO projects (project_id_with_serial, input_hash, result) VALUES (?, ?, ?)',
+            (project_id_with_serial, input_hash, result)
+        )
+        self.connection.commit()
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -55,38 +55,46 @@ class CsvGenerator:
 
             details_to_write_to_csv.append(new_row)
 
+        # If the detail level of every project is none, there are no rows,
+        # but the .csv still has its header.
+        if len(details_to_write_to_csv) == 0:
+            return pd.DataFrame(columns=["Project ID with serial", "Module", "Variable name", "Unit",
+                                         "Numeric value", "Non-numeric value"])
+
         details = pd.DataFrame(details_to_write_to_csv)
 
         return details
 
+    # The columns of the costs .csv and the columns of the cost rows they
+    # are taken from.
+    costs_columns = {
+        "Project ID with serial": "project_id_with_serial",
+        "Number of turbines": "num_turbines",
+        "Turbine rating MW": "turbine_rating_MW",
+        "Rotor diameter m": "rotor_diameter_m",
+        "Module": "module",
+        "Type of cost": "type_of_cost",
+        "Cost per turbine": "cost_per_turbine",
+        "Cost per project": "cost_per_project",
+        "Cost per kW": "usd_per_kw_per_project",
+    }
+
     def create_costs_dataframe(self, costs):
         """
         Parameters
         ----------
-        costs : list[dict]
-            The list of dictionaries of costs.
+        costs : pd.DataFrame
+            The dataframe of costs, with the columns in
+            CostModule.cost_columns.
 
         Returns
         -------
         pd.DataFrame
             A dataframe to be written as a .csv
         """
-        new_rows = []
-        for row in costs:
-            new_row = {
-                "Project ID with serial": row["project_id_with_serial"],
-                "Number of turbines": row["num_turbines"],
-                "Turbine rating MW": row["turbine_rating_MW"],
-                "Rotor diameter m": row["rotor_diameter_m"],
-                "Module": row["module"],
-                "Type of cost": row["type_of_cost"],
-                "Cost per turbine": row["cost_per_turbine"],
-                "Cost per project": row["cost_per_project"],
-                "Cost per kW": row["usd_per_kw_per_project"]
-            }
-            new_rows.append(new_row)
-        costs_df = pd.DataFrame(new_rows)
-        return costs_df
+        costs_df = costs[list(self.costs_columns.values())]
+        costs_df.columns = list(self.costs_columns)
+        return costs_df.reset_index(drop=True)
 
     def _is_numeric(self, value):
         """
@@ -0,0 +1,230 @@
+import json
+import os
+from concurrent import futures
+
+import pandas as pd
+
+from .XlsxDataframeCache import XlsxDataframeCache
+from .XlsxGenerator import XlsxGenerator
+from .XlsxOperationException import XlsxOperationException
+from .XlsxReader import XlsxReader
+
+
+class ParametricProjectDataWriter:
+    """
+    This class records the project data of every parametric variant in
+    the calculated_parametric_inputs/parametric_project_data output folder.
+
+    Writing a .xlsx file for every variant with openpyxl can take longer
+    than running the model, so there are three modes:
+
+    xlsx
+        Writes {project_id_with_serial}_project_data.xlsx for every variant.
+        This is the default, and what LandBOSSE has always done.
+
+    manifest
+        Writes one parametric_project_data_manifest.csv with a row for every
+        cell that a variant changes in its project data file. The .xlsx of
+        any variant can be made from the manifest later with reconstruct().
+
+    none
+        Writes nothing.
+
+    In xlsx mode, the files can be written in the background by a pool of
+    writer processes. Each writer is sent only the project data basename
+    and the cell edits, not the project data.
+
+    Instances are context managers. The background writes are waited for
+    and the manifest is written when the context exits.
+    """
+
+    modes = ('xlsx', 'manifest', 'none')
+
+    manifest_basename = 'parametric_project_data_manifest.csv'
+
+    manifest_columns = ['Project ID with serial', 'Project data file', 'Dataframe', 'Row', 'Column', 'Value']
+
+    def __init__(self, output_path, mode='xlsx', writers=0):
+        """
+        Parameters
+        ----------
+        output_path : str
+            The folder in which to write the project data.
+
+        mode : str
+            One of 'xlsx', 'manifest' or 'none'. See the class docstring.
+
+        writers : int
+            In xlsx mode, the number of background writer processes. 0
+            writes each file before add() returns.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the mode is not one of the modes.
+        """
+        if mode not in self.modes:
+            raise XlsxOperationException(f'Parametric project data mode must be one of {self.modes}, not {mode}.')
+        self.output_path = output_path
+        self.mode = mode
+        self.writers = writers
+        self.manifest_rows = []
+        self.pending_writes = []
+        self.executor = None
+        if self.mode == 'xlsx' and self.writers > 0:
+            self.executor = futures.ProcessPoolExecutor(max_workers=self.writers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add(self, project_id_with_serial, project_data_basename, project_data_edits, project_data_sheets=None):
+        """
+        Records the project data of one variant.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the variant.
+
+        project_data_basename : str
+            The basename of the unmodified project data file.
+
+        project_data_edits : list
+            The (dataframe name, row name, column name, value) cell edits
+            of the project data, as made by XlsxReader.cell_edits(). Edits
+            of the project list are recorded in the extended project list
+            instead, so they should not be included.
+
+        project_data_sheets : dict
+            Optional. The project data with the edits already applied. If
+            given, a synchronous xlsx write uses it instead of applying the
+            edits again.
+        """
+        if self.mode == 'none':
+            return
+
+        if self.mode == 'manifest':
+            for dataframe_name, row_name, column_name, value in project_data_edits:
+                self.manifest_rows.append([project_id_with_serial, project_data_basename,
+                                           dataframe_name, row_name, column_name, encode_value(value)])
+            return
+
+        parametric_project_data_path = os.path.join(self.output_path, f'{project_id_with_serial}_project_data.xlsx')
+        if self.executor is not None:
+            self.pending_writes.append(self.executor.submit(write_parametric_project_data,
+                                                            project_data_basename,
+                                                            project_data_edits,
+                                                            parametric_project_data_path))
+        elif project_data_sheets is not None:
+            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
+        else:
+            write_parametric_project_data(project_data_basename, project_data_edits, parametric_project_data_path)
+
+    def close(self):
+        """
+        Waits for the background writes and writes the manifest, if there
+        is one. Errors from the background writes are raised here.
+        """
+        if self.executor is not None:
+            try:
+                for pending_write in self.pending_writes:
+                    pending_write.result()
+            finally:
+                self.executor.shutdown()
+                self.executor = None
+                self.pending_writes = []
+
+        if self.mode == 'manifest':
+            manifest = pd.DataFrame(self.manifest_rows, columns=self.manifest_columns)
+            manifest.to_csv(os.path.join(self.output_path, self.manifest_basename), index=False)
+
+    @classmethod
+    def reconstruct(cls, manifest_csv, project_id_with_serial, output_xlsx=None, xlsx_path=None):
+        """
+        Makes the project data of one variant from a manifest written in
+        manifest mode. This is the same project data that xlsx mode would
+        have written.
+
+        Parameters
+        ----------
+        manifest_csv : str
+            The pathname of parametric_project_data_manifest.csv.
+
+        project_id_with_serial : str
+            The name of the variant.
+
+        output_xlsx : str
+            Optional. If given, the project data is written to this .xlsx.
+
+        xlsx_path : str
+            Optional. The folder with the unmodified project data files. The
+            default is the project_data folder of the input directory.
+
+        Returns
+        -------
+        dict
+            The project data of the variant. Keys are sheet names and values
+            are dataframes.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the variant is not in the manifest.
+        """
+        manifest = pd.read_csv(manifest_csv, dtype=str, keep_default_na=False)
+        rows = manifest[manifest['Project ID with serial'] == project_id_with_serial]
+        if rows.empty:
+            raise XlsxOperationException(f'{project_id_with_serial} not found in {manifest_csv}.')
+
+        project_data_basename = rows['Project data file'].iloc[0]
+        project_data_edits = [
+            (row['Dataframe'], row['Row'], row['Column'], decode_value(row['Value']))
+            for _, row in rows.iterrows()
+        ]
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename, xlsx_path)
+        XlsxReader().apply_cell_edits(project_data_sheets, pd.Series(dtype=object), project_data_edits)
+        if output_xlsx is not None:
+            XlsxGenerator.write_project_data(project_data_sheets, output_xlsx)
+        return project_data_sheets
+
+
+def encode_value(value):
+    """
+    Encodes the value of a cell edit as JSON, so that numbers and strings
+    read back from the manifest exactly.
+    """
+    if hasattr(value, 'item'):
+        value = value.item()
+    return json.dumps(value)
+
+
+def decode_value(encoded_value):
+    """
+    Decodes a value encoded by encode_value().
+    """
+    return json.loads(encoded_value)
+
+
+def write_parametric_project_data(project_data_basename, project_data_edits, parametric_project_data_path):
+    """
+    Writes the project data of one variant to a .xlsx file. This is
+    deliberately defined outside of the class so it can run in a writer
+    process.
+
+    Parameters
+    ----------
+    project_data_basename : str
+        The basename of the unmodified project data file.
+
+    project_data_edits : list
+        The cell edits of the project data.
+
+    parametric_project_data_path : str
+        The pathname of the .xlsx file to write.
+    """
+    project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+    XlsxReader().apply_cell_edits(project_data_sheets, pd.Series(dtype=object), project_data_edits)
+    XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
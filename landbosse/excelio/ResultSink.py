@@ -0,0 +1,227 @@
+from ..model import CostModule
+from .CsvGenerator import CsvGenerator
+
+
+class ResultSink:
+    """
+    A result sink receives the results of projects one at a time, as they
+    finish, so that the runners do not need to hold the output dictionaries
+    of every project until the end of a run.
+
+    The results given to add() are reduced output dictionaries made by
+    reduce(). They only have the dataframes of cost rows (keys ending in
+    '_module_type_operation') and the lists of detail rows (keys ending in
+    '_csv').
+
+    Subclasses implement add() and, if needed, close().
+
+    The detail rows are made lazily by DetailRows. If no sink of a run
+    needs them, the runners drop them from the reduced output dictionaries
+    so that they are never made, sent between processes or checkpointed.
+    See needs_details and sinks_need_details().
+    """
+
+    # True if the sink uses the detail rows given to add().
+    needs_details = True
+
+    @staticmethod
+    def sinks_need_details(result_sinks):
+        """
+        Parameters
+        ----------
+        result_sinks : list or None
+            The result sinks of a run, or None if results are not streamed.
+
+        Returns
+        -------
+        bool
+            True if the detail rows are needed: results are not streamed,
+            or at least one of the sinks needs them.
+        """
+        if result_sinks is None:
+            return True
+        return any(result_sink.needs_details for result_sink in result_sinks)
+
+    @staticmethod
+    def reduce(output_dict, keep_details=True):
+        """
+        Reduces an output dictionary to the rows that are written to the
+        costs and details outputs. Large intermediate values, such as the
+        crane and weather dataframes, are dropped.
+
+        Parameters
+        ----------
+        output_dict : dict
+            The output dictionary of a project after Manager has run.
+
+        keep_details : bool
+            If False, the detail rows are dropped too, without being made.
+
+        Returns
+        -------
+        dict
+            The keys ending in '_module_type_operation' or, if keep_details
+            is True, '_csv' and their rows, in their original order.
+        """
+        return {
+            key: value
+            for key, value in output_dict.items()
+            if key.endswith('_module_type_operation') or (keep_details and key.endswith('_csv'))
+        }
+
+    @staticmethod
+    def cost_rows(reduced_output_dict):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The cost rows of a reduced output dictionary, concatenated in
+            order.
+        """
+        return CostModule.concat_costs(value for key, value in reduced_output_dict.items()
+                                       if key.endswith('_module_type_operation'))
+
+    @staticmethod
+    def detail_rows(reduced_output_dict):
+        """
+        Returns
+        -------
+        list
+            The detail rows of a reduced output dictionary, concatenated in
+            order.
+        """
+        rows = []
+        for key, value in reduced_output_dict.items():
+            if key.endswith('_csv'):
+                rows.extend(value)
+        return rows
+
+    def add(self, project_id_with_serial, reduced_output_dict):
+        """
+        Receives the result of one project.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The name of the project.
+
+        reduced_output_dict : dict
+            The output dictionary of the project, reduced by reduce().
+        """
+        raise NotImplementedError('add() can only be called on subclasses')
+
+    def close(self):
+        """
+        Called once after the results of all projects have been added.
+        """
+        pass
+
+
+class ListResultSink(ResultSink):
+    """
+    This sink keeps the cost and detail rows. They are the
+    costs_by_module_type_operation and details_list of the final result of
+    a run.
+
+    Only the rows are kept, not the output dictionaries. Keeping the details
+    is optional, because there are many more detail rows than cost rows.
+    """
+
+    def __init__(self, keep_details=True):
+        """
+        Parameters
+        ----------
+        keep_details : bool
+            If False, the detail rows are discarded.
+        """
+        self.keep_details = keep_details
+        self.costs = []
+        self.details_list = []
+
+    @property
+    def needs_details(self):
+        """
+        Returns
+        -------
+        bool
+            True if the detail rows are kept.
+        """
+        return self.keep_details
+
+    @property
+    def costs_by_module_type_operation(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The cost rows of every project added, in order.
+        """
+        if len(self.costs) != 1:
+            self.costs = [CostModule.concat_costs(self.costs)]
+        return self.costs[0]
+
+    def add(self, project_id_with_serial, reduced_output_dict):
+        self.costs.append(self.cost_rows(reduced_output_dict))
+        if self.keep_details:
+            self.details_list.extend(self.detail_rows(reduced_output_dict))
+
+
+class CsvResultSink(ResultSink):
+    """
+    This sink appends the cost and detail rows of each project to the costs
+    and details .csv files as the project finishes. The files have the same
+    columns as those written by CsvGenerator at the end of a run.
+    """
+
+    costs_columns = [
+        'Project ID with serial',
+        'Number of turbines',
+        'Turbine rating MW',
+        'Rotor diameter m',
+        'Module',
+        'Type of cost',
+        'Cost per turbine',
+        'Cost per project',
+        'Cost per kW',
+    ]
+
+    details_columns = [
+        'Project ID with serial',
+        'Module',
+        'Variable name',
+        'Unit',
+        'Numeric value',
+        'Non-numeric value',
+    ]
+
+    def __init__(self, costs_csv, details_csv):
+        """
+        Parameters
+        ----------
+        costs_csv : str
+            The pathname of the costs .csv. It is overwritten.
+
+        details_csv : str
+            The pathname of the details .csv. It is overwritten.
+        """
+        self.costs_csv = costs_csv
+        self.details_csv = details_csv
+        self.csv_generator = CsvGenerator(file_ops=None)
+        self.headers_written = False
+
+    def add(self, project_id_with_serial, reduced_output_dict):
+        costs = self.csv_generator.create_costs_dataframe(self.cost_rows(reduced_output_dict))
+        details = self.csv_generator.create_details_dataframe(self.detail_rows(reduced_output_dict))
+        self.append(costs.reindex(columns=self.costs_columns), self.costs_csv)
+        self.append(details.reindex(columns=self.details_columns), self.details_csv)
+        self.headers_written = True
+
+    def append(self, df, csv_filename):
+        """
+        Appends rows to a .csv, or writes the .csv with a header for the
+        first project.
+        """
+        if self.headers_written:
+            df.to_csv(csv_filename, mode='a', header=False, index=False)
+        else:
+            df.to_csv(csv_filename, mode='w', header=True, index=False)
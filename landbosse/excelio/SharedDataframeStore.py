@@ -0,0 +1,178 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class SharedDataframeStore:
+    """
+    This class publishes read-only dataframes to memory-mapped files so
+    that worker processes can attach to them instead of receiving a pickled
+    copy with every task.
+
+    XlsxParallelManagerRunner uses it for weather windows. Every parametric
+    variant of a project has the same weather window, so the parent
+    publishes each distinct processed weather window once. Tasks carry only
+    the handle returned by publish(), which is a small dictionary. Each
+    worker calls attach() with the handle to get the dataframe.
+
+    Each column is stored in its own .npy file in a temporary directory:
+
+    - Numeric and boolean columns are stored as they are. Workers map
+      them into memory without copying them.
+
+    - Timezone-aware date columns are stored as int64 offsets from the
+      epoch and converted back to dates with the original unit and
+      timezone.
+
+    - All other columns, such as strings, are stored as integer codes
+      into the list of distinct values, which is pickled to a separate
+      file.
+
+    Attached dataframes are cached in each worker, so a worker attaches to
+    each published dataframe only once. The attached dataframes must not
+    be modified, since the numeric columns are read-only maps of the
+    files.
+
+    Instances are context managers. The temporary directory is made when
+    the first dataframe is published and removed when the context exits,
+    so the context must outlast the workers.
+    """
+
+    # _attached is a class attribute that holds the dataframes attached in
+    # this process. Keys are the keys of the handles.
+    _attached = {}
+
+    _lock = threading.Lock()
+
+    def __init__(self, directory=None):
+        """
+        Parameters
+        ----------
+        directory : str
+            The directory in which to make the temporary directory of
+            published dataframes. None uses the default temporary directory.
+        """
+        self.directory = directory
+        self.path = None
+        self.handles = {}
+        self.published_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Removes the published files.
+        """
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
+
+    def publish(self, key, df):
+        """
+        Publishes a dataframe, unless a dataframe with the same key has
+        already been published.
+
+        Parameters
+        ----------
+        key : str
+            A key that identifies the contents of the dataframe, such as
+            the key made by WeatherWindowCache.key().
+
+        df : pd.DataFrame
+            The dataframe to publish. It must have a RangeIndex.
+
+        Returns
+        -------
+        dict
+            The handle to pass to attach().
+        """
+        if key in self.handles:
+            return self.handles[key]
+
+        if self.path is None:
+            self.path = tempfile.mkdtemp(prefix='landbosse-shared-', dir=self.directory)
+
+        columns = []
+        for position, (column_name, column) in enumerate(df.items()):
+            filename = os.path.join(self.path, f'{key}-{position}.npy')
+            dtype = column.dtype
+            if isinstance(dtype, pd.DatetimeTZDtype):
+                values = column.array.asi8
+                column_info = {'kind': 'datetime', 'unit': dtype.unit, 'tz': str(dtype.tz)}
+            elif isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+                values = column.to_numpy()
+                column_info = {'kind': 'numeric'}
+            else:
+                codes, uniques = pd.factorize(column, use_na_sentinel=False)
+                values = codes.astype(np.int32)
+                uniques_filename = os.path.join(self.path, f'{key}-{position}-uniques.pkl')
+                with open(uniques_filename, 'wb') as f:
+                    pickle.dump(np.asarray(uniques, dtype=object), f, protocol=pickle.HIGHEST_PROTOCOL)
+                column_info = {'kind': 'coded', 'uniques_filename': uniques_filename, 'dtype': dtype}
+            np.save(filename, np.ascontiguousarray(values), allow_pickle=False)
+            self.published_bytes += values.nbytes
+            column_info['name'] = column_name
+            column_info['filename'] = filename
+            columns.append(column_info)
+
+        handle = {'key': key, 'length': len(df), 'column_index': df.columns, 'columns': columns}
+        self.handles[key] = handle
+        return handle
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Returns the dataframe for a handle returned by publish(). This is
+        called in the worker processes.
+
+        Parameters
+        ----------
+        handle : dict
+            The handle returned by publish().
+
+        Returns
+        -------
+        pd.DataFrame
+            The published dataframe. Do not modify it.
+        """
+        key = handle['key']
+        with cls._lock:
+            if key in cls._attached:
+                return cls._attached[key]
+
+        data = {}
+        for column_info in handle['columns']:
+            values = np.load(column_info['filename'], mmap_mode='r', allow_pickle=False).view(np.ndarray)
+            if column_info['kind'] == 'numeric':
+                data[column_info['name']] = pd.Series(values, copy=False)
+            elif column_info['kind'] == 'datetime':
+                dates = pd.to_datetime(np.asarray(values), unit=column_info['unit'], utc=True)
+                dates = dates.as_unit(column_info['unit']).tz_convert(column_info['tz'])
+                data[column_info['name']] = pd.Series(dates)
+            else:
+                with open(column_info['uniques_filename'], 'rb') as f:
+                    uniques = pickle.load(f)
+                data[column_info['name']] = pd.Series(uniques.take(np.asarray(values)), dtype=column_info['dtype'])
+
+        df = pd.DataFrame(data, copy=False)
+        df.columns = handle['column_index']
+        with cls._lock:
+            cls._attached[key] = df
+        return df
+
+    @classmethod
+    def detach_all(cls):
+        """
+        Forgets all the dataframes attached in this process.
+        """
+        with cls._lock:
+            cls._attached.clear()
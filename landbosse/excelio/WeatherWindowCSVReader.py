@@ -1,5 +1,6 @@
 from math import ceil
 
+import numpy as np
 import pandas as pd
 
 
@@ -115,8 +116,9 @@ def read_weather_window(weather_data, local_timezone='America/Denver'):
     weather_data['Day'] = weather_data['Date'].dt.day
     weather_data['Hour'] = weather_data['Date'].dt.hour
 
-    # The original date columns are now redundant. Drop them.
-    weather_data.drop(columns=['Date', 'Date UTC'])
+    # The original date columns are redundant for the calculations, but
+    # they are kept here for anyone inspecting the weather window.
+    # compact_weather_window() drops them.
 
     # create time window for normal (8am to 6pm) versus long (24 hour) time window for operation
     weather_data['Time window'] = weather_data['Hour'].between(8, 18, inclusive='both')
@@ -134,6 +136,60 @@ def read_weather_window(weather_data, local_timezone='America/Denver'):
     # return the result
     return weather_data
 
+
+def compact_weather_window(weather_window_df):
+    """
+    This function makes a compact copy of a weather window made by
+    read_weather_window() or extend_weather_window(). The compact weather
+    window uses several times less memory and pickles to several times
+    fewer bytes, which matters because every project has its own weather
+    window.
+
+    The compact weather window differs from the original in these ways:
+
+    'Date UTC' and 'Date' are dropped. The calculations only need the
+        season and time window, and 'Month', 'Day' and 'Hour' are kept.
+
+    'Season' and 'Time window' are categoricals instead of strings.
+        Comparisons and isin() work on them the same way, so
+        Manager.execute_landbosse filters the compact weather window the
+        same way as the original.
+
+    'Temp C', 'Pressure atm', 'Direction deg' and 'Speed m per s' are
+        float32. read_weather_window() reads the values at float32
+        precision, so no values change. However, calculations on an
+        extended weather window, which is float64, are done in float32
+        on the compact weather window and can differ in the last bits.
+
+    'Month', 'Day' and 'Hour' are int8.
+
+    Parameters
+    ----------
+    weather_window_df : pd.DataFrame
+        The weather window to compact. It is not modified.
+
+    Returns
+    -------
+    pd.DataFrame
+        The compact weather window.
+    """
+    date_columns = [column for column in ['Date UTC', 'Date'] if column in weather_window_df.columns]
+    result = weather_window_df.drop(columns=date_columns)
+
+    for column in ['Season', 'Time window']:
+        if column in result.columns:
+            result[column] = result[column].astype('category')
+
+    for column in ['Temp C', 'Pressure atm', 'Direction deg', 'Speed m per s']:
+        if column in result.columns:
+            result[column] = pd.to_numeric(result[column]).astype(np.float32)
+
+    for column in ['Month', 'Day', 'Hour']:
+        if column in result.columns:
+            result[column] = result[column].astype(np.int8)
+
+    return result
+
 def extend_weather_window(weather_window_df, months_of_weather_data_needed):
     """
     This function extends a weather window by duplicating the rows to create
@@ -151,6 +207,14 @@ def extend_weather_window(weather_window_df, months_of_weather_data_needed):
     If rows are added to the weather window, they are added to a new dataframe.
     The weather window is not modified in place.
 
+    The new dataframe is built column by column by repeating the underlying
+    arrays, without making a Python object for each row. Its columns have
+    the dtypes that building the dataframe from a list of row dictionaries
+    would give them: float columns become float64, integer columns become
+    int64, object columns are converted to the type of their values and
+    all other columns, such as dates and strings, keep their dtype. See
+    tiled_column() below.
+
     Parameters
     ----------
     weather_window_df : pd.DataFrame
@@ -176,8 +240,39 @@ def extend_weather_window(weather_window_df, months_of_weather_data_needed):
         return weather_window_df
 
     number_of_windows_needed = int(ceil(hours_of_weather_data_needed / hours_of_weather_data_available))
-    weather_window_as_list = weather_window_df.to_dict(orient='records')
-    weather_window_repeated_as_list = weather_window_as_list * number_of_windows_needed
-    result = pd.DataFrame(weather_window_repeated_as_list)
+    repeated_rows = np.tile(np.arange(hours_of_weather_data_available), number_of_windows_needed)
+    result = pd.DataFrame({
+        column_name: tiled_column(column, repeated_rows)
+        for column_name, column in weather_window_df.items()
+    })
 
     return result
+
+
+def tiled_column(column, repeated_rows):
+    """
+    Repeats the values of one column of a weather window.
+
+    Parameters
+    ----------
+    column : pd.Series
+        The column to repeat.
+
+    repeated_rows : np.ndarray
+        The positions of the rows to take, in order.
+
+    Returns
+    -------
+    pd.Series
+        The repeated values, with a new RangeIndex.
+    """
+    tiled = pd.Series(column.array.take(repeated_rows), name=column.name)
+    if pd.api.types.is_bool_dtype(tiled.dtype) or not isinstance(tiled.dtype, np.dtype):
+        return tiled
+    if pd.api.types.is_float_dtype(tiled.dtype):
+        return tiled.astype(np.float64)
+    if pd.api.types.is_integer_dtype(tiled.dtype):
+        return tiled.astype(np.int64)
+    if pd.api.types.is_object_dtype(tiled.dtype):
+        return tiled.infer_objects()
+    return tiled
@@ -0,0 +1,253 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .WeatherWindowCSVReader import read_weather_window
+
+
+class WeatherWindowCache:
+    """
+    This class does not need to be instantiated. Like XlsxDataframeCache,
+    the cache is a class attribute, so it is shared by all the projects
+    that run in one process.
+
+    read_weather_window() parses the dates, converts timezones, extracts
+    months, days and hours and maps seasons. That is slow, and in a
+    parametric run every variant of a project reads the same weather_window
+    sheet. This class remembers the processed weather window so that each
+    distinct sheet is only processed once per process.
+
+    The processed weather windows can also be stored on disk, so that
+    later runs load them without processing them at all. To enable the
+    disk cache, set the environment variable LANDBOSSE_WEATHER_CACHE_DIR
+    to a directory, or set the cache_dir class attribute. The files are
+    pandas pickles, because they keep the timezone-aware dates and the
+    float32 columns exactly as read_weather_window() makes them.
+
+    Weather windows are keyed by a hash of the contents of the sheet
+    (column names, dtypes and every value) and the local timezone, so an
+    edited sheet is processed again rather than served from the cache.
+
+    The weather windows in memory are kept in a least recently used (LRU)
+    cache bounded to maxsize weather windows, since each one is several MB
+    and every parametric edit of the weather_window sheet makes another.
+    Setting maxsize to 0 disables the memory cache.
+
+    As with XlsxDataframeCache, copies are returned so callers cannot
+    mutate the cached dataframes.
+    """
+
+    # _cache holds processed weather windows in this process in least
+    # recently used order. Keys are the hashes made by key() below.
+    _cache = OrderedDict()
+
+    # Maximum number of weather windows in the memory cache.
+    maxsize = 8
+
+    # Directory for the disk cache. None means the directory is taken from
+    # the LANDBOSSE_WEATHER_CACHE_DIR environment variable. If that is
+    # not set either, there is no disk cache.
+    cache_dir = None
+
+    # Changing the output of read_weather_window() must change this version
+    # so that stale files in the disk cache are not used.
+    format_version = 1
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def key(cls, weather_data, local_timezone='America/Denver'):
+        """
+        Makes the cache key for a weather_window sheet.
+
+        Parameters
+        ----------
+        weather_data : pd.DataFrame
+            The weather_window sheet as read from the project_data .xlsx
+            file.
+
+        local_timezone : str
+            The TZ database name of the local timezone.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the sheet contents and timezone.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'v{cls.format_version}|{local_timezone}|'.encode())
+        digest.update(repr(list(weather_data.columns)).encode())
+        digest.update(repr([str(dtype) for dtype in weather_data.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(weather_data, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def disk_cache_dir(cls):
+        """
+        Returns
+        -------
+        str or None
+            The directory of the disk cache, or None if the disk cache is
+            disabled.
+        """
+        if cls.cache_dir is not None:
+            return cls.cache_dir
+        return os.environ.get('LANDBOSSE_WEATHER_CACHE_DIR')
+
+    @classmethod
+    def read_weather_window(cls, weather_data, local_timezone='America/Denver'):
+        """
+        Returns the processed weather window for a weather_window sheet. It
+        is taken from this process's cache if possible, then from the disk
+        cache, and only processed with read_weather_window() if neither has
+        it.
+
+        Parameters
+        ----------
+        weather_data : pd.DataFrame
+            The weather_window sheet as read from the project_data .xlsx
+            file.
+
+        local_timezone : str
+            The TZ database name of the local timezone.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of the processed weather window. See read_weather_window()
+            in the WeatherWindowCSVReader module for the columns.
+        """
+        key = cls.key(weather_data, local_timezone)
+
+        with cls._lock:
+            weather_window = cls._cache.get(key)
+            if weather_window is not None:
+                cls._cache.move_to_end(key)
+        if weather_window is not None:
+            return weather_window.copy()
+
+        weather_window = cls.load(key)
+        if weather_window is None:
+            weather_window = read_weather_window(weather_data, local_timezone)
+            cls.save(key, weather_window)
+
+        cls.remember(key, weather_window)
+        return weather_window.copy()
+
+    @classmethod
+    def remember(cls, key, weather_window):
+        """
+        Stores a weather window in the memory cache, evicting the least
+        recently used weather windows if it is full.
+        """
+        with cls._lock:
+            if cls.maxsize <= 0:
+                return
+            cls._cache[key] = weather_window
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def cache_filename(cls, key):
+        """
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        str or None
+            The filename of the weather window in the disk cache, or None if
+            the disk cache is disabled.
+        """
+        cache_dir = cls.disk_cache_dir()
+        if not cache_dir:
+            return None
+        return os.path.join(cache_dir, f'weather-window-{key}.pkl')
+
+    @classmethod
+    def load(cls, key):
+        """
+        Loads a weather window from the disk cache.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        pd.DataFrame or None
+            The weather window, or None if it is not in the disk cache or the
+            file cannot be read.
+        """
+        filename = cls.cache_filename(key)
+        if filename is None or not os.path.exists(filename):
+            return None
+        try:
+            return pd.read_pickle(filename)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as err:
+            print(f'Ignoring unreadable weather window cache file {filename}: {err}')
+            return None
+
+    @classmethod
+    def save(cls, key, weather_window):
+        """
+        Saves a weather window to the disk cache, if the disk cache is
+        enabled. The file is written under a temporary name and renamed,
+        so a parallel process never reads a partially written file.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        weather_window : pd.DataFrame
+            The processed weather window.
+        """
+        filename = cls.cache_filename(key)
+        if filename is None:
+            return
+        cache_dir = os.path.dirname(filename)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(weather_window, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, filename)
+        except OSError as err:
+            print(f'Could not write weather window cache file {filename}: {err}')
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    @classmethod
+    def clear(cls):
+        """
+        Empties this process's cache. Files in the disk cache are not
+        removed.
+        """
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def set_maxsize(cls, maxsize):
+        """
+        Changes the maximum number of weather windows in the memory cache,
+        evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        maxsize : int
+            The new maximum size. 0 disables the memory cache.
+        """
+        with cls._lock:
+            cls.maxsize = maxsize
+            while len(cls._cache) > max(maxsize, 0):
+                cls._cache.popitem(last=False)
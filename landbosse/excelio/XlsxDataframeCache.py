@@ -29,7 +29,7 @@ class XlsxDataframeCache:
     _cache = {}
 
     @classmethod
-    def read_all_sheets_from_xlsx(cls, xlsx_basename, xlsx_path=None):
+    def read_all_sheets_from_xlsx(cls, xlsx_basename, xlsx_path=None, copy=True, exclude=()):
         """
         If the .xlsx file specified by .xlsx_basename has been read before
         (meaning it is stored as a key on cls._cache), a copy of all the
@@ -54,6 +54,16 @@ class XlsxDataframeCache:
             The path from which to read the .xlsx file. This parameter
             has the default value of
 
+        copy : bool
+            If True, copies of the dataframes are returned. If False, the
+            cached dataframes themselves are returned. This is faster, but
+            the caller must not modify them.
+
+        exclude : iterable
+            The names of sheets that are left out of the returned
+            dictionary, so that they are not copied. They are still read
+            and cached.
+
         Returns
         -------
         dict
@@ -63,8 +73,33 @@ class XlsxDataframeCache:
         """
         if xlsx_basename in cls._cache:
             original = cls._cache[xlsx_basename]
-            return cls.copy_dataframes(original)
+        else:
+            original = cls.read_xlsx(xlsx_basename, xlsx_path)
+            cls._cache[xlsx_basename] = original
+        sheets_dict = {sheet_name: df for sheet_name, df in original.items() if sheet_name not in exclude}
+        return cls.copy_dataframes(sheets_dict) if copy else sheets_dict
+
+    @classmethod
+    def read_xlsx(cls, xlsx_basename, xlsx_path=None):
+        """
+        Reads all the sheets of an .xlsx file, without the rows that are
+        entirely empty.
 
+        Parameters
+        ----------
+        xlsx_basename : str
+            The base name of the xlsx file to read. See
+            read_all_sheets_from_xlsx().
+
+        xlsx_path : str
+            The path from which to read the .xlsx file. See
+            read_all_sheets_from_xlsx().
+
+        Returns
+        -------
+        dict
+            A dictionary of dataframes, keyed by the names of the sheets.
+        """
         file_ops = XlsxFileOperations()
 
         if xlsx_path is None:
@@ -76,8 +111,7 @@ class XlsxDataframeCache:
         sheets_dict = {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
         for sheet_name in xlsx.sheet_names:
             sheets_dict[sheet_name].dropna(inplace=True, how='all')
-        cls._cache[xlsx_basename] = sheets_dict
-        return cls.copy_dataframes(sheets_dict)
+        return sheets_dict
 
     @classmethod
     def copy_dataframes(cls, dict_of_dataframes):
@@ -4,6 +4,8 @@ from datetime import datetime
 from shutil import copy2
 from shutil import copytree
 
+from ..model import DetailRows
+from .ArrowResultSink import ArrowResultSink
 from .XlsxOperationException import XlsxOperationException
 
 
@@ -118,6 +120,230 @@ class XlsxFileOperations:
         # Return the state of the command line arguments.
         return input_path, output_path, validation_enabled, enable_scaling_study
 
+    def get_option_from_argv_or_env(self, flag, env_name, default=None):
+        """
+        This looks for the value of an option on the command line, in the
+        form:
+
+        --flag [value]
+
+        If the option is not on the command line, the value of the
+        environment variable is used. If that is not set either, the default
+        is returned.
+
+        Parameters
+        ----------
+        flag : str
+            The command line flag, including the leading dashes.
+
+        env_name : str
+            The name of the environment variable.
+
+        default : str
+            The value returned if the option is not found.
+
+        Returns
+        -------
+        str
+            The value of the option.
+        """
+        if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv):
+            return sys.argv[sys.argv.index(flag) + 1]
+        return os.environ.get(env_name, default)
+
+    def parametric_project_data_options(self):
+        """
+        This finds how the project data of parametric variants should be
+        written. See ParametricProjectDataWriter for the modes.
+
+        The mode is set with --parametric-project-data [xlsx|manifest|none] on
+        the command line or the LANDBOSSE_PARAMETRIC_PROJECT_DATA environment
+        variable. The default is xlsx.
+
+        The number of background writer processes for xlsx mode is set with
+        --project-data-writers [number] on the command line or the
+        LANDBOSSE_PROJECT_DATA_WRITERS environment variable. The default is
+        0, which writes in the foreground.
+
+        Returns
+        -------
+        str, int
+            The mode and the number of writer processes.
+        """
+        mode = self.get_option_from_argv_or_env('--parametric-project-data', 'LANDBOSSE_PARAMETRIC_PROJECT_DATA', 'xlsx')
+        writers = self.get_option_from_argv_or_env('--project-data-writers', 'LANDBOSSE_PROJECT_DATA_WRITERS', '0')
+        try:
+            writers = int(writers)
+        except ValueError:
+            raise XlsxOperationException(f'The number of project data writers must be an integer, not {writers}.')
+        return mode, writers
+
+    def parallel_options(self):
+        """
+        This finds how the parallel runner schedules projects on its
+        workers.
+
+        The number of worker processes is set with --workers [number] on the
+        command line or the LANDBOSSE_WORKERS environment variable. The
+        default is the number of CPUs.
+
+        The number of projects sent to a worker at once is set with
+        --chunk-size [number] or LANDBOSSE_CHUNK_SIZE. The default is 1.
+
+        The number of chunks submitted to the workers at any time is set
+        with --max-in-flight [number] or LANDBOSSE_MAX_IN_FLIGHT. The
+        default is twice the number of workers.
+
+        Returns
+        -------
+        int or None, int, int or None
+            The number of workers, the chunk size and the number of chunks
+            in flight. None means the default.
+
+        Raises
+        ------
+        XlsxOperationException
+            If an option is not a positive integer.
+        """
+        options = [
+            ('--workers', 'LANDBOSSE_WORKERS', None),
+            ('--chunk-size', 'LANDBOSSE_CHUNK_SIZE', '1'),
+            ('--max-in-flight', 'LANDBOSSE_MAX_IN_FLIGHT', None),
+        ]
+        values = []
+        for flag, env_name, default in options:
+            value = self.get_option_from_argv_or_env(flag, env_name, default)
+            if value is not None:
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise XlsxOperationException(f'{flag} must be an integer, not {value}.')
+                if value < 1:
+                    raise XlsxOperationException(f'{flag} must be at least 1, not {value}.')
+            values.append(value)
+        workers, chunk_size, max_in_flight = values
+        return workers, chunk_size, max_in_flight
+
+    def stream_results_enabled(self):
+        """
+        This checks whether results should be streamed to the output .csv
+        files as projects finish, instead of being held in memory until the
+        end of the run. Streaming is enabled with --stream-results on the
+        command line or by setting the LANDBOSSE_STREAM_RESULTS environment
+        variable to 1, true or yes.
+
+        Returns
+        -------
+        bool
+            True if streaming is enabled.
+        """
+        if '--stream-results' in sys.argv:
+            return True
+        return os.environ.get('LANDBOSSE_STREAM_RESULTS', '').lower() in ('1', 'true', 'yes')
+
+    def detail_level_option(self):
+        """
+        This finds how many rows of the detailed output the modules make.
+        See DetailRows for the levels.
+
+        The level is set with --detail-level [none|summary|full] on the
+        command line or the LANDBOSSE_DETAIL_LEVEL environment variable. The
+        default is full. The 'Detail level' column of the project list, if
+        there is one, overrides it for each project.
+
+        Returns
+        -------
+        str
+            The detail level.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the level is not one of the detail levels.
+        """
+        detail_level = self.get_option_from_argv_or_env('--detail-level', 'LANDBOSSE_DETAIL_LEVEL',
+                                                        DetailRows.default_level)
+        try:
+            return DetailRows.check_level(detail_level)
+        except ValueError as err:
+            raise XlsxOperationException(str(err))
+
+    def output_format_options(self):
+        """
+        This finds the formats in which the costs, details and extended
+        project list are written in addition to the .csv files, and how the
+        costs and details in those formats are partitioned. See
+        ArrowResultSink.
+
+        The formats are set with --output-formats on the command line or the
+        LANDBOSSE_OUTPUT_FORMATS environment variable, as a comma separated
+        list of parquet and feather. By default, only the .csv files are
+        written. The partitioning is set with
+        --partition-by [none|project|module] on the command line or the
+        LANDBOSSE_PARTITION_BY environment variable. The default is none.
+
+        Returns
+        -------
+        list, str
+            The formats and the partitioning.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a format or the partitioning is unknown.
+        """
+        formats = self.get_option_from_argv_or_env('--output-formats', 'LANDBOSSE_OUTPUT_FORMATS', '')
+        formats = [output_format.strip().lower() for output_format in formats.split(',') if output_format.strip()]
+        for output_format in formats:
+            if output_format not in ArrowResultSink.formats:
+                raise XlsxOperationException(f'--output-formats must be a list of '
+                                             f'{", ".join(ArrowResultSink.formats)}, not {output_format}.')
+        partition_by = self.get_option_from_argv_or_env('--partition-by', 'LANDBOSSE_PARTITION_BY', 'none').lower()
+        if partition_by not in ArrowResultSink.partitions:
+            raise XlsxOperationException(f'--partition-by must be one of '
+                                         f'{", ".join(ArrowResultSink.partitions)}, not {partition_by}.')
+        return list(dict.fromkeys(formats)), partition_by
+
+    def checkpoint_options(self):
+        """
+        This finds where the results of finished projects are checkpointed
+        and whether a run resumes from the checkpoint. See CheckpointStore.
+
+        Checkpointing is disabled by default. The checkpoint is an SQLite
+        database. It is enabled with --checkpoint [pathname] on the command
+        line, with the LANDBOSSE_CHECKPOINT environment variable set to a
+        pathname, or by resuming. If no pathname is given, the checkpoint is
+        landbosse_checkpoint.sqlite in the output directory given on the
+        command line, outside of the timestamped folder of each run, so that
+        later runs can find it. A pathname of none disables checkpointing.
+
+        Resuming is enabled with --resume on the command line or by setting
+        the LANDBOSSE_RESUME environment variable to 1, true or yes. When a
+        run resumes, projects that finished with identical inputs are not
+        calculated again.
+
+        Returns
+        -------
+        str or None, bool
+            The pathname of the checkpoint, or None if checkpointing is
+            disabled, and whether to resume.
+        """
+        if '--resume' in sys.argv:
+            resume = True
+        else:
+            resume = os.environ.get('LANDBOSSE_RESUME', '').lower() in ('1', 'true', 'yes')
+
+        checkpoint = self.get_option_from_argv_or_env('--checkpoint', 'LANDBOSSE_CHECKPOINT')
+        if checkpoint is not None and checkpoint.startswith('-'):
+            # --checkpoint is followed by another option, not a pathname.
+            checkpoint = None
+        if checkpoint is None and ('--checkpoint' in sys.argv or resume):
+            _, output_base_path, _, _ = self.get_input_output_paths_from_argv_or_env()
+            checkpoint = os.path.join(output_base_path, 'landbosse_checkpoint.sqlite')
+        if checkpoint is not None and checkpoint.lower() == 'none':
+            checkpoint = None
+        return checkpoint, resume
+
     def landbosse_input_dir(self):
         """
         See the get_input_output_paths_from_argv_or_env() function above. This
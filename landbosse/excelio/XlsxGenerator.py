@@ -133,9 +133,9 @@ class XlsxGenerator:
 
         Parameters
         ----------
-        rows : list
-            List of dictionaries that are each row in the output
-            sheet.
+        rows : pd.DataFrame
+            The costs, with the columns in CostModule.cost_columns. Each
+            row is a row in the output sheet.
         """
         worksheet = self.workbook.add_worksheet('costs_by_module_type_operation')
         for idx, col_name in enumerate(['Project ID with serial',
@@ -149,19 +149,21 @@ class XlsxGenerator:
                                         'Cost per project',
                                         'USD/kW per project']):
             worksheet.write(0, idx, col_name, self.header_format)
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['num_turbines'])
-            worksheet.write(row_idx + 1, 2, row['turbine_rating_MW'])
-            worksheet.write(row_idx + 1, 3, row['rotor_diameter_m'])
-            worksheet.write(row_idx + 1, 4, row['module'])
-            worksheet.write(row_idx + 1, 5, row['operation_id'])
-            worksheet.write(row_idx + 1, 6, row['type_of_cost'])
-            worksheet.write(row_idx + 1, 7, row['cost_per_turbine'], self.accounting_format)
-            worksheet.write(row_idx + 1, 8, row['cost_per_project'], self.accounting_format)
-            worksheet.write(row_idx + 1, 9, row['usd_per_kw_per_project'], self.accounting_format)
-            worksheet.set_column(0, 5, 25)
-            worksheet.set_column(6, 10, 17)
+        columns = ['project_id_with_serial',
+                   'num_turbines',
+                   'turbine_rating_MW',
+                   'rotor_diameter_m',
+                   'module',
+                   'operation_id',
+                   'type_of_cost',
+                   'cost_per_turbine',
+                   'cost_per_project',
+                   'usd_per_kw_per_project']
+        for col_idx, col_name in enumerate(columns):
+            cell_format = self.accounting_format if col_idx >= 7 else None
+            worksheet.write_column(1, col_idx, rows[col_name].tolist(), cell_format)
+        worksheet.set_column(0, 5, 25)
+        worksheet.set_column(6, 10, 17)
         worksheet.freeze_panes(1, 0)  # Freeze the first row.
 
     def tab_details(self, rows):
@@ -1,8 +1,14 @@
+import os
+
 import pandas as pd
 
+from ..model import CostModule, DetailRows
+from .CheckpointStore import CheckpointStore
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
+from .ParametricProjectDataWriter import ParametricProjectDataWriter
+from .ResultSink import ListResultSink
 
 
 class XlsxManagerRunner:
@@ -14,7 +20,8 @@ class XlsxManagerRunner:
     or parallel manager runner is needed.
     """
 
-    def __init__(self, file_ops=None):
+    def __init__(self, file_ops=None, parametric_project_data=None, project_data_writers=None, checkpoint=None,
+                 resume=None, detail_level=None):
         """
         The constructor simply creates an XlsxFileOperations instance
         to live throughout the lifetime of the instance
@@ -25,10 +32,137 @@ class XlsxManagerRunner:
             The file operation instance used to create filenames. If this
             is left at the default of None, a new instance of
             XlsxFileOperations is created.
+
+        parametric_project_data : str
+            How the project data of each parametric variant is written:
+            'xlsx', 'manifest' or 'none'. See ParametricProjectDataWriter.
+            If None, it is found by
+            XlsxFileOperations.parametric_project_data_options().
+
+        project_data_writers : int
+            The number of background processes that write project data in
+            xlsx mode. If None, it is found by
+            XlsxFileOperations.parametric_project_data_options().
+
+        checkpoint : str
+            The pathname of the SQLite database in which the results of
+            finished projects are checkpointed, or 'none' to disable
+            checkpointing. If None, it is found by
+            XlsxFileOperations.checkpoint_options().
+
+        resume : bool
+            If True, projects that finished with identical inputs in the
+            checkpoint are not calculated again. If None, it is found by
+            XlsxFileOperations.checkpoint_options().
+
+        detail_level : str
+            How many rows of the detailed output the modules make: 'none',
+            'summary' or 'full'. See DetailRows. The 'Detail level' column
+            of the project list overrides it for each project. If None, it
+            is found by XlsxFileOperations.detail_level_option().
         """
         self.file_ops = file_ops if file_ops is not None else XlsxFileOperations()
+        mode, writers = self.file_ops.parametric_project_data_options()
+        self.parametric_project_data = parametric_project_data if parametric_project_data is not None else mode
+        self.project_data_writers = project_data_writers if project_data_writers is not None else writers
+        options_checkpoint, options_resume = self.file_ops.checkpoint_options()
+        if checkpoint is None:
+            checkpoint = options_checkpoint
+        elif checkpoint.lower() == 'none':
+            checkpoint = None
+        self.checkpoint = checkpoint
+        self.resume = resume if resume is not None else options_resume
+        if detail_level is None:
+            self.detail_level = self.file_ops.detail_level_option()
+        else:
+            self.detail_level = DetailRows.check_level(detail_level)
+
+    @staticmethod
+    def project_id_with_serial(project_parameters):
+        """
+        Finds the name of a project in the extended project list.
+
+        Parameters
+        ----------
+        project_parameters : pd.Series
+            The row of the extended project list for the project.
+
+        Returns
+        -------
+        str
+            The Project ID with serial. If it is null, there are no
+            parametric modifications to the project data, and the plain
+            Project ID is returned.
+        """
+        if pd.isnull(project_parameters['Project ID with serial']):
+            return project_parameters['Project ID']
+        return project_parameters['Project ID with serial']
+
+    def checkpoint_store(self):
+        """
+        Opens the checkpoint of the results of finished projects.
+
+        Returns
+        -------
+        CheckpointStore or None
+            The checkpoint, or None if checkpointing is disabled.
+        """
+        if self.checkpoint is None:
+            return None
+        checkpoint_store = CheckpointStore(self.checkpoint)
+        if self.resume:
+            print(f'Resuming from checkpoint {self.checkpoint}')
+        return checkpoint_store
+
+    def project_input_hash(self, checkpoint_store, project_parameters, project_data_edits, keep_details=True):
+        """
+        Hashes the inputs of a project for the checkpoint.
+
+        Parameters
+        ----------
+        checkpoint_store : CheckpointStore
+            The checkpoint.
+
+        project_parameters : pd.Series
+            The row of the extended project list for the project, after the
+            parametric and scaling modifications.
+
+        project_data_edits : list
+            The parametric modifications of the project data.
+
+        keep_details : bool
+            False if the detail rows are not checkpointed.
+
+        Returns
+        -------
+        str
+            The hash made by CheckpointStore.input_hash().
+        """
+        project_data_xlsx = os.path.join(self.file_ops.landbosse_input_dir(),
+                                         'project_data',
+                                         f'{project_parameters["Project data file"]}.xlsx')
+        return checkpoint_store.input_hash(project_parameters, project_data_xlsx, project_data_edits,
+                                           detail_level=self.detail_level, keep_details=keep_details)
+
+    def parametric_project_data_writer(self, file_ops):
+        """
+        Makes the writer for the project data of the parametric variants.
+
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            The file operations that find the output folder.
 
-    def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True):
+        Returns
+        -------
+        ParametricProjectDataWriter
+            The writer, configured as set in the constructor.
+        """
+        return ParametricProjectDataWriter(output_path=file_ops.parametric_project_data_output_path(),
+                                           mode=self.parametric_project_data,
+                                           writers=self.project_data_writers)
+
+    def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True, result_sinks=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -53,6 +187,15 @@ class XlsxManagerRunner:
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified. This is implemented by subclasses.
 
+        result_sinks : list
+            Optional. If given, results are streamed: each project's output
+            dictionary is reduced to its cost and detail rows by
+            ResultSink.reduce() and added to every sink as soon as the
+            project finishes, instead of being kept until the end of the
+            run. The details and costs in the final result come from the
+            first ListResultSink in result_sinks, and are empty if there is
+            none.
+
         Returns
         -------
         OrderedDict or dict, list
@@ -73,10 +216,36 @@ class XlsxManagerRunner:
         """
         raise NotImplementedError('run_from_project_list_xlsx() can only be called on subclasses')
 
-    def extract_module_type_operation_lists(self, runs_dict):
+    def final_result_lists(self, runs_dict, result_sinks):
+        """
+        This method makes the details_list and
+        costs_by_module_type_operation of the final result of a run.
+
+        Parameters
+        ----------
+        runs_dict : dict
+            The output dictionaries of the projects, if results were not
+            streamed.
+
+        result_sinks : list
+            The result sinks, if results were streamed. Otherwise None.
+
+        Returns
+        -------
+        list, pd.DataFrame
+            The details list and the dataframe of costs.
         """
-        This method extract all the cost_by_module_type_operation lists for
-        output in an Excel file.
+        if result_sinks is None:
+            return self.extract_details_lists(runs_dict), self.extract_costs_by_module_type_operation(runs_dict)
+        for result_sink in result_sinks:
+            if isinstance(result_sink, ListResultSink):
+                return result_sink.details_list, result_sink.costs_by_module_type_operation
+        return [], CostModule.concat_costs([])
+
+    def extract_costs_by_module_type_operation(self, runs_dict):
+        """
+        This method extract all the cost_by_module_type_operation dataframes
+        for output in an Excel file.
 
         It finds values for the keys ending in '_module_type_operation'. It
         then concatenates them
@@ -85,20 +254,19 @@ class XlsxManagerRunner:
         Parameters
         ----------
         runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+            Values are the names of the projects. Keys are the output
+            dictionaries of the projects.
 
         Returns
         -------
-        list
-            List of dicts to write to the .csv.
+        pd.DataFrame
+            The cost rows of every project, with the columns in
+            CostModule.cost_columns.
         """
-        result = []
-        for project_results in runs_dict.values():
-            for key, value in project_results.items():
-                if key.endswith('_module_type_operation'):
-                    result.extend(value)
-        return result
+        return CostModule.concat_costs(value
+                                       for project_results in runs_dict.values()
+                                       for key, value in project_results.items()
+                                       if key.endswith('_module_type_operation'))
 
     def extract_details_lists(self, runs_dict):
         """
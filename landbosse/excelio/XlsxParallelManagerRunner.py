@@ -1,23 +1,92 @@
+import itertools
 import os
+import time
 from concurrent import futures
 
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
-from .XlsxGenerator import XlsxGenerator
+from .WeatherWindowCache import WeatherWindowCache
+from .SharedDataframeStore import SharedDataframeStore
+from .ResultSink import ResultSink
 
 
 class XlsxParallelManagerRunner(XlsxManagerRunner):
     """
     This subclass implementation of XlsxManagerRunner runs all projects
     with a ProcessPoolExecutor.
+
+    Every parametric variant of a project has the same weather window,
+    which is by far the largest sheet of the project data. So, by default,
+    the weather windows are not sent to the workers with each task.
+    Instead, each distinct weather window is processed once and published
+    to memory-mapped files with SharedDataframeStore, and tasks carry only
+    a handle to it.
+
+    Tasks do not carry copies of the project data either. They carry the
+    basename of the project data file and the list of parametric cell
+    edits. Each worker reads the project data file once into its own
+    XlsxDataframeCache and applies the edits to a copy. See
+    run_single_project() below.
+
+    Tasks are made lazily from the project list as the workers need them.
+    They are grouped into chunks of chunk_size projects, and at most
+    max_in_flight chunks are submitted to the workers at any time, so a
+    large parametric sweep never has all its tasks in memory at once.
+    Throughput is printed as the chunks finish.
     """
 
-    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
+    # The minimum number of seconds between throughput reports.
+    report_interval_seconds = 10.0
+
+    def __init__(self, file_ops=None, share_weather_windows=True, workers=None, chunk_size=None,
+                 max_in_flight=None, **kwargs):
+        """
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            See XlsxManagerRunner.
+
+        share_weather_windows : bool
+            If True, weather windows are shared with the workers through
+            memory-mapped files. If False, each worker reads the
+            weather_window sheet from the project data file itself, like
+            the other sheets; the tasks carry only the basename of that file
+            and the cell edits either way.
+
+        workers : int
+            The number of worker processes. If None, it is found by
+            XlsxFileOperations.parallel_options(), which defaults to the
+            number of CPUs.
+
+        chunk_size : int
+            The number of projects sent to a worker at once. If None, it is
+            found by XlsxFileOperations.parallel_options().
+
+        max_in_flight : int
+            The maximum number of chunks submitted to the workers at any
+            time. If None, it is found by
+            XlsxFileOperations.parallel_options(), which defaults to twice
+            the number of workers.
+
+        kwargs
+            The other keyword arguments of XlsxManagerRunner.
+        """
+        super().__init__(file_ops, **kwargs)
+        self.share_weather_windows = share_weather_windows
+        options_workers, options_chunk_size, options_max_in_flight = self.file_ops.parallel_options()
+        self.workers = workers if workers is not None else options_workers
+        self.chunk_size = chunk_size if chunk_size is not None else options_chunk_size
+        if max_in_flight is None:
+            max_in_flight = options_max_in_flight
+        if max_in_flight is None:
+            max_in_flight = 2 * (self.workers or os.cpu_count() or 1)
+        self.max_in_flight = max_in_flight
+
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, result_sinks=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -39,25 +108,30 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified.
 
+        result_sinks : list
+            Optional. If given, results are streamed: each project's output
+            dictionary is reduced to its cost and detail rows by
+            ResultSink.reduce() and added to every sink as soon as the
+            project finishes, instead of being kept until the end of the
+            run. The details and costs in the final result come from the
+            first ListResultSink in result_sinks, and are empty if there is
+            none.
+
         Returns
         -------
-        dict, list, module_type_operation_lists
+        dict, list, pd.DataFrame
             First element of tuple is a dict that is the result of
             all the runs. Each key is the name of a project and each value
             is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets.
+            is the list of rows for the csv. The third element is the
+            dataframe of costs for the spreadsheets.
         """
         # Load the project list
         print('Calculating parametric values')
         extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
 
         # Prepare the file operations
-        file_ops = XlsxFileOperations()
-
-        # Instantiate an XlsxReader to handle the parametrics and master input
-        # dictionaries
-        xlsx_reader = XlsxReader()
+        file_ops = self.file_ops
 
         # Get a list ready to hold the project parameters after they have been modified
         # After all rows have been added to this list (each row is a series) then the
@@ -67,29 +141,185 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
-        # Prep all task for the executor
-        all_tasks = []
+        # The weather windows shared with the workers. See the class docstring.
+        shared_weather_windows = SharedDataframeStore()
+
+        # The project data of the variants is written as it is prepared,
+        # possibly in the background.
+        project_data_writer = self.parametric_project_data_writer(file_ops)
+
+        # The number of tasks, for report_task_payload()
+        task_payload = {'tasks': 0}
+
+        # The results of finished projects are checkpointed as they arrive.
+        checkpoint_store = self.checkpoint_store()
+
+        # The workers drop the detail rows, without making them, if no sink
+        # needs them.
+        keep_details = ResultSink.sinks_need_details(result_sinks)
+
+        # The output dictionaries of the projects, if they are not streamed.
+        # They are put in the order of the project list at the end.
+        results_by_project = dict()
+
+        def add_result(project_id_with_serial, output_dict, status=0, checkpointed=False):
+            # Only projects that finish without errors are checkpointed, so
+            # that failed projects run again when resuming.
+            if checkpoint_store is not None and status == 0 and not checkpointed:
+                checkpoint_store.add(project_id_with_serial, ResultSink.reduce(output_dict, keep_details))
+            if result_sinks is None:
+                results_by_project[project_id_with_serial] = output_dict
+            else:
+                for result_sink in result_sinks:
+                    result_sink.add(project_id_with_serial, output_dict)
+
+        def add_checkpointed_result(project_id_with_serial, reduced_output_dict):
+            add_result(project_id_with_serial, reduced_output_dict, checkpointed=True)
+
+        def add_chunk_results(chunk_index, results):
+            for project_id_with_serial, output_dict, status in results:
+                add_result(project_id_with_serial, output_dict, status)
+
+        # The tasks are made as the scheduler needs them.
         print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
+        tasks = self.generate_tasks(extended_project_list_before_parameter_modifications,
+                                    extended_project_list_after_parameter_modifications,
+                                    shared_weather_windows,
+                                    project_data_writer,
+                                    task_payload,
+                                    enable_cost_and_scaling_modifications,
+                                    reduce_output=result_sinks is not None,
+                                    keep_details=keep_details,
+                                    checkpoint_store=checkpoint_store,
+                                    add_checkpointed_result=add_checkpointed_result)
+
+        # Execute every project. The shared weather windows must exist until
+        # all the workers are done.
+        try:
+            with shared_weather_windows, futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self.run_tasks(executor, tasks, add_chunk_results)
+        finally:
+            # Wait for any project data still being written in the background.
+            project_data_writer.close()
+            if checkpoint_store is not None:
+                checkpoint_store.close()
+
+        if result_sinks is None:
+            # Get the output dictionary ready
+            runs_dict = dict()
+            for project_parameters in extended_project_list_after_parameter_modifications:
+                project_id_with_serial = self.project_id_with_serial(project_parameters)
+                runs_dict[project_id_with_serial] = results_by_project[project_id_with_serial]
+        else:
+            for result_sink in result_sinks:
+                result_sink.close()
+            runs_dict = dict()
+
+        self.report_task_payload(task_payload, shared_weather_windows)
+
+        # Assemble the dictionary with content for the details, details with inputs,
+        #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
+        final_result = dict()
+        final_result['details_list'], final_result['costs_by_module_type_operation'] = \
+            self.final_result_lists(runs_dict, result_sinks)
+        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+
+        # Return the runs for all the scenarios.
+        return final_result
+
+    def generate_tasks(self,
+                       extended_project_list_before_parameter_modifications,
+                       extended_project_list_after_parameter_modifications,
+                       shared_weather_windows,
+                       project_data_writer,
+                       task_payload,
+                       enable_cost_and_scaling_modifications,
+                       reduce_output,
+                       keep_details=True,
+                       checkpoint_store=None,
+                       add_checkpointed_result=None):
+        """
+        This generator prepares the task of each project in the extended
+        project list, one at a time, as the scheduler asks for them.
+
+        As each task is made, the modified project parameters are appended
+        to extended_project_list_after_parameter_modifications, the project
+        data is given to project_data_writer, the weather window is
+        published to shared_weather_windows and the task is counted in
+        task_payload.
+
+        Parameters
+        ----------
+        extended_project_list_before_parameter_modifications : pd.DataFrame
+            The project list extended with the parametric variants.
+
+        extended_project_list_after_parameter_modifications : list
+            The list to which the modified project parameters are appended.
+
+        shared_weather_windows : SharedDataframeStore
+            The store of weather windows shared with the workers.
+
+        project_data_writer : ParametricProjectDataWriter
+            The writer of the project data of each variant.
+
+        task_payload : dict
+            The counts for report_task_payload().
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx().
+
+        reduce_output : bool
+            If True, the workers reduce each output dictionary with
+            ResultSink.reduce().
+
+        keep_details : bool
+            If False, the workers do not keep the detail rows. See
+            ResultSink.sinks_need_details().
+
+        checkpoint_store : CheckpointStore
+            Optional. The checkpoint of the results of finished projects. The
+            input hash of each task is given to its expect() method.
+
+        add_checkpointed_result : function
+            If self.resume is True, projects that finished with identical
+            inputs in checkpoint_store are not yielded. Instead, this is
+            called with the name of the project and its reduced output
+            dictionary from the checkpoint.
+
+        Yields
+        ------
+        dict
+            The task of each project, for run_single_project().
+        """
+        # Instantiate an XlsxReader to handle the parametrics and master input
+        # dictionaries
+        xlsx_reader = XlsxReader()
+
+        # Keys of the unmodified weather windows of each project data file,
+        # so that each one is only hashed once.
+        weather_window_keys = dict()
+
         for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
 
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
+            project_id_with_serial = self.project_id_with_serial(project_parameters)
 
             print(f'Preparing {project_id_with_serial}')
 
             project_data_basename = project_parameters['Project data file']
             task = dict()
 
-            task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(task['project_data_sheets'], project_parameters)
+            # Find the parametric modifications. Check them against the cached,
+            # unmodified project data, which is not copied, and apply the
+            # modifications of the project list to the project parameters.
+            # The workers apply the modifications of the project data.
+            cached_project_data_sheets = \
+                XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename, copy=False)
+            cell_edits = xlsx_reader.cell_edits(project_parameters)
+            for cell_edit in cell_edits:
+                xlsx_reader.check_cell_edit(cached_project_data_sheets, project_parameters, cell_edit)
+            project_list_edits = [cell_edit for cell_edit in cell_edits if cell_edit[0] == 'project list']
+            project_data_edits = [cell_edit for cell_edit in cell_edits if cell_edit[0] != 'project list']
+            xlsx_reader.apply_cell_edits(cached_project_data_sheets, project_parameters, project_list_edits)
 
             # Apply cost and scaling modifications if needed.
             if enable_cost_and_scaling_modifications:
@@ -98,32 +328,146 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             # Append the modified project parameters
             extended_project_list_after_parameter_modifications.append(project_parameters)
 
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
+            # Record the project data of this variant.
+            project_data_writer.add(project_id_with_serial, project_data_basename, project_data_edits)
+
+            # Skip projects that have already finished with the same inputs.
+            if checkpoint_store is not None:
+                input_hash = self.project_input_hash(checkpoint_store, project_parameters, project_data_edits,
+                                                     keep_details)
+                if self.resume:
+                    checkpointed_output_dict = checkpoint_store.completed(project_id_with_serial, input_hash)
+                    if checkpointed_output_dict is not None:
+                        print(f'Resuming {project_id_with_serial} from checkpoint')
+                        add_checkpointed_result(project_id_with_serial, checkpointed_output_dict)
+                        continue
+                checkpoint_store.expect(project_id_with_serial, input_hash)
+
+            # Share the processed weather window with the workers. Only
+            # weather windows that are modified parametrically need to be
+            # hashed for each project.
+            if self.share_weather_windows:
+                weather_window_edits = [cell_edit for cell_edit in project_data_edits if cell_edit[0] == 'weather_window']
+                if len(weather_window_edits) > 0:
+                    weather_window_sheets = {'weather_window': cached_project_data_sheets['weather_window'].copy()}
+                    xlsx_reader.apply_cell_edits(weather_window_sheets, project_parameters, weather_window_edits)
+                    weather_window_sheet = weather_window_sheets['weather_window']
+                    key = WeatherWindowCache.key(weather_window_sheet)
+                else:
+                    weather_window_sheet = cached_project_data_sheets['weather_window']
+                    if project_data_basename not in weather_window_keys:
+                        weather_window_keys[project_data_basename] = WeatherWindowCache.key(weather_window_sheet)
+                    key = weather_window_keys[project_data_basename]
+                if key not in shared_weather_windows.handles:
+                    weather_window = WeatherWindowCache.read_weather_window(weather_window_sheet)
+                    shared_weather_windows.publish(key, weather_window)
+                task['weather_window_handle'] = shared_weather_windows.handles[key]
 
             task['project_data_basename'] = project_data_basename
+            task['project_data_edits'] = project_data_edits
             task['project_id_with_serial'] = project_id_with_serial
             task['project_series'] = project_parameters
-            all_tasks.append(task)
+            task['reduce_output'] = reduce_output
+            task['keep_details'] = keep_details
+            task['detail_level'] = self.detail_level
 
-        # Execute every project
-        with futures.ProcessPoolExecutor() as executor:
-            executor_result = executor.map(run_single_project, all_tasks)
+            task_payload['tasks'] += 1
 
-        # Get the output dictionary ready
-        runs_dict = {project_id_with_serial: result for project_id_with_serial, result in executor_result}
+            yield task
 
-        # Assemble the dictionary with content for the details, details with inputs,
-        #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
-        final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+    def run_tasks(self, executor, tasks, add_chunk_results):
+        """
+        Runs the tasks on the executor in chunks of self.chunk_size tasks,
+        with at most self.max_in_flight chunks submitted at any time. Tasks
+        are taken from the tasks iterable only when there is room for
+        another chunk.
 
-        # Return the runs for all the scenarios.
-        return final_result
+        Chunks finish in any order. Each finished chunk is given to
+        add_chunk_results() and dropped, so the results do not accumulate
+        here.
+
+        Parameters
+        ----------
+        executor : futures.Executor
+            The executor that runs run_project_chunk().
+
+        tasks : iterable
+            The task dictionaries.
+
+        add_chunk_results : function
+            Called with the index of each chunk, counting from 0 in the order
+            of the tasks, and the list of (project_id_with_serial,
+            output_dict, status) tuples of the chunk.
+        """
+        tasks = iter(tasks)
+        in_flight = dict()
+        chunk_index = 0
+        projects_done = 0
+        start_time = time.perf_counter()
+        last_report_time = start_time
+        tasks_remaining = True
+
+        while tasks_remaining or in_flight:
+            # Fill the window of chunks in flight.
+            while tasks_remaining and len(in_flight) < self.max_in_flight:
+                chunk = list(itertools.islice(tasks, self.chunk_size))
+                if len(chunk) == 0:
+                    tasks_remaining = False
+                    break
+                in_flight[executor.submit(run_project_chunk, chunk)] = chunk_index
+                chunk_index += 1
+
+            if not in_flight:
+                break
+
+            done, _ = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                results = future.result()
+                add_chunk_results(in_flight.pop(future), results)
+                projects_done += len(results)
+
+            now = time.perf_counter()
+            if now - last_report_time >= self.report_interval_seconds:
+                last_report_time = now
+                self.report_throughput(projects_done, now - start_time)
+
+        self.report_throughput(projects_done, time.perf_counter() - start_time)
+
+    def report_throughput(self, projects_done, elapsed_seconds):
+        """
+        Prints the number of projects done and the projects per second.
+
+        Parameters
+        ----------
+        projects_done : int
+            The number of projects done so far.
+
+        elapsed_seconds : float
+            The seconds since the first chunk was submitted.
+        """
+        projects_per_second = projects_done / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        print(f'Throughput: {projects_done} projects done in {elapsed_seconds:.1f} s, '
+              f'{projects_per_second:.2f} projects/s')
+
+    def report_task_payload(self, task_payload, shared_weather_windows):
+        """
+        Prints the number of tasks sent to the workers and the size of the
+        weather windows shared with them. The tasks are not pickled again
+        to measure them, which would double the cost of sending them.
+
+        Parameters
+        ----------
+        task_payload : dict
+            The counts made by generate_tasks().
+
+        shared_weather_windows : SharedDataframeStore
+            The store of weather windows shared with the workers.
+        """
+        print(f'Task payload: {task_payload["tasks"]} tasks, each with the basename and cell edits of its '
+              f'project data.')
+        if self.share_weather_windows:
+            print(f'{len(shared_weather_windows.handles)} weather windows '
+                  f'({shared_weather_windows.published_bytes / 1e6:.2f} MB) shared through memory-mapped files.')
 
 
 """
@@ -140,17 +484,40 @@ def run_single_project(task_dict):
     For each process another logger is created, so that each process does
     not attempt to use the same logger.
 
-    input_xlsx : str
-        The filename for the input .xlsx that has all the dataframes
-        for the for ErectionCost and FoundationCost
+    project_data_basename : str
+        The basename of the project data .xlsx that has all the dataframes
+        for the for ErectionCost and FoundationCost. Each worker reads it
+        once through its own XlsxDataframeCache.
+
+    project_data_edits : list
+        The parametric modifications of the project data, as
+        (dataframe name, row name, column name, value) tuples made by
+        XlsxReader.cell_edits().
+
+    weather_window_handle : dict
+        Optional. The handle of the processed weather window shared through
+        SharedDataframeStore.
 
     project_series : pd.Series
         The series that has the non-dataframe values for each project,
         including the project name.
 
-    project_id : str
+    project_id_with_serial : str
         The string that is the name of the project.
 
+    reduce_output : bool
+        If True, the output dictionary is reduced with ResultSink.reduce()
+        before it is returned.
+
+    keep_details : bool
+        Optional. If False, the detail rows are not kept in the reduced
+        output dictionary or in ProjectResultCache, so they are never made.
+        True by default.
+
+    detail_level : str
+        Optional. The detail level of the run. See
+        XlsxReader.create_master_input_dictionary().
+
     Basically, the map operation goes like this:
 
     task_dict -> master_input_dict -> master_output_dict
@@ -165,28 +532,70 @@ def run_single_project(task_dict):
 
     Returns
     -------
-    tuple : (str, dict)
+    tuple : (str, dict, int)
         The str is the project_id. The dict is the resulting output
-        dictionary.
+        dictionary. The int is the status returned by
+        Manager.execute_landbosse(), which is 0 if every module ran
+        without errors.
     """
     project_data_basename = task_dict['project_data_basename']
     project_series = task_dict['project_series']
     project_id_with_serial = task_dict['project_id_with_serial']
-    project_data_sheets = task_dict['project_data_sheets']
+
+    # Make this worker's own copy of the project data and apply the
+    # parametric modifications to it. If the weather window is shared, the
+    # weather_window sheet, which is most of the project data, is not
+    # copied and its edits are already in the shared weather window.
+    project_data_edits = task_dict['project_data_edits']
+    if 'weather_window_handle' in task_dict:
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename,
+                                                                           exclude=('weather_window',))
+        project_data_edits = [cell_edit for cell_edit in project_data_edits if cell_edit[0] != 'weather_window']
+        weather_window = SharedDataframeStore.attach(task_dict['weather_window_handle'])
+    else:
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+        weather_window = None
+    xlsx_reader = XlsxReader()
+    xlsx_reader.apply_cell_edits(project_data_sheets, project_series, project_data_edits)
 
     # Log each project. Use print because it works better for multiple processes.
     print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
 
     # Read the Excel
-    xlsx_reader = XlsxReader()
-    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_series)
+    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets,
+                                                                   project_series,
+                                                                   weather_window=weather_window,
+                                                                   detail_level=task_dict.get('detail_level'))
 
     # Now run the manager and accumulate its result into the runs_dict
     output_dict = dict()
     output_dict['project_series'] = project_series
-    mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-    mc.execute_landbosse(project_name=project_id_with_serial)
+    keep_details = task_dict.get('keep_details', True)
+    mc = Manager(input_dict=master_input_dict, output_dict=output_dict, keep_details=keep_details)
+    status = mc.execute_landbosse(project_name=project_id_with_serial)
 
     print(f'End {project_id_with_serial}')
 
-    return project_id_with_serial, output_dict
+    if task_dict.get('reduce_output', False):
+        output_dict = ResultSink.reduce(output_dict, keep_details)
+
+    return project_id_with_serial, output_dict, status
+
+
+def run_project_chunk(task_dicts):
+    """
+    Runs a chunk of projects in one worker, so that a chunk is sent to a
+    worker and its results are sent back in one round trip.
+
+    Parameters
+    ----------
+    task_dicts : list
+        The task dictionaries. See run_single_project().
+
+    Returns
+    -------
+    list
+        The (project_id_with_serial, output_dict, status) tuple of each
+        task, in the order of the tasks.
+    """
+    return [run_single_project(task_dict) for task_dict in task_dicts]
@@ -1,3 +1,4 @@
+import os
 import re
 
 import pandas as pd
@@ -5,8 +6,9 @@ import numpy as np
 from math import ceil
 
 from .XlsxOperationException import XlsxOperationException
-from .WeatherWindowCSVReader import read_weather_window, extend_weather_window
-from ..model import DefaultMasterInputDict
+from .WeatherWindowCSVReader import extend_weather_window, compact_weather_window
+from .WeatherWindowCache import WeatherWindowCache
+from ..model import DefaultMasterInputDict, DetailRows
 from .GridSearchTree import GridSearchTree
 
 
@@ -275,58 +277,131 @@ class XlsxReader:
             is not found. The message is descriptive to help diagnose the
             problem during operation.
         """
+        self.apply_cell_edits(project_data_dataframes, project_parameters, self.cell_edits(project_parameters))
+
+    def cell_edits(self, project_parameters):
+        """
+        This method finds the parametric modifications in the project
+        parameters. Each modification is in a column named
+        dataframe/row/column, where the dataframe is the name of a
+        project_data sheet or 'project list'.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The enhanced project parameters as created by
+            create_parametric_value_list.
+
+        Returns
+        -------
+        list
+            A list of (dataframe name, row name, column name, value) tuples
+            in the order of the columns. Columns with null values are
+            skipped, because they do not modify anything.
+        """
         # This is a regex to match a column name that specifies a change to make
         # to a cell
         cell_spec_re = re.compile('^.*/.*/.*$')
 
-        # Go through each project parameter
+        cell_edits = []
         for index, value in project_parameters.items():
-
-            # If the column specifies a cell to change in the dataframe
-            # or project list, inspect it to ensure it points somewhere
-            # valid and change the project list or the dataframe
-
             if cell_spec_re.match(index) and not pd.isnull(value):
                 dataframe_name, row_name, column_name = index.split('/')
+                cell_edits.append((dataframe_name, row_name, column_name, value))
+        return cell_edits
 
-                # First, branch on whether this a project list parameter
-                # or a dataframe parameter. First, if it is a project list
-                # parameter.
-                if dataframe_name == 'project list':
-                    if column_name not in project_parameters:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in project parameters'
-                        )
-                    if not pd.isnull(value):
-                        project_parameters[column_name] = value
-
-                # Second, if it is a dataframe parameter
-                else:
-                    # Check if dataframe exists
-                    if dataframe_name not in project_data_dataframes:
-                        raise XlsxOperationException(
-                            f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
-
-                    df = project_data_dataframes[dataframe_name]
-                    first_col = df.columns[0]
-
-                    # Check if row exists
-                    if df.loc[df[first_col] == row_name].empty:
-                        raise XlsxOperationException(
-                            f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # Check if column exists
-                    if df.loc[df[first_col] == row_name, column_name].empty:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # If all the above check pass, check to make sure the value is not nan.
-                    # If it is not nan, then a modification needs to be made, either to the
-                    # dataframe or the project list.
-                    if not pd.isnull(value):
-                        df.loc[df[first_col] == row_name, column_name] = value
-
-    def create_master_input_dictionary(self, project_data_dataframes, project_parameters):
+    def check_cell_edit(self, project_data_dataframes, project_parameters, cell_edit):
+        """
+        This method checks that a cell edit made by cell_edits() points to
+        a cell that exists. It does not modify anything.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are the names of the project_data sheets. Values are the
+            dataframes.
+
+        project_parameters : pandas.Series
+            The enhanced project parameters.
+
+        cell_edit : tuple
+            A (dataframe name, row name, column name, value) tuple.
+
+        Raises
+        ------
+        XlsxOperationException
+            This exception is raised of a dataframe, row or column
+            is not found. The message is descriptive to help diagnose the
+            problem during operation.
+        """
+        dataframe_name, row_name, column_name, _ = cell_edit
+
+        # First, branch on whether this a project list parameter
+        # or a dataframe parameter. First, if it is a project list
+        # parameter.
+        if dataframe_name == 'project list':
+            if column_name not in project_parameters:
+                raise XlsxOperationException(
+                    f'Column {column_name} not found in project parameters'
+                )
+
+        # Second, if it is a dataframe parameter
+        else:
+            # Check if dataframe exists
+            if dataframe_name not in project_data_dataframes:
+                raise XlsxOperationException(
+                    f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
+
+            df = project_data_dataframes[dataframe_name]
+            first_col = df.columns[0]
+
+            # Check if row exists
+            if df.loc[df[first_col] == row_name].empty:
+                raise XlsxOperationException(
+                    f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+
+            # Check if column exists
+            if df.loc[df[first_col] == row_name, column_name].empty:
+                raise XlsxOperationException(
+                    f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+
+    def apply_cell_edits(self, project_data_dataframes, project_parameters, cell_edits):
+        """
+        This method checks and applies cell edits made by cell_edits(). Edits
+        to the 'project list' modify the project parameters. All other edits
+        modify the project data dataframes. Both are modified in place.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are the names of the project_data sheets. Values are the
+            dataframes to be modified.
+
+        project_parameters : pandas.Series
+            The enhanced project parameters to be modified.
+
+        cell_edits : list
+            The (dataframe name, row name, column name, value) tuples to
+            apply, in order.
+
+        Raises
+        ------
+        XlsxOperationException
+            If an edit points to a cell that does not exist. See
+            check_cell_edit().
+        """
+        for cell_edit in cell_edits:
+            self.check_cell_edit(project_data_dataframes, project_parameters, cell_edit)
+            dataframe_name, row_name, column_name, value = cell_edit
+            if dataframe_name == 'project list':
+                project_parameters[column_name] = value
+            else:
+                df = project_data_dataframes[dataframe_name]
+                first_col = df.columns[0]
+                df.loc[df[first_col] == row_name, column_name] = value
+
+    def create_master_input_dictionary(self, project_data_dataframes, project_parameters, compact_weather=None,
+                                       weather_window=None, detail_level=None):
         """
         This method takes a dictionary of dataframes that are the project data
         and unites them with the project parameters as found in the project list
@@ -347,6 +422,19 @@ class XlsxReader:
             See the subclasses of XlsxManagerRunner for examples on how this
             project series is read from a spreadsheet.
 
+        compact_weather : bool
+            If True, the weather window is converted with
+            compact_weather_window() to use less memory. If None, the
+            weather window is compacted if the LANDBOSSE_COMPACT_WEATHER_WINDOW
+            environment variable is set to 1, true or yes.
+
+        weather_window : pd.DataFrame
+            The weather window already processed by read_weather_window().
+            If None, it is processed from the weather_window sheet of
+            project_data_dataframes. XlsxParallelManagerRunner passes the
+            weather windows it shares with its workers here, in which case
+            the weather_window sheet may be omitted.
+
         Returns
         -------
         dict
@@ -489,6 +577,11 @@ class XlsxReader:
         incomplete_input_dict['overtime_multiplier'] = project_parameters['Overtime multiplier']
         incomplete_input_dict['allow_same_flag'] = True if project_parameters['Allow same flag'] == 'y' else False
 
+        # How many detail rows the modules make.
+        if 'Detail level' in project_parameters and not pd.isnull(project_parameters['Detail level']):
+            detail_level = project_parameters['Detail level']
+        incomplete_input_dict['detail_level'] = DetailRows.check_level(detail_level)
+
         override_total_mgmt_cost_col_name = 'Override total management cost for distributed (0 does not override)'
         if override_total_mgmt_cost_col_name in project_parameters and project_parameters[override_total_mgmt_cost_col_name] > 0:
             incomplete_input_dict['override_total_management_cost'] = \
@@ -502,11 +595,19 @@ class XlsxReader:
 
         # The weather window is stored on a sheet of the project_data, but
         # needs preprocessing after it is read. The preprocessing changes it
-        # from wind toolkit format to a dataframe.
+        # from wind toolkit format to a dataframe. The preprocessed weather
+        # window is cached, since many projects share the same sheet.
         number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
-        weather_window_input = project_data_dataframes['weather_window']
-        weather_window_intermediate = read_weather_window(weather_window_input)
+        if weather_window is None:
+            weather_window_input = project_data_dataframes['weather_window']
+            weather_window_intermediate = WeatherWindowCache.read_weather_window(weather_window_input)
+        else:
+            weather_window_intermediate = weather_window
         extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
+        if compact_weather is None:
+            compact_weather = os.environ.get('LANDBOSSE_COMPACT_WEATHER_WINDOW', '').lower() in ('1', 'true', 'yes')
+        if compact_weather:
+            extended_weather_window = compact_weather_window(extended_weather_window)
         incomplete_input_dict['weather_window'] = extended_weather_window
 
         # Now fill any missing values with sensible defaults.
@@ -4,11 +4,10 @@ import os
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
-from .XlsxGenerator import XlsxGenerator
+from .ResultSink import ResultSink
 
 
 class XlsxSerialManagerRunner(XlsxManagerRunner):
@@ -17,7 +16,7 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
     in a serial loop.
     """
 
-    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, result_sinks=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -39,23 +38,32 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified.
 
+        result_sinks : list
+            Optional. If given, results are streamed: each project's output
+            dictionary is reduced to its cost and detail rows by
+            ResultSink.reduce() and added to every sink as soon as the
+            project finishes, instead of being kept until the end of the
+            run. The details and costs in the final result come from the
+            first ListResultSink in result_sinks, and are empty if there is
+            none.
+
         Returns
         -------
         OrderedDict, list, list, list
             First element of tuple is an ordered dict that is the result of
             all the runs. Each key is the name of a project and each value
             is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets. The fourth element is the same as
-            module_type_operation_lists, but every row has all the inputs
-            on each row.
+            is the list of rows for the csv. The third element is the
+            dataframe of costs for the spreadsheets. The fourth element is
+            the same as costs_by_module_type_operation, but every row has all
+            the inputs on each row.
         """
         # Load the project list
         extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
         print('>>> Project and parametric lists loaded')
 
         # For file operations
-        file_ops = XlsxFileOperations()
+        file_ops = self.file_ops
 
         # Get the output dictionary ready
         runs_dict = OrderedDict()
@@ -71,59 +79,103 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
-        # Loop over every project
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
-
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            project_data_basename = project_parameters['Project data file']
-
-            # Input path for unmodified project input data.
-            project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
-
-            # Log each project
-            print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
-            print('>>> project_id: {}'.format(project_id_with_serial))
-            print('>>> Project data: {}'.format(project_data_xlsx))
-
-            # Read the project data sheets.
-            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
-
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
-
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
-
-            # Create the master input dictionary.
-            master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
-
-            # Now run the manager and accumulate its result into the runs_dict
-            output_dict = dict()
-            mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-            mc.execute_landbosse(project_name=project_id_with_serial)
-            output_dict['project_series'] = project_parameters
-            runs_dict[project_id_with_serial] = output_dict
+        # The project data of the variants is written as it is prepared,
+        # possibly in the background.
+        project_data_writer = self.parametric_project_data_writer(file_ops)
+
+        # The results of finished projects are checkpointed as they finish.
+        checkpoint_store = self.checkpoint_store()
+
+        # The detail rows are dropped, without being made, if no sink needs
+        # them.
+        keep_details = ResultSink.sinks_need_details(result_sinks)
+
+        try:
+            # Loop over every project
+            for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
+
+                project_id_with_serial = self.project_id_with_serial(project_parameters)
+
+                project_data_basename = project_parameters['Project data file']
+
+                # Input path for unmodified project input data.
+                project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
+
+                # Log each project
+                print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
+                print('>>> project_id: {}'.format(project_id_with_serial))
+                print('>>> Project data: {}'.format(project_data_xlsx))
+
+                # Read the project data sheets.
+                project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+
+                # Transform the dataframes so that they have the right values for
+                # the parametric variables.
+                cell_edits = xlsx_reader.cell_edits(project_parameters)
+                xlsx_reader.apply_cell_edits(project_data_sheets, project_parameters, cell_edits)
+
+                # Apply cost and scaling modifications if needed.
+                if enable_cost_and_scaling_modifications:
+                    xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+
+                # Append the modified project parameters
+                extended_project_list_after_parameter_modifications.append(project_parameters)
+
+                # Record the project data of this variant.
+                project_data_edits = [cell_edit for cell_edit in cell_edits if cell_edit[0] != 'project list']
+                project_data_writer.add(project_id_with_serial,
+                                        project_data_basename,
+                                        project_data_edits,
+                                        project_data_sheets=project_data_sheets)
+
+                # Skip projects that have already finished with the same inputs.
+                if checkpoint_store is not None:
+                    input_hash = self.project_input_hash(checkpoint_store, project_parameters, project_data_edits,
+                                                         keep_details)
+                    checkpointed_output_dict = None
+                    if self.resume:
+                        checkpointed_output_dict = checkpoint_store.completed(project_id_with_serial, input_hash)
+                    if checkpointed_output_dict is not None:
+                        print(f'>>> Resuming {project_id_with_serial} from checkpoint')
+                        if result_sinks is None:
+                            runs_dict[project_id_with_serial] = checkpointed_output_dict
+                        else:
+                            for result_sink in result_sinks:
+                                result_sink.add(project_id_with_serial, checkpointed_output_dict)
+                        continue
+                    checkpoint_store.expect(project_id_with_serial, input_hash)
+
+                # Create the master input dictionary.
+                master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets,
+                                                                               project_parameters,
+                                                                               detail_level=self.detail_level)
+
+                # Now run the manager and accumulate its result into the runs_dict
+                output_dict = dict()
+                mc = Manager(input_dict=master_input_dict, output_dict=output_dict, keep_details=keep_details)
+                status = mc.execute_landbosse(project_name=project_id_with_serial)
+                output_dict['project_series'] = project_parameters
+                reduced_output_dict = ResultSink.reduce(output_dict, keep_details)
+
+                # Only projects that finish without errors are checkpointed,
+                # so that failed projects run again when resuming.
+                if checkpoint_store is not None and status == 0:
+                    checkpoint_store.add(project_id_with_serial, reduced_output_dict)
+                if result_sinks is None:
+                    runs_dict[project_id_with_serial] = output_dict
+                else:
+                    for result_sink in result_sinks:
+                        result_sink.add(project_id_with_serial, reduced_output_dict)
+        finally:
+            project_data_writer.close()
+            if checkpoint_store is not None:
+                checkpoint_store.close()
+        for result_sink in result_sinks or []:
+            result_sink.close()
 
         final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
+        final_result['details_list'], final_result['costs_by_module_type_operation'] = \
+            self.final_result_lists(runs_dict, result_sinks)
         final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
 
         # Return the runs for all the projects.
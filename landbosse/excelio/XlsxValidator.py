@@ -6,7 +6,7 @@ class XlsxValidator:
     to the results of a current model run.
     """
 
-    def compare_expected_to_actual(self, expected_xlsx, actual_module_type_operation_list, validation_output_xlsx):
+    def compare_expected_to_actual(self, expected_xlsx, actual_costs, validation_output_xlsx):
         """
         This compares the expected costs as calculated by a prior model run
         with the actual results from a current model run.
@@ -18,8 +18,8 @@ class XlsxValidator:
         expected_xlsx : str
             The absolute filename of the expected output .xlsx file.
 
-        actual_module_type_operation_list : str
-            The module_type_operation_list as returned by a subclass of
+        actual_costs : pd.DataFrame
+            The costs_by_module_type_operation as returned by a subclass of
             XlsxManagerRunner.
 
         validation_output_xlsx : str
@@ -32,10 +32,9 @@ class XlsxValidator:
             True if the expected and actual results are equal. It returns
             False otherwise.
         """
-        # First, make the list of dictionaries into a dataframe, and drop
-        # the raw_cost and raw_cost_total_or_per_turbine columns.
-        actual_df = pd.DataFrame(actual_module_type_operation_list)
-        actual_df.drop(['raw_cost', 'raw_cost_total_or_per_turbine'], axis=1, inplace=True)
+        # First, drop the raw_cost and raw_cost_total_or_per_turbine
+        # columns.
+        actual_df = actual_costs.drop(['raw_cost', 'raw_cost_total_or_per_turbine'], axis=1)
         expected_df = pd.read_excel(expected_xlsx, 'costs_by_module_type_operation', engine='openpyxl')
         #expected_df = expected_df.dropna(inplace=True, how='all')
         expected_df.rename(columns={
@@ -6,4 +6,10 @@ from .XlsxParallelManagerRunner import XlsxParallelManagerRunner
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxValidator import XlsxValidator
 from .XlsxDataframeCache import XlsxDataframeCache
+from .WeatherWindowCache import WeatherWindowCache
+from .SharedDataframeStore import SharedDataframeStore
 from .CsvGenerator import CsvGenerator
+from .ParametricProjectDataWriter import ParametricProjectDataWriter
+from .ResultSink import ResultSink, ListResultSink, CsvResultSink
+from .CheckpointStore import CheckpointStore
+from .ArrowResultSink import ArrowResultSink
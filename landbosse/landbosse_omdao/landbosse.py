@@ -6,7 +6,9 @@ import openmdao.api as om
 
 from landbosse.landbosse_omdao.OpenMDAODataframeCache import OpenMDAODataframeCache
 from landbosse.landbosse_omdao.WeatherWindowCSVReader import read_weather_window
+from landbosse.model.CostModule import CostModule
 from landbosse.model.DefaultMasterInputDict import DefaultMasterInputDict
+from landbosse.model.FoundationRadiusBatch import FoundationRadiusBatch
 from landbosse.model.Manager import Manager
 
 with warnings.catch_warnings():
@@ -48,6 +50,15 @@ class LandBOSSE(om.Group):
 
 
 class LandBOSSE_API(om.ExplicitComponent):
+    def initialize(self):
+        self.options.declare(
+            "module_threads",
+            default=None,
+            allow_none=True,
+            types=int,
+            desc="Threads that run the cost modules. None uses the LANDBOSSE_MODULE_THREADS environment variable.",
+        )
+
     def setup(self):
         # Clear the cache
         OpenMDAODataframeCache._cache = {}
@@ -372,7 +383,14 @@ class LandBOSSE_API(om.ExplicitComponent):
         # Put the inputs together and run all the modules
         master_output_dict = dict()
         master_input_dict = self.prepare_master_input_dictionary(inputs, discrete_inputs)
-        manager = Manager(master_input_dict, master_output_dict)
+        # The outputs below read more of the output dictionary than the rows
+        # that ProjectResultCache restores, so it is not used.
+        manager = Manager(
+            master_input_dict,
+            master_output_dict,
+            module_threads=self.options["module_threads"],
+            use_project_cache=False,
+        )
         result = manager.execute_landbosse("WISDEM")
 
         # Check if everything executed correctly
@@ -460,8 +478,8 @@ class LandBOSSE_API(om.ExplicitComponent):
 
     def gather_costs_from_master_output_dict(self, master_output_dict):
         """
-        This method extract all the cost_by_module_type_operation lists for
-        output in an Excel file.
+        This method extract all the cost_by_module_type_operation dataframes
+        for output in an Excel file.
 
         It finds values for the keys ending in '_module_type_operation'. It
         then concatenates them together so they can be easily written to
@@ -478,41 +496,32 @@ class LandBOSSE_API(om.ExplicitComponent):
 
         Parameters
         ----------
-        runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+        master_output_dict : dict
+            The master output dict with the finished module output in it.
 
         Returns
         -------
-        list
-            List of dicts to write to the .csv.
+        pd.DataFrame
+            The costs to write to the .csv, one row per cost.
         """
-        line_items = []
+        # Gather the dataframes of costs
+        costs = CostModule.concat_costs(
+            value for key, value in master_output_dict.items() if key.endswith("_module_type_operation")
+        )
 
-        # Gather the lists of costs
-        cost_lists = [value for key, value in master_output_dict.items() if key.endswith("_module_type_operation")]
-
-        # Flatten the list of lists that is the result of the gathering
-        for cost_list in cost_lists:
-            line_items.extend(cost_list)
-
-        # Filter out the keys needed and rename them to meaningful values
-        final_costs = []
-        for line_item in line_items:
-            item = {
-                "Module": line_item["module"],
-                "Type of cost": line_item["type_of_cost"],
-                "Cost / kW": line_item["usd_per_kw_per_project"],
-                "Cost / project": line_item["cost_per_project"],
-                "Cost / turbine": line_item["cost_per_turbine"],
-                "Number of turbines": line_item["num_turbines"],
-                "Rotor diameter (m)": line_item["rotor_diameter_m"],
-                "Turbine rating (MW)": line_item["turbine_rating_MW"],
-                "Project ID with serial": line_item["project_id_with_serial"],
-            }
-            final_costs.append(item)
-
-        return final_costs
+        # Filter out the columns needed and rename them to meaningful values
+        columns = {
+            "module": "Module",
+            "type_of_cost": "Type of cost",
+            "usd_per_kw_per_project": "Cost / kW",
+            "cost_per_project": "Cost / project",
+            "cost_per_turbine": "Cost / turbine",
+            "num_turbines": "Number of turbines",
+            "rotor_diameter_m": "Rotor diameter (m)",
+            "turbine_rating_MW": "Turbine rating (MW)",
+            "project_id_with_serial": "Project ID with serial",
+        }
+        return costs[list(columns)].rename(columns=columns)
 
     def gather_details_from_master_output_dict(self, master_output_dict):
         """
@@ -570,8 +579,8 @@ class LandBOSSE_API(om.ExplicitComponent):
 
         Parameters
         ----------
-        costs_by_module_type_operation: List[Dict[str, Any]]
-            The lists of costs by module, type and operation.
+        costs_by_module_type_operation: pd.DataFrame
+            The costs by module, type and operation.
 
         master_output_dict: Dict[str, Any]
             The master output dictionary from the run. Used to obtain the
@@ -580,17 +589,11 @@ class LandBOSSE_API(om.ExplicitComponent):
         outputs : openmdao.vectors.default_vector.DefaultVector
             The outputs in which to place the results of the computations
         """
-        bos_per_kw = 0.0
-        bos_per_project = 0.0
-        installation_per_project = 0.0
-        installation_per_kW = 0.0
-
-        for row in costs_by_module_type_operation:
-            bos_per_kw += row["Cost / kW"]
-            bos_per_project += row["Cost / project"]
-            if row["Module"] in ["ErectionCost", "FoundationCost"]:
-                installation_per_project += row["Cost / project"]
-                installation_per_kW += row["Cost / kW"]
+        installation = costs_by_module_type_operation["Module"].isin(["ErectionCost", "FoundationCost"])
+        bos_per_kw = costs_by_module_type_operation["Cost / kW"].sum()
+        bos_per_project = costs_by_module_type_operation["Cost / project"].sum()
+        installation_per_project = costs_by_module_type_operation.loc[installation, "Cost / project"].sum()
+        installation_per_kW = costs_by_module_type_operation.loc[installation, "Cost / kW"].sum()
 
         commissioning_pct = inputs["commissioning_pct"]
         decommissioning_pct = inputs["decommissioning_pct"]
@@ -793,3 +796,47 @@ class LandBOSSE_API(om.ExplicitComponent):
             sections.append(section)
 
         return sections
+
+
+class FoundationRadii(om.ExplicitComponent):
+    """
+    Calculates the foundation radii of many turbine designs at once, with
+    FoundationRadiusBatch, for sweeps of the foundation design inputs.
+    The loads are the F_dead_kN_per_turbine, F_horiz_kN_per_turbine and
+    M_tot_kN_m_per_turbine details of FoundationCost, in N and N * m, or
+    the outputs of FoundationRadiusBatch.loads(). Radii that FoundationCost
+    cannot solve for are NaN.
+    """
+
+    def initialize(self):
+        self.options.declare("num_designs", default=1, types=int, desc="Number of designs in each input.")
+
+    def setup(self):
+        n = self.options["num_designs"]
+        self.add_input("dead_load_N", shape=n, units="N", desc="Dead load")
+        self.add_input("lateral_load_N", shape=n, units="N", desc="Lateral load")
+        self.add_input("moment_N_m", shape=n, units="N*m", desc="Moment")
+        self.add_input("rated_thrust_N", val=5.89e5, shape=n, units="N", desc="Rated Thrust (N)")
+        self.add_input("depth", val=2.36, shape=n, units="m", desc="Foundation depth m")
+        self.add_input("bearing_pressure_n_m2", val=191521, shape=n, desc="Bearing Pressure (n/m2)")
+
+        for name, desc in [
+            ("Radius_o_m", "Foundation radius based on overturning moment"),
+            ("Radius_s_m", "Foundation radius based on slipping"),
+            ("Radius_g_m", "Foundation radius based on gapping"),
+            ("Radius_b_m", "Foundation radius based on bearing pressure"),
+            ("Radius_m", "Largest foundation radius"),
+        ]:
+            self.add_output(name, shape=n, units="m", desc=desc)
+
+    def compute(self, inputs, outputs):
+        radii = FoundationRadiusBatch.radii(
+            inputs["dead_load_N"],
+            inputs["lateral_load_N"],
+            inputs["moment_N_m"],
+            inputs["rated_thrust_N"],
+            inputs["depth"],
+            inputs["bearing_pressure_n_m2"],
+        )
+        for name, value in radii.items():
+            outputs[name] = value
@@ -9,7 +9,7 @@ import pandas as pd
 
 from landbosse.excelio import XlsxReader
 from landbosse.excelio.XlsxManagerRunner import XlsxManagerRunner
-from landbosse.model import Manager
+from landbosse.model import DetailRows, Manager
 
 
 @attrs.define(auto_attribs=True)
@@ -178,6 +178,12 @@ class LandBOSSERunner:
     weather: pd.DataFrame = attrs.field(
         validator=attrs.validators.instance_of(pd.DataFrame),
     )
+    # How many rows of model_variables the modules make: "none", "summary" or
+    # "full". See landbosse.model.DetailRows.
+    detail_level: str = attrs.field(
+        default=DetailRows.default_level,
+        converter=DetailRows.check_level,
+    )
     result: LandBOSSEResult = attrs.field(
         validator=attrs.validators.instance_of(LandBOSSEResult),
         init=False,
@@ -272,6 +278,7 @@ class LandBOSSERunner:
         master_input_dict = xlsx_reader.create_master_input_dictionary(
             data_sheets,
             project_parameters,
+            detail_level=self.detail_level,
         )
 
         output_dict: dict = {}
@@ -281,9 +288,7 @@ class LandBOSSERunner:
         # Extract result dataframes
         runs_dict = {project_parameters["Project ID with serial"]: output_dict}
         model_variables = pd.DataFrame(XlsxManagerRunner.extract_details_lists(None, runs_dict))
-        operation_cost = pd.DataFrame(
-            XlsxManagerRunner.extract_module_type_operation_lists(None, runs_dict),
-        )
+        operation_cost = XlsxManagerRunner.extract_costs_by_module_type_operation(None, runs_dict)
 
         # Save outputs into LandBOSSEResult object
         self.result = LandBOSSEResult(
@@ -271,6 +271,80 @@ class ArraySystem(CostModule):
 
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "cable_specs",
+        "cable_specs_pd",
+        "construct_duration",
+        "crew",
+        "crew_cost",
+        "critical_height_non_erection_wind_delays_m",
+        "critical_speed_non_erection_wind_delays_m_per_s",
+        "detail_level",
+        "distance_to_grid_connection_km",
+        "hour_day",
+        "line_frequency_hz",
+        "num_turbines",
+        "operational_hrs_per_day",
+        "overtime_multiplier",
+        "rotor_diameter_m",
+        "row_spacing_rotor_diameters",
+        "rsmeans",
+        "rsmeans_per_diem",
+        "time_construct",
+        "turbine_rating_MW",
+        "turbine_spacing_rotor_diameters",
+        "user_defined_distance_to_grid_connection",
+        "weather_window",
+        "weather_window_index",
+        "wind_shear_exponent",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "cable_len_to_grid_connection_km",
+        "cables",
+        "collection_construction_months",
+        "collection_cost_csv",
+        "collection_cost_module_type_operation",
+        "Days taken for trenching (equipment)",
+        "Days taken for trenching (labor)",
+        "distance_to_grid_connection_km",
+        "Equipment cost of trenching per day {usd/day)",
+        "Equipment Cost USD with weather delays",
+        "Equipment Cost USD without weather delays",
+        "Labor cost of trenching per day (usd/day)",
+        "Labor Cost USD with weather delays",
+        "Labor Cost USD without weather delays",
+        "managament_crew_cost_before_wind_delay",
+        "management_crew",
+        "mob_cost",
+        "num_full_strings",
+        "num_leftover_turb",
+        "num_partial_strings",
+        "num_strings",
+        "num_turb_per_cable",
+        "operation_data_entire_farm",
+        "operation_data_id_days_crews_workers",
+        "perc_partial_string",
+        "time_construct_days",
+        "Total per diem costs (USD)",
+        "total_cable_len_km",
+        "total_collection_cost",
+        "total_turb",
+        "total_turb_per_string",
+        "trench_length_km",
+        "trenching_cable_equipment_usd_per_hr",
+        "trenching_equipment_daily_output",
+        "trenching_labor_daily_output",
+        "trenching_labor_usd_per_hr",
+        "turb_per_partial_string",
+        "turb_per_string",
+        "wind_delay_time",
+        "wind_delays",
+        "wind_multiplier",
+    )
+    input_keys_written = ("cable_specs",)
+
     def __init__(self, input_dict, output_dict, project_name):
 
         self.input_dict = input_dict
@@ -991,187 +1065,165 @@ class ArraySystem(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
+
+        Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
         """
-        result = []
-        module = "Collection Cost"
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Total Number of Turbines",
-                "value": float(self.output_dict["total_turb"]),
-            }
-        )
+        self.output_dict["collection_cost_csv"] = self.detail_rows(self.detailed_rows, module="Collection Cost")
+        return self.output_dict["collection_cost_csv"]
 
-        result.append(
-            {
-                "unit": "km",
-                "type": "variable",
-                "variable_df_key_col_name": "Total trench length",
-                "value": float(self.output_dict["trench_length_km"]),
-            }
-        )
+    def detailed_rows(self, input_dict, output_dict, summary):
+        """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
 
-        result.append(
-            {
-                "unit": "km",
-                "type": "variable",
-                "variable_df_key_col_name": "Total cable length",
-                "value": float(self.output_dict["total_cable_len_km"]),
-            }
-        )
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
 
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Number of Turbines Per String in Full String",
-                "value": float(self.output_dict["total_turb_per_string"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Number of Full Strings",
-                "value": float(self.output_dict["num_full_strings"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Number of Turbines in Partial String",
-                "value": float(self.output_dict["num_leftover_turb"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Number of Partial Strings",
-                "value": float(self.output_dict["num_partial_strings"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Total number of strings full + partial",
-                "value": float(self.output_dict["num_full_strings"] + self.output_dict["num_partial_strings"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Trench Length to Substation (km)",
-                "value": float(self.output_dict["distance_to_grid_connection_km"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "Cable Length to Substation (km)",
-                "value": float(self.output_dict["cable_len_to_grid_connection_km"]),
-            }
-        )
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Total Number of Turbines",
+            "value": float(output_dict["total_turb"]),
+        }
+
+        yield {
+            "unit": "km",
+            "type": "variable",
+            "variable_df_key_col_name": "Total trench length",
+            "value": float(output_dict["trench_length_km"]),
+        }
+
+        yield {
+            "unit": "km",
+            "type": "variable",
+            "variable_df_key_col_name": "Total cable length",
+            "value": float(output_dict["total_cable_len_km"]),
+        }
+
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Number of Turbines Per String in Full String",
+            "value": float(output_dict["total_turb_per_string"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Number of Full Strings",
+            "value": float(output_dict["num_full_strings"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Number of Turbines in Partial String",
+            "value": float(output_dict["num_leftover_turb"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Number of Partial Strings",
+            "value": float(output_dict["num_partial_strings"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Total number of strings full + partial",
+            "value": float(output_dict["num_full_strings"] + output_dict["num_partial_strings"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Trench Length to Substation (km)",
+            "value": float(output_dict["distance_to_grid_connection_km"]),
+        }
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "Cable Length to Substation (km)",
+            "value": float(output_dict["cable_len_to_grid_connection_km"]),
+        }
 
         cables = ""
         n = 1  # to keep tab of number of cables input by user.
-        for cable, specs in self.output_dict["cables"].items():
-            if n == len(self.output_dict["cables"]):
+        for cable, specs in output_dict["cables"].items():
+            if n == len(output_dict["cables"]):
                 cables += str(cable)
             else:
                 cables += str(cable) + "  ,  "
 
             for variable, value in specs.__dict__.items():
                 if variable == "array_cable_len":
-                    result.append(
-                        {
-                            "unit": "km",
-                            "type": "variable",
-                            "variable_df_key_col_name": "Array cable length for cable  " + cable,
-                            "value": float(value),
-                        }
-                    )
+                    yield {
+                        "unit": "km",
+                        "type": "variable",
+                        "variable_df_key_col_name": "Array cable length for cable  " + cable,
+                        "value": float(value),
+                    }
                 elif variable == "total_length":
-                    result.append(
-                        {
-                            "unit": "km",
-                            "type": "variable",
-                            "variable_df_key_col_name": "Total cable length for cable  " + cable,
-                            "value": float(value),
-                        }
-                    )
+                    yield {
+                        "unit": "km",
+                        "type": "variable",
+                        "variable_df_key_col_name": "Total cable length for cable  " + cable,
+                        "value": float(value),
+                    }
 
                 elif variable == "total_cost":
-                    result.append(
-                        {
-                            "unit": "usd",
-                            "type": "variable",
-                            "variable_df_key_col_name": "Total cable cost for cable  " + cable,
-                            "value": float(value),
-                        }
-                    )
+                    yield {
+                        "unit": "usd",
+                        "type": "variable",
+                        "variable_df_key_col_name": "Total cable cost for cable  " + cable,
+                        "value": float(value),
+                    }
             n += 1
 
-        result.append(
-            {
-                "unit": "",
-                "type": "list",
-                "variable_df_key_col_name": "Number of turbines per cable type in full strings [" + cables + "]",
-                "value": str(self.output_dict["num_turb_per_cable"]),
-            }
-        )
+        yield {
+            "unit": "",
+            "type": "list",
+            "variable_df_key_col_name": "Number of turbines per cable type in full strings [" + cables + "]",
+            "value": str(output_dict["num_turb_per_cable"]),
+        }
 
-        if self.input_dict["turbine_rating_MW"] > 0.1:
-            for row in self.output_dict["management_crew"].itertuples():
+        if input_dict["turbine_rating_MW"] > 0.1 and not summary:
+            for row in output_dict["management_crew"].itertuples():
                 dashed_row = " <--> ".join(str(x) for x in list(row))
-                result.append(
-                    {
-                        "unit": "",
-                        "type": "dataframe",
-                        "variable_df_key_col_name": "Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ",
-                        "value": dashed_row,
-                    }
-                )
-
-        result.append(
-            {
-                "unit": "",
-                "type": "list",
-                "variable_df_key_col_name": "Percent length of cable in partial string [" + cables + "]",
-                "value": str(self.output_dict["perc_partial_string"]),
-            }
-        )
-
-        for row in self.output_dict["total_collection_cost"].itertuples():
-            dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], math.ceil(row[2]))
-            result.append(
-                {
+                yield {
                     "unit": "",
                     "type": "dataframe",
-                    "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
+                    "variable_df_key_col_name": "Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ",
                     "value": dashed_row,
-                    "last_number": row[2],
                 }
-            )
 
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
+        yield {
+            "unit": "",
+            "type": "list",
+            "variable_df_key_col_name": "Percent length of cable in partial string [" + cables + "]",
+            "value": str(output_dict["perc_partial_string"]),
+        }
 
-        self.output_dict["collection_cost_csv"] = result
-        return result
+        for row in output_dict["total_collection_cost"].itertuples():
+            dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], math.ceil(row[2]))
+            yield {
+                "unit": "",
+                "type": "dataframe",
+                "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
+                "value": dashed_row,
+                "last_number": row[2],
+            }
 
     def run_module(self):
         """
@@ -1185,7 +1237,7 @@ class ArraySystem(CostModule):
             operation_data = self.estimate_construction_time(self.input_dict, self.output_dict)
 
             # pull only global inputs for weather delay from input_dict
-            weather_data_keys = ("wind_shear_exponent", "weather_window")
+            weather_data_keys = ("wind_shear_exponent", "weather_window", "weather_window_index")
 
             # specify collection-specific weather delay inputs
             self.weather_input_dict = dict(
@@ -1,12 +1,105 @@
 import math
 
+import pandas as pd
+
+from .DetailRows import DetailRows
+
+
 class CostModule:
     """
     This is a super class for all other cost modules to import
     that provides shared methods for outputs from results and
     mobilization cost calculations.
+
+    Each subclass declares the keys it reads and writes in the class
+    attributes below. Manager uses them to reuse the results of a module
+    from an earlier project when all the values the module reads are the
+    same, and to find the modules that can run at the same time. See
+    ModuleResultCache and Manager.module_dependencies(). A test checks the
+    declarations against the keys the modules actually use.
     """
 
+    # Keys of the input dictionary that the module reads. None means the
+    # keys are not declared, and the module always runs.
+    input_keys = None
+
+    # Keys of the output dictionary that the module reads but that are
+    # written before it runs, by other modules or by Manager.
+    output_keys_read = ()
+
+    # Keys of the output dictionary that the module writes.
+    output_keys = ()
+
+    # Keys of the input dictionary that the module writes for the modules
+    # that run after it.
+    input_keys_written = ()
+
+    # Keys of the input dictionary whose values the module modifies in
+    # place, such as by adding a column to a dataframe. Values of other keys
+    # may be the same objects.
+    input_keys_mutated = ()
+
+    # The columns of the rows of the costs_by_module_type_operation output,
+    # in order.
+    cost_columns = [
+        'operation_id',
+        'type_of_cost',
+        'raw_cost',
+        'turbine_rating_MW',
+        'num_turbines',
+        'rotor_diameter_m',
+        'project_id_with_serial',
+        'module',
+        'raw_cost_total_or_per_turbine',
+        'cost_per_turbine',
+        'cost_per_project',
+        'usd_per_kw_per_project',
+    ]
+
+    @property
+    def detail_level(self):
+        """
+        Returns
+        -------
+        str
+            The detail level of the project, from the 'detail_level' key
+            of the input dictionary. See DetailRows.
+        """
+        return DetailRows.check_level(self.input_dict.get("detail_level"))
+
+    def detail_rows(self, rows, module=None):
+        """
+        Makes the rows of the detailed output of the module, as set by the
+        detail level of the project.
+
+        Parameters
+        ----------
+        rows : function
+            The generator function of the module that yields the rows. It
+            is called with shallow copies of the input and output
+            dictionaries, so that values replaced in the dictionaries after
+            the module runs do not change the rows, and with True if only
+            the summary rows are needed.
+
+        module : str
+            The name of the module in the rows. The default is the name of
+            the class.
+
+        Returns
+        -------
+        list or DetailRows
+            An empty list if the detail level is 'none', in which case rows
+            is not called. Otherwise the rows, which are made when they are
+            first read.
+        """
+        detail_level = self.detail_level
+        if detail_level == "none":
+            return []
+        if module is None:
+            module = type(self).__name__
+        generator = rows(dict(self.input_dict), dict(self.output_dict), detail_level == "summary")
+        return DetailRows(generator, self.project_name, module)
+
     def mobilization_cost_multiplier(self, turbine_rating):
         """
         Calculates a mobilization cost term as a function of
@@ -32,23 +125,21 @@ class CostModule:
                                                    project_id,
                                                    total_or_turbine):
         """
-        This takes a dataframe and turns it into a list of dictionaries
-        suitable for output to a cost tab in a spreadsheet.
-
-        Outputs dictionaries that are rows, with each row being a dict that
-        has costs broken down by and module id, operation id, type of cost,
-        cost, and per turbine or total. Each of those values are stored in
-        their own column.
+        This takes a dataframe of costs and turns it into the dataframe of
+        rows for the costs_by_module_type_operation output.
 
-        It maps each row of this dataframe into a dictionary with keys
-        of those names. It accumulates these dictionaries into a list.
+        Each row has costs broken down by module id, operation id, type of
+        cost, cost, and per turbine or total, with the columns in
+        cost_columns. The cost per turbine, per project and per kW are
+        calculated for all rows at once.
 
         It must be called with keyword arguments.
 
         Parameters
         ----------
         input_df : pd.DataFrame
-           The input dataframe that has the columns listed above.
+           The input dataframe that has the columns 'Phase of
+           construction', 'Type of cost' and 'Cost USD'.
 
         project_id : str
             The id of the project (it is a string, not an integer) to
@@ -60,11 +151,9 @@ class CostModule:
 
         Returns
         -------
-        list
-            List of dicts, with each dict representing a row for
-            the output.
+        pd.DataFrame
+            One row for each row of input_df.
         """
-        result = []
         # module = type(self).__name__
         module = 'CollectionCost' if (type(self).__name__ == 'ArraySystem') else type(self).__name__
         turbine_rating_MW = self.input_dict['turbine_rating_MW']
@@ -72,30 +161,52 @@ class CostModule:
         rotor_diameter_m = self.input_dict['rotor_diameter_m']
         project_size_kw = num_turbines * turbine_rating_MW * 1000
 
-        for _, row in input_df.iterrows():
-            _dict = dict()
-            row = row.to_dict()
-            _dict['operation_id'] = row['Phase of construction']
-            _dict['type_of_cost'] = row['Type of cost']
-            _dict['raw_cost'] = row['Cost USD']
-            result.append(_dict)
-
-        for _dict in result:
-            _dict['turbine_rating_MW'] = turbine_rating_MW
-            _dict['num_turbines'] = num_turbines
-            _dict['rotor_diameter_m'] = rotor_diameter_m
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-            if total_or_turbine:  # If raw_cost is the total cost
-                _dict['raw_cost_total_or_per_turbine'] = 'total'
-                _dict['cost_per_turbine'] = _dict['raw_cost'] / num_turbines
-                _dict['cost_per_project'] = _dict['raw_cost']
-                _dict['usd_per_kw_per_project'] = _dict['raw_cost'] / project_size_kw
-            else:                 # If raw_cost is per turbine
-                _dict['raw_cost_total_or_per_turbine'] = 'turbine'
-                _dict['cost_per_turbine'] = _dict['raw_cost']
-                _dict['cost_per_project'] = _dict['raw_cost'] * num_turbines
-                _dict['usd_per_kw_per_project'] = _dict['cost_per_project'] / project_size_kw
-
-        return result
+        raw_cost = input_df['Cost USD'].to_numpy()
+        if total_or_turbine:  # If raw_cost is the total cost
+            raw_cost_total_or_per_turbine = 'total'
+            cost_per_turbine = raw_cost / num_turbines
+            cost_per_project = raw_cost
+            usd_per_kw_per_project = raw_cost / project_size_kw
+        else:                 # If raw_cost is per turbine
+            raw_cost_total_or_per_turbine = 'turbine'
+            cost_per_turbine = raw_cost
+            cost_per_project = raw_cost * num_turbines
+            usd_per_kw_per_project = cost_per_project / project_size_kw
+
+        return pd.DataFrame({
+            'operation_id': input_df['Phase of construction'].to_numpy(),
+            'type_of_cost': input_df['Type of cost'].to_numpy(),
+            'raw_cost': raw_cost,
+            'turbine_rating_MW': turbine_rating_MW,
+            'num_turbines': num_turbines,
+            'rotor_diameter_m': rotor_diameter_m,
+            'project_id_with_serial': self.project_name,
+            'module': module,
+            'raw_cost_total_or_per_turbine': raw_cost_total_or_per_turbine,
+            'cost_per_turbine': cost_per_turbine,
+            'cost_per_project': cost_per_project,
+            'usd_per_kw_per_project': usd_per_kw_per_project,
+        }, index=pd.RangeIndex(len(input_df)), columns=self.cost_columns)
+
+    @classmethod
+    def concat_costs(cls, costs):
+        """
+        Concatenates dataframes of cost rows, such as those of the modules
+        of many projects.
+
+        Parameters
+        ----------
+        costs : iterable
+            The dataframes made by
+            outputs_for_costs_by_module_type_operation(), in order.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows of all the dataframes, with a new index. If there are
+            none, an empty dataframe with the columns in cost_columns.
+        """
+        costs = [df for df in costs if len(df) > 0]
+        if len(costs) == 0:
+            return pd.DataFrame(columns=cls.cost_columns)
+        return pd.concat(costs, ignore_index=True)
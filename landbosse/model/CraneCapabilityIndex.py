@@ -0,0 +1,221 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .CraneGeometry import CraneGeometry
+from .ProjectResultCache import ProjectResultCache
+
+
+class CraneCapabilityIndex:
+    """
+    The lift polygons and load chart wind speeds of a table of cranes, as
+    NumPy arrays, to check which cranes can lift which components all at
+    once.
+
+    ErectionCost.calculate_crane_lift_polygons() makes a crane_poly table
+    with one row per crane and boom system. Its 'Crane poly' column holds
+    the polygon of points (mass in tonnes, height in m) that the crane can
+    lift. An index stores the vertices of those polygons in one array with
+    shape (cranes, vertices, 2), so that lift_feasibility() tests every
+    component against every crane in one pass, with the crossing number
+    test of CraneGeometry.
+
+    Indexes are built with for_crane_poly(). Because the crane_poly table
+    only depends on the crane_specs sheet, built indexes are kept in an
+    LRU cache that is a class attribute, keyed by a hash of the contents of
+    crane_specs and the cranes in the crane_poly table. Every project that
+    shares a crane_specs sheet, in the same process, reuses the same index.
+    Setting maxsize to 0 disables the cache.
+
+    Indexes must not be modified after they are built.
+    """
+
+    # _cache holds the indexes in least recently used order. The most
+    # recently used entry is at the end.
+    _cache = OrderedDict()
+
+    # Maximum number of indexes in the cache.
+    maxsize = 64
+
+    # Counters of cache hits and misses since the last clear()
+    hits = 0
+    misses = 0
+
+    # The lock makes the cache safe to use from multiple threads.
+    _lock = threading.Lock()
+
+    # Columns of the crane_poly table that identify a crane
+    crane_id_columns = ["Equipment name", "Equipment ID", "Crane name", "Boom system", "Crane capacity tonne"]
+
+    def __init__(self, crane_poly):
+        """
+        Parameters
+        ----------
+        crane_poly : pd.DataFrame
+            The crane_poly table made by
+            ErectionCost.calculate_crane_lift_polygons(). Every polygon must
+            have the same number of vertices.
+        """
+        self.vertices = np.array(crane_poly["Crane poly"].to_list(), dtype=np.float64).reshape(len(crane_poly), -1, 2)
+        self.max_wind_speed_tab = crane_poly["Max wind speed m per s"].to_numpy(dtype=np.float64)
+
+    def __len__(self):
+        return len(self.vertices)
+
+    @classmethod
+    def key(cls, crane_specs, crane_poly):
+        """
+        Parameters
+        ----------
+        crane_specs : pd.DataFrame
+            The crane_specs sheet that crane_poly was calculated from.
+
+        crane_poly : pd.DataFrame
+            The crane_poly table, which may be of some of the cranes in
+            crane_specs.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the crane_specs sheet and the cranes in
+            the crane_poly table.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        ProjectResultCache.update_digest(digest, crane_specs)
+        ProjectResultCache.update_digest(digest, crane_poly[cls.crane_id_columns])
+        return digest.hexdigest()
+
+    @classmethod
+    def for_crane_poly(cls, crane_poly, crane_specs):
+        """
+        Returns the index of a crane_poly table from the cache, or builds it
+        and stores it in the cache.
+
+        Parameters
+        ----------
+        crane_poly : pd.DataFrame
+            The crane_poly table.
+
+        crane_specs : pd.DataFrame
+            The crane_specs sheet that crane_poly was calculated from.
+
+        Returns
+        -------
+        CraneCapabilityIndex
+            The index of crane_poly.
+        """
+        if cls.maxsize <= 0:
+            return cls(crane_poly)
+        key = cls.key(crane_specs, crane_poly)
+        with cls._lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                cls.hits += 1
+                return cls._cache[key]
+            cls.misses += 1
+        index = cls(crane_poly)
+        with cls._lock:
+            cls._cache[key] = index
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+        return index
+
+    def lift_feasibility(self, mass_tonne, height_m):
+        """
+        Tests whether each crane can lift each point, with
+        CraneGeometry.points_in_polygons().
+
+        Parameters
+        ----------
+        mass_tonne : numpy.ndarray
+            The masses of the points, with shape (points,).
+
+        height_m : numpy.ndarray
+            The heights of the points, with shape (points,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (cranes, points) that is True where the
+            point is inside the lift polygon of the crane.
+        """
+        return CraneGeometry.points_in_polygons(mass_tonne, height_m, self.vertices)
+
+    def max_wind_speeds(self, mass_tonne, area_drag_sq_m):
+        """
+        Calculates the maximum permissible wind speed of each crane lifting
+        each component, vmax = min(vmax_tab, vmax_tab * sqrt(1.2 * mh / aw)),
+        as in ErectionCost.calculate_component_lift_max_wind_speed().
+
+        Parameters
+        ----------
+        mass_tonne : numpy.ndarray
+            The hoist loads mh of the components, with shape (components,).
+
+        area_drag_sq_m : numpy.ndarray
+            The areas exposed to wind aw of the components (surface area
+            times drag coefficient), with shape (components,).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with shape (cranes, components) of maximum wind speeds.
+        """
+        vmax_tab = self.max_wind_speed_tab[:, np.newaxis]
+        vmax_calc = vmax_tab * np.sqrt(
+            1.2 * np.asarray(mass_tonne, dtype=np.float64) / np.asarray(area_drag_sq_m, dtype=np.float64)
+        )
+        return np.minimum(vmax_tab, vmax_calc)
+
+    def capabilities(self, lift_mass_tonne, lift_height_m, mass_tonne, area_drag_sq_m):
+        """
+        Calculates lift_feasibility() and max_wind_speeds() together.
+
+        Parameters
+        ----------
+        lift_mass_tonne, lift_height_m : numpy.ndarray
+            The points to test the lift polygons with.
+
+        mass_tonne, area_drag_sq_m : numpy.ndarray
+            The hoist loads and areas exposed to wind of the components.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            The boolean feasibility matrix and the maximum wind speed matrix,
+            both with shape (cranes, components).
+        """
+        return (
+            self.lift_feasibility(lift_mass_tonne, lift_height_m),
+            self.max_wind_speeds(mass_tonne, area_drag_sq_m),
+        )
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns
+        -------
+        dict
+            The hits, misses, current size and maximum size of the cache.
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'size': len(cls._cache),
+                'maxsize': cls.maxsize,
+            }
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all indexes from the cache and resets the hit and miss
+        counters.
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls.hits = 0
+            cls.misses = 0
@@ -0,0 +1,361 @@
+import numpy as np
+import pandas as pd
+
+
+class CraneCostTensor:
+    """
+    The costs of every crane and boom system for every operation of an
+    erection, as NumPy arrays, to choose the least cost cranes without a
+    chain of merges and groupbys.
+
+    ErectionCost.aggregate_erection_costs() makes the possible_crane_cost
+    dataframe, with one row per crane, boom system, operation and equipment
+    ID, and labor, equipment rental and fuel costs on each row. A tensor is
+    built from those rows and the mobilization costs of the cranes:
+
+    - costs has shape (cost columns, cranes, operations) and holds the sum
+      of each cost column over the rows of each crane and operation.
+
+    - present is True for the (crane, operation) pairs that have rows.
+
+    - mobilization holds the mobilization and demobilization cost of each
+      crane.
+
+    - same_costs has shape (cost columns, cranes) and holds the costs of
+      using the same crane for every operation.
+
+    The cranes are the (crane name, boom system) pairs in sorted order and
+    the operations are in sorted order, which is the order of the groups of
+    pandas.DataFrame.groupby(). See group_sum() for how the sums are made
+    identical to those of groupby().sum(), so that the costs, and the
+    cranes chosen, are the same as with merges and groupbys.
+
+    separate_basetop() and same_basetop() return the dataframes of the
+    two crane strategies. minimum_cost_cranes() chooses between them.
+    """
+
+    # The cost columns of possible_crane_cost that are summed
+    cost_columns = [
+        "Labor cost USD without management",
+        "Subtotal for hourly labor (non-management) USD",
+        "Subtotal for per diem labor (non-management) USD",
+        "Equipment rental cost USD",
+        "Fuel cost USD",
+    ]
+
+    def __init__(self, possible_crane_cost, crane_specs):
+        """
+        Parameters
+        ----------
+        possible_crane_cost : pd.DataFrame
+            The rows of the cranes that can perform each operation, with the
+            cost_columns, as made by aggregate_erection_costs().
+
+        crane_specs : pd.DataFrame
+            The crane_specs sheet with the 'Mobilization cost USD' of each
+            crane.
+        """
+        crane_name = possible_crane_cost["Crane name"].to_numpy(dtype=object)
+        boom_system = possible_crane_cost["Boom system"].to_numpy(dtype=object)
+        operation = possible_crane_cost["Operation"].to_numpy(dtype=object)
+        values = possible_crane_cost[self.cost_columns].to_numpy(dtype=np.float64)
+        self.key_dtypes = {
+            column: possible_crane_cost[column].dtype for column in ["Crane name", "Boom system", "Operation"]
+        }
+
+        # Rows with a missing key are dropped by groupby(), and so are they
+        # here.
+        keyed = ~(pd.isnull(crane_name) | pd.isnull(boom_system) | pd.isnull(operation))
+        crane_name, boom_system, operation, values = (
+            crane_name[keyed], boom_system[keyed], operation[keyed], values[keyed]
+        )
+
+        crane_keys, crane_code = self.sorted_keys(crane_name, boom_system)
+        self.crane_name = crane_keys[0]
+        self.boom_system = crane_keys[1]
+        (self.operations,), operation_code = self.sorted_keys(operation)
+        num_cranes = len(self.crane_name)
+        num_operations = len(self.operations)
+
+        self.present = np.zeros((num_cranes, num_operations), dtype=bool)
+        self.present[crane_code, operation_code] = True
+        self.costs = self.group_sum(crane_code * num_operations + operation_code, values, num_cranes * num_operations)
+        self.costs = self.costs.T.reshape(len(self.cost_columns), num_cranes, num_operations)
+
+        self.mobilization, self.has_mobilization = self.mobilization_costs(crane_specs)
+
+        # The same crane can be used for all operations if it is a top crane
+        # whose crane name is the name of a base crane and whose boom system
+        # is the boom system of a base crane. The rows of every operation of
+        # the crane are summed once for each of its top rows, in turn.
+        base = operation == "Base"
+        top = operation == "Top"
+        same_top = (
+            top & np.isin(crane_name, crane_name[base].tolist()) & np.isin(boom_system, boom_system[base].tolist())
+        )
+        self.same_count = np.bincount(crane_code[same_top], minlength=num_cranes)
+        repeated_rows = [
+            np.tile(np.flatnonzero(crane_code == crane), count)
+            for crane, count in enumerate(self.same_count)
+            if count > 0
+        ]
+        repeated_rows = np.concatenate(repeated_rows) if repeated_rows else np.zeros(0, dtype=np.intp)
+        self.same_costs = self.group_sum(crane_code[repeated_rows], values[repeated_rows], num_cranes).T
+
+    @staticmethod
+    def sorted_keys(*columns):
+        """
+        Finds the distinct combinations of the values of key columns, in the
+        sorted order of groupby().
+
+        Parameters
+        ----------
+        columns : numpy.ndarray
+            Arrays of key values with the same length.
+
+        Returns
+        -------
+        list, numpy.ndarray
+            One array of distinct values per column, and the index of the
+            combination of each row.
+        """
+        if len(columns[0]) == 0:
+            return [column[:0] for column in columns], np.zeros(0, dtype=np.intp)
+        codes = []
+        uniques = []
+        for column in columns:
+            _, first, column_codes = np.unique(column.astype(str), return_index=True, return_inverse=True)
+            uniques.append(column[first])
+            codes.append(column_codes)
+        shape = [len(column_uniques) for column_uniques in uniques]
+        distinct, code = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+        positions = np.unravel_index(distinct, shape)
+        return [column_uniques[p] for column_uniques, p in zip(uniques, positions)], code
+
+    @staticmethod
+    def group_sum(codes, values, num_groups):
+        """
+        Sums the rows of each group, skipping NaN values, exactly as
+        groupby().sum() does.
+
+        groupby().sum() uses compensated summation. For at most two values
+        that is the same as adding them, so those sums are made with
+        numpy.add.at(). The few groups with more values in a column are
+        summed with groupby().sum() itself.
+
+        Parameters
+        ----------
+        codes : numpy.ndarray
+            The group of each row, with shape (rows,).
+
+        values : numpy.ndarray
+            The values, with shape (rows, columns).
+
+        num_groups : int
+            The number of groups.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sums, with shape (groups, columns). Empty groups sum to 0.
+        """
+        missing = np.isnan(values)
+        sums = np.zeros((num_groups, values.shape[1]))
+        np.add.at(sums, codes, np.where(missing, 0.0, values))
+
+        counts = np.zeros((num_groups, values.shape[1]), dtype=np.intp)
+        np.add.at(counts, codes, ~missing)
+        long_groups = np.flatnonzero((counts > 2).any(axis=1))
+        if len(long_groups) > 0:
+            rows = np.isin(codes, long_groups)
+            sums[long_groups] = pd.DataFrame(values[rows]).groupby(codes[rows]).sum().to_numpy()
+        return sums
+
+    def mobilization_costs(self, crane_specs):
+        """
+        Calculates the mobilization and demobilization costs of the cranes,
+        which are twice the largest 'Mobilization cost USD' of the rows of
+        each crane in crane_specs.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            The costs, in the dtype of crane_specs, and whether each crane is
+            in crane_specs.
+        """
+        crane_name = crane_specs["Crane name"].to_numpy(dtype=object)
+        boom_system = crane_specs["Boom system"].to_numpy(dtype=object)
+        cost = crane_specs["Mobilization cost USD"].to_numpy()
+
+        mobilization = np.zeros(len(self.crane_name), dtype=cost.dtype)
+        has_mobilization = np.zeros(len(self.crane_name), dtype=bool)
+        index = {key: i for i, key in enumerate(zip(self.crane_name.tolist(), self.boom_system.tolist()))}
+        for key, value in zip(zip(crane_name.tolist(), boom_system.tolist()), cost.tolist()):
+            i = index.get(key)
+            if i is None or pd.isnull(value):
+                continue
+            if not has_mobilization[i] or value > mobilization[i]:
+                mobilization[i] = value
+                has_mobilization[i] = True
+        return mobilization * 2, has_mobilization
+
+    def total_cost(self, costs, mobilization):
+        """
+        Adds labor, equipment rental, fuel and mobilization costs in the
+        same order as ErectionCost.
+        """
+        labor, _, _, equipment, fuel = costs
+        return labor + equipment + fuel + mobilization
+
+    def separate_basetop(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The costs of each crane for each operation, when separate cranes
+            are used for the base, top and offload operations. The rows are
+            sorted by crane name and boom system, then operation.
+        """
+        crane, operation = np.nonzero(self.present & self.has_mobilization[:, np.newaxis])
+        costs = self.costs[:, crane, operation]
+        mobilization = self.mobilization[crane]
+        columns = {
+            "Operation": pd.array(self.operations[operation].tolist(), dtype=self.key_dtypes["Operation"]),
+            "Crane name": pd.array(self.crane_name[crane].tolist(), dtype=self.key_dtypes["Crane name"]),
+            "Boom system": pd.array(self.boom_system[crane].tolist(), dtype=self.key_dtypes["Boom system"]),
+        }
+        columns.update(zip(self.cost_columns, costs))
+        columns["Mobilization cost USD"] = mobilization
+        columns["Total cost USD"] = self.total_cost(costs, mobilization)
+        return pd.DataFrame(columns)
+
+    def same_basetop(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The costs of each crane that can be used for the base and top
+            operations, with operation 'Base + Top'.
+        """
+        crane = np.flatnonzero((self.same_count > 0) & self.has_mobilization)
+        costs = self.same_costs[:, crane]
+        mobilization = self.mobilization[crane]
+        columns = {
+            "Crane name": pd.array(self.crane_name[crane].tolist(), dtype=self.key_dtypes["Crane name"]),
+            "Boom system": pd.array(self.boom_system[crane].tolist(), dtype=self.key_dtypes["Boom system"]),
+        }
+        columns.update(zip(self.cost_columns, costs))
+        columns["Mobilization cost USD"] = mobilization
+        columns["Total cost USD"] = self.total_cost(costs, mobilization)
+        columns["Operation"] = pd.array(["Base + Top"] * len(crane), dtype=self.key_dtypes["Operation"])
+        return pd.DataFrame(columns)
+
+    @staticmethod
+    def group_min(values, group_start):
+        """
+        Finds the smallest value of each group of consecutive rows, skipping
+        NaN values, as groupby().min() does.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            The values of a column, with the rows of each group together.
+
+        group_start : numpy.ndarray
+            The index of the first row of each group.
+
+        Returns
+        -------
+        numpy.ndarray
+            The smallest value of each group. Strings are compared as str.
+        """
+        if values.dtype.kind == "O":
+            _, first, codes = np.unique(values.astype(str), return_index=True, return_inverse=True)
+            return values[first[np.minimum.reduceat(codes, group_start)]]
+        return np.fmin.reduceat(values, group_start)
+
+    @classmethod
+    def minimum_cost_cranes(cls, separate_basetop, same_basetop, allow_same_flag):
+        """
+        Chooses the least cost cranes, as ErectionCost.find_minimum_cost_cranes()
+        documents. For each operation, the crane with the smallest total cost
+        is found with one vectorized minimum over all the rows. Two offload
+        cranes are assumed to be on site. If same cranes are allowed and using
+        the same crane for base and top is not more expensive, the cheapest
+        same crane is chosen instead.
+
+        Ties are resolved as the original loop over the operations did. The
+        operations are taken in the order of their first rows. For each one,
+        the rows of every operation whose total cost equals the smallest
+        total cost of the operation are grouped by operation, and each
+        column of a group is the smallest value of its rows.
+
+        Parameters
+        ----------
+        separate_basetop : pd.DataFrame
+            The costs of separate cranes, as made by separate_basetop().
+
+        same_basetop : pd.DataFrame
+            The costs of same cranes, as made by same_basetop().
+
+        allow_same_flag : bool
+            True if the same crane can be chosen for base and top.
+
+        Returns
+        -------
+        pd.DataFrame
+            The costs of the chosen cranes.
+
+        Raises
+        ------
+        ValueError
+            If an operation has no crane with a total cost.
+        """
+        operation = separate_basetop["Operation"].to_numpy(dtype=object)
+        total = separate_basetop["Total cost USD"].to_numpy(dtype=np.float64)
+        operations, operation_code = np.unique(operation.astype(str), return_inverse=True)
+        # The operations in the order they first appear, as in the loop
+        _, first = np.unique(operation_code, return_index=True)
+        appearance = np.argsort(first, kind="stable")
+
+        valid = ~np.isnan(total)
+        min_cost = np.full(len(operations), np.inf)
+        np.minimum.at(min_cost, operation_code[valid], total[valid])
+        if np.isinf(min_cost).any():
+            raise ValueError(f"No crane has a total cost for {operations[np.isinf(min_cost)][0]}.")
+
+        # The rows that match the smallest total cost of each operation,
+        # grouped by that operation, then the operation of the row. Without
+        # ties, each group is one row.
+        step, row = np.nonzero(total[np.newaxis, :] == min_cost[appearance, np.newaxis])
+        order = np.lexsort([row, operation_code[row], step])
+        step, row = step[order], row[order]
+        group_key = step * len(operations) + operation_code[row]
+        group_start = np.flatnonzero(np.r_[True, group_key[1:] != group_key[:-1]])
+        group_operation = operation[row[group_start]]
+
+        # duplicate offload records because assuming two offload cranes are on site
+        offload = np.flatnonzero(group_operation == "Offload")
+        group_total = cls.group_min(total[row], group_start)
+        cost_chosen_separate = group_total[np.r_[np.arange(len(group_start)), offload]].sum()
+
+        if allow_same_flag is True:
+            # get the minimum cost for using the same crane for all operations
+            cost_chosen_same = min(same_basetop["Total cost USD"])
+            if not cost_chosen_separate < cost_chosen_same:
+                return same_basetop.where(same_basetop["Total cost USD"] == cost_chosen_same).dropna()
+
+        # Sum the groups of each crane and operation, counting offload
+        # groups twice, in the order of groupby().
+        keys = ["Boom system", "Crane name", "Operation"]
+        group_keys = [cls.group_min(separate_basetop[key].to_numpy(dtype=object)[row], group_start) for key in keys]
+        key_values, chosen_code = cls.sorted_keys(*group_keys)
+        multiplier = np.where(group_operation == "Offload", 2, 1)
+        columns = dict()
+        for column in sorted(set(separate_basetop.columns) - set(keys)):
+            values = cls.group_min(separate_basetop[column].to_numpy()[row], group_start)
+            sums = np.zeros(len(key_values[0]), dtype=values.dtype)
+            np.add.at(sums, chosen_code, np.where(pd.isnull(values), 0, values) * multiplier)
+            columns[column] = sums
+        index = pd.MultiIndex.from_arrays(key_values, names=keys)
+        return pd.DataFrame(columns, index=index)
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class CraneGeometry:
+    """
+    This class does not need to be instantiated. It holds the geometry of
+    crane load charts as NumPy arrays.
+
+    A lift polygon is a (k, 2) float array of vertices. Each vertex is a
+    mass in tonnes (x) and a lift height in m (y). A crane can lift a load
+    to a height if the point (mass, height) is inside the polygon of the
+    crane. Polygons of many cranes are stacked into an (n, k, 2) array.
+
+    points_in_polygons() is a crossing number test: a segment is drawn from
+    each point to the right, and the point is inside a polygon if the
+    segment crosses an odd number of edges of the polygon. The segment ends
+    at 1.1 times the largest x coordinate of the point and the polygon, and
+    the orientation tests are done in the same order with the same float
+    arithmetic as the original Point based routine of ErectionCost, so
+    points on vertices and edges give the same results.
+    """
+
+    @staticmethod
+    def lift_polygon(max_capacity_tonne, hub_height_m):
+        """
+        Makes the lift polygon of a crane and boom system from the rows of
+        its load chart.
+
+        Parameters
+        ----------
+        max_capacity_tonne : numpy.ndarray
+            The 'Max capacity tonne' column of the load chart.
+
+        hub_height_m : numpy.ndarray
+            The 'Hub height m' column of the load chart.
+
+        Returns
+        -------
+        numpy.ndarray
+            The (5, 2) polygon through (0, 0), (0, max height),
+            (min capacity, max height), (max capacity, min height) and
+            (max capacity, 0).
+        """
+        x = np.asarray(max_capacity_tonne, dtype=np.float64)
+        y = np.asarray(hub_height_m, dtype=np.float64)
+        return np.array(
+            [
+                [0.0, 0.0],
+                [0.0, y.max()],
+                [x.min(), y.max()],
+                [x.max(), y.min()],
+                [x.max(), 0.0],
+            ]
+        )
+
+    @staticmethod
+    def ccw(ax, ay, bx, by, cx, cy):
+        """
+        Tests whether the points A, B and C are in counterclockwise order.
+        The coordinates are arrays that broadcast together.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array that is True where the points are counterclockwise.
+        """
+        return (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
+
+    @classmethod
+    def points_in_polygons(cls, x, y, polygons):
+        """
+        Tests every point against every polygon.
+
+        Parameters
+        ----------
+        x, y : numpy.ndarray
+            The coordinates of the points, with shape (m,).
+
+        polygons : numpy.ndarray
+            The polygons, with shape (n, k, 2), or one polygon with shape
+            (k, 2).
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with shape (n, m), or (m,) for one polygon, that is
+            True where the point is inside the polygon.
+        """
+        polygons = np.asarray(polygons, dtype=np.float64)
+        if polygons.ndim == 2:
+            return cls.points_in_polygons(x, y, polygons[np.newaxis])[0]
+
+        # Coordinates are arranged with shape (polygons, points, edges). Edge
+        # i goes from vertex i to vertex i + 1, and the last edge closes the
+        # polygon.
+        cx = np.asarray(x, dtype=np.float64)[np.newaxis, :, np.newaxis]
+        cy = np.asarray(y, dtype=np.float64)[np.newaxis, :, np.newaxis]
+        ax = polygons[:, np.newaxis, :, 0]
+        ay = polygons[:, np.newaxis, :, 1]
+        bx = np.roll(ax, -1, axis=2)
+        by = np.roll(ay, -1, axis=2)
+
+        # The crossing segment ends at D
+        dx = 1.1 * np.maximum(cx, ax.max(axis=2, keepdims=True))
+        dy = cy
+
+        # Segments AB and CD intersect
+        intersect = (cls.ccw(ax, ay, cx, cy, dx, dy) != cls.ccw(bx, by, cx, cy, dx, dy)) & (
+            cls.ccw(ax, ay, bx, by, cx, cy) != cls.ccw(ax, ay, bx, by, dx, dy)
+        )
+        return np.logical_xor.reduce(intersect, axis=2)
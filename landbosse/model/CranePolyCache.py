@@ -0,0 +1,230 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .ProjectResultCache import ProjectResultCache
+
+
+class CranePolyCache:
+    """
+    This class does not need to be instantiated. Like WeatherDelayCache,
+    the cache is a class attribute, so it is shared by every ErectionCost
+    in the process.
+
+    ErectionCost.calculate_crane_lift_polygons() groups the crane_specs
+    sheet by crane and boom system and makes a crane_poly table with one
+    row, and one lift polygon, per group. It does this twice for every
+    project, once for the erection cranes and once for the offload cranes.
+    In a sweep, crane_specs rarely changes between projects, so this class
+    keeps the crane_poly tables that have been made.
+
+    The key of a crane_poly table is a hash of the dataframe that was
+    grouped (its column names, dtypes, index and values) and the names of
+    the columns it was grouped by. A crane_specs sheet that is modified by
+    a parametric cell edit has different values, so it has a different key
+    and its crane_poly table is made again. The key also covers the code
+    version of ProjectResultCache, so tables made by a different version
+    of the code are not used.
+
+    Tables are kept in memory in a least recently used (LRU) cache bounded
+    to maxsize tables. Setting maxsize to 0 disables the memory cache.
+
+    Tables can also be kept on local disk, so that they are shared by the
+    workers of a parallel run and by later runs. To enable the disk cache,
+    set the LANDBOSSE_CRANE_POLY_CACHE_DIR environment variable to a
+    directory, or set the cache_dir class attribute. Each table is a small
+    file, and the files are not evicted.
+
+    Cached tables are never modified. get() returns a copy.
+    """
+
+    # _cache holds the cached tables in least recently used order. The most
+    # recently used entry is at the end.
+    _cache = OrderedDict()
+
+    # Maximum number of tables in the memory cache.
+    maxsize = 64
+
+    # Directory of the disk cache. None means the directory is taken from
+    # the LANDBOSSE_CRANE_POLY_CACHE_DIR environment variable. If that is
+    # not set either, the disk cache is disabled.
+    cache_dir = None
+
+    # Changing what is hashed or stored must change this version so that
+    # existing files are not used.
+    format_version = 2
+
+    # Counters of cache hits (from memory or disk) and misses since the
+    # last clear()
+    hits = 0
+    misses = 0
+
+    # The lock makes the cache safe to use from multiple threads.
+    _lock = threading.Lock()
+
+    @classmethod
+    def disk_cache_dir(cls):
+        """
+        Returns
+        -------
+        str or None
+            The directory of the disk cache, or None if it is disabled.
+        """
+        if cls.cache_dir is not None:
+            return cls.cache_dir
+        return os.environ.get('LANDBOSSE_CRANE_POLY_CACHE_DIR') or None
+
+    @classmethod
+    def key(cls, crane_grouped):
+        """
+        Parameters
+        ----------
+        crane_grouped : pandas.core.groupby.generic.DataFrameGroupBy
+            The grouped cranes that calculate_crane_lift_polygons() makes a
+            crane_poly table of.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the grouped dataframe, the grouping
+            columns and the code version.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'v{cls.format_version}|{ProjectResultCache.code_version()}|'.encode())
+        ProjectResultCache.update_digest(digest, list(crane_grouped.keys))
+        ProjectResultCache.update_digest(digest, crane_grouped.obj)
+        return digest.hexdigest()
+
+    @classmethod
+    def cache_filename(cls, key):
+        """
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        str
+            The filename of the table in the disk cache.
+        """
+        return os.path.join(cls.disk_cache_dir(), f'crane-poly-{key}.pkl')
+
+    @classmethod
+    def get(cls, key):
+        """
+        Looks up a crane_poly table in memory, then on disk, and counts a
+        hit or a miss.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        bool, pd.DataFrame
+            True and a copy of the table if it was found. False and None
+            otherwise.
+        """
+        with cls._lock:
+            crane_poly = cls._cache.get(key)
+            if crane_poly is not None:
+                cls._cache.move_to_end(key)
+
+        if crane_poly is None and cls.disk_cache_dir() is not None:
+            filename = cls.cache_filename(key)
+            try:
+                with open(filename, 'rb') as f:
+                    crane_poly = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as err:
+                print(f'Ignoring unreadable crane poly cache file {filename}: {err}')
+            if crane_poly is not None:
+                cls.remember(key, crane_poly)
+
+        with cls._lock:
+            if crane_poly is None:
+                cls.misses += 1
+                return False, None
+            cls.hits += 1
+        return True, crane_poly.copy()
+
+    @classmethod
+    def put(cls, key, crane_poly):
+        """
+        Stores a copy of a crane_poly table in memory and, if the disk cache
+        is enabled, on disk. The file is written under a temporary name and
+        renamed, so a parallel process never reads a partially written file.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        crane_poly : pd.DataFrame
+            The table made by calculate_crane_lift_polygons().
+        """
+        crane_poly = crane_poly.copy()
+        cls.remember(key, crane_poly)
+
+        cache_dir = cls.disk_cache_dir()
+        if cache_dir is None:
+            return
+        filename = cls.cache_filename(key)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(crane_poly, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, filename)
+        except OSError as err:
+            print(f'Could not write crane poly cache file {filename}: {err}')
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    @classmethod
+    def remember(cls, key, crane_poly):
+        """
+        Stores a table in the memory cache, evicting the least recently used
+        tables if it is full.
+        """
+        with cls._lock:
+            if cls.maxsize <= 0:
+                return
+            cls._cache[key] = crane_poly
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns
+        -------
+        dict
+            The hits, misses, current size and maximum size of the memory
+            cache.
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'size': len(cls._cache),
+                'maxsize': cls.maxsize,
+            }
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all tables from the memory cache and resets the hit and miss
+        counters. Files in the disk cache are not removed.
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls.hits = 0
+            cls.misses = 0
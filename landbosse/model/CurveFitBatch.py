@@ -0,0 +1,417 @@
+import numpy as np
+import pandas as pd
+import scipy.interpolate
+
+from .CostModule import CostModule
+
+
+class CurveFitBatch:
+    """
+    Evaluates the curve fit modules for many projects at once.
+
+    TransportCost, SubstationCost, GridConnectionCost, TurbineCost,
+    DevelopmentCost and ManagementCost are closed form functions of a few
+    scalars. Running them through Manager, one project at a time, spends
+    most of the time making small dataframes and rows. This class evaluates
+    the same equations on NumPy arrays, with one element per project, and
+    returns the costs of every project in one long format dataframe. It
+    does not run the other modules, so it is for sweeps of the parameters
+    of these modules only.
+
+    The parameters are named like the keys of the master input dictionary.
+    Each is a scalar, which is used for every project, or an array with one
+    value per project. The parameters each module needs are in
+    required_parameters. ManagementCost also needs the values that Manager
+    calculates from the other modules before it runs: project_value_usd,
+    foundation_cost_usd and actual_construction_months.
+
+    The optional parameter development_labor_cost_usd is required by
+    DevelopmentCost, because the development costs from a development
+    sheet of the project data are not a curve fit. The optional parameter
+    override_total_management_cost runs ManagementCost in distributed mode
+    for the projects where it is more than 0, like the "Override total
+    management cost for distributed" column of the project list.
+
+    The results are the same as those of the modules, within floating
+    point rounding.
+    """
+
+    # The parameters each module needs, in the order the modules run in
+    # Manager.
+    required_parameters = {
+        'SubstationCost': ['interconnect_voltage_kV', 'project_size_megawatts', 'num_turbines'],
+        'TransportCost': ['rotor_diameter_m', 'num_turbines'],
+        'GridConnectionCost': ['interconnect_voltage_kV', 'distance_to_interconnect_mi', 'new_switchyard',
+                               'turbine_rating_MW', 'num_turbines'],
+        'DevelopmentCost': ['development_labor_cost_usd'],
+        'TurbineCost': ['turbine_capex', 'turbine_rating_MW', 'num_turbines'],
+        'ManagementCost': ['project_value_usd', 'foundation_cost_usd', 'actual_construction_months',
+                           'num_hwy_permits', 'num_turbines', 'project_size_megawatts', 'hub_height_meters',
+                           'markup_contingency', 'markup_warranty_management', 'markup_sales_and_use_tax',
+                           'markup_overhead', 'markup_profit_margin'],
+    }
+
+    # The operation of the rows of each module
+    operation_ids = {
+        'SubstationCost': 'Substation',
+        'TransportCost': 'Transport',
+        'GridConnectionCost': 'Transmission and Distribution',
+        'DevelopmentCost': 'Development',
+        'TurbineCost': 'Turbine',
+        'ManagementCost': 'Management',
+    }
+
+    # The columns of the cost table, like the cost rows of the modules.
+    cost_columns = CostModule.cost_columns
+
+    def __init__(self, parameters, site_facility_building_area_df=None, project_ids=None):
+        """
+        Parameters
+        ----------
+        parameters : dict or pandas.DataFrame
+            The parameters of the projects. See the class docstring.
+
+        site_facility_building_area_df : pandas.DataFrame
+            The site_facility_building_area sheet of the project data, used
+            by ManagementCost for every project. It is not needed if
+            ManagementCost is not evaluated or every project is in
+            distributed mode.
+
+        project_ids : list
+            The project_id_with_serial of each project. By default, it is
+            the index of parameters if that is a dataframe, or the position
+            of each project otherwise.
+        """
+        columns = {name: np.asarray(value) for name, value in dict(parameters).items()}
+        sizes = {value.size for value in columns.values() if value.ndim > 0}
+        if len(sizes) > 1:
+            raise ValueError(f'The parameters have different numbers of projects: {sorted(sizes)}.')
+        self.num_projects = sizes.pop() if sizes else 1
+        self.parameters = {name: np.broadcast_to(value, self.num_projects) for name, value in columns.items()}
+        self.site_facility_building_area_df = site_facility_building_area_df
+
+        if project_ids is None:
+            if isinstance(parameters, pd.DataFrame):
+                project_ids = parameters.index
+            else:
+                project_ids = np.arange(self.num_projects)
+        self.project_ids = np.asarray(project_ids)
+        if self.project_ids.size != self.num_projects:
+            raise ValueError(f'There are {self.project_ids.size} project IDs for {self.num_projects} projects.')
+
+    def parameter(self, name, dtype=np.float64):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the parameter.
+
+        dtype : numpy.dtype
+            The type to convert the values to.
+
+        Returns
+        -------
+        numpy.ndarray
+            The value of the parameter for each project.
+
+        Raises
+        ------
+        KeyError
+            If the parameter was not given.
+        """
+        if name not in self.parameters:
+            raise KeyError(f'{type(self).__name__} needs the parameter {name}.')
+        return self.parameters[name].astype(dtype)
+
+    def substation_cost(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The substation cost of each project, in USD. See SubstationCost.
+        """
+        voltage = self.parameter('interconnect_voltage_kV')
+        size = self.parameter('project_size_megawatts')
+        num_turbines = self.parameter('num_turbines')
+        utility = 11652 * (voltage + size) + 11795 * (size ** 0.3549) + 1526800
+        return np.where(num_turbines > 10, utility, 0.0)
+
+    def transport_cost(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The transport cost of each project, in USD. See TransportCost.
+        """
+        blade_length = 0.5 * self.parameter('rotor_diameter_m')
+        num_turbines = self.parameter('num_turbines')
+        xlen = np.array([-500., 0., 65., 75., 95., 115.])
+        ycost = 1e3 * np.array([0.0, 0.0, 52., 70., 120., 171.])
+        yinfra = 1e6 * np.array([0.0, 0.0, 0.0, 0.2, 1.0, 5.0])
+        f_blade = scipy.interpolate.interp1d(xlen, ycost, fill_value='extrapolate', assume_sorted=True)
+        f_infra = scipy.interpolate.interp1d(xlen, yinfra, fill_value='extrapolate', assume_sorted=True)
+        return 4 * f_blade(blade_length) * num_turbines + f_infra(blade_length)
+
+    def grid_connection_cost(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The transmission and distribution cost of each project, in USD.
+            See GridConnectionCost.
+        """
+        voltage = self.parameter('interconnect_voltage_kV')
+        distance = self.parameter('distance_to_interconnect_mi')
+        new_switchyard = self.parameter('new_switchyard', bool)
+        rating = self.parameter('turbine_rating_MW')
+        num_turbines = self.parameter('num_turbines')
+
+        interconnect_adder = np.where(new_switchyard, 18115 * voltage + 165944, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utility = (1176 * voltage + 218257) * (distance ** -0.1063) * distance + interconnect_adder
+        utility = np.where(distance == 0, 0.0, utility)
+
+        project_size_kw = num_turbines * rating * 1000
+        distributed = project_size_kw * (1736.7 * (project_size_kw ** -0.272))
+        return np.where(rating * num_turbines > 15, utility, distributed)
+
+    def development_cost(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The development labor cost of each project, in USD. The other
+            types of development cost are 0. See DevelopmentCost.
+        """
+        return self.parameter('development_labor_cost_usd')
+
+    def turbine_cost(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The turbine cost of each project, in USD. See TurbineCost.
+        """
+        turbine_capex = np.nan_to_num(self.parameter('turbine_capex'), nan=0.0)
+        return turbine_capex * self.parameter('num_turbines') * (self.parameter('turbine_rating_MW') * 1000)
+
+    def distributed_management(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            True for the projects in which ManagementCost is in distributed
+            mode.
+        """
+        if 'override_total_management_cost' not in self.parameters:
+            return np.zeros(self.num_projects, dtype=bool)
+        return np.nan_to_num(self.parameter('override_total_management_cost'), nan=0.0) > 0
+
+    def site_facility_building_area(self, project_size_megawatts):
+        """
+        Looks up the building area of each project in
+        site_facility_building_area_df.
+
+        Parameters
+        ----------
+        project_size_megawatts : numpy.ndarray
+            The size of each project.
+
+        Returns
+        -------
+        numpy.ndarray
+            The building area of each project, in square feet.
+
+        Raises
+        ------
+        ValueError
+            If the size of a project is not in any row of the dataframe.
+        """
+        df = self.site_facility_building_area_df
+        if df is None:
+            raise KeyError(f'{type(self).__name__} needs site_facility_building_area_df.')
+        size_min = df['Size Min (MW)'].to_numpy(dtype=np.float64)
+        size_max = df['Size Max (MW)'].to_numpy(dtype=np.float64)
+        area = df['Building area (sq. ft.)'].to_numpy(dtype=np.float64)
+        matches = (size_max[:, np.newaxis] > project_size_megawatts) & \
+                  (size_min[:, np.newaxis] <= project_size_megawatts)
+        if not matches.any(axis=0).all():
+            missing = project_size_megawatts[~matches.any(axis=0)]
+            raise ValueError(f'No site facility building area for project sizes {missing[:5]} MW.')
+        return area[matches.argmax(axis=0)]
+
+    def management_costs(self, projects=None):
+        """
+        Parameters
+        ----------
+        projects : numpy.ndarray
+            Boolean mask of the projects to evaluate. By default, every
+            project is evaluated.
+
+        Returns
+        -------
+        dict
+            The management costs of the projects, in USD, under the keys of
+            the output dictionary of ManagementCost: 'insurance_usd',
+            'construction_permitting_usd', 'project_management_usd',
+            'bonding_usd', 'markup_contingency_usd', 'engineering_usd' and
+            'site_facility_usd'.
+        """
+        if projects is None:
+            projects = np.ones(self.num_projects, dtype=bool)
+
+        def parameter(name):
+            return self.parameter(name)[projects]
+
+        value = parameter('project_value_usd')
+        months = parameter('actual_construction_months')
+        size = parameter('project_size_megawatts')
+        num_turbines = parameter('num_turbines')
+        costs = dict()
+
+        costs['insurance_usd'] = 0.0056 * value
+        costs['construction_permitting_usd'] = 0.02 * parameter('foundation_cost_usd') + \
+            20000 * parameter('num_hwy_permits')
+        costs['project_management_usd'] = np.where(
+            months < 28,
+            (53.333 * months ** 2 - 3442 * months + 209542) * (months + 2),
+            (months + 2) * 155000,
+        )
+        costs['bonding_usd'] = 0.01 * value
+        costs['markup_contingency_usd'] = (parameter('markup_contingency')
+                                           + parameter('markup_warranty_management')
+                                           + parameter('markup_sales_and_use_tax')
+                                           + parameter('markup_overhead')
+                                           + parameter('markup_profit_margin')) * value
+
+        development_engineering = 7188.5 * num_turbines + \
+            np.round(3.4893 * np.log(num_turbines) - 7.3049, 0) * 16800 + np.where(size < 200, 165675, 327250)
+        large = np.round(size / 100)
+        num_perm_met_mast = np.select([(30 <= size) & (size <= 100), (100 < size) & (size <= 300), size > 300],
+                                      [2, 2, large], 1)
+        num_temp_met_mast = np.select([(30 <= size) & (size <= 100), (100 < size) & (size <= 300), size > 300],
+                                      [2, 4, large * 2], 1)
+        tall = parameter('hub_height_meters') >= 90
+        met_mast = num_perm_met_mast * np.where(tall, 290000, 232600) + \
+            num_temp_met_mast * np.where(tall, 116800, 92600) + 200000
+        costs['engineering_usd'] = development_engineering + met_mast
+
+        construction_building = self.site_facility_building_area(size) * 125 + 176125
+        num_roads = np.where(num_turbines < 30, 1, np.round(0.05 * num_turbines))
+        access_road_security = np.select([num_turbines < 30, num_turbines < 100], [30000, 240000], 390000)
+        compound_security = 9825 * num_roads + 29850 * months + access_road_security + 60 * size + 62400
+        costs['site_facility_usd'] = construction_building + compound_security
+
+        return costs
+
+    def cost_table(self, modules=None):
+        """
+        Evaluates the modules for every project.
+
+        Parameters
+        ----------
+        modules : list
+            The names of the modules to evaluate, from required_parameters.
+            By default, all of them are evaluated.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per project, module and type of cost, with the columns
+            in cost_columns, like the cost rows of the modules. The rows are
+            ordered by project, then by module in the order of
+            required_parameters, then by type of cost in the order of the
+            modules. The columns of names are categorical, to keep tables of
+            many projects small.
+
+        Raises
+        ------
+        KeyError
+            If a parameter that a module needs was not given.
+        """
+        if modules is None:
+            modules = list(self.required_parameters)
+        all_projects = np.ones(self.num_projects, dtype=bool)
+
+        # Each block is (module, type of cost, mask of projects, raw cost
+        # of those projects).
+        blocks = []
+        for module_name in self.required_parameters:
+            if module_name not in modules:
+                continue
+            if module_name == 'SubstationCost':
+                blocks.append((module_name, 'Other', all_projects, self.substation_cost()))
+            elif module_name == 'TransportCost':
+                blocks.append((module_name, 'Other', all_projects, self.transport_cost()))
+            elif module_name == 'GridConnectionCost':
+                blocks.append((module_name, 'Other', all_projects, self.grid_connection_cost()))
+            elif module_name == 'DevelopmentCost':
+                labor = self.development_cost()
+                zeros = np.zeros(self.num_projects)
+                blocks.append((module_name, 'Equipment rental', all_projects, zeros))
+                blocks.append((module_name, 'Labor', all_projects, labor))
+                blocks.append((module_name, 'Materials', all_projects, zeros))
+                blocks.append((module_name, 'Mobilization', all_projects, zeros))
+                blocks.append((module_name, 'Other', all_projects, zeros))
+            elif module_name == 'TurbineCost':
+                blocks.append((module_name, 'Other', all_projects, self.turbine_cost()))
+            elif module_name == 'ManagementCost':
+                distributed = self.distributed_management()
+                if distributed.any():
+                    override = self.parameter('override_total_management_cost')[distributed]
+                    blocks.append((module_name, 'total_management_cost', distributed, override))
+                if not distributed.all():
+                    costs = self.management_costs(~distributed)
+                    for type_of_cost, key in [('insurance', 'insurance_usd'),
+                                              ('Construction Permitting', 'construction_permitting_usd'),
+                                              ('Project Management', 'project_management_usd'),
+                                              ('Bonding', 'bonding_usd'),
+                                              ('Markup Contingency', 'markup_contingency_usd'),
+                                              ('Engineering Foundation and Collections System (includes met mast)',
+                                               'engineering_usd'),
+                                              ('Site Facility', 'site_facility_usd')]:
+                        blocks.append((module_name, type_of_cost, ~distributed, costs[key]))
+            else:
+                raise KeyError(f'{type(self).__name__} cannot evaluate {module_name}.')
+
+        if not blocks:
+            return pd.DataFrame(columns=self.cost_columns)
+
+        project_index = np.concatenate([np.flatnonzero(mask) for _, _, mask, _ in blocks])
+        raw_cost = np.concatenate([np.asarray(cost, dtype=np.float64) for _, _, _, cost in blocks])
+        block_index = np.concatenate([np.full(mask.sum(), index, dtype=np.int32)
+                                      for index, (_, _, mask, _) in enumerate(blocks)])
+
+        # Sort by project, keeping the order of the blocks within each
+        # project.
+        order = np.argsort(project_index, kind='stable')
+        project_index = project_index[order]
+        raw_cost = raw_cost[order]
+        block_index = block_index[order]
+
+        def block_column(values):
+            # A categorical column with the value of each row's block
+            categories = list(dict.fromkeys(values))
+            codes = np.array([categories.index(value) for value in values], dtype=np.int32)
+            return pd.Categorical.from_codes(codes[block_index], categories)
+
+        rating = self.parameter('turbine_rating_MW')[project_index]
+        num_turbines = self.parameter('num_turbines')[project_index]
+        rotor_diameter_m = self.parameters['rotor_diameter_m'][project_index] \
+            if 'rotor_diameter_m' in self.parameters else np.full(len(project_index), np.nan)
+
+        return pd.DataFrame({
+            'operation_id': block_column([self.operation_ids[name] for name, _, _, _ in blocks]),
+            'type_of_cost': block_column([name for _, name, _, _ in blocks]),
+            'raw_cost': raw_cost,
+            'turbine_rating_MW': rating,
+            'num_turbines': self.parameters['num_turbines'][project_index],
+            'rotor_diameter_m': rotor_diameter_m,
+            'project_id_with_serial': self.project_ids[project_index],
+            'module': block_column([name for name, _, _, _ in blocks]),
+            'raw_cost_total_or_per_turbine': pd.Categorical.from_codes(np.zeros(len(raw_cost), dtype=np.int8),
+                                                                        ['total']),
+            'cost_per_turbine': raw_cost / num_turbines,
+            'cost_per_project': raw_cost,
+            'usd_per_kw_per_project': raw_cost / (num_turbines * rating * 1000),
+        }, columns=self.cost_columns)
@@ -0,0 +1,139 @@
+class DetailRows:
+    """
+    The rows of the detailed output of one cost module, made lazily.
+
+    Each module makes its detail rows with a generator, and this class
+    runs the generator only when the rows are first read, such as when a
+    result sink writes them to the details .csv. Rows that are never read,
+    as in a run whose ListResultSink discards the details, are never made.
+    Once made, the rows are kept, so they can be read any number of times.
+    Each row is labeled with the name of the project and the module.
+
+    Pickling and deep copies make the rows and return them as a plain
+    list, so the checkpoint, the result caches and the results sent back
+    from parallel workers hold ordinary lists.
+
+    How many rows the modules make is set by the detail level of a
+    project, which is the 'detail_level' key of the master input
+    dictionary:
+
+    'full'
+        Every row, as before detail levels were added. This is the
+        default.
+
+    'summary'
+        The scalar results and cost breakdowns of each module. The rows
+        made from intermediate dataframes, such as the crane data of
+        ErectionCost, are left out.
+
+    'none'
+        No rows. The generators of the modules are not made at all, so
+        only the costs are calculated.
+
+    See CostModule.detail_rows().
+    """
+
+    # The detail levels, from the fewest rows to the most.
+    levels = ('none', 'summary', 'full')
+
+    # The detail level of a project that does not set one.
+    default_level = 'full'
+
+    def __init__(self, rows, project_name, module):
+        """
+        Parameters
+        ----------
+        rows : iterator
+            The generator of the rows. Each row is a dict.
+
+        project_name : str
+            The name of the project, put in the 'project_id_with_serial'
+            key of every row.
+
+        module : str
+            The name of the module, put in the 'module' key of every row.
+        """
+        self._generator = rows
+        self._rows = None
+        self.project_name = project_name
+        self.module = module
+
+    @classmethod
+    def check_level(cls, level):
+        """
+        Checks a detail level.
+
+        Parameters
+        ----------
+        level : str or None
+            The detail level. Case and surrounding spaces are ignored.
+            None is the default level.
+
+        Returns
+        -------
+        str
+            The detail level, in lower case.
+
+        Raises
+        ------
+        ValueError
+            If the level is not one of the levels.
+        """
+        if level is None:
+            return cls.default_level
+        checked = str(level).strip().lower()
+        if checked not in cls.levels:
+            raise ValueError(f'The detail level must be one of {", ".join(cls.levels)}, not {level}.')
+        return checked
+
+    def rows(self):
+        """
+        Makes the rows if they have not been made yet.
+
+        Returns
+        -------
+        list
+            The rows.
+        """
+        if self._rows is None:
+            rows = []
+            for row in self._generator:
+                row["project_id_with_serial"] = self.project_name
+                row["module"] = self.module
+                rows.append(row)
+            self._rows = rows
+            self._generator = None
+        return self._rows
+
+    @property
+    def made(self):
+        """
+        Returns
+        -------
+        bool
+            True if the rows have been made.
+        """
+        return self._rows is not None
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def __len__(self):
+        return len(self.rows())
+
+    def __getitem__(self, index):
+        return self.rows()[index]
+
+    def __eq__(self, other):
+        if isinstance(other, DetailRows):
+            other = other.rows()
+        return self.rows() == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return list, (self.rows(),)
+
+    def __repr__(self):
+        state = f'{len(self._rows)} rows' if self.made else 'not made'
+        return f'DetailRows({self.module} of {self.project_name}, {state})'
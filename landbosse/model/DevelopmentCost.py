@@ -14,6 +14,23 @@ class DevelopmentCost(CostModule):
 
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        'detail_level',
+        'development_df',
+        'development_labor_cost_usd',
+        'num_turbines',
+        'rotor_diameter_m',
+        'turbine_rating_MW',
+    )
+    output_keys_read = ()
+    output_keys = (
+        'development_cost_csv',
+        'development_module_type_operation',
+        'total_development_cost',
+    )
+    input_keys_written = ()
+
     def __init__(self, input_dict, output_dict, project_name):
         self.input_dict = input_dict
         self.output_dict = output_dict
@@ -53,35 +70,44 @@ class DevelopmentCost(CostModule):
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
+        """
+        self.output_dict['development_cost_csv'] = self.detail_rows(self.detailed_rows)
+        return self.output_dict['development_cost_csv']
+
+    def detailed_rows(self, input_dict, output_dict, summary):
         """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
+
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
 
-        result = []
-        module = type(self).__name__
-        for _, row in self.output_dict['total_development_cost'].iterrows():
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        for _, row in output_dict['total_development_cost'].iterrows():
             dashed_row = '{} - {} - {}'.format(row["Type of cost"], row["Phase of construction"], math.ceil(row["Cost USD"]))
-            result.append({
+            yield {
                 'unit': '',
                 'type': 'dataframe',
                 'variable_df_key_col_name': 'Type of Cost - Phase of Construction - Cost in USD',
                 'value': dashed_row,
                 'last_number': row.iloc[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-        self.output_dict['development_cost_csv'] = result
-        return result
+            }
 
     def run_module(self):
         """
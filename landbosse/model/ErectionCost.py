@@ -4,6 +4,10 @@ from math import ceil
 
 from .CostModule import CostModule
 from .WeatherDelay import WeatherDelay
+from .CraneCapabilityIndex import CraneCapabilityIndex
+from .CraneCostTensor import CraneCostTensor
+from .CraneGeometry import CraneGeometry
+from .CranePolyCache import CranePolyCache
 
 import traceback
 
@@ -13,44 +17,6 @@ hr_per_min = 1 / 60
 m_per_ft = 0.3048
 
 
-class Point(object):
-    def __init__(self, x, y):
-        if type(x) == type(pd.Series(dtype=np.float64)):
-            self.x = float(x.values[0])
-            self.y = float(y.values[0])
-        elif type(x) == type(np.array([])):
-            self.x = float(x[0])
-            self.y = float(y[0])
-        elif type(x) == type(int(0)):
-            self.x = float(x)
-            self.y = float(y)
-        elif type(x) == type(float(0.0)):
-            self.x = x
-            self.y = y
-        else:
-            raise ValueError(type(x))
-
-
-def ccw(A, B, C):
-    return (C.y - A.y) * (B.x - A.x) > (B.y - A.y) * (C.x - A.x)
-
-
-# Return true if line segments AB and CD intersect
-def intersect(A, B, C, D):
-    return ccw(A, C, D) != ccw(B, C, D) and ccw(A, B, C) != ccw(A, B, D)
-
-
-def point_in_polygon(pt, poly):
-    result = False
-    maxx = float(np.r_[pt.x, np.array([m.x for m in poly])].max())
-    for i in range(len(poly) - 1):
-        if intersect(poly[i], poly[i + 1], pt, Point(1.1 * maxx, pt.y)):
-            result = not result
-    if intersect(poly[-1], poly[0], pt, Point(1.1 * maxx, pt.y)):
-        result = not result
-    return result
-
-
 class ErectionCost(CostModule):
     """
         ErectionCost.py
@@ -161,6 +127,73 @@ class ErectionCost(CostModule):
             (p.DataFrame) RSMeans data
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "allow_same_flag",
+        "breakpoint_between_base_and_topping_percent",
+        "construct_duration",
+        "crane_breakdown_fraction",
+        "detail_level",
+        "fuel_cost_usd_per_gal",
+        "hour_day",
+        "hub_height_meters",
+        "num_turbines",
+        "operational_construction_time",
+        "overtime_multiplier",
+        "project_data",
+        "rate_of_deliveries",
+        "rotor_diameter_m",
+        "time_construct",
+        "turbine_rating_MW",
+        "turbine_spacing_rotor_diameters",
+        "weather_window",
+        "wind_shear_exponent",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "component_name_topvbase",
+        "crane_choice",
+        "crane_cost_details",
+        "crane_data_output",
+        "crane_specs",
+        "crane_specs_withoffload",
+        "cranes_wind_delay_withoffload",
+        "crew_cost",
+        "enhanced_crane_specs",
+        "erection_construction_months",
+        "erection_cost_csv",
+        "erection_module_type_operation",
+        "erection_operation_time",
+        "erection_selected_detailed_data",
+        "erection_wind_mult",
+        "join_wind_operation",
+        "labor_cost_management",
+        "labor_cost_non_management",
+        "labor_cost_total",
+        "management_crews_cost",
+        "management_crews_cost_grouped",
+        "offload_specs",
+        "offload_time",
+        "operation_time",
+        "operation_time_withoffload",
+        "possible_cranes",
+        "same_basetop",
+        "separate_basetop",
+        "time_weighted_weather_multiplier",
+        "total_cost_summed_erection",
+        "total_erection_cost",
+    )
+    input_keys_written = ()
+
+    # The "Operation" column is added to the components dataframe, which is
+    # also the value of component_data and, in the OpenMDAO component,
+    # components.
+    input_keys_mutated = (
+        "component_data",
+        "components",
+        "project_data",
+    )
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -207,217 +240,195 @@ class ErectionCost(CostModule):
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
+        """
+        self.output_dict["erection_cost_csv"] = self.detail_rows(self.detailed_rows)
+        return self.output_dict["erection_cost_csv"]
+
+    def detailed_rows(self, input_dict, output_dict, summary):
         """
-        result = []
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
 
-        for _, row in self._number_of_equip.iterrows():
-            result.append(
-                {
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
+
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        # The crane data, operations and management crews are left out of the
+        # summary.
+        if not summary:
+            for _, row in self._number_of_equip.iterrows():
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "_number_of_equip: Operation-Crane name-Boom system-Number of equipment",
                     "value": f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Number of equipment"]}',
                     "last_number": row["Number of equipment"],
                 }
-            )
 
-        for _, row in self.output_dict["erection_selected_detailed_data"].iterrows():
-            result.append(
-                {
+            for _, row in output_dict["erection_selected_detailed_data"].iterrows():
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": f"erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days",
                     "value": f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Operational construct days over time construct days"]}',
                     "last_number": row["Operational construct days over time construct days"],
                 }
-            )
 
-        for row in self.output_dict["component_name_topvbase"].itertuples():
-            dashed_row = "{} - {}".format(row[1], row[2])
-            result.append(
-                {
+            for row in output_dict["component_name_topvbase"].itertuples():
+                dashed_row = "{} - {}".format(row[1], row[2])
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "component_name_topvbase: Operation - Top or Base",
                     "value": dashed_row,
                 }
-            )
 
-        for row in self.output_dict["crane_choice"].itertuples():
-            dashed_row = "{} - {} - {}".format(row[1], row[2], row[3])
-            result.append(
-                {
+            for row in output_dict["crane_choice"].itertuples():
+                dashed_row = "{} - {} - {}".format(row[1], row[2], row[3])
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "crane_choice: Crew name - Boom system - Operation",
                     "value": dashed_row,
                 }
-            )
 
-        for _, row in self.output_dict["crane_data_output"].iterrows():
-            dashed_row = "{} - {} - {}".format(row.iloc[0], row.iloc[1], row.iloc[2])
-            result.append(
-                {
+            for _, row in output_dict["crane_data_output"].iterrows():
+                dashed_row = "{} - {} - {}".format(row.iloc[0], row.iloc[1], row.iloc[2])
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "crane_data_output: crane_boom_operation_concat - variable - value",
                     "value": dashed_row,
                     "last_number": row.iloc[2],
                 }
-            )
 
-        for _, row in self.output_dict["crane_cost_details"].iterrows():
-            dashed_row = "{} - {} - {}".format(row.iloc[0], row.iloc[1], row.iloc[2])
-            result.append(
-                {
+            for _, row in output_dict["crane_cost_details"].iterrows():
+                dashed_row = "{} - {} - {}".format(row.iloc[0], row.iloc[1], row.iloc[2])
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "crane_cost_details: Operation ID - Type of cost - Cost",
                     "value": dashed_row,
                     "last_number": row.iloc[2],
                 }
-            )
 
-        for _, row in self.output_dict["total_erection_cost"].iterrows():
+        for _, row in output_dict["total_erection_cost"].iterrows():
             dashed_row = "{} - {} - {}".format(row.iloc[0], row.iloc[1], row.iloc[2])
-            result.append(
-                {
-                    "unit": "",
-                    "type": "dataframe",
-                    "variable_df_key_col_name": "total_erection_cost: Phase of construction - Type of cost - Cost USD",
-                    "value": dashed_row,
-                    "last_number": row.iloc[2],
-                }
-            )
+            yield {
+                "unit": "",
+                "type": "dataframe",
+                "variable_df_key_col_name": "total_erection_cost: Phase of construction - Type of cost - Cost USD",
+                "value": dashed_row,
+                "last_number": row.iloc[2],
+            }
 
-        for _, row in self.output_dict["erection_selected_detailed_data"].iterrows():
-            value = row["Labor cost USD without management"]
-            operation = row["Operation"]
-            result.append(
-                {
+        if not summary:
+            for _, row in output_dict["erection_selected_detailed_data"].iterrows():
+                value = row["Labor cost USD without management"]
+                operation = row["Operation"]
+                yield {
                     "unit": "usd",
                     "type": "dataframe",
                     "variable_df_key_col_name": "erection_selected_detailed_data: crew cost without management",
                     "value": value,
                     "non_numeric_value": operation,
                 }
-            )
 
-        for _, row in self.output_dict["erection_selected_detailed_data"].iterrows():
-            value = row["Mobilization cost USD"]
-            crane_boom_operation_concat = row["crane_boom_operation_concat"]
-            result.append(
-                {
+            for _, row in output_dict["erection_selected_detailed_data"].iterrows():
+                value = row["Mobilization cost USD"]
+                crane_boom_operation_concat = row["crane_boom_operation_concat"]
+                yield {
                     "unit": "usd",
                     "type": "dataframe",
                     "variable_df_key_col_name": "erection_selected_detailed_data: mobilization",
                     "value": value,
                     "non_numeric_value": crane_boom_operation_concat,
                 }
-            )
 
-        for _, row in self.output_dict["erection_selected_detailed_data"].iterrows():
-            value = row["Wind multiplier"]
-            operation = row["Operation"]
-            result.append(
-                {
+            for _, row in output_dict["erection_selected_detailed_data"].iterrows():
+                value = row["Wind multiplier"]
+                operation = row["Operation"]
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": f"erection_selected_detailed_data: wind multiplier",
                     "value": value,
                     "non_numeric_value": operation,
                 }
-            )
 
-        result.append(
-            {
-                "unit": "usd",
-                "type": "variable",
-                "variable_df_key_col_name": "total_cost_summed_erection",
-                "value": float(self.output_dict["total_cost_summed_erection"]),
-            }
-        )
+        yield {
+            "unit": "usd",
+            "type": "variable",
+            "variable_df_key_col_name": "total_cost_summed_erection",
+            "value": float(output_dict["total_cost_summed_erection"]),
+        }
 
-        for _, row in self.output_dict["management_crews_cost"].iterrows():
-            result.append(
-                {
+        if not summary:
+            for _, row in output_dict["management_crews_cost"].iterrows():
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "management_crews_cost: {}".format(" - ".join(row.index)),
                     "value": " - ".join(list(str(x) for x in row)[1:]),
                 }
-            )
-
-        result.append(
-            {
-                "unit": "hours",
-                "type": "variable",
-                "variable_df_key_col_name": "number of hours in weather window",
-                "value": len(self.input_dict["weather_window"]),
-            }
-        )
 
-        result.append(
-            {
-                "unit": "none",
-                "type": "variable",
-                "variable_df_key_col_name": "time_weighted_weather_multiplier",
-                "value": self.output_dict["time_weighted_weather_multiplier"],
-            }
-        )
-
-        result.append(
-            {
-                "unit": "months",
-                "type": "variable",
-                "variable_df_key_col_name": "erection_construction_months",
-                "value": self.output_dict["erection_construction_months"],
-            }
-        )
-
-        result.append(
-            {
-                "unit": "usd",
-                "type": "variable",
-                "variable_df_key_col_name": "labor_cost_management",
-                "value": self.output_dict["labor_cost_management"],
-            }
-        )
-
-        result.append(
-            {
-                "unit": "usd",
-                "type": "variable",
-                "variable_df_key_col_name": "labor_cost_non_management",
-                "value": self.output_dict["labor_cost_non_management"],
-            }
-        )
-
-        result.append(
-            {
-                "unit": "usd",
-                "type": "variable",
-                "variable_df_key_col_name": "labor_cost_total",
-                "value": self.output_dict["labor_cost_total"],
-            }
-        )
-
-        module = type(self).__name__
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
-        self.output_dict["erection_cost_csv"] = result
-
-        return result
+        yield {
+            "unit": "hours",
+            "type": "variable",
+            "variable_df_key_col_name": "number of hours in weather window",
+            "value": len(input_dict["weather_window"]),
+        }
+
+        yield {
+            "unit": "none",
+            "type": "variable",
+            "variable_df_key_col_name": "time_weighted_weather_multiplier",
+            "value": output_dict["time_weighted_weather_multiplier"],
+        }
+
+        yield {
+            "unit": "months",
+            "type": "variable",
+            "variable_df_key_col_name": "erection_construction_months",
+            "value": output_dict["erection_construction_months"],
+        }
+
+        yield {
+            "unit": "usd",
+            "type": "variable",
+            "variable_df_key_col_name": "labor_cost_management",
+            "value": output_dict["labor_cost_management"],
+        }
+
+        yield {
+            "unit": "usd",
+            "type": "variable",
+            "variable_df_key_col_name": "labor_cost_non_management",
+            "value": output_dict["labor_cost_non_management"],
+        }
+
+        yield {
+            "unit": "usd",
+            "type": "variable",
+            "variable_df_key_col_name": "labor_cost_total",
+            "value": output_dict["labor_cost_total"],
+        }
 
     def calculate_erection_operation_time(self):
         """
@@ -476,6 +487,7 @@ class ErectionCost(CostModule):
 
         # Calculate the crane lift polygons
         crane_poly = self.calculate_crane_lift_polygons(crane_grouped=crane_grouped)
+        capability_index = CraneCapabilityIndex.for_crane_poly(crane_poly, project_data["crane_specs"])
 
         # loop through operation type (topping vs. base)
         component_max_speed = pd.DataFrame()
@@ -485,6 +497,7 @@ class ErectionCost(CostModule):
                 crane_poly=crane_poly,
                 component_max_speed=component_max_speed,
                 operation=name_operation,
+                capability_index=capability_index,
             )
             crane_poly = lift_max_wind_speed["crane_poly"]
             component_max_speed = lift_max_wind_speed["component_max_speed"]
@@ -631,6 +644,7 @@ class ErectionCost(CostModule):
             crane_poly=crane_poly,
             component_max_speed=component_max_speed,
             operation="offload",
+            capability_index=CraneCapabilityIndex.for_crane_poly(crane_poly, project_data["crane_specs"]),
         )
         component_max_speed = lift_max_wind_speed["component_max_speed"]
         crane_poly = lift_max_wind_speed["crane_poly"]
@@ -722,9 +736,15 @@ class ErectionCost(CostModule):
         Returns
         -------
         pd.DataFrame
-            A dataframe of the cranes and their lifting polygons.
+            A dataframe of the cranes and their lifting polygons. Tables that
+            have been made before, from the same cranes, are reused from
+            CranePolyCache.
         """
-        crane_poly = pd.concat(self.iterate_crane_lift_polygons(crane_grouped))
+        key = CranePolyCache.key(crane_grouped)
+        found, crane_poly = CranePolyCache.get(key)
+        if not found:
+            crane_poly = pd.concat(self.iterate_crane_lift_polygons(crane_grouped))
+            CranePolyCache.put(key, crane_poly)
         return crane_poly
 
     def iterate_crane_lift_polygons(self, crane_grouped):
@@ -740,13 +760,7 @@ class ErectionCost(CostModule):
             crew_type = crane.loc[
                 0, "Crew type ID"
             ]  # For every crane/boom combo the crew is the same, so we can just take first crew.
-            polygon = [
-                Point(0, 0),
-                Point(0, max(y)),
-                Point(min(x), max(y)),
-                Point(max(x), min(y)),
-                Point(max(x), 0),
-            ]
+            polygon = CraneGeometry.lift_polygon(x, y)
             df = pd.DataFrame(
                 [
                     [
@@ -781,7 +795,9 @@ class ErectionCost(CostModule):
             )
             yield df
 
-    def calculate_component_lift_max_wind_speed(self, *, component_group, crane_poly, component_max_speed, operation):
+    def calculate_component_lift_max_wind_speed(
+        self, *, component_group, crane_poly, component_max_speed, operation, capability_index=None
+    ):
         """
         First, using the height and mass of the component being lifted, this method determines
         if a component can be lifted to the necessary height by each crane.
@@ -823,6 +839,9 @@ class ErectionCost(CostModule):
             offload operations. (See the calculate_crane_lift_polygons() method
             above for more about calculating the lift polygons.
 
+        capability_index : CraneCapabilityIndex
+            The index of crane_poly. If it is None, it is built from crane_poly.
+
         Returns
         -------
         dict
@@ -831,54 +850,50 @@ class ErectionCost(CostModule):
             crane_poly dataframe passed as a parameter to this function and with a column
             of "Crane bool {operation}" attached.
         """
-        for idx, crane in crane_poly.iterrows():
-            polygon = crane["Crane poly"]
-
-            # calculate polygon for crane capacity and check if component can be lifted by each crane without wind loading
-            for component in component_group["Component"]:
-                # get weight and height of component in each component group
-                component_only = component_group.where(component_group["Component"] == component).dropna(thresh=1)
-
-                # See docstring for "operation" parameter above about mass calculations for offloading
-                if operation == "offload":
-                    point = Point(
-                        component_only["Mass tonne"] / 2,
-                        (component_only["Section height m"] + component_only["Offload hook height m"]),
-                    )
-                else:
-                    point = Point(
-                        component_only["Mass tonne"],
-                        (component_only["Lift height m"] + component_only["Offload hook height m"]),
-                    )
-                crane["Lift boolean {component}".format(component=component)] = point_in_polygon(point, polygon)
+        if capability_index is None:
+            capability_index = CraneCapabilityIndex(crane_poly)
+
+        # get weight and height of component in each component group. If a component
+        # name is repeated, its lift is checked at the first component with that name.
+        codes, _ = pd.factorize(component_group["Component"], use_na_sentinel=False)
+        first_row = np.unique(codes, return_index=True)[1][codes]
+        mass_tonne = component_group["Mass tonne"].to_numpy(dtype=np.float64)
+        offload_hook_height_m = component_group["Offload hook height m"].to_numpy(dtype=np.float64)
+
+        # See docstring for "operation" parameter above about mass calculations for offloading
+        if operation == "offload":
+            lift_mass_tonne = mass_tonne / 2
+            lift_height_m = component_group["Section height m"].to_numpy(dtype=np.float64) + offload_hook_height_m
+        else:
+            lift_mass_tonne = mass_tonne
+            lift_height_m = component_group["Lift height m"].to_numpy(dtype=np.float64) + offload_hook_height_m
+
+        # mh is an effective mass (it should be the mass of the entire component for both offload and other cranes, not just 1/2 that's used above for determining whether the part can be lifted)
+        mh = component_group["Mass tonne"]
+        aw = component_group["Surface area sq m"] * component_group["Coeff drag"]
+
+        # check if each component can be lifted by each crane without wind loading, and
+        # calculate vmax. If vmax_calc is less than vmax_tab then vmax_calc, otherwise
+        # vmax_tab (based on pg. 33 of Liebherr). Rows of the matrices are cranes and
+        # columns are components.
+        crane_bool, vmax = capability_index.capabilities(lift_mass_tonne[first_row], lift_height_m[first_row], mh, aw)
+
+        # One copy of the component group for each crane, in the order of the cranes
+        num_cranes = len(crane_poly)
+        num_components = len(component_group)
+        component_group_new = pd.DataFrame(
+            component_group.iloc[np.tile(np.arange(num_components), num_cranes)],
+            columns=list(component_group.columns.values) + ["vmax", "Crane name", "Boom system", "crane_bool"],
+        )
+        component_group_new["vmax"] = vmax.ravel()
+        component_group_new["Crane name"] = np.repeat(crane_poly["Crane name"].to_numpy(), num_components)
+        component_group_new["Boom system"] = np.repeat(crane_poly["Boom system"].to_numpy(), num_components)
+        component_group_new["crane_bool"] = crane_bool.ravel()
 
-            # Transform the "Lift boolean" indexes in the series to a list of booleans
-            # that signify if the crane can lift a component.
-            bool_list = []
-            for component in component_group["Component"]:
-                if crane["Lift boolean {component}".format(component=component)] is False:
-                    crane_bool = False
-                else:
-                    crane_bool = True
-                bool_list.append(crane_bool)
-
-            # mh is an effective mass (it should be the mass of the entire component for both offload and other cranes, not just 1/2 that's used above for determining whether the part can be lifted)
-            mh = component_group["Mass tonne"]
-            aw = component_group["Surface area sq m"] * component_group["Coeff drag"]
-            vmax_tab = crane["Max wind speed m per s"]
-            vmax_calc = vmax_tab * np.sqrt(1.2 * mh / aw)
-
-            # if vmax_calc is less than vmax_tab then vmax_calc, otherwise vmax_tab (based on pg. 33 of Liebherr)
-            component_group_new = pd.DataFrame(
-                component_group,
-                columns=list(component_group.columns.values) + ["vmax", "Crane name", "Boom system", "crane_bool"],
-            )
-            component_group_new["vmax"] = np.minimum(vmax_tab, vmax_calc)
-            component_group_new["Crane name"] = crane["Crane name"]
-            component_group_new["Boom system"] = crane["Boom system"]
-            component_group_new["crane_bool"] = bool_list
+        component_max_speed = pd.concat((component_max_speed, component_group_new), sort=True)
 
-            component_max_speed = pd.concat((component_max_speed, component_group_new), sort=True)
+        # Whether the last crane can lift every component
+        bool_list = crane_bool[-1].tolist()
 
         crane_poly_new = crane_poly.copy()
         crane_poly_new["Crane bool {}".format(operation)] = min(bool_list)
@@ -903,46 +918,33 @@ class ErectionCost(CostModule):
 
         # calculate wind delay for each component and crane combination
         crane_specs = crane_specs.reset_index()
-        crane_specs["Wind delay percent"] = np.nan
-
-        # pull global inputs for weather delay from input_dict
-        weather_data_keys = {"wind_shear_exponent", "weather_window"}
 
-        # specify collection-specific weather delay inputs
-        weather_delay_global_inputs = {i: self.input_dict[i] for i in self.input_dict if i in weather_data_keys}
-
-        # Iterate over every crane + boom combination
-        for i, row in crane_specs.iterrows():
-            # assume we don't know when the operation occurs
-            operation_window = len(weather_window.index)  # operation window = entire construction weather window
-            operation_start = 0  # start time is at beginning of construction weather window
-
-            # extract critical wind speed
-            critical_wind_operation = row["vmax"]
-
-            # extract height of interest (differs for offload cranes)
-            if (row["Crane bool offload"] == 1) is True:
-                height_interest = row["Section height m"] + row["Offload hook height m"]
-            else:
-                height_interest = row["Lift height m"] + row["Offload hook height m"]
-
-            # compute weather delay
-            weather_delay_input_dict = weather_delay_global_inputs
-            weather_delay_output_dict = dict()
-            weather_delay_input_dict["start_delay_hours"] = operation_start
-            weather_delay_input_dict["critical_wind_speed_m_per_s"] = critical_wind_operation
-            weather_delay_input_dict["wind_height_of_interest_m"] = height_interest
-            weather_delay_input_dict["mission_time_hours"] = operation_window
-
-            WeatherDelay(weather_delay_input_dict, weather_delay_output_dict)
-            wind_delay = np.array(weather_delay_output_dict["wind_delays"])
-
-            # if greater than 4 hour delay, then shut down for full day (10 hours)
-            wind_delay[(wind_delay > 4)] = 10
-            wind_delay_time = float(wind_delay.sum())
+        # extract critical wind speed for every crane + boom + component combination
+        critical_wind_operation = crane_specs["vmax"].to_numpy(dtype=np.float64)
+
+        # extract height of interest (differs for offload cranes)
+        offload_bool = (crane_specs["Crane bool offload"] == 1).to_numpy()
+        height_interest = np.where(
+            offload_bool,
+            crane_specs["Section height m"] + crane_specs["Offload hook height m"],
+            crane_specs["Lift height m"] + crane_specs["Offload hook height m"],
+        ).astype(np.float64)
+
+        # assume we don't know when the operation occurs, so the operation window is
+        # the entire construction weather window and the start time is at the
+        # beginning of the construction weather window. Delays longer than 4 hours
+        # become a full day (10 hours) of shutdown inside WeatherDelay.batch().
+        wind_delay_time = WeatherDelay.batch(
+            weather_window=weather_window,
+            critical_speeds=critical_wind_operation,
+            heights=height_interest,
+            wind_shear_exponent=self.input_dict["wind_shear_exponent"],
+            start_delay_hours=0,
+            mission_time_hours=len(weather_window.index),
+        )
 
-            # store weather delay for operation, component, crane, and boom combination
-            crane_specs.loc[i, "Wind delay percent"] = wind_delay_time / len(weather_window)
+        # store weather delay for operation, component, crane, and boom combination
+        crane_specs["Wind delay percent"] = wind_delay_time / len(weather_window)
 
         self.output_dict["enhanced_crane_specs"] = crane_specs
         return crane_specs
@@ -1070,88 +1072,15 @@ class ErectionCost(CostModule):
             * labor_day_operation
         )
 
-        # calculate costs if top and base cranes are the same
-        base_cranes = possible_crane_cost[possible_crane_cost["Operation"] == "Base"]
-        top_cranes = possible_crane_cost[possible_crane_cost["Operation"] == "Top"]
-        crane_topbase_bool = top_cranes["Crane name"].isin(base_cranes["Crane name"])
-        boom_topbase_bool = top_cranes["Boom system"].isin(base_cranes["Boom system"])
-        possible_crane_topbase = top_cranes[boom_topbase_bool & crane_topbase_bool]
-        same_topbase_crane_list = possible_crane_topbase[["Crane name", "Boom system"]]
-        possible_crane_topbase = same_topbase_crane_list.merge(
-            possible_crane_cost, on=["Crane name", "Boom system"], sort=True
-        )
-        possible_crane_topbase_sum = (
-            possible_crane_topbase.groupby(["Crane name", "Boom system"])[
-                [
-                    "Labor cost USD without management",
-                    "Subtotal for hourly labor (non-management) USD",
-                    "Subtotal for per diem labor (non-management) USD",
-                    "Equipment rental cost USD",
-                    "Fuel cost USD",
-                ]
-            ]
-            .sum()
-            .reset_index()
-        )
-
         # Store the possible cranes for the top and base for future diagnostics.
         self._possible_crane_cost = possible_crane_cost.copy()
 
-        # group crane spec data for mobilization
-        mobilization_costs = (
-            project_data["crane_specs"]
-            .groupby(["Crane name", "Boom system"])["Mobilization cost USD"]
-            .max()
-            .reset_index()
-        )
-
-        mobilization_costs["Mobilization cost USD"] = (
-            mobilization_costs["Mobilization cost USD"] * 2
-        )  # for mobilization and demobilizaton
-
-        # join top and base crane data with mobilization data
-        topbase_same_crane_cost = pd.merge(
-            possible_crane_topbase_sum, mobilization_costs, on=["Crane name", "Boom system"], sort=True
-        )
-
-        # compute total project cost for erection
-        topbase_same_crane_cost["Total cost USD"] = (
-            topbase_same_crane_cost["Labor cost USD without management"]
-            + topbase_same_crane_cost["Equipment rental cost USD"]
-            + topbase_same_crane_cost["Fuel cost USD"]
-            + topbase_same_crane_cost["Mobilization cost USD"]
-        )
-
-        # adds operation label for same crane used for base and topping (this way columns are consistent for same and separate basetop)
-        topbase_same_crane_cost["Operation"] = "Base + Top"
-
-        # calculate costs if top and base use separate cranes
-        separate_topbase = (
-            possible_crane_cost.groupby(["Operation", "Crane name", "Boom system"])[
-                [
-                    "Labor cost USD without management",
-                    "Subtotal for hourly labor (non-management) USD",
-                    "Subtotal for per diem labor (non-management) USD",
-                    "Equipment rental cost USD",
-                    "Fuel cost USD",
-                ]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        # join mobilization data to separate top base crane costs
-        separate_topbase_crane_cost = pd.merge(
-            separate_topbase, mobilization_costs, on=["Crane name", "Boom system"], sort=True
-        )
-
-        # compute total project cost for erection
-        separate_topbase_crane_cost["Total cost USD"] = (
-            separate_topbase_crane_cost["Labor cost USD without management"]
-            + separate_topbase_crane_cost["Equipment rental cost USD"]
-            + separate_topbase_crane_cost["Fuel cost USD"]
-            + separate_topbase_crane_cost["Mobilization cost USD"]
-        )
+        # Sum the costs of each crane for each operation, and for the same crane
+        # used for base and topping, then add mobilization costs and compute the
+        # total project cost for erection of both options.
+        crane_cost_tensor = CraneCostTensor(possible_crane_cost, project_data["crane_specs"])
+        separate_topbase_crane_cost = crane_cost_tensor.separate_basetop()
+        topbase_same_crane_cost = crane_cost_tensor.same_basetop()
 
         return separate_topbase_crane_cost, topbase_same_crane_cost, crew_cost
 
@@ -1178,42 +1107,7 @@ class ErectionCost(CostModule):
 
         self.output_dict["separate_basetop"] = separate_basetop
 
-        total_separate_cost = pd.DataFrame()
-        for operation in separate_basetop["Operation"].unique():
-            # find minimum cost option for separate base and topping cranes
-            min_val = min(separate_basetop["Total cost USD"].where(separate_basetop["Operation"] == operation).dropna())
-
-            # find the crane that corresponds to the minimum cost for each operation
-            crane = separate_basetop[separate_basetop["Total cost USD"] == min_val]
-            cost = crane.groupby("Operation").min()
-            total_separate_cost = pd.concat((total_separate_cost, cost), sort=True)
-
-        # reset index for separate crane costs
-        total_separate_cost = total_separate_cost.reset_index()
-
-        # duplicate offload records because assuming two offload cranes are on site
-        total_separate_cost = pd.concat(
-            (total_separate_cost, total_separate_cost.loc[total_separate_cost["Operation"] == "Offload"]), sort=True
-        )
-
-        # sum costs for separate cranes to get total for all cranes
-        cost_chosen_separate = total_separate_cost["Total cost USD"].sum()
-
-        if allow_same_flag is True:
-            # get the minimum cost for using the same crane for all operations
-            cost_chosen_same = min(same_basetop["Total cost USD"])
-
-            # check if separate or same crane option is cheaper and choose crane cost
-            if cost_chosen_separate < cost_chosen_same:
-                cost_chosen = total_separate_cost.groupby(
-                    by=["Boom system", "Crane name", "Operation"]
-                ).sum()  # added crane name and operation to groupby
-            else:
-                cost_chosen = same_basetop.where(same_basetop["Total cost USD"] == cost_chosen_same).dropna()
-        else:
-            cost_chosen = total_separate_cost.groupby(
-                by=["Boom system", "Crane name", "Operation"]
-            ).sum()  # added crane name and operation to groupby
+        cost_chosen = CraneCostTensor.minimum_cost_cranes(separate_basetop, same_basetop, allow_same_flag)
 
         return cost_chosen
 
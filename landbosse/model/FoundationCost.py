@@ -176,6 +176,69 @@ class FoundationCost(CostModule):
         4. Mobilization
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "bearing_pressure_n_m2",
+        "Coeff drag (installed)",
+        "construct_duration",
+        "crew",
+        "crew_cost",
+        "critical_height_non_erection_wind_delays_m",
+        "critical_speed_non_erection_wind_delays_m_per_s",
+        "depth",
+        "detail_level",
+        "gust_velocity_m_per_s",
+        "hour_day",
+        "Lever arm m",
+        "Mass tonne",
+        "material_price",
+        "Multiplier tower drag",
+        "Multplier drag rotor",
+        "num_turbines",
+        "operational_hrs_per_day",
+        "overtime_multiplier",
+        "rated_thrust_N",
+        "rotor_diameter_m",
+        "rsmeans",
+        "rsmeans_per_diem",
+        "Section height m",
+        "Surface area sq m",
+        "time_construct",
+        "turbine_rating_MW",
+        "weather_window",
+        "weather_window_index",
+        "wind_shear_exponent",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "excavated_volume_m3",
+        "F_dead_kN_per_turbine",
+        "F_horiz_kN_per_turbine",
+        "foundation_construction_months",
+        "foundation_cost_csv",
+        "foundation_module_type_operation",
+        "foundation_volume_concrete_m3_per_turbine",
+        "labor_equip_data",
+        "M_tot_kN_m_per_turbine",
+        "managament_crew_cost_before_wind_delay",
+        "management_crew",
+        "material_needs_entire_farm",
+        "material_needs_per_turbine",
+        "operation_data_entire_farm",
+        "operation_data_id_days_crews_workers",
+        "Radius_b_m",
+        "Radius_g_m",
+        "Radius_m",
+        "Radius_o_m",
+        "Radius_s_m",
+        "steel_mass_short_ton_per_turbine",
+        "total_foundation_cost",
+        "wind_delay_time",
+        "wind_delays",
+        "wind_multiplier",
+    )
+    input_keys_written = ("operational_hrs_per_day",)
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -809,149 +872,134 @@ class FoundationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
+        """
+        self.output_dict["foundation_cost_csv"] = self.detail_rows(self.detailed_rows)
+        return self.output_dict["foundation_cost_csv"]
+
+    def detailed_rows(self, input_dict, output_dict, summary):
         """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
+
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
 
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
         # Note that some values are cast with float() so that XlsxWriter
         # (the library depended on by XlsxGenerator) can output them as
         # numbers. XlsxWriter, interestingly, cannot handle np.float32()
         # types.
 
-        result = []
-        module = type(self).__name__
-        result.append(
-            {
-                "unit": "",
-                "type": "variable",
-                "variable_df_key_col_name": "wind_multiplier",
-                "value": float(self.output_dict["wind_multiplier"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "kN",
-                "type": "variable",
-                "variable_df_key_col_name": "F_dead",
-                "value": float(self.output_dict["F_dead_kN_per_turbine"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "kN",
-                "type": "variable",
-                "variable_df_key_col_name": "F_horiz",
-                "value": float(self.output_dict["F_horiz_kN_per_turbine"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "kN_m",
-                "type": "variable",
-                "variable_df_key_col_name": "M_tot_kN",
-                "value": float(self.output_dict["M_tot_kN_m_per_turbine"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Radius_o",
-                "value": float(self.output_dict["Radius_o_m"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Radius_g",
-                "value": float(self.output_dict["Radius_g_m"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Radius_b",
-                "value": float(self.output_dict["Radius_b_m"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Radius",
-                "value": float(self.output_dict["Radius_m"]),
-            }
-        )
-        result.append(
-            {
-                "unit": "short_ton",
-                "type": "variable",
-                "variable_df_key_col_name": "steel_mass_short_ton_per_turbine",
-                "value": self.output_dict["steel_mass_short_ton_per_turbine"],
-            }
-        )
+        yield {
+            "unit": "",
+            "type": "variable",
+            "variable_df_key_col_name": "wind_multiplier",
+            "value": float(output_dict["wind_multiplier"]),
+        }
+        yield {
+            "unit": "kN",
+            "type": "variable",
+            "variable_df_key_col_name": "F_dead",
+            "value": float(output_dict["F_dead_kN_per_turbine"]),
+        }
+        yield {
+            "unit": "kN",
+            "type": "variable",
+            "variable_df_key_col_name": "F_horiz",
+            "value": float(output_dict["F_horiz_kN_per_turbine"]),
+        }
+        yield {
+            "unit": "kN_m",
+            "type": "variable",
+            "variable_df_key_col_name": "M_tot_kN",
+            "value": float(output_dict["M_tot_kN_m_per_turbine"]),
+        }
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Radius_o",
+            "value": float(output_dict["Radius_o_m"]),
+        }
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Radius_g",
+            "value": float(output_dict["Radius_g_m"]),
+        }
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Radius_b",
+            "value": float(output_dict["Radius_b_m"]),
+        }
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Radius",
+            "value": float(output_dict["Radius_m"]),
+        }
+        yield {
+            "unit": "short_ton",
+            "type": "variable",
+            "variable_df_key_col_name": "steel_mass_short_ton_per_turbine",
+            "value": output_dict["steel_mass_short_ton_per_turbine"],
+        }
         # foundation_volume_concrete_m3_per_turbine
-        result.append(
-            {
-                "unit": "m^3",
-                "type": "variable",
-                "variable_df_key_col_name": "foundation_volume_concrete_m3_per_turbine",
-                "value": self.output_dict["foundation_volume_concrete_m3_per_turbine"],
-            }
-        )
-
-        for row in self.output_dict["operation_data_id_days_crews_workers"].itertuples():
-            dashed_row = "{}-{}-{}-{}".format(row[1], math.ceil(row[2]), row[3], row[4])
-            result.append(
-                {
+        yield {
+            "unit": "m^3",
+            "type": "variable",
+            "variable_df_key_col_name": "foundation_volume_concrete_m3_per_turbine",
+            "value": output_dict["foundation_volume_concrete_m3_per_turbine"],
+        }
+
+        # The operations and materials are left out of the summary.
+        if not summary:
+            for row in output_dict["operation_data_id_days_crews_workers"].itertuples():
+                dashed_row = "{}-{}-{}-{}".format(row[1], math.ceil(row[2]), row[3], row[4])
+                yield {
                     "unit": "",
                     "type": "dataframe",
                     "variable_df_key_col_name": "operation_data: Operation ID-Number of days-Number of crews-Number of workers",
                     "value": dashed_row,
                 }
-            )
 
-        for row in self.output_dict["material_needs_per_turbine"].itertuples():
-            # This must be formatted in Python
-            dashed_row = "{}-{}-{:.2e}".format(row[0], row[1], row[2])
-            result.append(
-                {
+            for row in output_dict["material_needs_per_turbine"].itertuples():
+                # This must be formatted in Python
+                dashed_row = "{}-{}-{:.2e}".format(row[0], row[1], row[2])
+                yield {
                     "unit": row[3],
                     "type": "dataframe",
                     "variable_df_key_col_name": "material_needs_per_turbine: {}".format(
-                        "-".join(self.output_dict["material_needs_per_turbine"].columns[:-1])
+                        "-".join(output_dict["material_needs_per_turbine"].columns[:-1])
                     ),
                     "value": dashed_row,
                 }
-            )
 
-        for row in self.output_dict["total_foundation_cost"].itertuples():
+        for row in output_dict["total_foundation_cost"].itertuples():
             dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], math.ceil(row[2]))
-            result.append(
-                {
-                    "unit": "",
-                    "type": "dataframe",
-                    "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
-                    "value": dashed_row,
-                    "last_number": row[2],
-                }
-            )
-
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
-
-        self.output_dict["foundation_cost_csv"] = result
-        return result
+            yield {
+                "unit": "",
+                "type": "dataframe",
+                "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
+                "value": dashed_row,
+                "last_number": row[2],
+            }
 
     def outputs_for_module_type_operation(self, input_dict, output_dict):
         result = []
@@ -1000,7 +1048,7 @@ class FoundationCost(CostModule):
             )  # Estimates construction time
 
             # pull only global inputs for weather delay from input_dict
-            weather_data_keys = ("wind_shear_exponent", "weather_window")
+            weather_data_keys = ("wind_shear_exponent", "weather_window", "weather_window_index")
 
             # specify foundation-specific weather delay inputs
             self.weather_input_dict = dict(
@@ -0,0 +1,239 @@
+import numpy as np
+
+
+class FoundationRadiusBatch:
+    """
+    This class does not need to be instantiated. It calculates the loads
+    on, and the radii of, the foundations of many projects at once, with
+    the equations of FoundationCost.calculate_foundation_load().
+
+    FoundationCost solves for the gapping and bearing radii with a scalar
+    root finder for each project. Both equations have closed form
+    solutions:
+
+    - The overturning and gapping radii are the one real root of a cubic
+      a * r**3 + c * r - d = 0, with a > 0 and c, d >= 0. It is found with
+      Cardano's formula, then refined with Newton's method to full
+      precision.
+
+    - The bearing radius solves 2 * (r**2 - e * sqrt(r**2 - e**2)) = A.
+      With u = sqrt(r**2 - e**2), that is the quadratic
+      u**2 - e * u + e**2 - A / 2 = 0.
+
+    So the radii of every project are calculated at once with NumPy, to
+    better than the tolerances of the root finder of FoundationCost.
+
+    FoundationCost raises a ValueError if a root is not inside the bracket
+    of its root finder. Those radii are NaN here.
+
+    The arguments are NumPy arrays, or scalars, that broadcast together.
+    For loads(), the last axis of the arrays of components is the
+    component, and the other axes are the projects.
+    """
+
+    # Constants of FoundationCost.calculate_foundation_load()
+    kg_per_tonne = 1000
+    vol_fraction_fill = 0.55
+    unit_weight_fill = 17.3e3  # in N / m^3
+    unit_weight_concrete = 23.6e3  # in N / m^3
+    safety_overturn = 1.5
+    safety_slipping = 1.5
+    friction_angle_soil = 25
+
+    # The upper ends of the brackets of the root finders of FoundationCost
+    max_radius_m = 50
+
+    # The number of Newton's method iterations that refine the roots of
+    # the cubics
+    newton_iterations = 3
+
+    @classmethod
+    def unit_weight(cls):
+        """
+        Returns
+        -------
+        float
+            The unit weight of the foundation, in N / m^3.
+        """
+        vol_fraction_concrete = 1 - cls.vol_fraction_fill
+        return cls.vol_fraction_fill * cls.unit_weight_fill + vol_fraction_concrete * cls.unit_weight_concrete
+
+    @classmethod
+    def loads(cls,
+              section_height_m,
+              surface_area_sq_m,
+              coeff_drag,
+              lever_arm_m,
+              multiplier_rotor,
+              multiplier_tower,
+              mass_tonne,
+              gust_velocity_m_per_s,
+              rated_thrust_N):
+        """
+        Calculates the loads on the foundations.
+
+        Parameters
+        ----------
+        section_height_m, surface_area_sq_m, coeff_drag, lever_arm_m,
+        multiplier_rotor, multiplier_tower, mass_tonne : numpy.ndarray
+            The columns of the components sheet of each project, with the
+            components on the last axis.
+
+        gust_velocity_m_per_s : numpy.ndarray
+            The 50 year gust velocity of each project.
+
+        rated_thrust_N : numpy.ndarray
+            The rated thrust of each project.
+
+        Returns
+        -------
+        dict
+            The arrays 'F_dead_N' (dead load), 'F_lat_N' (lateral load) and
+            'M_tot_N_m' (moment), with one value per project.
+        """
+        # set exposure constants
+        a = 9.5
+        z_g = 274.32
+
+        v = np.asarray(gust_velocity_m_per_s, dtype=np.float64)[..., np.newaxis]
+        a_f = np.asarray(surface_area_sq_m, dtype=np.float64)
+        lever_arm_m = np.asarray(lever_arm_m, dtype=np.float64)
+
+        # calculate wind pressure
+        k_z = 2.01 * (np.asarray(section_height_m, dtype=np.float64) / z_g) ** (2 / a)
+        k_d = 0.95
+        k_zt = 1
+        wind_pressure = 0.613 * k_z * k_zt * k_d * v**2
+
+        # calculate wind loads on each tower component and drag on the rotor
+        f_t = (wind_pressure * 0.85 * 0.6 * a_f) * multiplier_tower
+        rho = 1.225
+        f_r = (0.5 * rho * np.asarray(coeff_drag, dtype=np.float64) * a_f * v**2) * multiplier_rotor
+        f = f_t + f_r
+
+        # calculate dead load in N, scaled to adjust for uplift
+        f_dead = np.sum(mass_tonne, axis=-1) * 9.8 * cls.kg_per_tonne / 1.15
+
+        f_lat = f.sum(axis=-1)
+        m_overturn = (f * lever_arm_m).sum(axis=-1)
+        m_thrust = rated_thrust_N * lever_arm_m.max(axis=-1)
+
+        return {
+            'F_dead_N': f_dead,
+            'F_lat_N': f_lat,
+            'M_tot_N_m': np.maximum(m_thrust, m_overturn),
+        }
+
+    @classmethod
+    def cubic_root(cls, a, c, d):
+        """
+        Solves a * x**3 + c * x - d = 0 for every element of the arrays.
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            Coefficients greater than 0.
+
+        c, d : numpy.ndarray
+            Coefficients of at least 0, so that there is one real root.
+
+        Returns
+        -------
+        numpy.ndarray
+            The real roots.
+        """
+        a, c, d = np.broadcast_arrays(*[np.asarray(value, dtype=np.float64) for value in (a, c, d)])
+        p = c / a
+        q = -d / a
+        s = np.cbrt(-q / 2 + np.sqrt((q / 2) ** 2 + (p / 3) ** 3))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.where(s > 0, s - p / (3 * s), 0.0)
+        for _ in range(cls.newton_iterations):
+            slope = 3 * a * x**2 + c
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(slope > 0, (a * x**3 + c * x - d) / slope, 0.0)
+            x = x - step
+        return x
+
+    @classmethod
+    def radii(cls, f_dead, f_lat, m_tot, rated_thrust_N, depth, bearing_pressure_n_m2):
+        """
+        Calculates the radii of the foundations.
+
+        Parameters
+        ----------
+        f_dead, f_lat, m_tot : numpy.ndarray
+            The loads of each project, as calculated by loads().
+
+        rated_thrust_N : numpy.ndarray
+            The rated thrust of each project.
+
+        depth : numpy.ndarray
+            The depth of the foundation of each project, in m.
+
+        bearing_pressure_n_m2 : numpy.ndarray
+            The bearing pressure of each project.
+
+        Returns
+        -------
+        dict
+            The arrays 'Radius_o_m' (overturning), 'Radius_s_m' (slipping),
+            'Radius_g_m' (gapping), 'Radius_b_m' (bearing) and 'Radius_m'
+            (the largest), with one value per project.
+        """
+        f_dead, f_lat, m_tot, rated_thrust_N, depth, bearing_pressure_n_m2 = np.broadcast_arrays(
+            *[np.asarray(value, dtype=np.float64)
+              for value in (f_dead, f_lat, m_tot, rated_thrust_N, depth, bearing_pressure_n_m2)])
+
+        # The weight of the foundation per m^2 of radius squared
+        k = np.pi * depth * cls.unit_weight()
+
+        def eccentricity(radius):
+            return m_tot / (k * radius**2 + f_dead)
+
+        # calculate foundation radius based on overturning moment
+        f_horiz = np.maximum(f_lat, rated_thrust_N)
+        r_overturn = cls.cubic_root(k, f_dead, cls.safety_overturn * (m_tot + f_horiz * depth))
+
+        # calculate foundation radius based on slipping
+        tangent_slip_angle = np.tan((cls.friction_angle_soil * np.pi) / 180)
+        slipping_force_with_sf = cls.safety_slipping * f_lat
+        slipping = slipping_force_with_sf >= f_dead * tangent_slip_angle
+        with np.errstate(invalid='ignore'):
+            r_slipping = np.where(slipping, (((slipping_force_with_sf / tangent_slip_angle) - f_dead) / k) ** 0.5, 0.0)
+
+        # calculate foundation radius based on gapping, r = 3 * e, unless
+        # the gapping constraint r / 3 < e is already satisfied.
+        r_test_gapping = np.maximum(r_overturn, r_slipping)
+        gapping = (r_test_gapping / 3) >= eccentricity(r_test_gapping)
+        r_gapping = cls.cubic_root(k, f_dead, 3 * m_tot)
+        bracketed = (0.5 * r_overturn <= r_gapping) & (r_gapping <= cls.max_radius_m)
+        r_gapping = np.where(gapping, np.where(bracketed, r_gapping, np.nan), 0.0)
+
+        # calculate foundation radius based on bearing pressure
+        r_test_bearing = np.maximum(r_test_gapping, r_gapping)
+        v_1 = k * r_test_bearing**2 + f_dead
+        e = m_tot / v_1
+        a_eff = v_1 / bearing_pressure_n_m2
+
+        def r_b(x):
+            with np.errstate(invalid='ignore'):
+                return 2 * (x**2 - e * (x**2 - e**2) ** 0.5) - a_eff
+
+        with np.errstate(invalid='ignore'):
+            u = (e + np.sqrt(4 * (a_eff / 2) - 3 * e**2)) / 2
+            r_bearing = np.sqrt(u**2 + e**2)
+        bracketed = (r_b(e + 1e-3) <= 0) & (r_b(np.full_like(e, cls.max_radius_m)) >= 0)
+        r_bearing = np.where(bracketed, r_bearing, np.nan)
+
+        # pick the largest foundation radius based on all 4 foundation
+        # design criteria
+        r_choosen = np.maximum.reduce([r_bearing, r_overturn, r_slipping, r_gapping])
+
+        return {
+            'Radius_o_m': r_overturn,
+            'Radius_s_m': r_slipping,
+            'Radius_g_m': r_gapping,
+            'Radius_b_m': r_bearing,
+            'Radius_m': r_choosen,
+        }
@@ -31,6 +31,28 @@ class GridConnectionCost(CostModule):
 
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        'detail_level',
+        'distance_to_interconnect_mi',
+        'interconnect_voltage_kV',
+        'new_switchyard',
+        'num_turbines',
+        'rotor_diameter_m',
+        'turbine_rating_MW',
+    )
+    output_keys_read = ()
+    output_keys = (
+        'interconnect_adder_USD',
+        'total_transdist_cost',
+        'tower_to_point_of_interconnection_usd_per_kw',
+        'trans_dist_cost_csv',
+        'trans_dist_cost_module_type_operation',
+        'trans_dist_usd',
+        'trans_dist_usd_df',
+    )
+    input_keys_written = ()
+
     def __init__(self, input_dict, output_dict , project_name):
         """
         Parameters
@@ -104,35 +126,44 @@ class GridConnectionCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
         """
-        result = []
-        module = type(self).__name__
+        self.output_dict['trans_dist_cost_csv'] = self.detail_rows(self.detailed_rows)
+        return self.output_dict['trans_dist_cost_csv']
+
+    def detailed_rows(self, input_dict, output_dict, summary):
+        """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
+
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
 
-        for row in self.output_dict['trans_dist_usd_df'].itertuples():
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        for row in output_dict['trans_dist_usd_df'].itertuples():
             dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
+            yield {
                 'unit': '',
                 'type': 'dataframe',
                 'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
                 'value': dashed_row,
                 'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-        self.output_dict['trans_dist_cost_csv'] = result
-        return result
+            }
 
     def outputs_for_module_type_operation(self, input_dict, output_dict):
         """
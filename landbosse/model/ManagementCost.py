@@ -1,7 +1,12 @@
 import math
 import traceback
 
-class ManagementCost:
+import pandas as pd
+
+from .CostModule import CostModule
+
+
+class ManagementCost(CostModule):
     """
     This class models management costs of a wind plant. Its inputs are
     configured with a dictionary with the key value pairs being the
@@ -78,6 +83,46 @@ class ManagementCost:
         (float) Total cost of everything else
     """
 
+    # The keys this module reads and writes. See CostModule for how
+    # Manager uses them.
+    input_keys = (
+        'construct_duration',
+        'detail_level',
+        'foundation_cost_usd',
+        'hub_height_meters',
+        'markup_contingency',
+        'markup_overhead',
+        'markup_profit_margin',
+        'markup_sales_and_use_tax',
+        'markup_warranty_management',
+        'num_access_roads',
+        'num_hwy_permits',
+        'num_turbines',
+        'override_total_management_cost',
+        'project_size_megawatts',
+        'project_value_usd',
+        'rotor_diameter_m',
+        'site_facility_building_area_df',
+        'turbine_rating_MW',
+    )
+    output_keys_read = (
+        'actual_construction_months',
+    )
+    output_keys = (
+        'bonding_usd',
+        'construction_permitting_usd',
+        'engineering_usd',
+        'insurance_usd',
+        'management_cost_csv',
+        'mangement_module_type_operation',
+        'markup_contingency_usd',
+        'project_management_usd',
+        'site_facility_usd',
+        'total_management_cost',
+    )
+    input_keys_written = ()
+    input_keys_mutated = ()
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         This method runs all cost calculations in the model based on the
@@ -415,27 +460,42 @@ class ManagementCost:
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
+        """
+        self.output_dict['management_cost_csv'] = self.detail_rows(self.detailed_rows)
+        return self.output_dict['management_cost_csv']
+
+    def detailed_rows(self, input_dict, output_dict, summary):
+        """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
+
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
+
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
         """
-        result = []
         if self.in_distributed_mode:
-            row = {
-                'project_id_with_serial': self.project_name,
-                'module': type(self).__name__,
+            yield {
                 'type': 'variable',
                 'variable_df_key_col_name': 'total_management_cost',
                 'unit': 'usd',
-                'value': self.output_dict['total_management_cost']
+                'value': output_dict['total_management_cost']
             }
-            result.append(row)
         else:
             management_cost_keys = [
                 'insurance_usd',
@@ -448,85 +508,44 @@ class ManagementCost:
             ]
 
             for key in management_cost_keys:
-                value = self.output_dict[key]
-                row = {
-                    'project_id_with_serial': self.project_name,
-                    'module': type(self).__name__,
+                yield {
                     'type': 'variable',
                     'variable_df_key_col_name': key,
                     'unit': 'usd',
-                    'value': value
+                    'value': output_dict[key]
                 }
-                result.append(row)
-
-        return result
 
     def outputs_for_module_type_operation(self):
         """
-        Outputs dictionaries that are rows for the
-        costs_by_module_type_operation
+        Makes the rows for the costs_by_module_type_operation output.
 
         Returns
         -------
-        list
-            List of dicts, with each dict representing a row for
-            the output.
+        pd.DataFrame
+            The rows, as made by
+            outputs_for_costs_by_module_type_operation().
         """
-        result = []
-        module = type(self).__name__
-        turbine_rating_MW = self.input_dict['turbine_rating_MW']
-        num_turbines = self.input_dict['num_turbines']
-        project_size_kw = num_turbines * turbine_rating_MW * 1000
-
         if self.in_distributed_mode:
-            result.append({
-                'type_of_cost': 'total_management_cost',
-                'raw_cost': self.output_dict['total_management_cost']
-            })
-
+            costs = [('total_management_cost', 'total_management_cost')]
         else:
-            result.append({
-                'type_of_cost': 'insurance',
-                'raw_cost': self.output_dict['insurance_usd']
-            })
-            result.append({
-                'type_of_cost': 'Construction Permitting',
-                'raw_cost': self.output_dict['construction_permitting_usd']
-            })
-            result.append({
-                'type_of_cost': 'Project Management',
-                'raw_cost': self.output_dict['project_management_usd']
-            })
-            result.append({
-                'type_of_cost': 'Bonding',
-                'raw_cost': self.output_dict['bonding_usd']
-            })
-            result.append({
-                'type_of_cost': 'Markup Contingency',
-                'raw_cost': self.output_dict['markup_contingency_usd']
-            })
-            result.append({
-                'type_of_cost': 'Engineering Foundation and Collections System (includes met mast)',
-                'raw_cost': self.output_dict['engineering_usd']
-            })
-            result.append({
-                'type_of_cost': 'Site Facility',
-                'raw_cost': self.output_dict['site_facility_usd']
-            })
-
-        for _dict in result:
-            _dict['turbine_rating_MW'] = self.input_dict['turbine_rating_MW']
-            _dict['num_turbines'] = self.input_dict['num_turbines']
-            _dict['rotor_diameter_m'] = self.input_dict['rotor_diameter_m']
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['operation_id'] = 'Management'
-            _dict['module'] = module
-            _dict['raw_cost_total_or_per_turbine'] = 'total'
-            _dict['cost_per_turbine'] = _dict['raw_cost'] / num_turbines
-            _dict['cost_per_project'] = _dict['raw_cost']
-            _dict['usd_per_kw_per_project'] = _dict['raw_cost'] / project_size_kw
-
-        return result
+            costs = [
+                ('insurance', 'insurance_usd'),
+                ('Construction Permitting', 'construction_permitting_usd'),
+                ('Project Management', 'project_management_usd'),
+                ('Bonding', 'bonding_usd'),
+                ('Markup Contingency', 'markup_contingency_usd'),
+                ('Engineering Foundation and Collections System (includes met mast)', 'engineering_usd'),
+                ('Site Facility', 'site_facility_usd'),
+            ]
+
+        cost_df = pd.DataFrame({
+            'Phase of construction': 'Management',
+            'Type of cost': [type_of_cost for type_of_cost, _ in costs],
+            'Cost USD': [self.output_dict[key] for _, key in costs],
+        })
+        return self.outputs_for_costs_by_module_type_operation(input_df=cost_df,
+                                                               project_id=self.project_name,
+                                                               total_or_turbine=True)
 
     def run_module(self):
         """
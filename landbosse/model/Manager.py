@@ -1,5 +1,7 @@
 import traceback
 import math
+import os
+from concurrent import futures
 
 from .ManagementCost import ManagementCost
 from .FoundationCost import FoundationCost
@@ -11,6 +13,9 @@ from .SitePreparationCost import SitePreparationCost
 from .CollectionCost import ArraySystem
 from .ErectionCost import ErectionCost
 from .DevelopmentCost import DevelopmentCost
+from .WeatherWindowIndex import WeatherWindowIndex
+from .ProjectResultCache import ProjectResultCache
+from .ModuleResultCache import ModuleResultCache
 
 import pandas as pd
 
@@ -19,23 +24,271 @@ class Manager:
     The Manager class distributes input and output dictionaries among
     the various modules. It maintains the hierarchical dictionary
     structure.
+
+    The modules in cost_modules run before the construction months are
+    totaled. Most of them do not depend on each other. If module_threads
+    is more than 1, they run on a pool of that many threads, each module
+    starting as soon as the modules it depends on have finished. The
+    dependencies are found from the keys the modules declare. See
+    module_dependencies(). The modules spend much of their time in NumPy
+    and pandas, which release the GIL, so this shortens the time to run
+    one project, such as in the OpenMDAO component. It does not help runs
+    of many projects, which XlsxParallelManagerRunner already spreads over
+    processes.
+
+    The number of threads is the module_threads argument of the
+    initializer or, if that is None, the LANDBOSSE_MODULE_THREADS
+    environment variable. It is 1 by default, which runs the modules one at
+    a time, in order.
     """
 
-    def __init__(self, input_dict, output_dict):
+    # The modules that run before the construction months are totaled, in
+    # the order they run one at a time.
+    cost_modules = [
+        FoundationCost,
+        SitePreparationCost,
+        SubstationCost,
+        TransportCost,
+        GridConnectionCost,
+        ArraySystem,
+        DevelopmentCost,
+        TurbineCost,
+        ErectionCost,
+    ]
+
+    def __init__(self, input_dict, output_dict, module_threads=None, keep_details=True, use_project_cache=True):
         """
         This initializer sets up the instance variables of:
 
-        self.cost_modules: A list of cost module instances. Each of the
-            instances must implement the method input_output.
-
         self.input_dict: A placeholder for the inputs dictionary
 
         self.output_dict: A placeholder for the output dictionary
+
+        self.module_threads: The number of threads that run the cost
+            modules. None reads the LANDBOSSE_MODULE_THREADS environment
+            variable, which defaults to 1.
+
+        self.keep_details: False if the detail rows of the project are not
+            needed. They are then left out of the rows stored by
+            ProjectResultCache, and a cache hit gives only the cost rows.
+
+        self.use_project_cache: False if ProjectResultCache must not be
+            used even if it is enabled. A cache hit only restores the cost
+            and detail rows, so callers that read other values from the
+            output dictionary, such as the OpenMDAO component, set this to
+            False.
+
+        Raises
+        ------
+        ValueError
+            If the number of threads is not an integer of at least 1.
         """
         self.input_dict = input_dict
         self.output_dict = output_dict
+        if module_threads is None:
+            module_threads = os.environ.get('LANDBOSSE_MODULE_THREADS', '1')
+            try:
+                module_threads = int(module_threads)
+            except ValueError:
+                raise ValueError(f'LANDBOSSE_MODULE_THREADS must be an integer, not {module_threads}.')
+        if module_threads < 1:
+            raise ValueError(f'module_threads must be at least 1, not {module_threads}.')
+        self.module_threads = module_threads
+        self.keep_details = keep_details
+        self.use_project_cache = use_project_cache
 
     def execute_landbosse(self, project_name):
+        """
+        Runs the cost modules of a project. If self.use_project_cache is
+        True, ProjectResultCache is enabled and it has the rows of a
+        project with the same master input dictionary, the rows are put in
+        the output dictionary instead and no module runs.
+
+        Parameters
+        ----------
+        project_name : str
+            The name of the project.
+
+        Returns
+        -------
+        int
+            0 if the modules ran successfully, 1 otherwise.
+        """
+        key = None
+        if self.use_project_cache and ProjectResultCache.enabled():
+            try:
+                key = ProjectResultCache.key(self.input_dict, self.keep_details)
+            except TypeError as err:
+                print(f'{project_name} is not cached: {err}')
+            if key is not None:
+                rows = ProjectResultCache.load(key, project_name)
+                if rows is not None:
+                    self.output_dict.update(rows)
+                    return 0
+
+        status = self.run_modules(project_name)
+        if key is not None and status == 0:
+            ProjectResultCache.save(key, self.output_dict, self.keep_details)
+        return status
+
+    def run_module(self, module_class, project_name, output_dict=None):
+        """
+        Runs one cost module. If ModuleResultCache is enabled and has the
+        results of the module for the same values of the keys it reads,
+        the results are put in the input and output dictionaries instead
+        and the module does not run.
+
+        Parameters
+        ----------
+        module_class : type
+            The class of the cost module.
+
+        project_name : str
+            The name of the project.
+
+        output_dict : dict
+            The output dictionary of the module. None uses the output
+            dictionary of the Manager. See run_module_graph().
+
+        Returns
+        -------
+        tuple
+            What run_module() of the module returns: (0, 0) if it ran
+            successfully, (1, error) otherwise. (0, 0) if its results were
+            reused.
+        """
+        if output_dict is None:
+            output_dict = self.output_dict
+
+        key = None
+        if ModuleResultCache.enabled(module_class):
+            try:
+                key = ModuleResultCache.key(module_class, self.input_dict, output_dict)
+            except TypeError as err:
+                print(f'{module_class.__name__} of {project_name} is not cached: {err}')
+            if key is not None:
+                found, results = ModuleResultCache.get(key)
+                if found:
+                    ModuleResultCache.apply(results, self.input_dict, output_dict, project_name)
+                    return 0, 0
+
+        module = module_class(input_dict=self.input_dict, output_dict=output_dict, project_name=project_name)
+        status, error = module.run_module()
+        if key is not None and status == 0:
+            ModuleResultCache.put(key, module_class, self.input_dict, output_dict)
+        return status, error
+
+    @staticmethod
+    def module_dependencies(module_classes):
+        """
+        Finds the modules that each module must wait for, so that running
+        the modules at the same time gives the same results as running them
+        one at a time in order.
+
+        A module waits for an earlier module if it reads a key the earlier
+        module writes, if it writes a key the earlier module reads, or if
+        both write the same key. Modifying a value in place counts as
+        writing its key. A module that does not declare its keys waits for
+        every earlier module, and every later module waits for it.
+
+        Parameters
+        ----------
+        module_classes : list
+            The classes of the modules, in the order they run one at a
+            time.
+
+        Returns
+        -------
+        dict
+            For each class in module_classes, the set of earlier classes it
+            waits for.
+        """
+        def reads(module_class):
+            return {('input', key) for key in module_class.input_keys} | \
+                   {('output', key) for key in module_class.output_keys_read}
+
+        def writes(module_class):
+            return {('input', key) for key in module_class.input_keys_written} | \
+                   {('input', key) for key in module_class.input_keys_mutated} | \
+                   {('output', key) for key in module_class.output_keys}
+
+        dependencies = dict()
+        for index, module_class in enumerate(module_classes):
+            dependencies[module_class] = set()
+            for earlier in module_classes[:index]:
+                if module_class.input_keys is None or earlier.input_keys is None:
+                    dependencies[module_class].add(earlier)
+                elif writes(earlier) & (reads(module_class) | writes(module_class)) or \
+                        reads(earlier) & writes(module_class):
+                    dependencies[module_class].add(earlier)
+        return dependencies
+
+    def run_module_graph(self, module_classes, project_name):
+        """
+        Runs modules one at a time, in order, or, if module_threads is more
+        than 1, on a pool of threads in an order allowed by
+        module_dependencies().
+
+        On the pool, each module writes to its own output dictionary, which
+        starts as a copy of the output dictionary with the outputs of the
+        modules that have finished. When all the modules have finished,
+        their outputs are put in the output dictionary in the order the
+        modules would have run one at a time, so that the rows are output
+        in the same order.
+
+        Parameters
+        ----------
+        module_classes : list
+            The classes of the modules, in the order they run one at a
+            time.
+
+        project_name : str
+            The name of the project.
+        """
+        if self.module_threads <= 1:
+            for module_class in module_classes:
+                self.run_module(module_class, project_name)
+            return
+
+        # The output dictionary of each finished module, and a copy of it
+        # from before the module ran.
+        module_outputs = dict()
+
+        def outputs_of_finished_modules(output_dict):
+            for module_class in module_classes:
+                if module_class in module_outputs:
+                    before, after = module_outputs[module_class]
+                    for key, value in after.items():
+                        if key not in before or before[key] is not value:
+                            output_dict[key] = value
+            return output_dict
+
+        def run_module(module_class, output_dict):
+            before = dict(output_dict)
+            self.run_module(module_class, project_name, output_dict)
+            return before, output_dict
+
+        waiting = self.module_dependencies(module_classes)
+        with futures.ThreadPoolExecutor(max_workers=self.module_threads) as executor:
+            running = dict()
+            while waiting or running:
+                for module_class in [module_class for module_class, dependencies in waiting.items()
+                                     if not dependencies]:
+                    del waiting[module_class]
+                    output_dict = outputs_of_finished_modules(dict(self.output_dict))
+                    running[executor.submit(run_module, module_class, output_dict)] = module_class
+                done, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    module_class = running.pop(future)
+                    # Raise the exception, if any, as running the modules
+                    # one at a time would.
+                    module_outputs[module_class] = future.result()
+                    for dependencies in waiting.values():
+                        dependencies.discard(module_class)
+
+        outputs_of_finished_modules(self.output_dict)
+
+    def run_modules(self, project_name):
         try:
             # Create weather window that will be used for all tasks (window for entire project; selected to restrict to seasons and hours specified)
             weather_data_user_input = self.input_dict['weather_window']
@@ -51,42 +304,13 @@ class Manager:
             self.input_dict['weather_window'] = filtered_weather_window
             self.input_dict['weather_data_user_input'] = weather_data_user_input
 
-            foundation_cost = FoundationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            foundation_cost.run_module()
-
-            roads_cost = SitePreparationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            roads_cost.run_module()
-
-            substation_cost = SubstationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            substation_cost.run_module()
-
-            transport_cost = TransportCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transport_cost.run_module()
-
-            transdist_cost = GridConnectionCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transdist_cost.run_module()
-
-            collection_cost = ArraySystem(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            collection_cost.run_module()
-
-            development_cost = DevelopmentCost(input_dict=self.input_dict, output_dict=self.output_dict,
-                                          project_name=project_name)
-            development_cost.run_module()
+            # Index the filtered window once so that the weather delay
+            # calculations in every module do not rescan it.
+            self.input_dict['weather_window_index'] = WeatherWindowIndex(filtered_weather_window)
 
-            turbine_cost = TurbineCost(
-                input_dict=self.input_dict,
-                output_dict=self.output_dict,
-                project_name=project_name,
-            )
-            turbine_cost.run_module()
+            self.run_module_graph(self.cost_modules, project_name)
 
             erection_cost_output_dict = dict()
-            erection_cost = ErectionCost(
-                input_dict=self.input_dict,
-                output_dict=self.output_dict,
-                project_name=project_name
-            )
-            erection_cost.run_module()
             self.output_dict['erection_cost'] = erection_cost_output_dict
 
 
@@ -97,7 +321,10 @@ class Manager:
                                                              self.output_dict['collection_construction_months']) + 1
 
             if self.output_dict['actual_construction_months'] < self.input_dict['construct_duration']:
-                road_cost = self.output_dict['total_road_cost']
+                # Change a copy, so that the detail rows of
+                # SitePreparationCost, which may be made later, keep the
+                # cost it calculated.
+                road_cost = self.output_dict['total_road_cost'].copy()
                 index = road_cost['Type of cost'] == 'Other'
                 other = road_cost[index]
                 amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] - self.output_dict['siteprep_construction_months'])
@@ -116,8 +343,7 @@ class Manager:
             self.input_dict['project_value_usd'] = float(total_costs['Cost USD'].sum())
             self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost']['Cost USD'].sum()
 
-            management_cost = ManagementCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            management_cost.run_module()
+            self.run_module(ManagementCost, project_name)
 
             return 0
         except Exception:
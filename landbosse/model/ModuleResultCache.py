@@ -0,0 +1,280 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .ProjectResultCache import ProjectResultCache
+
+
+class ModuleResultCache:
+    """
+    This class does not need to be instantiated. Like WeatherDelayCache,
+    the cache is a class attribute, so it is shared by every Manager in
+    the process. Within one worker of a parallel run, every project that
+    runs in that worker shares the same cache.
+
+    In a one at a time sensitivity study, most projects differ from a
+    baseline project in only one input. Most modules do not read that
+    input, so their results are the same as for the baseline. This class
+    remembers the results of each module so that Manager can reuse them
+    instead of running the module again.
+
+    Each module declares the keys it reads and writes. See CostModule.
+    The key of a module's results is a hash of the module's name and the
+    values of every key that it reads, whether they are in the input
+    dictionary or, for output_keys_read, the output dictionary. The
+    results are copies of the values of the keys that it writes.
+
+    The name of the project is not part of the key. Rows of the cost and
+    detail outputs are relabeled with the name of the project that reuses
+    them, and the values are copied again when they are reused, so the
+    cached values are never modified. Values that a module modifies in
+    place (input_keys_mutated) are updated in place when its results are
+    reused.
+
+    The cache is a least recently used (LRU) cache bounded to maxsize
+    results. It is disabled by default, with a maxsize of 0. To enable it,
+    set the LANDBOSSE_MODULE_CACHE_SIZE environment variable to the number
+    of module results to keep, or call set_maxsize(). Environment variables
+    are inherited by the workers of parallel runs.
+    """
+
+    # _cache holds the cached results in least recently used order. The
+    # most recently used entry is at the end.
+    _cache = OrderedDict()
+
+    # Maximum number of module results in the cache.
+    maxsize = int(os.environ.get('LANDBOSSE_MODULE_CACHE_SIZE', 0))
+
+    # Keys of the input dictionary that are calculated by Manager from other
+    # keys in the input dictionary. They are not hashed, because the keys
+    # they are calculated from are.
+    derived_input_keys = frozenset(['weather_window_index'])
+
+    # Counters of cache hits and misses since the last clear()
+    hits = 0
+    misses = 0
+
+    # The lock makes the cache safe to use from multiple threads.
+    _lock = threading.Lock()
+
+    @classmethod
+    def enabled(cls, module_class):
+        """
+        Parameters
+        ----------
+        module_class : type
+            The class of a cost module.
+
+        Returns
+        -------
+        bool
+            True if the cache is enabled and the module declares its keys.
+        """
+        return cls.maxsize > 0 and getattr(module_class, 'input_keys', None) is not None
+
+    @classmethod
+    def key(cls, module_class, input_dict, output_dict):
+        """
+        Hashes the name of a module and the values it reads.
+
+        Parameters
+        ----------
+        module_class : type
+            The class of the cost module.
+
+        input_dict : dict
+            The input dictionary, before the module runs.
+
+        output_dict : dict
+            The output dictionary, before the module runs.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the module and its inputs.
+
+        Raises
+        ------
+        TypeError
+            If a value that the module reads cannot be hashed.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'{module_class.__module__}.{module_class.__qualname__}|'.encode())
+        digest.update(f'{ProjectResultCache.code_version()}|'.encode())
+        for name, keys, values in [('input', module_class.input_keys, input_dict),
+                                   ('output', module_class.output_keys_read, output_dict)]:
+            for key in keys:
+                if key in cls.derived_input_keys:
+                    continue
+                digest.update(f'{name}:{key}='.encode())
+                if key in values:
+                    ProjectResultCache.update_digest(digest, values[key])
+                else:
+                    digest.update(b'<missing>')
+        return digest.hexdigest()
+
+    @classmethod
+    def get(cls, key):
+        """
+        Looks up the results of a module and counts a hit or a miss.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        bool, dict
+            True and the cached results if the key was found. False and None
+            otherwise. The results must not be modified. See apply().
+        """
+        with cls._lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                cls.hits += 1
+                return True, cls._cache[key]
+            cls.misses += 1
+            return False, None
+
+    @classmethod
+    def put(cls, key, module_class, input_dict, output_dict):
+        """
+        Stores copies of the values a module wrote. If the cache is full, the
+        least recently used results are evicted.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key() before the module ran.
+
+        module_class : type
+            The class of the cost module.
+
+        input_dict : dict
+            The input dictionary, after the module ran.
+
+        output_dict : dict
+            The output dictionary, after the module ran.
+        """
+        results = {
+            'input': {key: copy.deepcopy(input_dict[key])
+                      for key in module_class.input_keys_written if key in input_dict},
+            'output': {key: copy.deepcopy(output_dict[key])
+                       for key in module_class.output_keys if key in output_dict},
+            # The mutated values are copied together, so that values that
+            # are the same object are copied once.
+            'mutated': copy.deepcopy({key: input_dict[key]
+                                      for key in module_class.input_keys_mutated if key in input_dict}),
+        }
+        with cls._lock:
+            if cls.maxsize <= 0:
+                return
+            cls._cache[key] = results
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+
+    @staticmethod
+    def apply(results, input_dict, output_dict, project_name):
+        """
+        Writes copies of cached results into the input and output
+        dictionaries, as if the module had run.
+
+        Parameters
+        ----------
+        results : dict
+            The results returned by get().
+
+        input_dict : dict
+            The input dictionary of the project.
+
+        output_dict : dict
+            The output dictionary of the project.
+
+        project_name : str
+            The name of the project. Rows of the cost and detail outputs are
+            relabeled with it.
+        """
+        input_dict.update(copy.deepcopy(results['input']))
+        for key, value in copy.deepcopy(results['mutated']).items():
+            if key in input_dict:
+                ModuleResultCache.update_in_place(input_dict[key], value)
+        output_values = copy.deepcopy(results['output'])
+        rows = ProjectResultCache.rows(output_values)
+        output_values.update(ProjectResultCache.relabel(rows, project_name))
+        output_dict.update(output_values)
+
+    @staticmethod
+    def update_in_place(target, value):
+        """
+        Makes a dictionary or dataframe equal to a copy of it that a module
+        modified, without replacing the object, since other keys of the
+        input dictionary may refer to it.
+
+        Parameters
+        ----------
+        target : dict or pandas.DataFrame
+            The value to update.
+
+        value : dict or pandas.DataFrame
+            The modified copy.
+        """
+        if isinstance(target, dict):
+            for key, item in value.items():
+                if isinstance(target.get(key), (dict, pd.DataFrame)):
+                    ModuleResultCache.update_in_place(target[key], item)
+                else:
+                    target[key] = item
+        elif isinstance(target, pd.DataFrame):
+            for column in value.columns:
+                target[column] = value[column]
+        else:
+            raise TypeError(f'Cannot update values of type {type(target).__name__} in place.')
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns
+        -------
+        dict
+            The hits, misses, current size and maximum size of the cache.
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'size': len(cls._cache),
+                'maxsize': cls.maxsize,
+            }
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all entries from the cache and resets the hit and miss
+        counters.
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def set_maxsize(cls, maxsize):
+        """
+        Changes the maximum number of results in the cache, evicting the
+        least recently used results if needed.
+
+        Parameters
+        ----------
+        maxsize : int
+            The new maximum size. 0 disables the cache.
+        """
+        with cls._lock:
+            cls.maxsize = maxsize
+            while len(cls._cache) > max(maxsize, 0):
+                cls._cache.popitem(last=False)
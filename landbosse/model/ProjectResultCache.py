@@ -0,0 +1,464 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .. import __version__
+
+
+class ProjectResultCache:
+    """
+    This class does not need to be instantiated. Like WeatherDelayCache,
+    its settings are class attributes shared by every Manager in the
+    process.
+
+    Manager.execute_landbosse() uses this class to avoid running the cost
+    modules of a project whose inputs have been run before. The cost rows
+    (keys ending in '_module_type_operation') and detail rows (keys ending
+    in '_csv') of each project are stored in a file on local disk under a
+    hash of the master input dictionary. When a project with the same
+    master input dictionary runs again, in the same run or a later one, the
+    rows are loaded from the file and no module runs.
+
+    The hash covers every value in the master input dictionary: the
+    dataframes (column names, dtypes, index and values), arrays, nested
+    dictionaries and lists, and scalars, including their types. The
+    weather window is one of the dataframes. The name of the project is
+    not part of the hash. Cached rows are relabeled with the name of the
+    project that loads them.
+
+    If the detail rows of a run are not needed (see Manager.keep_details),
+    only the cost rows are stored, under a different key, so that the
+    detail rows are never made.
+
+    The cache is disabled by default. To enable it, set the environment
+    variable LANDBOSSE_RESULT_CACHE_DIR to a directory, or set the
+    cache_dir class attribute. Environment variables are inherited by the
+    workers of parallel runs.
+
+    Results calculated by a different version of the code must not be
+    used, so the hash also covers code_version(). That is the version of
+    LandBOSSE, followed by the LANDBOSSE_RESULT_CACHE_VERSION environment
+    variable or the version class attribute, if either is set. Changing the
+    version invalidates every entry in the cache.
+
+    The size of the cache is bounded by max_bytes, or the
+    LANDBOSSE_RESULT_CACHE_MAX_BYTES environment variable. When the files
+    in the cache directory exceed it, the least recently used files are
+    deleted. Loading a file marks it as used by updating its modification
+    time.
+
+    Only the rows are cached. The other values that the modules put in
+    the output dictionary, such as the cost dataframes, are not available
+    after a cache hit. Callers that need them, such as the OpenMDAO
+    component, make their Manager with use_project_cache=False.
+    """
+
+    # Directory of the cache. None means the directory is taken from the
+    # LANDBOSSE_RESULT_CACHE_DIR environment variable. If that is not set
+    # either, the cache is disabled.
+    cache_dir = None
+
+    # Maximum total size of the files in the cache. None means the size is
+    # taken from the LANDBOSSE_RESULT_CACHE_MAX_BYTES environment variable,
+    # or default_max_bytes if that is not set.
+    max_bytes = None
+
+    default_max_bytes = 1 << 30
+
+    # An explicit version of the code. None means it is taken from the
+    # LANDBOSSE_RESULT_CACHE_VERSION environment variable, if it is set.
+    version = None
+
+    # Changing what is hashed or stored must change this version so that
+    # existing files are not used.
+    format_version = 2
+
+    # The approximate total size of the files in the cache directory. It is
+    # counted by a scan of the directory when the cache is first written in
+    # this process, then increased by each file this process writes. Other
+    # processes writing to the same directory are accounted for at the
+    # next eviction, which scans the directory again.
+    _approximate_bytes = None
+
+    # Counters of cache hits and misses since the last clear()
+    hits = 0
+    misses = 0
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def disk_cache_dir(cls):
+        """
+        Returns
+        -------
+        str or None
+            The directory of the cache, or None if the cache is disabled.
+        """
+        if cls.cache_dir is not None:
+            return cls.cache_dir
+        return os.environ.get('LANDBOSSE_RESULT_CACHE_DIR') or None
+
+    @classmethod
+    def enabled(cls):
+        """
+        Returns
+        -------
+        bool
+            True if the cache is enabled.
+        """
+        return cls.disk_cache_dir() is not None
+
+    @classmethod
+    def maximum_bytes(cls):
+        """
+        Returns
+        -------
+        int
+            The maximum total size of the files in the cache.
+        """
+        if cls.max_bytes is not None:
+            return cls.max_bytes
+        return int(os.environ.get('LANDBOSSE_RESULT_CACHE_MAX_BYTES', cls.default_max_bytes))
+
+    @classmethod
+    def code_version(cls):
+        """
+        Returns
+        -------
+        str
+            The version of the code that is part of every key.
+        """
+        version = cls.version if cls.version is not None else os.environ.get('LANDBOSSE_RESULT_CACHE_VERSION')
+        if version is None:
+            return __version__
+        return f'{__version__}+{version}'
+
+    @classmethod
+    def key(cls, input_dict, keep_details=True):
+        """
+        Hashes a master input dictionary. See the class docstring.
+
+        Parameters
+        ----------
+        input_dict : dict
+            The master input dictionary, before Manager has run.
+
+        keep_details : bool
+            False if the detail rows are not stored. Such entries have a
+            different key, so that they are not used when the detail rows
+            are needed.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the input dictionary and code version.
+
+        Raises
+        ------
+        TypeError
+            If the input dictionary has a value of a type that cannot be
+            hashed.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f'v{cls.format_version}|{cls.code_version()}|'.encode())
+        cls.update_digest(digest, input_dict)
+        if not keep_details:
+            digest.update(b'|no details')
+        return digest.hexdigest()
+
+    @classmethod
+    def update_digest(cls, digest, value):
+        """
+        Adds the canonical form of a value to a digest. The type of every
+        value is included, so that, for example, 1 and 1.0 hash differently.
+        ModuleResultCache also uses this to hash the inputs of modules.
+
+        Parameters
+        ----------
+        digest : hashlib.blake2b
+            The digest to update.
+
+        value
+            A dictionary, list, tuple, dataframe, series, array or scalar.
+            Containers are hashed recursively.
+
+        Raises
+        ------
+        TypeError
+            If the value, or a value in it, is of another type.
+        """
+        digest.update(f'<{type(value).__module__}.{type(value).__qualname__}>'.encode())
+        if isinstance(value, dict):
+            digest.update(f'{len(value)}{{'.encode())
+            for key in sorted(value, key=repr):
+                cls.update_digest(digest, key)
+                cls.update_digest(digest, value[key])
+            digest.update(b'}')
+        elif isinstance(value, (list, tuple)):
+            digest.update(f'{len(value)}['.encode())
+            for item in value:
+                cls.update_digest(digest, item)
+            digest.update(b']')
+        elif isinstance(value, (pd.DataFrame, pd.Series)):
+            columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+            dtypes = list(value.dtypes) if isinstance(value, pd.DataFrame) else [value.dtype]
+            digest.update(repr(columns).encode())
+            digest.update(repr([str(dtype) for dtype in dtypes]).encode())
+            digest.update(repr(value.shape).encode())
+            digest.update(pd.util.hash_pandas_object(value.index).values.tobytes())
+            digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        elif isinstance(value, np.ndarray):
+            digest.update(f'{value.dtype}{value.shape}'.encode())
+            if value.dtype.hasobject:
+                cls.update_digest(digest, value.tolist())
+            else:
+                digest.update(np.ascontiguousarray(value).tobytes())
+        elif value is None or isinstance(value, (str, bytes, bool, int, float, complex, np.generic)):
+            digest.update(repr(value).encode())
+        else:
+            raise TypeError(f'Cannot hash values of type {type(value).__name__}.')
+
+    @staticmethod
+    def rows(output_dict, keep_details=True):
+        """
+        Parameters
+        ----------
+        output_dict : dict
+            The output dictionary of a project after its modules have run.
+
+        keep_details : bool
+            If False, the detail rows are left out without being made.
+
+        Returns
+        -------
+        dict
+            The keys of the output dictionary that end in
+            '_module_type_operation' or, if keep_details is True, '_csv',
+            and their dataframes of cost rows or lists of detail rows.
+        """
+        return {
+            key: value
+            for key, value in output_dict.items()
+            if key.endswith('_module_type_operation') or (keep_details and key.endswith('_csv'))
+        }
+
+    @staticmethod
+    def relabel(rows, project_name):
+        """
+        Changes the project name in every row.
+
+        Parameters
+        ----------
+        rows : dict
+            The rows made by rows().
+
+        project_name : str
+            The name of the project that loads the rows.
+
+        Returns
+        -------
+        dict
+            The rows, with 'project_id_with_serial' set to project_name.
+        """
+        relabeled = dict()
+        for key, value in rows.items():
+            if isinstance(value, pd.DataFrame):
+                relabeled[key] = value.assign(project_id_with_serial=project_name)
+            else:
+                relabeled[key] = [dict(row, project_id_with_serial=project_name)
+                                  if 'project_id_with_serial' in row else row
+                                  for row in value]
+        return relabeled
+
+    @classmethod
+    def cache_filename(cls, key):
+        """
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        Returns
+        -------
+        str
+            The filename of the rows in the cache.
+        """
+        return os.path.join(cls.disk_cache_dir(), f'project-result-{key}.pkl')
+
+    @classmethod
+    def load(cls, key, project_name):
+        """
+        Loads the rows of a project from the cache, and counts a hit or a
+        miss.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        project_name : str
+            The name of the project that loads the rows.
+
+        Returns
+        -------
+        dict or None
+            The rows relabeled with project_name, or None if they are not in
+            the cache or the file cannot be read.
+        """
+        filename = cls.cache_filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                rows = pickle.load(f)
+            os.utime(filename)
+        except FileNotFoundError:
+            rows = None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as err:
+            print(f'Ignoring unreadable project result cache file {filename}: {err}')
+            rows = None
+
+        with cls._lock:
+            if rows is None:
+                cls.misses += 1
+            else:
+                cls.hits += 1
+        if rows is None:
+            return None
+        return cls.relabel(rows, project_name)
+
+    @classmethod
+    def save(cls, key, output_dict, keep_details=True):
+        """
+        Saves the rows of a project to the cache. The file is written under
+        a temporary name and renamed, so a parallel process never reads a
+        partially written file. Then, if the cache is too large, the least
+        recently used files are deleted.
+
+        Parameters
+        ----------
+        key : str
+            The key made by key().
+
+        output_dict : dict
+            The output dictionary of the project after its modules have run.
+
+        keep_details : bool
+            If False, the detail rows are not stored. The key must have been
+            made with the same keep_details.
+        """
+        filename = cls.cache_filename(key)
+        cache_dir = os.path.dirname(filename)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cls.rows(output_dict, keep_details), f, protocol=pickle.HIGHEST_PROTOCOL)
+            file_bytes = os.path.getsize(temp_filename)
+            os.replace(temp_filename, filename)
+        except OSError as err:
+            print(f'Could not write project result cache file {filename}: {err}')
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            return
+
+        with cls._lock:
+            if cls._approximate_bytes is None:
+                cls._approximate_bytes = cls.cache_bytes()
+            else:
+                cls._approximate_bytes += file_bytes
+            needs_eviction = cls._approximate_bytes > cls.maximum_bytes()
+        if needs_eviction:
+            cls.evict()
+
+    @classmethod
+    def cache_files(cls):
+        """
+        Returns
+        -------
+        list
+            (modification time, size, filename) of every file in the cache,
+            least recently used first.
+        """
+        cache_dir = cls.disk_cache_dir()
+        files = []
+        if cache_dir is None or not os.path.isdir(cache_dir):
+            return files
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('project-result-') and entry.name.endswith('.pkl'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        return files
+
+    @classmethod
+    def cache_bytes(cls):
+        """
+        Returns
+        -------
+        int
+            The total size of the files in the cache.
+        """
+        return sum(size for _, size, _ in cls.cache_files())
+
+    @classmethod
+    def evict(cls):
+        """
+        Deletes the least recently used files until the cache is no larger
+        than maximum_bytes().
+        """
+        files = cls.cache_files()
+        total_bytes = sum(size for _, size, _ in files)
+        maximum_bytes = cls.maximum_bytes()
+        for _, size, filename in files:
+            if total_bytes <= maximum_bytes:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        with cls._lock:
+            cls._approximate_bytes = total_bytes
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns
+        -------
+        dict
+            The hits and misses of this process, and the number of files and
+            bytes in the cache.
+        """
+        files = cls.cache_files()
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'files': len(files),
+                'bytes': sum(size for _, size, _ in files),
+                'max_bytes': cls.maximum_bytes(),
+            }
+
+    @classmethod
+    def clear(cls):
+        """
+        Deletes every file in the cache and resets the hit and miss
+        counters.
+        """
+        for _, _, filename in cls.cache_files():
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+        with cls._lock:
+            cls._approximate_bytes = None
+            cls.hits = 0
+            cls.misses = 0
@@ -130,6 +130,68 @@ class SitePreparationCost(CostModule):
 
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "construct_duration",
+        "crane_width",
+        "crew",
+        "crew_cost",
+        "critical_height_non_erection_wind_delays_m",
+        "critical_speed_non_erection_wind_delays_m_per_s",
+        "detail_level",
+        "fraction_new_roads",
+        "hour_day",
+        "material_price",
+        "num_access_roads",
+        "num_turbines",
+        "operational_hrs_per_day",
+        "overtime_multiplier",
+        "road_distributed_wind",
+        "road_length_adder_m",
+        "road_quality",
+        "road_thickness",
+        "road_width_ft",
+        "rotor_diameter_m",
+        "rsmeans",
+        "rsmeans_per_diem",
+        "site_prep_area_m2",
+        "time_construct",
+        "turbine_rating_MW",
+        "turbine_spacing_rotor_diameters",
+        "weather_window",
+        "weather_window_index",
+        "wind_shear_exponent",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "crane_path_width_m",
+        "depth_to_subgrade_m",
+        "embankment_volume_crane",
+        "embankment_volume_road",
+        "managament_crew_cost_before_wind_delay",
+        "management_crew",
+        "material_needs",
+        "material_volume_cubic_yards",
+        "operation_data",
+        "road_construction_time",
+        "road_length_m",
+        "road_thickness_m",
+        "road_volume",
+        "road_volume_m3",
+        "road_width_m",
+        "roads_cost_csv",
+        "roads_cost_module_type_operation",
+        "rough_grading_area",
+        "siteprep_construction_months",
+        "siteprep_module_type_operation",
+        "topsoil_volume",
+        "total_road_cost",
+        "wind_delay_time",
+        "wind_delays",
+        "wind_multiplier",
+    )
+    input_keys_written = ()
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -757,142 +819,128 @@ class SitePreparationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
+        Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
         """
-        result = []
-        module = type(self).__name__
+        self.output_dict["roads_cost_csv"] = self.detail_rows(self.detailed_rows)
+        return self.output_dict["roads_cost_csv"]
 
+    def detailed_rows(self, input_dict, output_dict, summary):
+        """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
+
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
+
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
         # Note that some values are cast with float() so that XlsxWriter
         # (the library depended on by XlsxGenerator) can output them as
         # numbers. XlsxWriter, interestingly, cannot handle np.float32()
         # types.
 
-        result.append(
-            {
-                "unit": "m^3",
-                "type": "variable",
-                "variable_df_key_col_name": "Total road volume",
-                "value": float(self.output_dict["road_volume_m3"]),
-            }
-        )
-
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Depth to subgrade",
-                "value": self.output_dict["depth_to_subgrade_m"],
-            }
-        )
-
-        result.append(
-            {
-                "unit": "ft",
-                "type": "variable",
-                "variable_df_key_col_name": "Crane path width",
-                "value": self.output_dict["crane_path_width_m"],  # TODO: Rename variable to: crane_path_width_ft
-            }
-        )
+        yield {
+            "unit": "m^3",
+            "type": "variable",
+            "variable_df_key_col_name": "Total road volume",
+            "value": float(output_dict["road_volume_m3"]),
+        }
+
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Depth to subgrade",
+            "value": output_dict["depth_to_subgrade_m"],
+        }
+
+        yield {
+            "unit": "ft",
+            "type": "variable",
+            "variable_df_key_col_name": "Crane path width",
+            "value": output_dict["crane_path_width_m"],  # TODO: Rename variable to: crane_path_width_ft
+        }
 
         if not input_dict["road_distributed_wind"]:
-            result.append(
-                {
-                    "unit": "m",
-                    "type": "variable",
-                    "variable_df_key_col_name": "Road length",
-                    "value": float(self.output_dict["road_length_m"]),
-                }
-            )
-
-        result.append(
-            {
+            yield {
                 "unit": "m",
                 "type": "variable",
-                "variable_df_key_col_name": "Road width",
-                "value": self.output_dict["road_width_m"],
+                "variable_df_key_col_name": "Road length",
+                "value": float(output_dict["road_length_m"]),
             }
-        )
 
-        result.append(
-            {
-                "unit": "m",
-                "type": "variable",
-                "variable_df_key_col_name": "Road thickness",
-                "value": self.output_dict["road_thickness_m"],
-            }
-        )
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Road width",
+            "value": output_dict["road_width_m"],
+        }
+
+        yield {
+            "unit": "m",
+            "type": "variable",
+            "variable_df_key_col_name": "Road thickness",
+            "value": output_dict["road_thickness_m"],
+        }
+
+        yield {
+            "unit": "cubic yards",
+            "type": "variable",
+            "variable_df_key_col_name": "Material volume",
+            "value": float(output_dict["material_volume_cubic_yards"]),
+        }
+
+        yield {
+            "unit": "cubic yards",
+            "type": "variable",
+            "variable_df_key_col_name": "Topsoil volume",
+            "value": float(output_dict["topsoil_volume"]),
+        }
 
-        result.append(
-            {
+        if input_dict["turbine_rating_MW"] >= 0.1:
+            yield {
                 "unit": "cubic yards",
                 "type": "variable",
-                "variable_df_key_col_name": "Material volume",
-                "value": float(self.output_dict["material_volume_cubic_yards"]),
+                "variable_df_key_col_name": "Embankment volume crane",
+                "value": float(output_dict["embankment_volume_crane"]),
             }
-        )
 
-        result.append(
-            {
+            yield {
                 "unit": "cubic yards",
                 "type": "variable",
-                "variable_df_key_col_name": "Topsoil volume",
-                "value": float(self.output_dict["topsoil_volume"]),
+                "variable_df_key_col_name": "Embankment volume road",
+                "value": float(output_dict["embankment_volume_road"]),
             }
-        )
-
-        if input_dict["turbine_rating_MW"] >= 0.1:
-            result.append(
-                {
-                    "unit": "cubic yards",
-                    "type": "variable",
-                    "variable_df_key_col_name": "Embankment volume crane",
-                    "value": float(self.output_dict["embankment_volume_crane"]),
-                }
-            )
 
-            result.append(
-                {
-                    "unit": "cubic yards",
-                    "type": "variable",
-                    "variable_df_key_col_name": "Embankment volume road",
-                    "value": float(self.output_dict["embankment_volume_road"]),
-                }
-            )
-
-            result.append(
-                {
-                    "unit": "ft^2",
-                    "type": "variable",
-                    "variable_df_key_col_name": "Rough grading area",
-                    "value": float(self.output_dict["rough_grading_area"]),
-                }
-            )
+            yield {
+                "unit": "ft^2",
+                "type": "variable",
+                "variable_df_key_col_name": "Rough grading area",
+                "value": float(output_dict["rough_grading_area"]),
+            }
 
-        for row in self.output_dict["total_road_cost"].itertuples():
+        for row in output_dict["total_road_cost"].itertuples():
             dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], math.ceil(row[2]))
-            result.append(
-                {
-                    "unit": "",
-                    "type": "dataframe",
-                    "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
-                    "value": dashed_row,
-                    "last_number": row[2],
-                }
-            )
-
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
-
-        self.output_dict["roads_cost_csv"] = result
-        return result
+            yield {
+                "unit": "",
+                "type": "dataframe",
+                "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
+                "value": dashed_row,
+                "last_number": row[2],
+            }
 
     def outputs_for_module_type_operation(self, input_dict, output_dict):
         """
@@ -937,7 +985,7 @@ class SitePreparationCost(CostModule):
             operation_data = self.estimate_construction_time(self.input_dict, self.output_dict)
 
             # pull only global inputs for weather delay from input_dict
-            weather_data_keys = ("wind_shear_exponent", "weather_window")
+            weather_data_keys = ("wind_shear_exponent", "weather_window", "weather_window_index")
 
             # specify roads-specific weather delay inputs
             self.weather_input_dict = dict(
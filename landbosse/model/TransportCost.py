@@ -31,6 +31,23 @@ class TransportCost(CostModule):
 
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "detail_level",
+        "num_turbines",
+        "rotor_diameter_m",
+        "turbine_rating_MW",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "total_transport_cost",
+        "transport_cost_csv",
+        "transport_cost_output_df",
+        "transport_cost_usd",
+        "transport_module_type_operation",
+    )
+    input_keys_written = ()
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -95,37 +112,44 @@ class TransportCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
         """
-        result = []
-        module = type(self).__name__
+        self.output_dict["transport_cost_csv"] = self.detail_rows(self.detailed_rows)
+        return self.output_dict["transport_cost_csv"]
 
-        for row in self.output_dict["transport_cost_output_df"].itertuples():
-            dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], np.ceil(row[2]))
-            result.append(
-                {
-                    "unit": "",
-                    "type": "dataframe",
-                    "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
-                    "value": dashed_row,
-                    "last_number": row[2],
-                }
-            )
+    def detailed_rows(self, input_dict, output_dict, summary):
+        """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
 
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
+
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
 
-        self.output_dict["transport_cost_csv"] = result
-        return result
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        for row in output_dict["transport_cost_output_df"].itertuples():
+            dashed_row = "{} <--> {} <--> {}".format(row[1], row[3], np.ceil(row[2]))
+            yield {
+                "unit": "",
+                "type": "dataframe",
+                "variable_df_key_col_name": "Type of Cost <--> Phase of Construction <--> Cost in USD ",
+                "value": dashed_row,
+                "last_number": row[2],
+            }
 
     def run_module(self):
         """
@@ -22,6 +22,23 @@ class TurbineCost(CostModule):
         (int) Number of turbines
     """
 
+    # The keys this module reads and writes. See CostModule.
+    input_keys = (
+        "detail_level",
+        "num_turbines",
+        "rotor_diameter_m",
+        "turbine_capex",
+        "turbine_rating_MW",
+    )
+    output_keys_read = ()
+    output_keys = (
+        "turbine_cost",
+        "turbine_cost_csv",
+        "turbine_cost_output_df",
+        "turbine_module_type_operation",
+    )
+    input_keys_written = ()
+
     def __init__(self, input_dict, output_dict, project_name):
         """
         Parameters
@@ -76,32 +93,41 @@ class TurbineCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Puts the rows of the detailed output in the output dictionary, as
+        set by the detail level of the project.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        list(dict) or DetailRows
+            The rows, each a dict. See CostModule.detail_rows().
+        """
+        self.output_dict["turbine_cost_csv"] = self.detail_rows(self.detailed_rows)
+        return self.output_dict["turbine_cost_csv"]
+
+    def detailed_rows(self, input_dict, output_dict, summary):
         """
+        Yields the rows of the detailed output, each a dict. See
+        CostModule.detail_rows().
 
-        result = []
-        module = type(self).__name__
+        Parameters
+        ----------
+        input_dict : dict
+            A copy of the input dictionary.
 
-        result.append({
+        output_dict : dict
+            A copy of the output dictionary after the module has run.
+
+        summary : bool
+            If True, only the summary rows are yielded.
+        """
+        yield {
             "unit": "usd",
             "type": "variable",
             "variable_df_key_col_name": "Turbine CapEx",
-            "value": float(self.output_dict["turbine_cost"]),
-        })
-
-        for _dict in result:
-            _dict["project_id_with_serial"] = self.project_name
-            _dict["module"] = module
-
-        self.output_dict["turbine_cost_csv"] = result
+            "value": float(output_dict["turbine_cost"]),
+        }
 
     def run_module(self):
         """
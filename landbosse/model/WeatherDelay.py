@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from .WeatherDelayCache import WeatherDelayCache
+from .WeatherWindowIndex import WeatherWindowIndex
+
 
 class WeatherDelay:
     """
@@ -40,6 +43,12 @@ class WeatherDelay:
     wind_height_of_interest_m
         (float) Height used in wind shear calculations.
 
+    weather_window_index
+        (WeatherWindowIndex) Optional. An index built from weather_window.
+        If present, delays are looked up in the index instead of scanning
+        the weather window. Manager.execute_landbosse builds one per
+        project.
+
     The OUTPUT keys are the following
 
     wind_delay
@@ -60,7 +69,15 @@ class WeatherDelay:
         self.input_dict = input_dict
         self.output_dict = output_dict
         self.validate_inputs(self.input_dict)
-        self.output_dict['wind_delays'] = self.calculate_wind_delay()
+
+        # Identical calculations are memoized across projects in the process.
+        # See WeatherDelayCache for details.
+        key = self.cache_key()
+        found, wind_delays = WeatherDelayCache.get(key)
+        if not found:
+            wind_delays = self.calculate_wind_delay()
+            WeatherDelayCache.put(key, tuple(wind_delays))
+        self.output_dict['wind_delays'] = list(wind_delays)
 
     def validate_inputs(self, input_dict):
         """
@@ -92,6 +109,48 @@ class WeatherDelay:
             err_msg = '{}: did not find all required keys in inputs dictionary. Missing keys are {}'
             raise ValueError(err_msg.format(type(self).__name__, required_keys - found_keys))
 
+    def cache_key(self):
+        """
+        Makes the key for this calculation in the WeatherDelayCache. The key
+        is a fingerprint of the wind speeds in the weather window and all
+        the scalar inputs.
+
+        Returns
+        -------
+        tuple
+            The key for the WeatherDelayCache.
+        """
+        index = self.weather_window_index()
+        if index is not None:
+            fingerprint = index.fingerprint
+        else:
+            fingerprint = WeatherDelayCache.fingerprint(self.input_dict['weather_window']['Speed m per s'].values)
+        return (
+            'wind_delays',
+            fingerprint,
+            WeatherDelayCache.scalar_key(self.input_dict['start_delay_hours']),
+            WeatherDelayCache.scalar_key(self.input_dict['mission_time_hours']),
+            WeatherDelayCache.scalar_key(self.input_dict['critical_wind_speed_m_per_s']),
+            WeatherDelayCache.scalar_key(self.input_dict['wind_height_of_interest_m']),
+            WeatherDelayCache.scalar_key(self.input_dict['wind_shear_exponent']),
+        )
+
+    def weather_window_index(self):
+        """
+        Finds the WeatherWindowIndex to use for this calculation, if any.
+
+        Returns
+        -------
+        WeatherWindowIndex or None
+            The index in the weather_window_index input key if it was built
+            from the weather_window input key. None otherwise, in which case
+            the weather window is scanned directly.
+        """
+        index = self.input_dict.get('weather_window_index')
+        if isinstance(index, WeatherWindowIndex) and index.indexes(self.input_dict['weather_window']):
+            return index
+        return None
+
     def calculate_wind_delay(self):
         """
         Calculates wind delay based on weather window, mission time, and critical wind speed.
@@ -122,6 +181,17 @@ class WeatherDelay:
         wind_shear_exponent = self.input_dict['wind_shear_exponent']
         weather_window = self.input_dict['weather_window']
 
+        # Look the delays up in the index when there is one. Start delays
+        # that are not whole, non-negative numbers of hours are sliced
+        # directly below.
+        index = self.weather_window_index()
+        if index is not None and isinstance(start_delay, (int, np.integer)) and start_delay >= 0:
+            return index.wind_delays(start_delay,
+                                     mission_time,
+                                     critical_wind_speed,
+                                     wind_height_of_interest_m,
+                                     wind_shear_exponent)
+
         # Extract only the 'Speed m per s' as a dataframe, and only retain
         # elements where index is > start_delay and < mission_time
         wind_speeds_m_s = weather_window['Speed m per s'].values
@@ -138,65 +208,200 @@ class WeatherDelay:
         # exceeded. Each element represents an hour of wind
         wind_delays = wind_speed_at_height_m_s > critical_wind_speed
 
-        # If there are any wind delays found:
-        #
-        # Iterate over each of the wind_delays. Count for contiguous blocks of
-        # hours of wind delays. Add the length of each of these blocks to the
-        # delay_durations.
-        #
-        # This code snippet takes O(n) linear time. The trick in vectorizing it
-        # is that contiguous blocks of unknown length of True wind delays
-        # are needed to find durations. But linear time may not be a problem
-        # because the data we are iterating over has already been filtered down
-        # to a small set.
-
-        if np.any(wind_delays):
-
-            # Holds the list of delay durations
-            delay_durations = []
-
-            # As we go through each delay, this accumulates the duration of
-            # the current delay. Each True element of wind_delays increments
-            # this by one
-            current_delay_duration = 0
-
-            # The following variable is True if we are iterating through
-            # that are True, which means a weather delay.
-            iterating_through_wind_delay = False
-
-            # Iterate over each element of wind_delays. This is O(n) as
-            # noted above.
-            for wind_delay in np.nditer(wind_delays):
-                # If we are in a weather delay...
-                if wind_delay:
-                    # If we are not currently iterating over a weather delay
-                    # a new continuous sequence of delayed hours has started.
-                    if not iterating_through_wind_delay:
-                        current_delay_duration = 1
-                        iterating_through_wind_delay = True
-
-                    # While iterating over delay, increment counter.
-                    else:
-                        current_delay_duration += 1
-
-                # If we are NOT iterating through a wind delay
-                # And we were iterating through a wind delay, end that
-                # delay and record the duration.
-                elif iterating_through_wind_delay:
-                    delay_durations.append(current_delay_duration)
-                    iterating_through_wind_delay = False
-
-                # Otherwise we are not iterating through a wind delay and
-                # and did not finish a wind delay, so we do nothing with
-                # no need for an else.
-
-            # Finally return the durations we found.
-            return delay_durations
-
         # If there are not wind delays, return a list with just 0 in it
-        else:
+        if not np.any(wind_delays):
             return [0]
 
+        return self.delay_durations(wind_delays)
+
+    @staticmethod
+    def delay_durations(wind_delays):
+        """
+        Finds the durations of the contiguous blocks of True values in a
+        boolean array of hourly wind delays.
+
+        This is a run-length encoding done entirely in NumPy. The array is
+        differenced so that +1 marks the first hour of a delay and -1 marks
+        the first hour after a delay has ended. The duration of each delay
+        is the distance between those two positions.
+
+        A delay that is still in progress at the end of the array has no
+        ending hour, so it is not counted. This matches the behavior of the
+        original hour-by-hour loop, which recorded a delay only when it saw
+        the delay end.
+
+        Parameters
+        ----------
+        wind_delays : np.ndarray
+            One dimensional array of booleans. True means the critical wind
+            speed is exceeded during that hour.
+
+        Returns
+        -------
+        list
+            Number of hours for each wind delay, in the order the delays
+            occur.
+        """
+        edges = np.diff(np.asarray(wind_delays, dtype=np.int8), prepend=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # Every end is preceded by a start, so pairing the first len(ends)
+        # starts with the ends drops only a trailing, unfinished delay.
+        return (ends - starts[:len(ends)]).tolist()
+
+    @classmethod
+    def batch(cls,
+              weather_window,
+              critical_speeds,
+              heights,
+              wind_shear_exponent,
+              start_delay_hours=0,
+              mission_time_hours=None,
+              max_cells_per_chunk=10_000_000):
+        """
+        Calculates the total wind delay time for many combinations of
+        critical wind speed and height of interest over the same weather
+        window at once.
+
+        Each row is one (critical speed, height) pair. For every row, the
+        delays are found exactly as an instance of this class would find
+        them, then each delay longer than 4 hours is turned into a 10 hour
+        shutdown for the full day, and the delays are summed. This is the
+        same total that the cost modules compute from the wind_delays
+        output key.
+
+        All rows are evaluated as one 2-D array operation. To bound memory,
+        the rows are processed in chunks so that no more than
+        max_cells_per_chunk hours are held in the 2-D arrays at once. Rows
+        already calculated in this process are taken from the
+        WeatherDelayCache instead.
+
+        Parameters
+        ----------
+        weather_window : pd.DataFrame
+            The weather window with a 'Speed m per s' column.
+
+        critical_speeds : array-like
+            Critical wind speed for each row in m/s.
+
+        heights : array-like
+            Height of interest for each row in m. Same length as
+            critical_speeds.
+
+        wind_shear_exponent : float
+            The exponent of the power law wind shear calculation.
+
+        start_delay_hours : int
+            Delay of the mission from the start of the weather window.
+
+        mission_time_hours : float
+            Length of the mission. If None, the mission is the entire
+            weather window.
+
+        max_cells_per_chunk : int
+            Upper bound on rows times hours evaluated in one chunk.
+
+        Returns
+        -------
+        np.ndarray
+            Total wind delay time in hours for each row.
+
+        Raises
+        ------
+        ValueError
+            If the mission time is longer than the weather window or the
+            speed and height arrays have different lengths.
+        """
+        critical_speeds = np.asarray(critical_speeds, dtype=np.float64)
+        heights = np.asarray(heights, dtype=np.float64)
+        if critical_speeds.shape != heights.shape or critical_speeds.ndim != 1:
+            raise ValueError('{}: critical_speeds and heights must be 1-D arrays of the same length'.format(cls.__name__))
+
+        wind_speeds_m_s = weather_window['Speed m per s'].values
+        if mission_time_hours is None:
+            mission_time_hours = len(wind_speeds_m_s)
+        if mission_time_hours > len(wind_speeds_m_s):
+            raise ValueError('{}: Error: Mission time longer than weather window'.format(cls.__name__))
+        wind_speeds_m_s_filtered = wind_speeds_m_s[(start_delay_hours + 1):(int(mission_time_hours) + 1)]
+
+        totals = np.zeros(len(critical_speeds))
+        hours = len(wind_speeds_m_s_filtered)
+        if hours == 0:
+            return totals
+
+        # Look up every row in the WeatherDelayCache first, so only rows that
+        # have not been calculated before in this process are evaluated.
+        fingerprint = WeatherDelayCache.fingerprint(wind_speeds_m_s)
+        keys = [
+            ('batch_total',
+             fingerprint,
+             WeatherDelayCache.scalar_key(start_delay_hours),
+             WeatherDelayCache.scalar_key(mission_time_hours),
+             critical_speed,
+             height,
+             WeatherDelayCache.scalar_key(wind_shear_exponent))
+            for critical_speed, height in zip(critical_speeds.tolist(), heights.tolist())
+        ]
+        missing_rows = []
+        for row, key in enumerate(keys):
+            found, total = WeatherDelayCache.get(key)
+            if found:
+                totals[row] = total
+            else:
+                missing_rows.append(row)
+        missing_rows = np.array(missing_rows, dtype=np.intp)
+
+        rows_per_chunk = max(1, max_cells_per_chunk // hours)
+        for first_row in range(0, len(missing_rows), rows_per_chunk):
+            chunk = missing_rows[first_row:first_row + rows_per_chunk]
+            totals[chunk] = cls._batch_delay_totals(wind_speeds_m_s_filtered,
+                                                    critical_speeds[chunk],
+                                                    heights[chunk],
+                                                    wind_shear_exponent)
+        for row in missing_rows.tolist():
+            WeatherDelayCache.put(keys[row], float(totals[row]))
+
+        return totals
+
+    @staticmethod
+    def _batch_delay_totals(wind_speeds_m_s, critical_speeds, heights, wind_shear_exponent):
+        """
+        Computes the delay totals for one chunk of rows. See batch() for
+        the meaning of the parameters.
+
+        The run-length encoding is the same as delay_durations(), done on
+        every row of a 2-D array. Starts and ends come back from
+        np.nonzero in row-major order, so after removing any unfinished
+        delay at the end of a row, the k-th start pairs with the k-th end.
+        """
+        # calculate_wind_delay() scales the speeds by a Python float, which
+        # NumPy evaluates in the dtype of the speeds. Compute each row's shear
+        # multiplier the same way and cast the multipliers and the critical
+        # speeds to that dtype so that every row matches the scalar path.
+        dtype = wind_speeds_m_s.dtype if np.issubdtype(wind_speeds_m_s.dtype, np.floating) else np.float64
+        shear_multipliers = np.array([(height / 100) ** wind_shear_exponent for height in heights.tolist()], dtype=dtype)
+        wind_speed_at_height_m_s = wind_speeds_m_s[np.newaxis, :] * shear_multipliers[:, np.newaxis]
+        wind_delays = wind_speed_at_height_m_s > critical_speeds.astype(dtype)[:, np.newaxis]
+
+        edges = np.diff(wind_delays.astype(np.int8), axis=1, prepend=np.int8(0))
+        start_rows, start_cols = np.nonzero(edges == 1)
+        end_rows, end_cols = np.nonzero(edges == -1)
+
+        # A row has an unfinished delay if it has more starts than ends.
+        # That delay is always the last start in its row.
+        starts_per_row = np.bincount(start_rows, minlength=len(heights))
+        ends_per_row = np.bincount(end_rows, minlength=len(heights))
+        last_start_in_row = np.r_[start_rows[1:] != start_rows[:-1], True] if len(start_rows) else np.array([], dtype=bool)
+        unfinished = last_start_in_row & (starts_per_row > ends_per_row)[start_rows]
+        start_cols = start_cols[~unfinished]
+
+        durations = end_cols - start_cols
+
+        # if greater than 4 hour delay, then shut down for full day (10 hours)
+        durations = np.where(durations > 4, 10, durations)
+        return np.bincount(end_rows, weights=durations, minlength=len(heights))
+
     def run_module(self):
         """
         This method runs all other methods in the module in order to set the
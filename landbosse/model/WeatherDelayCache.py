@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class WeatherDelayCache:
+    """
+    This class does not need to be instantiated. The cache is a class
+    attribute, so it is shared by every WeatherDelay calculation in the
+    process. Within one worker of a parallel run, every project that
+    runs in that worker shares the same cache.
+
+    FoundationCost, SitePreparationCost, CollectionCost and ErectionCost
+    all calculate wind delays over the same filtered weather window. In a
+    parametric sweep, the same weather window, wind shear exponent and
+    critical wind speed recur across many projects. This class memoizes
+    the results of those calculations so each one is only done once.
+
+    Keys are tuples made of a fingerprint of the wind speed array (a hash
+    of its contents, see fingerprint() below) and the scalar inputs of the
+    calculation. The values are whatever the caller stores. WeatherDelay
+    stores lists of delay durations and totals of delay time.
+
+    The cache is a least recently used (LRU) cache bounded to maxsize
+    entries. Setting maxsize to 0 disables the cache.
+
+    Hits and misses are counted so the effectiveness of the cache can be
+    inspected with stats().
+    """
+
+    # _cache holds the cached values in least recently used order. The
+    # most recently used entry is at the end.
+    _cache = OrderedDict()
+
+    # Maximum number of entries in the cache.
+    maxsize = 65536
+
+    # Counters of cache hits and misses since the last clear()
+    hits = 0
+    misses = 0
+
+    # The lock makes the cache safe to use from multiple threads.
+    _lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(values):
+        """
+        Creates a fingerprint of the contents of an array. Arrays with the
+        same dtype, shape and contents have the same fingerprint.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The array to fingerprint, usually the 'Speed m per s' column
+            of a weather window.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the array.
+        """
+        values = np.ascontiguousarray(values)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(values.dtype).encode())
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def scalar_key(value):
+        """
+        Makes a key component for a scalar input.
+
+        The type is part of the key because NumPy evaluates a Python float
+        and a np.float64 with the same value differently when they are
+        combined with a float32 weather window.
+
+        Parameters
+        ----------
+        value
+            The scalar input, such as a critical wind speed.
+
+        Returns
+        -------
+        tuple
+            The name of the type and the value.
+        """
+        return type(value).__name__, value
+
+    @classmethod
+    def get(cls, key):
+        """
+        Looks up a key in the cache and counts a hit or a miss.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the cached value.
+
+        Returns
+        -------
+        bool, object
+            True and the cached value if the key was found. False and None
+            otherwise.
+        """
+        with cls._lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                cls.hits += 1
+                return True, cls._cache[key]
+            cls.misses += 1
+            return False, None
+
+    @classmethod
+    def put(cls, key, value):
+        """
+        Stores a value in the cache. If the cache is full, the least recently
+        used entries are evicted.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the value.
+
+        value : object
+            The value to store. It should not be mutated after it is stored.
+        """
+        with cls._lock:
+            if cls.maxsize <= 0:
+                return
+            cls._cache[key] = value
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.maxsize:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns
+        -------
+        dict
+            The hits, misses, current size and maximum size of the cache.
+        """
+        with cls._lock:
+            return {
+                'hits': cls.hits,
+                'misses': cls.misses,
+                'size': len(cls._cache),
+                'maxsize': cls.maxsize,
+            }
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all entries from the cache and resets the hit and miss
+        counters.
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def set_maxsize(cls, maxsize):
+        """
+        Changes the maximum number of entries in the cache, evicting the
+        least recently used entries if needed.
+
+        Parameters
+        ----------
+        maxsize : int
+            The new maximum size. 0 disables the cache.
+        """
+        with cls._lock:
+            cls.maxsize = maxsize
+            while len(cls._cache) > max(maxsize, 0):
+                cls._cache.popitem(last=False)
@@ -0,0 +1,233 @@
+import threading
+
+import numpy as np
+
+from .WeatherDelayCache import WeatherDelayCache
+
+
+class WeatherWindowIndex:
+    """
+    An index over the wind speeds of one weather window that answers wind
+    delay queries without rescanning the window.
+
+    Manager.execute_landbosse builds one index per project from the
+    filtered weather window. WeatherDelay then uses it to answer every
+    (start delay, mission time, critical wind speed) query on that window.
+
+    For each distinct threshold, meaning each combination of critical wind
+    speed, height of interest and wind shear exponent, the index is built
+    once over the whole window. It holds:
+
+    - The cumulative count of hours that exceed the threshold, so whether
+      a slice of the window has any delay is a subtraction.
+
+    - The first and one-past-last hour of each contiguous delay (the run
+      boundaries).
+
+    - The cumulative sum of the delay lengths after the "longer than 4 hours
+      becomes a 10 hour shutdown" rule is applied (the clipped lengths).
+
+    A query for hours start_delay + 1 through mission_time finds the delays
+    that end inside that slice by binary search on the run ends. The total
+    delay time is a difference of two prefix sums, corrected for the first
+    delay if it began before the slice. Delays still in progress at the
+    end of the slice are not counted, the same as in WeatherDelay.
+
+    Parameters
+    ----------
+    weather_window : pd.DataFrame
+        The weather window with a 'Speed m per s' column. The index keeps a
+        reference to it so that WeatherDelay can check that it is being
+        asked about the same window.
+    """
+
+    def __init__(self, weather_window):
+        self.weather_window = weather_window
+        self.wind_speeds_m_s = weather_window['Speed m per s'].values
+        self.fingerprint = WeatherDelayCache.fingerprint(self.wind_speeds_m_s)
+        self._thresholds = dict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.wind_speeds_m_s)
+
+    def indexes(self, weather_window):
+        """
+        Parameters
+        ----------
+        weather_window : pd.DataFrame
+            A weather window.
+
+        Returns
+        -------
+        bool
+            True if this index was built from the given weather window.
+        """
+        return weather_window is self.weather_window
+
+    def threshold(self, critical_wind_speed_m_per_s, wind_height_of_interest_m, wind_shear_exponent):
+        """
+        Returns the precomputed run boundaries and prefix sums for a
+        threshold, building them the first time the threshold is used.
+
+        The exceedance mask is computed with exactly the same arithmetic as
+        WeatherDelay.calculate_wind_delay() so that the answers are
+        identical.
+
+        Parameters
+        ----------
+        critical_wind_speed_m_per_s : float
+            Wind speed at which the mission shuts down.
+
+        wind_height_of_interest_m : float
+            Height used in the wind shear calculation.
+
+        wind_shear_exponent : float
+            The exponent of the power law wind shear calculation.
+
+        Returns
+        -------
+        dict
+            The keys are 'exceedance_count', 'starts', 'ends', 'lengths' and
+            'clipped_length_sum'. See the class docstring.
+        """
+        key = (
+            WeatherDelayCache.scalar_key(critical_wind_speed_m_per_s),
+            WeatherDelayCache.scalar_key(wind_height_of_interest_m),
+            WeatherDelayCache.scalar_key(wind_shear_exponent),
+        )
+        with self._lock:
+            if key in self._thresholds:
+                return self._thresholds[key]
+
+        wind_speed_at_height_m_s = self.wind_speeds_m_s * (wind_height_of_interest_m / 100) ** wind_shear_exponent
+        wind_delays = wind_speed_at_height_m_s > critical_wind_speed_m_per_s
+
+        edges = np.diff(wind_delays.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+
+        # A delay that reaches the end of the window has an end equal to the
+        # length of the window. No slice can contain its ending, so it is
+        # never counted, just like an unfinished delay in WeatherDelay.
+        clipped_lengths = np.where(lengths > 4, 10, lengths)
+
+        result = {
+            'exceedance_count': np.concatenate(([0], np.cumsum(wind_delays, dtype=np.int64))),
+            'starts': starts,
+            'ends': ends,
+            'lengths': lengths,
+            'clipped_length_sum': np.concatenate(([0], np.cumsum(clipped_lengths, dtype=np.int64))),
+        }
+        with self._lock:
+            self._thresholds[key] = result
+        return result
+
+    def _runs_in_slice(self, threshold, start_delay_hours, mission_time_hours):
+        """
+        Finds the delays that end inside the slice of the window used for a
+        mission.
+
+        Returns
+        -------
+        int, int, int, int, bool
+            The first hour of the slice, the end of the slice, the index of
+            the first delay and one past the index of the last delay that
+            end inside the slice, and whether any hour in the slice exceeds
+            the threshold.
+        """
+        if mission_time_hours > len(self):
+            raise ValueError('{}: Error: Mission time longer than weather window'.format(type(self).__name__))
+        first_hour = start_delay_hours + 1
+        end_hour = min(int(mission_time_hours) + 1, len(self))
+        if first_hour >= end_hour:
+            return first_hour, end_hour, 0, 0, False
+
+        exceedance_count = threshold['exceedance_count']
+        any_delays = exceedance_count[end_hour] - exceedance_count[first_hour] > 0
+
+        ends = threshold['ends']
+        first_run = int(np.searchsorted(ends, first_hour, side='right'))
+        last_run = int(np.searchsorted(ends, end_hour, side='left'))
+        return first_hour, end_hour, first_run, last_run, any_delays
+
+    def wind_delays(self,
+                    start_delay_hours,
+                    mission_time_hours,
+                    critical_wind_speed_m_per_s,
+                    wind_height_of_interest_m,
+                    wind_shear_exponent):
+        """
+        Finds the duration of each wind delay during a mission. The result is
+        the same as WeatherDelay.calculate_wind_delay() on the indexed
+        window.
+
+        Parameters
+        ----------
+        start_delay_hours : int
+            Delay of the mission from the start of the weather window.
+
+        mission_time_hours : float
+            Length of the mission.
+
+        critical_wind_speed_m_per_s : float
+            Wind speed at which the mission shuts down.
+
+        wind_height_of_interest_m : float
+            Height used in the wind shear calculation.
+
+        wind_shear_exponent : float
+            The exponent of the power law wind shear calculation.
+
+        Returns
+        -------
+        list
+            Number of hours for each wind delay during the mission, or [0]
+            if the critical wind speed is never exceeded.
+        """
+        threshold = self.threshold(critical_wind_speed_m_per_s, wind_height_of_interest_m, wind_shear_exponent)
+        first_hour, _, first_run, last_run, any_delays = \
+            self._runs_in_slice(threshold, start_delay_hours, mission_time_hours)
+        if not any_delays:
+            return [0]
+
+        durations = threshold['lengths'][first_run:last_run].tolist()
+        if durations and threshold['starts'][first_run] < first_hour:
+            durations[0] = int(threshold['ends'][first_run]) - first_hour
+        return durations
+
+    def wind_delay_time(self,
+                        start_delay_hours,
+                        mission_time_hours,
+                        critical_wind_speed_m_per_s,
+                        wind_height_of_interest_m,
+                        wind_shear_exponent):
+        """
+        Calculates the total wind delay time during a mission in O(1) after
+        the threshold has been indexed. Delays longer than 4 hours count as
+        a 10 hour shutdown for the full day.
+
+        See wind_delays() for the parameters.
+
+        Returns
+        -------
+        float
+            Total wind delay time in hours.
+        """
+        threshold = self.threshold(critical_wind_speed_m_per_s, wind_height_of_interest_m, wind_shear_exponent)
+        first_hour, _, first_run, last_run, any_delays = \
+            self._runs_in_slice(threshold, start_delay_hours, mission_time_hours)
+        if not any_delays or first_run >= last_run:
+            return 0.0
+
+        clipped_length_sum = threshold['clipped_length_sum']
+        total = int(clipped_length_sum[last_run] - clipped_length_sum[first_run])
+
+        # The first delay may have started before the slice. If so, only the
+        # hours inside the slice count.
+        if threshold['starts'][first_run] < first_hour:
+            full_length = int(threshold['lengths'][first_run])
+            partial_length = int(threshold['ends'][first_run]) - first_hour
+            total += (10 if partial_length > 4 else partial_length) - (10 if full_length > 4 else full_length)
+        return float(total)
@@ -1,6 +1,8 @@
 from .ManagementCost import ManagementCost
 from .Manager import Manager
 from .WeatherDelay import WeatherDelay
+from .WeatherDelayCache import WeatherDelayCache
+from .WeatherWindowIndex import WeatherWindowIndex
 from .FoundationCost import FoundationCost
 from .ErectionCost import ErectionCost
 from .SitePreparationCost import SitePreparationCost
@@ -9,3 +11,13 @@ from .GridConnectionCost import GridConnectionCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .DevelopmentCost import DevelopmentCost
 from .DefaultMasterInputDict import DefaultMasterInputDict
+from .ProjectResultCache import ProjectResultCache
+from .ModuleResultCache import ModuleResultCache
+from .CurveFitBatch import CurveFitBatch
+from .FoundationRadiusBatch import FoundationRadiusBatch
+from .CraneCapabilityIndex import CraneCapabilityIndex
+from .CranePolyCache import CranePolyCache
+from .CraneGeometry import CraneGeometry
+from .CraneCostTensor import CraneCostTensor
+from .DetailRows import DetailRows
+from .CostModule import CostModule
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+from unittest import TestCase, skipIf
+
+import pandas as pd
+
+from landbosse.excelio import ArrowResultSink, CsvResultSink, ResultSink
+from landbosse.tests.excelio.test_ResultSink import generate_output_dict
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset
+    import pyarrow.feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TestArrowResultSink(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, output_format, partition_by='none', projects=(('a', 100.0), ('b', 200.0))):
+        extension = ArrowResultSink.formats[output_format]
+        costs_path = os.path.join(self.directory.name, f'costs{extension}')
+        details_path = os.path.join(self.directory.name, f'details{extension}')
+        sink = ArrowResultSink(costs_path=costs_path, details_path=details_path, output_format=output_format,
+                               partition_by=partition_by)
+        for project_id_with_serial, cost in projects:
+            sink.add(project_id_with_serial, ResultSink.reduce(generate_output_dict(project_id_with_serial, cost)))
+        sink.close()
+        return costs_path, details_path
+
+    def test_files(self):
+        """
+        Tests that each project is a row group or record batch, that the
+        columns are those of the .csv files, and that the names are
+        dictionary encoded.
+        """
+        for output_format in ArrowResultSink.formats:
+            with self.subTest(output_format=output_format):
+                costs_path, details_path = self.write(output_format)
+                if output_format == 'parquet':
+                    self.assertEqual(pq.ParquetFile(costs_path).num_row_groups, 2)
+                    costs, details = pq.read_table(costs_path), pq.read_table(details_path)
+                else:
+                    with pa.ipc.open_file(costs_path) as reader:
+                        self.assertEqual(reader.num_record_batches, 2)
+                    costs, details = pa.feather.read_table(costs_path), pa.feather.read_table(details_path)
+
+                self.assertEqual(costs.schema.names, CsvResultSink.costs_columns)
+                self.assertEqual(details.schema.names, CsvResultSink.details_columns)
+                self.assertTrue(pa.types.is_dictionary(costs.schema.field('Project ID with serial').type))
+                self.assertTrue(pa.types.is_dictionary(details.schema.field('Variable name').type))
+                self.assertEqual(costs.column('Project ID with serial').to_pylist(), ['a', 'b'])
+                self.assertEqual(costs.column('Cost per project').to_pylist(), [100.0, 200.0])
+                self.assertEqual(costs.column('Number of turbines').to_pylist(), [10, 10])
+                self.assertEqual(details.column('Numeric value').to_pylist(), [100.0, 200.0])
+
+    def test_linear_size(self):
+        """
+        Tests that the size of the files grows linearly with the number of
+        projects, so that the dictionaries of earlier projects are not
+        written again with each project. The names of the projects are
+        hashes so that they do not compress.
+        """
+        for output_format in ArrowResultSink.formats:
+            with self.subTest(output_format=output_format):
+                sizes = []
+                for project_count in [50, 100, 200]:
+                    projects = [(hashlib.sha256(str(index).encode()).hexdigest(), float(index))
+                                for index in range(project_count)]
+                    costs_path, _ = self.write(output_format, projects=projects)
+                    sizes.append(os.path.getsize(costs_path))
+                self.assertLess(sizes[2] - sizes[1], 2.2 * (sizes[1] - sizes[0]))
+
+    def test_partitions(self):
+        """
+        Tests that partitioned files are read back as one dataset with hive
+        partitioning.
+        """
+        for output_format, dataset_format in [('parquet', 'parquet'), ('feather', 'ipc')]:
+            for partition_by, directories in [('project', ['Project ID with serial=a', 'Project ID with serial=b']),
+                                              ('module', ['Module=ErectionCost'])]:
+                with self.subTest(output_format=output_format, partition_by=partition_by):
+                    costs_path, _ = self.write(output_format, partition_by)
+                    self.assertEqual(sorted(os.listdir(costs_path)), directories)
+                    costs = pa.dataset.dataset(costs_path, format=dataset_format, partitioning='hive').to_table()
+                    self.assertEqual(sorted(costs.column('Cost per project').to_pylist()), [100.0, 200.0])
+
+    def test_no_rows(self):
+        """
+        Tests that files without rows still have their columns.
+        """
+        costs_path, _ = self.write('parquet', projects=())
+        self.assertEqual(pq.read_table(costs_path).schema.names, CsvResultSink.costs_columns)
+
+    def test_write_dataframe(self):
+        """
+        Tests that columns of mixed types are written as strings.
+        """
+        df = pd.DataFrame({'Project ID': ['a', 'b'], 'Value': [1, 'x'], 'Rating': [1.5, None]})
+        for output_format in ArrowResultSink.formats:
+            with self.subTest(output_format=output_format):
+                path = os.path.join(self.directory.name, f'list{ArrowResultSink.formats[output_format]}')
+                ArrowResultSink.write_dataframe(df, path, output_format)
+                table = pq.read_table(path) if output_format == 'parquet' else pa.feather.read_table(path)
+                self.assertEqual(table.column('Value').to_pylist(), ['1', 'x'])
+                self.assertEqual(table.column('Rating').to_pylist(), [1.5, None])
+
+    def test_unknown_options(self):
+        path = os.path.join(self.directory.name, 'costs')
+        with self.assertRaises(ValueError):
+            ArrowResultSink(costs_path=path, details_path=path, output_format='csv')
+        with self.assertRaises(ValueError):
+            ArrowResultSink(costs_path=path, details_path=path, partition_by='turbine')
@@ -0,0 +1,131 @@
+import os
+import sys
+import tempfile
+from concurrent import futures
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from landbosse.excelio import CheckpointStore, ListResultSink, XlsxParallelManagerRunner, XlsxSerialManagerRunner
+from landbosse.model import Manager, ManagementCost, ModuleResultCache, ProjectResultCache
+from landbosse.tests.model.test_ModuleResultCache import template_input_dir, template_project_list
+
+
+class TestCheckpointStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'checkpoint', 'checkpoint.sqlite')
+        self.project_data_xlsx = os.path.join(self.directory.name, 'project_data.xlsx')
+        with open(self.project_data_xlsx, 'wb') as f:
+            f.write(b'project data')
+        self.project_parameters = pd.Series({'Project ID': 'a', 'Total project construction time (months)': 9})
+        self.project_data_edits = [('components', 'Tower', 'Lever arm m', 55.5)]
+        self.reduced_output_dict = {'erection_module_type_operation': [{'cost_per_project': 100.0}]}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_input_hash(self):
+        """
+        Tests that the input hash changes when any of the inputs change.
+        """
+        with CheckpointStore(self.checkpoint) as store:
+            input_hash = store.input_hash(self.project_parameters, self.project_data_xlsx, self.project_data_edits)
+            self.assertEqual(input_hash,
+                             store.input_hash(self.project_parameters.copy(), self.project_data_xlsx,
+                                              list(self.project_data_edits)))
+
+            changed_parameters = self.project_parameters.copy()
+            changed_parameters['Total project construction time (months)'] = 10
+            self.assertNotEqual(input_hash,
+                                store.input_hash(changed_parameters, self.project_data_xlsx, self.project_data_edits))
+
+            changed_edits = [('components', 'Tower', 'Lever arm m', 56.5)]
+            self.assertNotEqual(input_hash,
+                                store.input_hash(self.project_parameters, self.project_data_xlsx, changed_edits))
+
+            self.assertNotEqual(input_hash,
+                                store.input_hash(self.project_parameters, self.project_data_xlsx,
+                                                 self.project_data_edits, keep_details=False))
+
+        # Files are hashed once per store, so use a new store to see the
+        # changed file.
+        with open(self.project_data_xlsx, 'wb') as f:
+            f.write(b'changed project data')
+        with CheckpointStore(self.checkpoint) as store:
+            self.assertNotEqual(input_hash,
+                                store.input_hash(self.project_parameters, self.project_data_xlsx,
+                                                 self.project_data_edits))
+
+    def test_resume(self):
+        """
+        Tests that a result is found again after the store is reopened, but
+        only with the same input hash, and that a new result replaces it.
+        """
+        with CheckpointStore(self.checkpoint) as store:
+            self.assertIsNone(store.completed('a', 'hash 1'))
+            store.expect('a', 'hash 1')
+            store.add('a', self.reduced_output_dict)
+
+        with CheckpointStore(self.checkpoint) as store:
+            self.assertEqual(store.completed('a', 'hash 1'), self.reduced_output_dict)
+            self.assertIsNone(store.completed('a', 'hash 2'))
+            self.assertIsNone(store.completed('b', 'hash 1'))
+
+            store.expect('a', 'hash 2')
+            store.add('a', {})
+            self.assertIsNone(store.completed('a', 'hash 1'))
+            self.assertEqual(store.completed('a', 'hash 2'), {})
+
+
+class TestResumeAfterFailure(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.directory = tempfile.TemporaryDirectory()
+        self.maxsize = ModuleResultCache.maxsize
+        self.cache_dir = ProjectResultCache.cache_dir
+        ModuleResultCache.set_maxsize(0)
+        ProjectResultCache.cache_dir = None
+
+    def tearDown(self):
+        ModuleResultCache.set_maxsize(self.maxsize)
+        ProjectResultCache.cache_dir = self.cache_dir
+        self.directory.cleanup()
+
+    def run_template(self, runner_class, checkpoint):
+        """
+        Runs the projects of the template with the checkpoint, resuming from
+        it, and returns the names of the projects that were calculated.
+        """
+        environ = {'LANDBOSSE_INPUT_DIR': template_input_dir(), 'LANDBOSSE_OUTPUT_DIR': self.directory.name}
+        calculated = []
+
+        def execute_landbosse(manager, project_name):
+            calculated.append(project_name)
+            return execute_landbosse.original(manager, project_name)
+
+        execute_landbosse.original = Manager.execute_landbosse
+        with mock.patch.dict(os.environ, environ), mock.patch.object(sys, 'argv', ['main.py']), \
+                mock.patch.object(Manager, 'execute_landbosse', execute_landbosse):
+            runner = runner_class(checkpoint=checkpoint, resume=True, parametric_project_data='none')
+            runner.run_from_project_list_xlsx(os.path.join(template_input_dir(), 'project_list.xlsx'),
+                                              result_sinks=[ListResultSink()])
+        return calculated
+
+    def test_failed_projects_run_again(self):
+        """
+        Tests that projects in which a module raised are not checkpointed,
+        so they are calculated again when the run is resumed.
+        """
+        project_count = len(template_project_list())
+        # Run the projects in threads, so that the patches reach them.
+        with mock.patch('landbosse.excelio.XlsxParallelManagerRunner.futures.ProcessPoolExecutor',
+                        futures.ThreadPoolExecutor):
+            for runner_class in [XlsxSerialManagerRunner, XlsxParallelManagerRunner]:
+                with self.subTest(runner_class=runner_class.__name__):
+                    checkpoint = os.path.join(self.directory.name, f'{runner_class.__name__}.sqlite')
+                    with mock.patch.object(ManagementCost, 'run_module', side_effect=RuntimeError('failed')):
+                        self.assertEqual(len(self.run_template(runner_class, checkpoint)), project_count)
+                    self.assertEqual(len(self.run_template(runner_class, checkpoint)), project_count)
+                    self.assertEqual(self.run_template(runner_class, checkpoint), [])
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio import ParametricProjectDataWriter, XlsxDataframeCache
+
+
+class TestParametricProjectDataWriter(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.basename = 'parametric_writer_test_project_data'
+        self.components = pd.DataFrame({'Component': ['Tower', 'Nacelle'], 'Mass tonne': [100.5, 60.25]})
+        with pd.ExcelWriter(os.path.join(self.temp_dir.name, f'{self.basename}.xlsx')) as writer:
+            self.components.to_excel(writer, sheet_name='components', index=False)
+        XlsxDataframeCache.read_all_sheets_from_xlsx(self.basename, self.temp_dir.name)
+        self.edits = [('components', 'Nacelle', 'Mass tonne', 75.5)]
+
+    def tearDown(self):
+        XlsxDataframeCache._cache.pop(self.basename, None)
+        self.temp_dir.cleanup()
+
+    def test_manifest_reconstructs_variant(self):
+        """
+        Tests that a variant reconstructed from the manifest has the edited
+        project data.
+        """
+        with ParametricProjectDataWriter(self.temp_dir.name, mode='manifest') as writer:
+            writer.add('variant_1', self.basename, self.edits)
+            writer.add('variant_2', self.basename, [('components', 'Tower', 'Mass tonne', 90.5)])
+        manifest_csv = os.path.join(self.temp_dir.name, ParametricProjectDataWriter.manifest_basename)
+
+        sheets = ParametricProjectDataWriter.reconstruct(manifest_csv, 'variant_1')
+        expected = self.components.copy()
+        expected.loc[1, 'Mass tonne'] = 75.5
+        assert_frame_equal(expected, sheets['components'])
+
+    def test_modes(self):
+        """
+        Tests that xlsx mode writes a workbook per variant and none mode
+        writes nothing.
+        """
+        with ParametricProjectDataWriter(self.temp_dir.name, mode='xlsx') as writer:
+            writer.add('variant_1', self.basename, self.edits)
+        written = os.path.join(self.temp_dir.name, 'variant_1_project_data.xlsx')
+        self.assertTrue(os.path.exists(written))
+        self.assertEqual(pd.read_excel(written, sheet_name='components', index_col=0).loc[1, 'Mass tonne'], 75.5)
+
+        files_before = set(os.listdir(self.temp_dir.name))
+        with ParametricProjectDataWriter(self.temp_dir.name, mode='none') as writer:
+            writer.add('variant_2', self.basename, self.edits)
+        self.assertEqual(files_before, set(os.listdir(self.temp_dir.name)))
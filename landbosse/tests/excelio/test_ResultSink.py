@@ -0,0 +1,109 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import ResultSink, ListResultSink, CsvResultSink
+from landbosse.model import CostModule
+
+
+def generate_output_dict(project_id_with_serial, cost):
+    """
+    Makes an output dictionary with one module's cost and detail rows and
+    a large value that should not be kept.
+    """
+    return {
+        'project_id_with_serial': project_id_with_serial,
+        'erection_crane_data': pd.DataFrame({'Crane name': ['a', 'b']}),
+        'erection_module_type_operation': pd.DataFrame({
+            'operation_id': ['Erection'],
+            'type_of_cost': ['Labor'],
+            'raw_cost': [cost],
+            'turbine_rating_MW': [2.5],
+            'num_turbines': [10],
+            'rotor_diameter_m': [120],
+            'project_id_with_serial': [project_id_with_serial],
+            'module': ['ErectionCost'],
+            'raw_cost_total_or_per_turbine': ['total'],
+            'cost_per_turbine': [cost / 10],
+            'cost_per_project': [cost],
+            'usd_per_kw_per_project': [cost / 25000],
+        }),
+        'erection_csv': [
+            {
+                'project_id_with_serial': project_id_with_serial,
+                'module': 'ErectionCost',
+                'variable_df_key_col_name': 'Total cost',
+                'unit': 'usd',
+                'value': cost,
+            }
+        ],
+    }
+
+
+class TestResultSink(TestCase):
+    def test_reduce(self):
+        """
+        Tests that reduce() keeps only the cost and detail rows.
+        """
+        reduced = ResultSink.reduce(generate_output_dict('a', 100.0))
+        self.assertEqual(sorted(reduced), ['erection_csv', 'erection_module_type_operation'])
+        self.assertEqual(len(ResultSink.cost_rows(reduced)), 1)
+        self.assertEqual(len(ResultSink.detail_rows(reduced)), 1)
+
+        reduced = ResultSink.reduce(generate_output_dict('a', 100.0), keep_details=False)
+        self.assertEqual(sorted(reduced), ['erection_module_type_operation'])
+        self.assertEqual(ResultSink.detail_rows(reduced), [])
+
+    def test_sinks_need_details(self):
+        """
+        Tests that the details are needed unless every sink discards them.
+        """
+        self.assertTrue(ResultSink.sinks_need_details(None))
+        self.assertFalse(ResultSink.sinks_need_details([]))
+        self.assertFalse(ResultSink.sinks_need_details([ListResultSink(keep_details=False)]))
+        self.assertTrue(ResultSink.sinks_need_details([ListResultSink(keep_details=False), ListResultSink()]))
+
+    def test_list_sink(self):
+        """
+        Tests that ListResultSink collects the rows in order and can
+        discard the details.
+        """
+        sink = ListResultSink()
+        summary_sink = ListResultSink(keep_details=False)
+        for project_id_with_serial, cost in [('a', 100.0), ('b', 200.0)]:
+            reduced = ResultSink.reduce(generate_output_dict(project_id_with_serial, cost))
+            sink.add(project_id_with_serial, reduced)
+            summary_sink.add(project_id_with_serial, reduced)
+        sink.close()
+        summary_sink.close()
+
+        self.assertEqual(list(sink.costs_by_module_type_operation['cost_per_project']), [100.0, 200.0])
+        self.assertEqual(list(sink.costs_by_module_type_operation.index), [0, 1])
+        self.assertEqual([row['value'] for row in sink.details_list], [100.0, 200.0])
+        self.assertEqual(len(summary_sink.costs_by_module_type_operation), 2)
+        self.assertEqual(list(ListResultSink().costs_by_module_type_operation.columns), CostModule.cost_columns)
+        self.assertEqual(summary_sink.details_list, [])
+
+    def test_csv_sink(self):
+        """
+        Tests that CsvResultSink writes one header and appends the rows of
+        each project.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            costs_csv = os.path.join(directory, 'costs.csv')
+            details_csv = os.path.join(directory, 'details.csv')
+            sink = CsvResultSink(costs_csv=costs_csv, details_csv=details_csv)
+            for project_id_with_serial, cost in [('a', 100.0), ('b', 200.0)]:
+                sink.add(project_id_with_serial, ResultSink.reduce(generate_output_dict(project_id_with_serial, cost)))
+            sink.close()
+
+            costs = pd.read_csv(costs_csv)
+            details = pd.read_csv(details_csv)
+
+        self.assertEqual(list(costs.columns), CsvResultSink.costs_columns)
+        self.assertEqual(list(details.columns), CsvResultSink.details_columns)
+        self.assertEqual(list(costs['Project ID with serial']), ['a', 'b'])
+        self.assertEqual(list(costs['Cost per project']), [100.0, 200.0])
+        self.assertEqual(list(details['Numeric value']), [100.0, 200.0])
@@ -0,0 +1,52 @@
+import pickle
+from concurrent import futures
+from unittest import TestCase
+
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio import SharedDataframeStore
+from landbosse.excelio.WeatherWindowCSVReader import read_weather_window
+from landbosse.tests.excelio.test_WeatherWindowCache import generate_weather_sheet
+
+
+def attached_speed_sum(handle):
+    """
+    Attaches to a shared dataframe in a worker process and sums its wind
+    speeds.
+    """
+    return float(SharedDataframeStore.attach(handle)['Speed m per s'].sum())
+
+
+class TestSharedDataframeStore(TestCase):
+    def setUp(self):
+        self.weather_window = read_weather_window(generate_weather_sheet(hours=2000))
+        SharedDataframeStore.detach_all()
+
+    def tearDown(self):
+        SharedDataframeStore.detach_all()
+
+    def test_round_trip(self):
+        """
+        Tests that an attached weather window equals the published one,
+        including dtypes, dates and strings, and that its numeric columns
+        are read-only maps of the published files.
+        """
+        with SharedDataframeStore() as store:
+            handle = store.publish('weather', self.weather_window)
+            self.assertIs(store.publish('weather', self.weather_window), handle)
+            attached = SharedDataframeStore.attach(handle)
+            assert_frame_equal(self.weather_window, attached)
+            self.assertFalse(attached['Speed m per s'].values.flags.writeable)
+            self.assertIs(SharedDataframeStore.attach(handle), attached)
+            self.assertLess(len(pickle.dumps(handle)) * 10, len(pickle.dumps(self.weather_window)))
+
+    def test_attach_in_worker(self):
+        """
+        Tests that a worker process can attach to a published weather window.
+        """
+        expected = float(self.weather_window['Speed m per s'].sum())
+        with SharedDataframeStore() as store:
+            handle = store.publish('weather', self.weather_window)
+            with futures.ProcessPoolExecutor(max_workers=1) as executor:
+                actual = executor.submit(attached_speed_sum, handle).result()
+        self.assertEqual(expected, actual)
@@ -0,0 +1,76 @@
+import pickle
+from math import ceil
+from unittest import TestCase
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio.WeatherWindowCSVReader import read_weather_window, extend_weather_window, compact_weather_window
+from landbosse.tests.excelio.test_WeatherWindowCache import generate_weather_sheet
+
+
+def extend_weather_window_by_records(weather_window_df, months_of_weather_data_needed):
+    """
+    The original implementation of extend_weather_window, which rebuilds the
+    dataframe from a list of row dictionaries. It is the reference that the
+    tiled implementation is tested against.
+    """
+    hours_of_weather_data_needed = 730 * months_of_weather_data_needed
+    if hours_of_weather_data_needed <= len(weather_window_df):
+        return weather_window_df
+    number_of_windows_needed = int(ceil(hours_of_weather_data_needed / len(weather_window_df)))
+    return pd.DataFrame(weather_window_df.to_dict(orient='records') * number_of_windows_needed)
+
+
+class TestExtendWeatherWindow(TestCase):
+    def setUp(self):
+        self.weather_window = read_weather_window(generate_weather_sheet(hours=1000))
+
+    def test_matches_records(self):
+        """
+        Tests that the tiled weather window has the same values, dtypes and
+        index as rebuilding it from row dictionaries.
+        """
+        for months in [2, 7, 30]:
+            expected = extend_weather_window_by_records(self.weather_window, months)
+            actual = extend_weather_window(self.weather_window, months)
+            assert_frame_equal(expected, actual)
+            self.assertEqual(len(actual) % len(self.weather_window), 0)
+
+    def test_short_window_not_copied(self):
+        """
+        Tests that a weather window that is already long enough is returned
+        as is.
+        """
+        self.assertIs(extend_weather_window(self.weather_window, 1), self.weather_window)
+
+
+class TestCompactWeatherWindow(TestCase):
+    def setUp(self):
+        self.weather_window = extend_weather_window(read_weather_window(generate_weather_sheet(hours=8760)), 24)
+        self.compact = compact_weather_window(self.weather_window)
+
+    def test_filtering_matches(self):
+        """
+        Tests that filtering by season and time window, as
+        Manager.execute_landbosse does, selects the same rows and wind speeds
+        from the compact weather window.
+        """
+        def filtered(weather_window):
+            return weather_window.loc[(weather_window['Season'].isin(['spring', 'summer'])) &
+                                      (weather_window['Time window'] == 'normal')]
+
+        expected = filtered(self.weather_window)
+        actual = filtered(self.compact)
+        self.assertTrue(expected.index.equals(actual.index))
+        self.assertTrue((expected['Speed m per s'].values == actual['Speed m per s'].values).all())
+
+    def test_compact(self):
+        """
+        Tests that the compact weather window drops the dates and pickles to
+        a fraction of the size.
+        """
+        self.assertNotIn('Date', self.compact.columns)
+        self.assertNotIn('Date UTC', self.compact.columns)
+        self.assertEqual(self.compact['Season'].dtype, 'category')
+        self.assertLess(len(pickle.dumps(self.compact)) * 3, len(pickle.dumps(self.weather_window)))
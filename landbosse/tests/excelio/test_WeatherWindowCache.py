@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio import WeatherWindowCache
+from landbosse.excelio.WeatherWindowCSVReader import read_weather_window
+
+
+def generate_weather_sheet(hours=200, seed=3):
+    """
+    Makes a sheet in wind toolkit format: four header rows followed by one
+    row per hour of date, temperature, pressure, direction and speed.
+    """
+    rng = np.random.default_rng(seed)
+    header = [['SiteID', 'Lat', 'Long', 'Tz', 'Elev']] * 4
+    dates = pd.date_range('2012-01-01', periods=hours, freq='h').strftime('%Y-%m-%d %H:%M:%S')
+    rows = [[date, 10.0, 0.9, 180.0, speed] for date, speed in zip(dates, rng.uniform(0, 15, hours))]
+    return pd.DataFrame(header + rows, columns=['Date', 'Temp', 'Pressure', 'Direction', 'Speed'])
+
+
+class TestWeatherWindowCache(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_cache_dir = WeatherWindowCache.cache_dir
+        WeatherWindowCache.cache_dir = self.temp_dir.name
+        self.original_maxsize = WeatherWindowCache.maxsize
+        WeatherWindowCache.clear()
+        self.weather_sheet = generate_weather_sheet()
+
+    def tearDown(self):
+        WeatherWindowCache.cache_dir = self.original_cache_dir
+        WeatherWindowCache.set_maxsize(self.original_maxsize)
+        WeatherWindowCache.clear()
+        self.temp_dir.cleanup()
+
+    def test_matches_read_weather_window(self):
+        """
+        Tests that the cached weather window is the same as processing the
+        sheet directly, whether it comes from memory or from disk.
+        """
+        expected = read_weather_window(self.weather_sheet)
+        assert_frame_equal(expected, WeatherWindowCache.read_weather_window(self.weather_sheet))
+        assert_frame_equal(expected, WeatherWindowCache.read_weather_window(self.weather_sheet.copy()))
+        self.assertEqual(len(os.listdir(self.temp_dir.name)), 1)
+
+        WeatherWindowCache.clear()
+        assert_frame_equal(expected, WeatherWindowCache.read_weather_window(self.weather_sheet))
+
+    def test_bounded(self):
+        """
+        Tests that the memory cache keeps only the most recently used
+        weather windows.
+        """
+        WeatherWindowCache.cache_dir = None
+        WeatherWindowCache.set_maxsize(2)
+        sheets = [generate_weather_sheet(seed=seed) for seed in range(3)]
+        keys = [WeatherWindowCache.key(sheet) for sheet in sheets]
+        for sheet in [sheets[0], sheets[1], sheets[0], sheets[2]]:
+            WeatherWindowCache.read_weather_window(sheet)
+        self.assertEqual(list(WeatherWindowCache._cache), [keys[0], keys[2]])
+
+        WeatherWindowCache.set_maxsize(0)
+        self.assertEqual(len(WeatherWindowCache._cache), 0)
+        WeatherWindowCache.read_weather_window(sheets[1])
+        self.assertEqual(len(WeatherWindowCache._cache), 0)
+
+    def test_returns_copies(self):
+        """
+        Tests that mutating a returned weather window does not change the
+        cached one.
+        """
+        first = WeatherWindowCache.read_weather_window(self.weather_sheet)
+        first['Speed m per s'] = 0.0
+        second = WeatherWindowCache.read_weather_window(self.weather_sheet)
+        self.assertTrue((second['Speed m per s'] > 0).any())
+
+    def test_key_depends_on_contents_and_timezone(self):
+        """
+        Tests that an edited sheet or a different timezone gets a different
+        key.
+        """
+        edited_sheet = self.weather_sheet.copy()
+        edited_sheet.iloc[10, 4] = 99.0
+        key = WeatherWindowCache.key(self.weather_sheet, 'America/Denver')
+        self.assertEqual(key, WeatherWindowCache.key(self.weather_sheet.copy(), 'America/Denver'))
+        self.assertNotEqual(key, WeatherWindowCache.key(edited_sheet, 'America/Denver'))
+        self.assertNotEqual(key, WeatherWindowCache.key(self.weather_sheet, 'America/Chicago'))
@@ -0,0 +1,24 @@
+import os
+from unittest import TestCase
+
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.tests.model.test_ModuleResultCache import template_input_dir, template_project_list
+
+
+class TestXlsxDataframeCache(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.basename = template_project_list().iloc[0]['Project data file']
+        self.path = os.path.join(template_input_dir(), 'project_data')
+
+    def test_exclude(self):
+        """
+        Tests that excluded sheets are left out of the returned sheets but
+        stay in the cache.
+        """
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(self.basename, self.path, exclude=('weather_window',))
+        self.assertNotIn('weather_window', sheets)
+        self.assertIn('components', sheets)
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(self.basename, self.path, copy=False)
+        self.assertIs(sheets['weather_window'], XlsxDataframeCache._cache[self.basename]['weather_window'])
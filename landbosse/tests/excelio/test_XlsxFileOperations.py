@@ -0,0 +1,30 @@
+import os
+import sys
+from unittest import TestCase, mock
+
+from landbosse.excelio import XlsxFileOperations
+
+
+class TestXlsxFileOperations(TestCase):
+    def checkpoint_options(self, argv, environ=None):
+        environ = dict(environ or {}, LANDBOSSE_OUTPUT_DIR='outputs')
+        with mock.patch.object(sys, 'argv', ['main.py'] + argv), mock.patch.dict(os.environ, environ):
+            for name in ['LANDBOSSE_CHECKPOINT', 'LANDBOSSE_RESUME']:
+                if name not in environ:
+                    os.environ.pop(name, None)
+            return XlsxFileOperations().checkpoint_options()
+
+    def test_checkpoint_options(self):
+        """
+        Tests that checkpointing is disabled unless a checkpoint is given or
+        the run resumes.
+        """
+        default_checkpoint = os.path.join('outputs', 'landbosse_checkpoint.sqlite')
+        self.assertEqual(self.checkpoint_options([]), (None, False))
+        self.assertEqual(self.checkpoint_options(['--checkpoint']), (default_checkpoint, False))
+        self.assertEqual(self.checkpoint_options(['--checkpoint', '--resume']), (default_checkpoint, True))
+        self.assertEqual(self.checkpoint_options(['--checkpoint', 'run.sqlite']), ('run.sqlite', False))
+        self.assertEqual(self.checkpoint_options(['--resume']), (default_checkpoint, True))
+        self.assertEqual(self.checkpoint_options([], {'LANDBOSSE_CHECKPOINT': 'run.sqlite'}), ('run.sqlite', False))
+        self.assertEqual(self.checkpoint_options([], {'LANDBOSSE_RESUME': 'yes'}), (default_checkpoint, True))
+        self.assertEqual(self.checkpoint_options(['--resume', '--checkpoint', 'none']), (None, True))
@@ -0,0 +1,138 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from concurrent import futures
+from unittest import TestCase, mock
+
+from landbosse.excelio import ListResultSink, XlsxParallelManagerRunner
+from landbosse.model import DetailRows, ModuleResultCache, ProjectResultCache
+from landbosse.tests.model.test_ModuleResultCache import template_input_dir, template_project_list
+
+
+class TestXlsxParallelManagerRunner(TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running_chunks = 0
+        self.max_running_chunks = 0
+        self.tasks_taken = 0
+        self.projects_done = 0
+        self.max_tasks_ahead = 0
+
+    def fake_run_project_chunk(self, task_dicts):
+        """
+        Stands in for run_project_chunk() and records how many chunks run
+        at once.
+        """
+        with self.lock:
+            self.running_chunks += 1
+            self.max_running_chunks = max(self.max_running_chunks, self.running_chunks)
+        time.sleep(0.001 * (task_dicts[0]['index'] % 3))
+        with self.lock:
+            self.running_chunks -= 1
+            self.projects_done += len(task_dicts)
+        return [(task_dict['project_id_with_serial'], {'index': task_dict['index']}, 0) for task_dict in task_dicts]
+
+    def generate_tasks(self, count):
+        """
+        Yields tasks and records how far the scheduler has read ahead of
+        the finished projects.
+        """
+        for index in range(count):
+            with self.lock:
+                self.tasks_taken += 1
+                self.max_tasks_ahead = max(self.max_tasks_ahead, self.tasks_taken - self.projects_done)
+            yield {'project_id_with_serial': f'project {index}', 'index': index}
+
+    def test_run_tasks(self):
+        """
+        Tests that every task runs once, in chunks, with a bounded number
+        of chunks in flight, and that the chunk indexes put the results
+        back in the order of the tasks.
+        """
+        runner = XlsxParallelManagerRunner(workers=4, chunk_size=3, max_in_flight=2)
+        chunk_results = dict()
+
+        def add_chunk_results(chunk_index, results):
+            self.assertNotIn(chunk_index, chunk_results)
+            chunk_results[chunk_index] = results
+
+        with mock.patch('landbosse.excelio.XlsxParallelManagerRunner.run_project_chunk', self.fake_run_project_chunk), \
+                futures.ThreadPoolExecutor(max_workers=4) as executor:
+            runner.run_tasks(executor, self.generate_tasks(20), add_chunk_results)
+
+        results = [result for chunk_index in sorted(chunk_results) for result in chunk_results[chunk_index]]
+        self.assertEqual([output_dict['index'] for _, output_dict, _ in results], list(range(20)))
+        self.assertEqual(len(chunk_results), 7)
+        self.assertLessEqual(self.max_running_chunks, 2)
+        self.assertLessEqual(self.max_tasks_ahead, 2 * 3)
+
+    def test_run_no_tasks(self):
+        """
+        Tests that an empty project list finishes without submitting
+        anything.
+        """
+        runner = XlsxParallelManagerRunner(workers=1, chunk_size=5, max_in_flight=1)
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            runner.run_tasks(executor, iter([]), self.fail)
+
+
+class PicklingThreadPoolExecutor(futures.ThreadPoolExecutor):
+    """
+    Runs the chunks in threads, so that patches reach them, but pickles
+    their results as a ProcessPoolExecutor would.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(lambda: pickle.loads(pickle.dumps(fn(*args, **kwargs))))
+
+
+class TestDiscardedDetails(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.directory = tempfile.TemporaryDirectory()
+        self.maxsize = ModuleResultCache.maxsize
+        self.cache_dir = ProjectResultCache.cache_dir
+        ModuleResultCache.set_maxsize(0)
+        ProjectResultCache.cache_dir = os.path.join(self.directory.name, 'project_result_cache')
+        ProjectResultCache.clear()
+
+    def tearDown(self):
+        ModuleResultCache.set_maxsize(self.maxsize)
+        ProjectResultCache.cache_dir = self.cache_dir
+        self.directory.cleanup()
+
+    def test_details_not_made(self):
+        """
+        Tests that a parallel, streamed run whose sinks discard the details
+        never makes them, even though its results are pickled, checkpointed
+        and stored in ProjectResultCache. The run is repeated so that the
+        second run loads every project from ProjectResultCache.
+        """
+        environ = {'LANDBOSSE_INPUT_DIR': template_input_dir(), 'LANDBOSSE_OUTPUT_DIR': self.directory.name}
+        checkpoint = os.path.join(self.directory.name, 'checkpoint.sqlite')
+        detail_rows = []
+        detail_rows_init = DetailRows.__init__
+
+        def record_detail_rows(instance, *args, **kwargs):
+            detail_rows.append(instance)
+            detail_rows_init(instance, *args, **kwargs)
+
+        with mock.patch.dict(os.environ, environ), mock.patch.object(sys, 'argv', ['main.py']), \
+                mock.patch.object(DetailRows, '__init__', record_detail_rows), \
+                mock.patch('landbosse.excelio.XlsxParallelManagerRunner.futures.ProcessPoolExecutor',
+                           PicklingThreadPoolExecutor):
+            for run in range(2):
+                sink = ListResultSink(keep_details=False)
+                runner = XlsxParallelManagerRunner(checkpoint=checkpoint, parametric_project_data='none')
+                runner.run_from_project_list_xlsx(os.path.join(template_input_dir(), 'project_list.xlsx'),
+                                                  result_sinks=[sink])
+                self.assertGreater(len(sink.costs_by_module_type_operation), 0)
+                self.assertEqual(sink.details_list, [])
+
+        self.assertEqual(ProjectResultCache.hits, len(template_project_list()))
+        self.assertGreater(len(detail_rows), 0)
+        self.assertFalse(any(rows.made for rows in detail_rows))
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio import XlsxReader
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestCellEdits(TestCase):
+    def setUp(self):
+        self.xlsx_reader = XlsxReader()
+        self.project_data_sheets = {
+            'components': pd.DataFrame({
+                'Component': ['Tower', 'Nacelle'],
+                'Mass tonne': [100.0, 60.0],
+            }),
+        }
+        self.project_parameters = pd.Series({
+            'Project ID': 'p',
+            'Hub height m': 80.0,
+            'components/Nacelle/Mass tonne': 75.0,
+            'project list/ignored/Hub height m': 90.0,
+            'components/Tower/Mass tonne': np.nan,
+        })
+
+    def test_cell_edits(self):
+        """
+        Tests that the cell edits are found in order and null edits are
+        skipped.
+        """
+        self.assertEqual(self.xlsx_reader.cell_edits(self.project_parameters), [
+            ('components', 'Nacelle', 'Mass tonne', 75.0),
+            ('project list', 'ignored', 'Hub height m', 90.0),
+        ])
+
+    def test_apply_matches_modify(self):
+        """
+        Tests that applying the cell edits to a copy of the project data
+        gives the same result as modify_project_data_and_project_list().
+        """
+        expected_sheets = {name: df.copy() for name, df in self.project_data_sheets.items()}
+        expected_parameters = self.project_parameters.copy()
+        self.xlsx_reader.modify_project_data_and_project_list(expected_sheets, expected_parameters)
+        self.assertEqual(expected_sheets['components'].loc[1, 'Mass tonne'], 75.0)
+        self.assertEqual(expected_parameters['Hub height m'], 90.0)
+
+        cell_edits = self.xlsx_reader.cell_edits(self.project_parameters)
+        self.xlsx_reader.apply_cell_edits(self.project_data_sheets, self.project_parameters, cell_edits)
+        assert_frame_equal(expected_sheets['components'], self.project_data_sheets['components'])
+        self.assertTrue(expected_parameters.equals(self.project_parameters))
+
+    def test_missing_row(self):
+        """
+        Tests that an edit of a row that does not exist is rejected without
+        modifying anything.
+        """
+        cell_edit = ('components', 'Blade', 'Mass tonne', 10.0)
+        with self.assertRaises(XlsxOperationException):
+            self.xlsx_reader.check_cell_edit(self.project_data_sheets, self.project_parameters, cell_edit)
+        with self.assertRaises(XlsxOperationException):
+            self.xlsx_reader.apply_cell_edits(self.project_data_sheets, self.project_parameters, [cell_edit])
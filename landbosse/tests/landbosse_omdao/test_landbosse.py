@@ -1,8 +1,10 @@
+import numpy as np
 import openmdao.api as om
 import pandas as pd
 import pytest
 
-from landbosse.landbosse_omdao.landbosse import LandBOSSE
+from landbosse.landbosse_omdao.landbosse import FoundationRadii, LandBOSSE
+from landbosse.model import FoundationRadiusBatch, ProjectResultCache
 from landbosse.landbosse_omdao.OpenMDAODataframeCache import OpenMDAODataframeCache
 
 
@@ -105,3 +107,51 @@ def test_landbosse(landbosse_costs_by_module_type_operation):
         costs_by_module_type_operation, landbosse_costs_by_module_type_operation, "test.csv"
     )
     assert result
+
+
+def test_foundation_radii():
+    """
+    Tests that the foundation radii component calculates the radii of
+    every design.
+    """
+    n = 3
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem("foundation", FoundationRadii(num_designs=n), promotes=["*"])
+    prob.setup()
+    prob["dead_load_N"] = [3.5e6, 3.5e6, 5e6]
+    prob["lateral_load_N"] = [5e5, 7e5, 9e5]
+    prob["moment_N_m"] = [5e7, 7e7, 9e7]
+    prob["rated_thrust_N"] = [5.89e5, 7e5, 9e5]
+    prob.run_model()
+
+    expected = FoundationRadiusBatch.radii(
+        prob["dead_load_N"], prob["lateral_load_N"], prob["moment_N_m"], prob["rated_thrust_N"], 2.36, 191521
+    )
+    for name, value in expected.items():
+        np.testing.assert_allclose(prob[name], value)
+    assert (prob["Radius_m"] > 0).all()
+
+
+def test_landbosse_with_project_result_cache(tmp_path, monkeypatch):
+    """
+    Tests that the component runs again, with the same outputs, when
+    ProjectResultCache is enabled, because it does not use the cache.
+    """
+    monkeypatch.setenv("LANDBOSSE_RESULT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ProjectResultCache, "cache_dir", None)
+    ProjectResultCache.clear()
+    outputs = []
+    for _ in range(2):
+        prob = om.Problem(reports=False)
+        prob.model = LandBOSSE()
+        prob.setup()
+        prob.run_model()
+        outputs.append(prob)
+
+    pd.testing.assert_frame_equal(
+        outputs[0]["landbosse_costs_by_module_type_operation"],
+        outputs[1]["landbosse_costs_by_module_type_operation"],
+    )
+    assert outputs[1]["erection_crane_choice"] is not None
+    assert outputs[1]["bos_capex_kW"] == outputs[0]["bos_capex_kW"]
+    assert ProjectResultCache.hits == 0
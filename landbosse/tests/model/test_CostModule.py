@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import CostModule
+
+
+class TestCostModule(TestCase):
+    def setUp(self):
+        self.module = CostModule()
+        self.module.input_dict = {'turbine_rating_MW': 2.5, 'num_turbines': 10, 'rotor_diameter_m': 120.0}
+        self.module.project_name = 'a'
+        self.cost_df = pd.DataFrame({
+            'Phase of construction': ['Erection', 'Erection'],
+            'Type of cost': ['Labor', 'Other'],
+            'Cost USD': [1000.0, 250.0],
+        }, index=[3, 7])
+
+    def costs(self, total_or_turbine):
+        return self.module.outputs_for_costs_by_module_type_operation(input_df=self.cost_df,
+                                                                      project_id='a',
+                                                                      total_or_turbine=total_or_turbine)
+
+    def test_total_costs(self):
+        costs = self.costs(True)
+        self.assertEqual(list(costs.columns), CostModule.cost_columns)
+        self.assertEqual(list(costs.index), [0, 1])
+        self.assertEqual(list(costs['type_of_cost']), ['Labor', 'Other'])
+        self.assertEqual(list(costs['module']), ['CostModule', 'CostModule'])
+        self.assertEqual(list(costs['raw_cost_total_or_per_turbine']), ['total', 'total'])
+        self.assertEqual(list(costs['cost_per_turbine']), [100.0, 25.0])
+        self.assertEqual(list(costs['cost_per_project']), [1000.0, 250.0])
+        self.assertEqual(list(costs['usd_per_kw_per_project']), [1000.0 / 25000, 250.0 / 25000])
+
+    def test_turbine_costs(self):
+        costs = self.costs(False)
+        self.assertEqual(list(costs['raw_cost_total_or_per_turbine']), ['turbine', 'turbine'])
+        self.assertEqual(list(costs['cost_per_turbine']), [1000.0, 250.0])
+        self.assertEqual(list(costs['cost_per_project']), [10000.0, 2500.0])
+        self.assertEqual(list(costs['usd_per_kw_per_project']), [10000.0 / 25000, 2500.0 / 25000])
+
+    def test_concat_costs(self):
+        self.cost_df = self.cost_df.iloc[:0]
+        empty = self.costs(True)
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(list(CostModule.concat_costs([]).columns), CostModule.cost_columns)
+        costs = CostModule.concat_costs([empty, self.module.outputs_for_costs_by_module_type_operation(
+            input_df=pd.DataFrame({'Phase of construction': ['Erection'], 'Type of cost': ['Labor'],
+                                   'Cost USD': [1.0]}), project_id='a', total_or_turbine=True), empty])
+        self.assertEqual(len(costs), 1)
@@ -0,0 +1,132 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import CraneCapabilityIndex, ErectionCost
+from landbosse.tests.model.test_CraneGeometry import point_in_polygon_by_loop
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir
+
+crane_id_columns = ["Equipment name", "Equipment ID", "Crane name", "Boom system", "Crane capacity tonne"]
+
+
+def component_lift_max_wind_speed(component_group, crane_poly, component_max_speed, operation):
+    """
+    The lift checks of ErectionCost.calculate_component_lift_max_wind_speed()
+    one crane and component at a time, with point_in_polygon_by_loop().
+    """
+    for _, crane in crane_poly.iterrows():
+        bool_list = []
+        polygon = [tuple(vertex) for vertex in crane["Crane poly"].tolist()]
+        for component in component_group["Component"]:
+            component_only = component_group.where(component_group["Component"] == component).dropna(thresh=1)
+            if operation == "offload":
+                x = component_only["Mass tonne"] / 2
+                y = component_only["Section height m"] + component_only["Offload hook height m"]
+            else:
+                x = component_only["Mass tonne"]
+                y = component_only["Lift height m"] + component_only["Offload hook height m"]
+            bool_list.append(point_in_polygon_by_loop(float(x.values[0]), float(y.values[0]), polygon))
+
+        mh = component_group["Mass tonne"]
+        aw = component_group["Surface area sq m"] * component_group["Coeff drag"]
+        vmax_tab = crane["Max wind speed m per s"]
+        vmax_calc = vmax_tab * np.sqrt(1.2 * mh / aw)
+
+        component_group_new = pd.DataFrame(
+            component_group,
+            columns=list(component_group.columns.values) + ["vmax", "Crane name", "Boom system", "crane_bool"],
+        )
+        component_group_new["vmax"] = np.minimum(vmax_tab, vmax_calc)
+        component_group_new["Crane name"] = crane["Crane name"]
+        component_group_new["Boom system"] = crane["Boom system"]
+        component_group_new["crane_bool"] = bool_list
+
+        component_max_speed = pd.concat((component_max_speed, component_group_new), sort=True)
+
+    crane_poly_new = crane_poly.copy()
+    crane_poly_new["Crane bool {}".format(operation)] = min(bool_list)
+    return {"component_max_speed": component_max_speed, "crane_poly": crane_poly_new}
+
+
+class TestCraneCapabilityIndex(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        CraneCapabilityIndex.clear()
+        self.input_dict = generate_input_dict()
+        self.module = ErectionCost(input_dict=self.input_dict, output_dict=dict(), project_name='a')
+        crane_specs = self.input_dict['project_data']['crane_specs']
+        self.crane_poly = self.module.calculate_crane_lift_polygons(crane_specs.groupby(crane_id_columns))
+
+    def tearDown(self):
+        CraneCapabilityIndex.clear()
+
+    def test_lift_feasibility(self):
+        """
+        Tests that the feasibility matrix is the same as the original loop
+        for points inside, outside, on the vertices and on the edges of
+        every lift polygon.
+        """
+        index = CraneCapabilityIndex(self.crane_poly)
+        rng = np.random.default_rng(0)
+        xs = [rng.uniform(-10, 1500, 200), index.vertices[..., 0].ravel()]
+        ys = [rng.uniform(-10, 200, 200), index.vertices[..., 1].ravel()]
+        for polygon in index.vertices:
+            midpoints = (polygon + np.roll(polygon, -1, axis=0)) / 2
+            xs.append(midpoints[:, 0])
+            ys.append(midpoints[:, 1])
+        x = np.concatenate(xs)
+        y = np.concatenate(ys)
+
+        actual = index.lift_feasibility(x, y)
+        self.assertEqual(actual.shape, (len(self.crane_poly), len(x)))
+        self.assertTrue(actual.any())
+        self.assertFalse(actual.all())
+        for i, polygon in enumerate(self.crane_poly["Crane poly"]):
+            vertices = [tuple(vertex) for vertex in polygon.tolist()]
+            expected = [point_in_polygon_by_loop(x_i, y_i, vertices) for x_i, y_i in zip(x.tolist(), y.tolist())]
+            np.testing.assert_array_equal(actual[i], expected)
+
+    def test_component_lift_max_wind_speed(self):
+        """
+        Tests that the lift checks and maximum wind speeds are the same as
+        checking each crane and component one at a time, including for a
+        repeated component name.
+        """
+        components = self.input_dict['project_data']['components'].copy()
+        components['Lift height m'] = components['Section height m'] * 1.2
+        components['Coeff drag'] = components['Coeff drag (installed)']
+        duplicate = components.iloc[[0]].copy()
+        duplicate['Mass tonne'] = 1e4
+        components = pd.concat([components, duplicate], ignore_index=True)
+        for operation in ['Base', 'offload']:
+            with self.subTest(operation=operation):
+                expected = component_lift_max_wind_speed(components, self.crane_poly, pd.DataFrame(), operation)
+                actual = self.module.calculate_component_lift_max_wind_speed(
+                    component_group=components,
+                    crane_poly=self.crane_poly,
+                    component_max_speed=pd.DataFrame(),
+                    operation=operation,
+                )
+                pd.testing.assert_frame_equal(actual['component_max_speed'], expected['component_max_speed'])
+                pd.testing.assert_frame_equal(actual['crane_poly'], expected['crane_poly'])
+                self.assertFalse(actual['component_max_speed']['crane_bool'].all())
+
+    def test_reuse(self):
+        """
+        Tests that projects with the same crane_specs share an index.
+        """
+        crane_specs = self.input_dict['project_data']['crane_specs']
+        index = CraneCapabilityIndex.for_crane_poly(self.crane_poly, crane_specs)
+        self.assertIs(CraneCapabilityIndex.for_crane_poly(self.crane_poly, crane_specs.copy()), index)
+        self.assertEqual(CraneCapabilityIndex.stats()['hits'], 1)
+
+        offload_poly = self.crane_poly[self.crane_poly['Equipment name'] == 'Offload crane']
+        self.assertIsNot(CraneCapabilityIndex.for_crane_poly(offload_poly, crane_specs), index)
+
+        changed_specs = crane_specs.copy()
+        changed_specs['Max wind speed m per s'] += 1
+        self.assertIsNot(CraneCapabilityIndex.for_crane_poly(self.crane_poly, changed_specs), index)
+        self.assertEqual(CraneCapabilityIndex.stats()['misses'], 3)
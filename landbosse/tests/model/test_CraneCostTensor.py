@@ -0,0 +1,250 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import CraneCostTensor, ErectionCost, Manager
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir
+
+
+def aggregate_by_merges(possible_crane_cost, crane_specs):
+    """
+    The costs of separate and same cranes for base and topping, with the
+    merges and groupbys of ErectionCost.aggregate_erection_costs() that
+    CraneCostTensor replaces.
+
+    Returns
+    -------
+    pd.DataFrame, pd.DataFrame
+        The separate_basetop and same_basetop dataframes.
+    """
+    # calculate costs if top and base cranes are the same
+    base_cranes = possible_crane_cost[possible_crane_cost["Operation"] == "Base"]
+    top_cranes = possible_crane_cost[possible_crane_cost["Operation"] == "Top"]
+    crane_topbase_bool = top_cranes["Crane name"].isin(base_cranes["Crane name"])
+    boom_topbase_bool = top_cranes["Boom system"].isin(base_cranes["Boom system"])
+    possible_crane_topbase = top_cranes[boom_topbase_bool & crane_topbase_bool]
+    same_topbase_crane_list = possible_crane_topbase[["Crane name", "Boom system"]]
+    possible_crane_topbase = same_topbase_crane_list.merge(
+        possible_crane_cost, on=["Crane name", "Boom system"], sort=True
+    )
+    possible_crane_topbase_sum = (
+        possible_crane_topbase.groupby(["Crane name", "Boom system"])[
+            [
+                "Labor cost USD without management",
+                "Subtotal for hourly labor (non-management) USD",
+                "Subtotal for per diem labor (non-management) USD",
+                "Equipment rental cost USD",
+                "Fuel cost USD",
+            ]
+        ]
+        .sum()
+        .reset_index()
+    )
+
+    # group crane spec data for mobilization
+    mobilization_costs = (
+        crane_specs
+        .groupby(["Crane name", "Boom system"])["Mobilization cost USD"]
+        .max()
+        .reset_index()
+    )
+
+    mobilization_costs["Mobilization cost USD"] = (
+        mobilization_costs["Mobilization cost USD"] * 2
+    )  # for mobilization and demobilizaton
+
+    # join top and base crane data with mobilization data
+    topbase_same_crane_cost = pd.merge(
+        possible_crane_topbase_sum, mobilization_costs, on=["Crane name", "Boom system"], sort=True
+    )
+
+    # compute total project cost for erection
+    topbase_same_crane_cost["Total cost USD"] = (
+        topbase_same_crane_cost["Labor cost USD without management"]
+        + topbase_same_crane_cost["Equipment rental cost USD"]
+        + topbase_same_crane_cost["Fuel cost USD"]
+        + topbase_same_crane_cost["Mobilization cost USD"]
+    )
+
+    # adds operation label for same crane used for base and topping (this way columns are consistent for same and separate basetop)
+    topbase_same_crane_cost["Operation"] = "Base + Top"
+
+    # calculate costs if top and base use separate cranes
+    separate_topbase = (
+        possible_crane_cost.groupby(["Operation", "Crane name", "Boom system"])[
+            [
+                "Labor cost USD without management",
+                "Subtotal for hourly labor (non-management) USD",
+                "Subtotal for per diem labor (non-management) USD",
+                "Equipment rental cost USD",
+                "Fuel cost USD",
+            ]
+        ]
+        .sum()
+        .reset_index()
+    )
+
+    # join mobilization data to separate top base crane costs
+    separate_topbase_crane_cost = pd.merge(
+        separate_topbase, mobilization_costs, on=["Crane name", "Boom system"], sort=True
+    )
+
+    # compute total project cost for erection
+    separate_topbase_crane_cost["Total cost USD"] = (
+        separate_topbase_crane_cost["Labor cost USD without management"]
+        + separate_topbase_crane_cost["Equipment rental cost USD"]
+        + separate_topbase_crane_cost["Fuel cost USD"]
+        + separate_topbase_crane_cost["Mobilization cost USD"]
+    )
+
+    return separate_topbase_crane_cost, topbase_same_crane_cost
+
+
+def minimum_cost_cranes_by_loop(separate_basetop, same_basetop, allow_same_flag):
+    """
+    Chooses the least cost cranes one operation at a time, with the loop of
+    ErectionCost.find_minimum_cost_cranes() that
+    CraneCostTensor.minimum_cost_cranes() replaces. When several cranes
+    have the smallest total cost for an operation, each cost column is the
+    smallest of those cranes.
+
+    The parameters and return value are those of minimum_cost_cranes().
+    """
+    total_separate_cost = pd.DataFrame()
+    for operation in separate_basetop["Operation"].unique():
+        # find minimum cost option for separate base and topping cranes
+        min_val = min(separate_basetop["Total cost USD"].where(separate_basetop["Operation"] == operation).dropna())
+
+        # find the crane that corresponds to the minimum cost for each operation
+        crane = separate_basetop[separate_basetop["Total cost USD"] == min_val]
+        cost = crane.groupby("Operation").min()
+        total_separate_cost = pd.concat((total_separate_cost, cost), sort=True)
+
+    # reset index for separate crane costs
+    total_separate_cost = total_separate_cost.reset_index()
+
+    # duplicate offload records because assuming two offload cranes are on site
+    total_separate_cost = pd.concat(
+        (total_separate_cost, total_separate_cost.loc[total_separate_cost["Operation"] == "Offload"]), sort=True
+    )
+
+    # sum costs for separate cranes to get total for all cranes
+    cost_chosen_separate = total_separate_cost["Total cost USD"].sum()
+
+    if allow_same_flag is True:
+        # get the minimum cost for using the same crane for all operations
+        cost_chosen_same = min(same_basetop["Total cost USD"])
+
+        # check if separate or same crane option is cheaper and choose crane cost
+        if cost_chosen_separate < cost_chosen_same:
+            cost_chosen = total_separate_cost.groupby(
+                by=["Boom system", "Crane name", "Operation"]
+            ).sum()  # added crane name and operation to groupby
+        else:
+            cost_chosen = same_basetop.where(same_basetop["Total cost USD"] == cost_chosen_same).dropna()
+    else:
+        cost_chosen = total_separate_cost.groupby(
+            by=["Boom system", "Crane name", "Operation"]
+        ).sum()  # added crane name and operation to groupby
+
+    return cost_chosen
+
+
+def possible_crane_cost_of_project(input_dict):
+    """
+    Runs a project and returns the possible_crane_cost dataframe of its
+    erection.
+    """
+    output_dict = dict()
+    Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(project_name='a')
+    module = ErectionCost(input_dict=input_dict, output_dict=output_dict, project_name='a')
+    module.aggregate_erection_costs()
+    return module._possible_crane_cost
+
+
+class TestCraneCostTensor(TestCase):
+    def setUp(self):
+        crane_names = ['LR1500', 'LR1500', 'LR1500', 'LR1500', 'LR1500', 'LB 75', 'AC 500', 'AC 500', 'AC 500']
+        boom_systems = ['SL3F', 'SL3F', 'SL3F', 'SL3F', 'SL3F', 'Hydraulic', 'Main', 'Main', 'Main']
+        operations = ['Base', 'Top', 'Top', 'Top', 'Offload', 'Offload', 'Top', 'Base', 'Base']
+        rng = np.random.default_rng(0)
+        self.possible_crane_cost = pd.DataFrame({
+            'Crane name': crane_names,
+            'Boom system': boom_systems,
+            'Operation': operations,
+            'Equipment ID': [f'E{i}' for i in range(len(crane_names))],
+        })
+        for column in CraneCostTensor.cost_columns:
+            self.possible_crane_cost[column] = rng.uniform(0, 1e5, len(crane_names)) / 3
+        self.possible_crane_cost.loc[3, 'Fuel cost USD'] = np.nan
+        self.crane_specs = pd.DataFrame({
+            'Crane name': ['LR1500', 'LR1500', 'LB 75', 'AC 500'],
+            'Boom system': ['SL3F', 'SL3F', 'Hydraulic', 'Main'],
+            'Mobilization cost USD': [30000, 45000, 2000, 20000],
+        })
+
+    def test_same_as_merges(self):
+        """
+        Tests that the costs of separate and same cranes are identical to
+        those made by merges and groupbys, with several rows per crane and
+        operation, a crane with several top rows and a missing cost.
+        """
+        tensor = CraneCostTensor(self.possible_crane_cost, self.crane_specs)
+        separate_basetop, same_basetop = aggregate_by_merges(self.possible_crane_cost, self.crane_specs)
+        self.assertEqual(len(separate_basetop), 6)
+        self.assertEqual(len(same_basetop), 2)
+        pd.testing.assert_frame_equal(tensor.separate_basetop(), separate_basetop, check_exact=True)
+        pd.testing.assert_frame_equal(tensor.same_basetop(), same_basetop, check_exact=True)
+
+    def test_template_project(self):
+        """
+        Tests the costs and crane choices of the first template project.
+        """
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        input_dict = generate_input_dict()
+        possible_crane_cost = possible_crane_cost_of_project(input_dict)
+        crane_specs = input_dict['project_data']['crane_specs']
+        tensor = CraneCostTensor(possible_crane_cost, crane_specs)
+        separate_basetop, same_basetop = aggregate_by_merges(possible_crane_cost, crane_specs)
+        pd.testing.assert_frame_equal(tensor.separate_basetop(), separate_basetop, check_exact=True)
+        pd.testing.assert_frame_equal(tensor.same_basetop(), same_basetop, check_exact=True)
+        for allow_same_flag in [False, True]:
+            with self.subTest(allow_same_flag=allow_same_flag):
+                if allow_same_flag and len(same_basetop) == 0:
+                    continue
+                pd.testing.assert_frame_equal(
+                    CraneCostTensor.minimum_cost_cranes(separate_basetop, same_basetop, allow_same_flag),
+                    minimum_cost_cranes_by_loop(separate_basetop, same_basetop, allow_same_flag),
+                    check_exact=True,
+                )
+
+    def test_minimum_cost_cranes(self):
+        """
+        Tests that the chosen cranes are the same as those chosen one
+        operation at a time, for separate and same cranes, and with ties
+        within an operation and across operations.
+        """
+        tensor = CraneCostTensor(self.possible_crane_cost, self.crane_specs)
+        separate_basetop = tensor.separate_basetop()
+        same_basetop = tensor.same_basetop()
+        cheap_same_basetop = same_basetop.copy()
+        cheap_same_basetop['Total cost USD'] /= 100
+        tied = separate_basetop.copy()
+        tied.loc[tied['Operation'] == 'Top', 'Total cost USD'] = 1e4
+        tied_across = tied.copy()
+        tied_across.loc[tied_across['Operation'] == 'Offload', 'Total cost USD'] = 1e4
+
+        for name, separate, same, allow_same_flag in [
+            ('separate', separate_basetop, same_basetop, False),
+            ('same not cheaper', separate_basetop, same_basetop, True),
+            ('same cheaper', separate_basetop, cheap_same_basetop, True),
+            ('tie', tied, same_basetop, False),
+            ('tie across operations', tied_across, same_basetop, False),
+        ]:
+            with self.subTest(name):
+                expected = minimum_cost_cranes_by_loop(separate, same, allow_same_flag)
+                actual = CraneCostTensor.minimum_cost_cranes(separate, same, allow_same_flag)
+                pd.testing.assert_frame_equal(actual, expected, check_exact=True)
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import numpy as np
+
+from landbosse.model import CraneGeometry
+
+
+def point_in_polygon_by_loop(x, y, polygon):
+    """
+    The original ray crossing test of ErectionCost, one point and one edge
+    at a time, on Python floats.
+
+    Parameters
+    ----------
+    x, y : float
+        The point.
+
+    polygon : list
+        (x, y) tuples of the vertices of the polygon.
+
+    Returns
+    -------
+    bool
+        True if the point is inside the polygon.
+    """
+
+    def ccw(a, b, c):
+        return (c[1] - a[1]) * (b[0] - a[0]) > (b[1] - a[1]) * (c[0] - a[0])
+
+    def intersect(a, b, c, d):
+        return ccw(a, c, d) != ccw(b, c, d) and ccw(a, b, c) != ccw(a, b, d)
+
+    point = (x, y)
+    result = False
+    maxx = float(np.r_[x, np.array([vertex[0] for vertex in polygon])].max())
+    for i in range(len(polygon) - 1):
+        if intersect(polygon[i], polygon[i + 1], point, (1.1 * maxx, y)):
+            result = not result
+    if intersect(polygon[-1], polygon[0], point, (1.1 * maxx, y)):
+        result = not result
+    return result
+
+
+class TestCraneGeometry(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.polygons = np.stack([
+            CraneGeometry.lift_polygon(rng.integers(5, 1200, 6), rng.uniform(40, 160, 6)) for _ in range(20)
+        ])
+
+    def test_lift_polygon(self):
+        """
+        Tests the vertices of a lift polygon made from a load chart.
+        """
+        polygon = CraneGeometry.lift_polygon([100, 60, 80], [80.0, 120.0, 100.0])
+        expected = [[0, 0], [0, 120], [60, 120], [100, 80], [100, 0]]
+        np.testing.assert_array_equal(polygon, expected)
+        self.assertEqual(polygon.dtype, np.float64)
+
+    def test_points_in_polygons(self):
+        """
+        Tests that the crossing number test is the same as the original
+        loop for random points and for points on the vertices and edges of
+        the polygons.
+        """
+        rng = np.random.default_rng(1)
+        midpoints = (self.polygons + np.roll(self.polygons, -1, axis=1)) / 2
+        x = np.concatenate([rng.uniform(-10, 1400, 300), self.polygons[..., 0].ravel(), midpoints[..., 0].ravel()])
+        y = np.concatenate([rng.uniform(-10, 200, 300), self.polygons[..., 1].ravel(), midpoints[..., 1].ravel()])
+
+        actual = CraneGeometry.points_in_polygons(x, y, self.polygons)
+        self.assertEqual(actual.shape, (len(self.polygons), len(x)))
+        self.assertTrue(actual.any())
+        self.assertFalse(actual.all())
+        for polygon, inside in zip(self.polygons, actual):
+            vertices = [tuple(vertex) for vertex in polygon.tolist()]
+            expected = [point_in_polygon_by_loop(x_i, y_i, vertices) for x_i, y_i in zip(x.tolist(), y.tolist())]
+            np.testing.assert_array_equal(inside, expected)
+
+    def test_one_polygon(self):
+        """
+        Tests one polygon and a point with a NaN coordinate.
+        """
+        inside = CraneGeometry.points_in_polygons([10.0, 2000.0, np.nan], [10.0, 10.0, 10.0], self.polygons[0])
+        np.testing.assert_array_equal(inside, [True, False, False])
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import XlsxReader
+from landbosse.model import CranePolyCache, ErectionCost
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir
+
+crane_id_columns = ["Equipment name", "Equipment ID", "Crane name", "Boom system", "Crane capacity tonne"]
+
+
+class TestCranePolyCache(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.cache_dir = CranePolyCache.cache_dir
+        self.temp_dir = tempfile.TemporaryDirectory()
+        CranePolyCache.cache_dir = self.temp_dir.name
+        CranePolyCache.clear()
+        self.input_dict = generate_input_dict()
+        self.module = ErectionCost(input_dict=self.input_dict, output_dict=dict(), project_name='a')
+
+    def tearDown(self):
+        CranePolyCache.cache_dir = self.cache_dir
+        CranePolyCache.clear()
+        self.temp_dir.cleanup()
+
+    def crane_poly(self, crane_specs):
+        return self.module.calculate_crane_lift_polygons(crane_specs.groupby(crane_id_columns))
+
+    def test_reuse(self):
+        """
+        Tests that crane_poly tables are reused from memory and from disk,
+        and that the tables are the same as tables that are made again.
+        """
+        crane_specs = self.input_dict['project_data']['crane_specs']
+        expected = self.crane_poly(crane_specs)
+        self.assertEqual(CranePolyCache.stats()['misses'], 1)
+
+        # Changing the returned table must not change the cached table.
+        expected_polygons = expected['Crane poly'].copy()
+        expected['Crane poly'] = None
+        actual = self.crane_poly(generate_input_dict()['project_data']['crane_specs'])
+        self.assertEqual(CranePolyCache.stats()['hits'], 1)
+        for polygon, expected_polygon in zip(actual['Crane poly'], expected_polygons):
+            np.testing.assert_array_equal(polygon, expected_polygon)
+
+        CranePolyCache.clear()
+        from_disk = self.crane_poly(crane_specs)
+        self.assertEqual(CranePolyCache.stats()['hits'], 1)
+        pd.testing.assert_frame_equal(from_disk.drop(columns='Crane poly'), actual.drop(columns='Crane poly'))
+        for polygon_from_disk, polygon in zip(from_disk['Crane poly'], actual['Crane poly']):
+            np.testing.assert_array_equal(polygon_from_disk, polygon)
+
+    def test_parametric_modification(self):
+        """
+        Tests that a parametric edit of the crane_specs sheet makes a new
+        crane_poly table.
+        """
+        project_data = self.input_dict['project_data']
+        crane_specs = project_data['crane_specs']
+        before = self.crane_poly(crane_specs)
+
+        row_name = crane_specs.iloc[0, 0]
+        max_capacity = crane_specs.loc[crane_specs.iloc[:, 0] == row_name, 'Max capacity tonne'].max()
+        cell_edit = ('crane_specs', row_name, 'Max capacity tonne', max_capacity * 2)
+        XlsxReader().apply_cell_edits(project_data, pd.Series(dtype=object), [cell_edit])
+        after = self.crane_poly(crane_specs)
+
+        self.assertEqual(CranePolyCache.stats()['misses'], 2)
+        rows = (after['Equipment name'] == row_name).to_numpy()
+        self.assertTrue(rows.any())
+        for polygon_before, polygon_after in zip(before['Crane poly'][rows], after['Crane poly'][rows]):
+            self.assertLessEqual(polygon_before[:, 0].max(), max_capacity)
+            self.assertEqual(polygon_after[:, 0].max(), 2 * max_capacity)
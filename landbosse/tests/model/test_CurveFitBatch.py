@@ -0,0 +1,103 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import (CurveFitBatch, DevelopmentCost, GridConnectionCost, ManagementCost, SubstationCost)
+from landbosse.model.TransportCost import TransportCost
+from landbosse.model.TurbineCost import TurbineCost
+
+
+def generate_parameters():
+    """
+    Makes the parameters of projects that cover every branch of the
+    equations.
+    """
+    return pd.DataFrame({
+        'num_turbines': [100, 5, 40, 250, 1],
+        'turbine_rating_MW': [1.5, 2.0, 3.5, 2.5, 0.1],
+        'rotor_diameter_m': [77.0, 100.0, 130.0, 200.0, 20.0],
+        'interconnect_voltage_kV': [137.0, 69.0, 230.0, 345.0, 12.0],
+        'distance_to_interconnect_mi': [50.0, 1.0, 0.0, 10.0, 0.5],
+        'new_switchyard': [True, False, False, True, False],
+        'turbine_capex': [1100.0, np.nan, 1300.0, 900.0, 2000.0],
+        'development_labor_cost_usd': [1e6, 2e5, 5e5, 3e6, 1e4],
+        'project_value_usd': [1.2e8, 5e6, 9e7, 4e8, 2e5],
+        'foundation_cost_usd': [2e7, 1e6, 1.5e7, 6e7, 5e4],
+        'actual_construction_months': [9.0, 4.0, 30.0, 14.0, 2.0],
+        'num_hwy_permits': [10, 1, 5, 20, 0],
+        'hub_height_meters': [80.0, 100.0, 120.0, 90.0, 30.0],
+        'markup_contingency': 0.03,
+        'markup_warranty_management': 0.0002,
+        'markup_sales_and_use_tax': 0.0,
+        'markup_overhead': 0.05,
+        'markup_profit_margin': 0.05,
+        'override_total_management_cost': [0.0, 0.0, 0.0, 0.0, 5e4],
+    }, index=['a', 'b', 'c', 'd', 'e'])
+
+
+def generate_site_facility_building_area_df():
+    return pd.DataFrame({
+        'Size Min (MW)': [0, 200, 500],
+        'Size Max (MW)': [200, 500, 1e6],
+        'Building area (sq. ft.)': [3000, 4000, 5000],
+    })
+
+
+class TestCurveFitBatch(TestCase):
+    def test_same_as_modules(self):
+        """
+        Tests that the cost table has the same rows as the modules.
+        """
+        parameters = generate_parameters()
+        parameters['project_size_megawatts'] = parameters['num_turbines'] * parameters['turbine_rating_MW']
+        site_facility_building_area_df = generate_site_facility_building_area_df()
+        batch = CurveFitBatch(parameters, site_facility_building_area_df)
+        actual = batch.cost_table()
+
+        expected = []
+        for project_id, project in parameters.iterrows():
+            input_dict = project.to_dict()
+            input_dict['num_turbines'] = int(input_dict['num_turbines'])
+            input_dict['site_facility_building_area_df'] = site_facility_building_area_df
+            # ManagementCost requires these keys but does not use them.
+            input_dict['construct_duration'] = input_dict['num_access_roads'] = 0
+            if input_dict.pop('override_total_management_cost') > 0:
+                input_dict['override_total_management_cost'] = project['override_total_management_cost']
+            output_dict = {'actual_construction_months': input_dict['actual_construction_months']}
+            for module_class, key in [(SubstationCost, 'substation_module_type_operation'),
+                                      (TransportCost, 'transport_module_type_operation'),
+                                      (GridConnectionCost, 'trans_dist_cost_module_type_operation'),
+                                      (DevelopmentCost, 'development_module_type_operation'),
+                                      (TurbineCost, 'turbine_module_type_operation'),
+                                      (ManagementCost, 'mangement_module_type_operation')]:
+                module = module_class(input_dict=input_dict, output_dict=output_dict, project_name=project_id)
+                self.assertEqual(module.run_module(), (0, 0))
+                expected.append(output_dict[key])
+        expected = pd.concat(expected, ignore_index=True)[CurveFitBatch.cost_columns]
+
+        self.assertEqual(len(actual), len(expected))
+        for column in ['operation_id', 'type_of_cost', 'project_id_with_serial', 'module',
+                       'raw_cost_total_or_per_turbine']:
+            self.assertEqual(list(actual[column]), list(expected[column]))
+        for column in ['raw_cost', 'turbine_rating_MW', 'num_turbines', 'rotor_diameter_m', 'cost_per_turbine',
+                       'cost_per_project', 'usd_per_kw_per_project']:
+            np.testing.assert_allclose(actual[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float), rtol=1e-12)
+
+    def test_scalars_and_missing_parameters(self):
+        """
+        Tests that scalar parameters are used for every project, and that
+        missing parameters are reported.
+        """
+        batch = CurveFitBatch({'num_turbines': [10, 20, 30], 'turbine_rating_MW': 2.0, 'turbine_capex': 1000.0,
+                               'rotor_diameter_m': 100.0})
+        table = batch.cost_table(['TurbineCost', 'TransportCost'])
+        self.assertEqual(list(table['project_id_with_serial']), [0, 0, 1, 1, 2, 2])
+        self.assertEqual(list(table['module']), ['TransportCost', 'TurbineCost'] * 3)
+        np.testing.assert_allclose(table.loc[table['module'] == 'TurbineCost', 'raw_cost'], [2e7, 4e7, 6e7])
+
+        with self.assertRaises(KeyError):
+            batch.cost_table(['SubstationCost'])
+        with self.assertRaises(ValueError):
+            CurveFitBatch({'num_turbines': [10, 20], 'turbine_rating_MW': [1.0, 2.0, 3.0]})
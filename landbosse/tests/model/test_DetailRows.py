@@ -0,0 +1,128 @@
+import copy
+import os
+import pickle
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache, XlsxReader
+from landbosse.model import DetailRows, Manager, ModuleResultCache, ProjectResultCache
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir, \
+    template_project_list
+
+
+class TestDetailRows(TestCase):
+    def setUp(self):
+        self.made = []
+
+        def rows():
+            for value in [100.0, 200.0]:
+                self.made.append(value)
+                yield {'type': 'variable', 'value': value}
+
+        self.rows = DetailRows(rows(), 'a', 'ErectionCost')
+
+    def test_lazy(self):
+        """
+        Tests that the rows are made when they are first read, labeled,
+        and kept.
+        """
+        self.assertFalse(self.rows.made)
+        self.assertEqual(self.made, [])
+        expected = [
+            {'type': 'variable', 'value': 100.0, 'project_id_with_serial': 'a', 'module': 'ErectionCost'},
+            {'type': 'variable', 'value': 200.0, 'project_id_with_serial': 'a', 'module': 'ErectionCost'},
+        ]
+        self.assertEqual(list(self.rows), expected)
+        self.assertTrue(self.rows.made)
+        self.assertEqual(list(self.rows), expected)
+        self.assertEqual(len(self.rows), 2)
+        self.assertEqual(self.rows[1]['value'], 200.0)
+        self.assertEqual(self.made, [100.0, 200.0])
+
+    def test_copies_are_lists(self):
+        """
+        Tests that pickles and deep copies of the rows are plain lists.
+        """
+        for copied in [pickle.loads(pickle.dumps(self.rows)), copy.deepcopy(self.rows)]:
+            self.assertIs(type(copied), list)
+            self.assertEqual(copied, list(self.rows))
+
+    def test_check_level(self):
+        self.assertEqual(DetailRows.check_level(' Summary '), 'summary')
+        self.assertEqual(DetailRows.check_level(None), 'full')
+        with self.assertRaises(ValueError):
+            DetailRows.check_level('some')
+
+
+class TestDetailLevels(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.maxsize = ModuleResultCache.maxsize
+        self.cache_dir = ProjectResultCache.cache_dir
+        ModuleResultCache.set_maxsize(0)
+        ProjectResultCache.cache_dir = None
+
+    def tearDown(self):
+        ModuleResultCache.set_maxsize(self.maxsize)
+        ProjectResultCache.cache_dir = self.cache_dir
+
+    def run_project(self, detail_level):
+        input_dict = generate_input_dict(**{'Detail level': detail_level})
+        self.assertEqual(input_dict['detail_level'], detail_level)
+        output_dict = dict()
+        status = Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(project_name='a')
+        self.assertEqual(status, 0)
+        return output_dict
+
+    @staticmethod
+    def rows(output_dict, suffix):
+        return {key: list(value) for key, value in output_dict.items() if key.endswith(suffix)}
+
+    def test_levels(self):
+        """
+        Tests that the detail levels change the detail rows but not the
+        costs, that the summary rows are a subset of the full rows in the
+        same order, and that the full rows are made lazily.
+        """
+        full = self.run_project('full')
+        self.assertFalse(full['erection_cost_csv'].made)
+        summary = self.run_project('summary')
+        none = self.run_project('none')
+
+        for output_dict in [summary, none]:
+            for key, value in full.items():
+                if key.endswith('_module_type_operation'):
+                    pd.testing.assert_frame_equal(output_dict[key], value)
+
+        full_details = self.rows(full, '_csv')
+        summary_details = self.rows(summary, '_csv')
+        self.assertEqual(len(full_details), 10)
+        self.assertEqual(summary_details.keys(), full_details.keys())
+        self.assertEqual(self.rows(none, '_csv'), {key: [] for key in full_details})
+        for key, rows in summary_details.items():
+            with self.subTest(key=key):
+                remaining = iter(full_details[key])
+                self.assertTrue(all(any(row == full_row for full_row in remaining) for row in rows))
+        self.assertLess(len(summary_details['erection_cost_csv']), len(full_details['erection_cost_csv']))
+        self.assertFalse(any(row['variable_df_key_col_name'].startswith('crane_data_output')
+                             for row in summary_details['erection_cost_csv']))
+
+    def test_run_option(self):
+        """
+        Tests that the detail level of the run is used if the project list
+        does not set one.
+        """
+        project_parameters = template_project_list().iloc[0].copy()
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(
+            project_parameters['Project data file'], os.path.join(template_input_dir(), 'project_data'))
+
+        def detail_level(**kwargs):
+            input_dict = XlsxReader().create_master_input_dictionary(project_data_sheets, project_parameters, **kwargs)
+            return input_dict['detail_level']
+
+        self.assertEqual(detail_level(), 'full')
+        self.assertEqual(detail_level(detail_level='None'), 'none')
+        project_parameters['Detail level'] = 'Summary'
+        self.assertEqual(detail_level(detail_level='none'), 'summary')
@@ -0,0 +1,113 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+
+from landbosse.model import FoundationCost, FoundationRadiusBatch
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir
+
+component_columns = ['Section height m', 'Surface area sq m', 'Coeff drag (installed)', 'Lever arm m',
+                     'Multplier drag rotor', 'Multiplier tower drag', 'Mass tonne']
+
+
+class TestFoundationRadiusBatch(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.input_dict = generate_input_dict()
+
+    def test_cubic_root(self):
+        """
+        Tests the roots of cubics, including one whose root is 0.
+        """
+        a = np.array([1.0, 2.0, 1e5, 3.0])
+        c = np.array([0.0, 5.0, 1e7, 1.0])
+        d = np.array([8.0, 1e3, 1e9, 0.0])
+        x = FoundationRadiusBatch.cubic_root(a, c, d)
+        np.testing.assert_allclose(a * x**3 + c * x, d, rtol=1e-12, atol=1e-12)
+        self.assertEqual(x[0], 2.0)
+        self.assertEqual(x[3], 0.0)
+
+    def test_same_as_foundation_cost(self):
+        """
+        Tests that the loads and radii are the same as those of
+        FoundationCost, within the tolerances of its root finder, over a
+        grid of thrust, hub height, depth and bearing pressure. FoundationCost
+        fails where the batch radii are NaN.
+        """
+        thrusts = [1e4, 5.89e5, 3e6, 1e7]
+        hub_heights = [0.8, 1.0, 1.4]
+        depths = [0.3, 2.36, 4.0]
+        bearing_pressures = [5e4, 191521, 5e5]
+        grid = np.array(np.meshgrid(thrusts, hub_heights, depths, bearing_pressures, indexing='ij')).reshape(4, -1)
+        thrust, hub_height_scale, depth, bearing_pressure = grid
+
+        # Scale the heights and lever arms of the components, as a change
+        # of hub height would.
+        components = {column: np.broadcast_to(np.asarray(self.input_dict[column], dtype=float),
+                                              (len(thrust), len(self.input_dict[column])))
+                      for column in component_columns}
+        for column in ['Section height m', 'Lever arm m']:
+            components[column] = components[column] * hub_height_scale[:, np.newaxis]
+        self.compare(components, thrust, depth, bearing_pressure)
+
+    def test_gapping(self):
+        """
+        Tests a component with a large area and a short lever arm, which
+        makes the gapping constraint active.
+        """
+        thrust = np.array([1e4, 1e5])
+        components = {
+            'Section height m': [[10.0]] * 2,
+            'Surface area sq m': [[1000.0]] * 2,
+            'Coeff drag (installed)': [[0.5]] * 2,
+            'Lever arm m': [[1.0]] * 2,
+            'Multplier drag rotor': [[0.0]] * 2,
+            'Multiplier tower drag': [[1.0]] * 2,
+            'Mass tonne': [[100.0]] * 2,
+        }
+        components = {column: np.array(value) for column, value in components.items()}
+        radii = self.compare(components, thrust, np.array([2.36, 3.0]), np.array([191521, 191521]))
+        self.assertTrue((radii['Radius_g_m'] > 0).all())
+
+    def compare(self, components, thrust, depth, bearing_pressure):
+        """
+        Compares the batch loads and radii to those of FoundationCost.
+
+        Returns
+        -------
+        dict
+            The batch radii.
+        """
+        gust_velocity = self.input_dict['gust_velocity_m_per_s']
+        loads = FoundationRadiusBatch.loads(
+            components['Section height m'], components['Surface area sq m'], components['Coeff drag (installed)'],
+            components['Lever arm m'], components['Multplier drag rotor'], components['Multiplier tower drag'],
+            components['Mass tonne'], gust_velocity, thrust)
+        radii = FoundationRadiusBatch.radii(loads['F_dead_N'], loads['F_lat_N'], loads['M_tot_N_m'],
+                                            thrust, depth, bearing_pressure)
+
+        module = FoundationCost(input_dict=self.input_dict, output_dict=dict(), project_name='a')
+        failures = 0
+        for index in range(len(thrust)):
+            foundation_load_input_data = {column: components[column][index] for column in component_columns}
+            foundation_load_input_data['gust_velocity_m_per_s'] = gust_velocity
+            foundation_load_input_data['rated_thrust_N'] = thrust[index]
+            foundation_load_input_data['depth'] = depth[index]
+            foundation_load_input_data['bearing_pressure_n_m2'] = bearing_pressure[index]
+            try:
+                expected = module.calculate_foundation_load(foundation_load_input_data, dict())
+            except ValueError:
+                failures += 1
+                self.assertTrue(np.isnan(radii['Radius_m'][index]))
+                continue
+            self.assertAlmostEqual(loads['F_dead_N'][index] / 1e3, expected['F_dead_kN_per_turbine'], places=6)
+            self.assertAlmostEqual(loads['F_lat_N'][index] / 1e3, expected['F_horiz_kN_per_turbine'], places=6)
+            self.assertAlmostEqual(loads['M_tot_N_m'][index] / 1e3, expected['M_tot_kN_m_per_turbine'], places=6)
+            self.assertAlmostEqual(radii['Radius_o_m'][index], expected['Radius_o_m'], places=9)
+            self.assertAlmostEqual(radii['Radius_s_m'][index], expected['Radius_s_m'], places=9)
+            self.assertAlmostEqual(radii['Radius_g_m'][index], expected['Radius_g_m'], delta=1e-4)
+            self.assertAlmostEqual(radii['Radius_b_m'][index], expected['Radius_b_m'], delta=1e-4)
+            self.assertAlmostEqual(radii['Radius_m'][index], expected['Radius_m'], delta=1e-4)
+        self.assertLess(failures, len(thrust))
+        return radii
@@ -0,0 +1,60 @@
+import os
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from landbosse.model import Manager, FoundationCost, SitePreparationCost, SubstationCost, ErectionCost
+from landbosse.model.CostModule import CostModule
+from landbosse.tests.model.test_ModuleResultCache import generate_input_dict, template_input_dir
+
+
+class UndeclaredModule(CostModule):
+    """
+    A module that does not declare the keys it reads and writes.
+    """
+
+
+class TestManager(TestCase):
+    def test_module_dependencies(self):
+        """
+        Tests that modules wait only for the earlier modules that they
+        share keys with, and that undeclared modules are barriers.
+        """
+        dependencies = Manager.module_dependencies(Manager.cost_modules)
+        self.assertEqual(dependencies[FoundationCost], set())
+        self.assertEqual(dependencies[SubstationCost], set())
+        self.assertIn(FoundationCost, dependencies[SitePreparationCost])
+
+        module_classes = [SubstationCost, UndeclaredModule, ErectionCost]
+        dependencies = Manager.module_dependencies(module_classes)
+        self.assertEqual(dependencies[UndeclaredModule], {SubstationCost})
+        self.assertEqual(dependencies[ErectionCost], {UndeclaredModule})
+
+    def test_module_threads(self):
+        """
+        Tests that running the modules on threads gives the same outputs,
+        in the same order, as running them one at a time.
+        """
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        with self.assertRaises(ValueError):
+            Manager(dict(), dict(), module_threads=0)
+        with mock.patch.dict(os.environ, {'LANDBOSSE_MODULE_THREADS': '3'}):
+            self.assertEqual(Manager(dict(), dict()).module_threads, 3)
+        with mock.patch.dict(os.environ, {'LANDBOSSE_MODULE_THREADS': 'auto'}), self.assertRaises(ValueError):
+            Manager(dict(), dict())
+
+        outputs = []
+        for module_threads in [1, 4]:
+            output_dict = dict()
+            manager = Manager(input_dict=generate_input_dict(), output_dict=output_dict, module_threads=module_threads)
+            self.assertEqual(manager.execute_landbosse(project_name='a'), 0)
+            outputs.append(output_dict)
+
+        serial, threaded = outputs
+        self.assertEqual(list(threaded), list(serial))
+        for key in serial:
+            if key.endswith('_module_type_operation'):
+                pd.testing.assert_frame_equal(threaded[key], serial[key])
+            elif key.endswith('_csv'):
+                self.assertEqual(threaded[key], serial[key])
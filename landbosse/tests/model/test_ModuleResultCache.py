@@ -0,0 +1,177 @@
+import os
+from collections import defaultdict
+from unittest import TestCase, mock
+
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache, XlsxReader
+from landbosse.model import CostModule, Manager, ModuleResultCache
+
+
+def template_input_dir():
+    """
+    Returns
+    -------
+    str
+        The project_input_template directory at the root of the repository.
+    """
+    test_source_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(test_source_dir, '..', '..', '..', 'project_input_template')
+
+
+def template_project_list():
+    """
+    Returns
+    -------
+    pd.DataFrame
+        The project list of the template.
+    """
+    sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('project_list', template_input_dir())
+    return sheets['Project list'] if 'Project list' in sheets else list(sheets.values())[0]
+
+
+def generate_input_dict(project_index=0, **project_parameter_changes):
+    """
+    Makes the master input dictionary of a project in the project list of
+    the template, the first one by default, with the project parameters
+    changed as given.
+    """
+    input_dir = template_input_dir()
+    project_parameters = template_project_list().iloc[project_index].copy()
+    for name, value in project_parameter_changes.items():
+        project_parameters[name] = value
+    project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_parameters['Project data file'],
+                                                                       os.path.join(input_dir, 'project_data'))
+    return XlsxReader().create_master_input_dictionary(project_data_sheets, project_parameters)
+
+
+class TrackingDict(dict):
+    """
+    A dictionary that records the keys that are read and written, under
+    the name of the module that is running.
+    """
+
+    def __init__(self, name, modules, *args):
+        super().__init__(*args)
+        self.name = name
+        self.modules = modules
+        self.reads = defaultdict(set)
+        self.writes = defaultdict(set)
+
+    def __getitem__(self, key):
+        self.reads[self.modules[-1]].add(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.reads[self.modules[-1]].add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.reads[self.modules[-1]].add(key)
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        self.writes[self.modules[-1]].add(key)
+        super().__setitem__(key, value)
+
+
+class TestModuleResultCache(TestCase):
+    def setUp(self):
+        if not os.path.isdir(template_input_dir()):
+            self.skipTest('project_input_template is not available')
+        self.maxsize = ModuleResultCache.maxsize
+        ModuleResultCache.clear()
+
+    def tearDown(self):
+        ModuleResultCache.set_maxsize(self.maxsize)
+        ModuleResultCache.clear()
+
+    def run_project(self, input_dict, project_name):
+        output_dict = dict()
+        status = Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(project_name=project_name)
+        self.assertEqual(status, 0)
+        return output_dict
+
+    def test_declarations(self):
+        """
+        Tests that each module reads and writes only the keys it declares,
+        including the keys read when its detail rows are made.
+        """
+        ModuleResultCache.set_maxsize(0)
+        modules = ['Manager']
+        input_dict = TrackingDict('input', modules, generate_input_dict())
+        output_dict = TrackingDict('output', modules)
+
+        run_module = Manager.run_module
+        detail_rows = CostModule.detail_rows
+
+        def tracked_run_module(manager, module_class, project_name, output_dict=None):
+            modules.append(module_class)
+            try:
+                return run_module(manager, module_class, project_name, output_dict)
+            finally:
+                modules.pop()
+
+        def tracking_copy(tracking_dict, values):
+            # The copy records its reads and writes with those of the
+            # dictionary it copies.
+            copy = TrackingDict(tracking_dict.name, modules, values)
+            copy.reads, copy.writes = tracking_dict.reads, tracking_dict.writes
+            return copy
+
+        def tracked_detail_rows(cost_module, rows, module=None):
+            def tracked_rows(input_values, output_values, summary):
+                return rows(tracking_copy(input_dict, input_values), tracking_copy(output_dict, output_values),
+                            summary)
+
+            # Make the rows now, while the module is still running, so that
+            # the keys they read are recorded under the module.
+            tracked = detail_rows(cost_module, tracked_rows, module)
+            list(tracked)
+            return tracked
+
+        with mock.patch.object(Manager, 'run_module', tracked_run_module), \
+                mock.patch.object(CostModule, 'detail_rows', tracked_detail_rows):
+            # The modules run one at a time, so that the module running is
+            # the one that reads and writes the keys.
+            manager = Manager(input_dict=input_dict, output_dict=output_dict, module_threads=1)
+            status = manager.execute_landbosse(project_name='a')
+        self.assertEqual(status, 0)
+
+        module_classes = [module for module in input_dict.reads if module != 'Manager']
+        self.assertEqual(len(module_classes), 10)
+        for module_class in module_classes:
+            with self.subTest(module=module_class.__name__):
+                input_keys = set(module_class.input_keys) | set(module_class.input_keys_written)
+                output_keys = set(module_class.output_keys_read) | set(module_class.output_keys)
+                self.assertLessEqual(input_dict.reads[module_class] - ModuleResultCache.derived_input_keys,
+                                     input_keys)
+                self.assertLessEqual(output_dict.reads[module_class], output_keys)
+                self.assertLessEqual(input_dict.writes[module_class], set(module_class.input_keys_written))
+                self.assertLessEqual(output_dict.writes[module_class], set(module_class.output_keys))
+
+    def test_reuse(self):
+        """
+        Tests that the results of modules are reused, relabeled with the
+        name of the project, and that only modules whose inputs changed
+        run again.
+        """
+        ModuleResultCache.set_maxsize(0)
+        expected = self.run_project(generate_input_dict(), 'b')
+
+        ModuleResultCache.set_maxsize(64)
+        self.run_project(generate_input_dict(), 'a')
+        self.assertEqual(ModuleResultCache.stats()['misses'], 10)
+
+        input_dict = generate_input_dict()
+        actual = self.run_project(input_dict, 'b')
+        self.assertEqual(ModuleResultCache.stats()['hits'], 10)
+        self.assertIn('Operation', input_dict['component_data'])
+        for key in ['erection_module_type_operation', 'mangement_module_type_operation']:
+            pd.testing.assert_frame_equal(actual[key], expected[key])
+        self.assertEqual(actual['erection_cost_csv'], expected['erection_cost_csv'])
+
+        # Only ManagementCost reads the number of highway permits.
+        self.run_project(generate_input_dict(**{'Number of highway permits': 20}), 'c')
+        stats = ModuleResultCache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (19, 11))
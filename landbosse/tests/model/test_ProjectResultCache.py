@@ -0,0 +1,140 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import Manager, ProjectResultCache
+
+
+def generate_input_dict():
+    """
+    Makes a small input dictionary with the kinds of values found in a
+    master input dictionary.
+    """
+    return {
+        'num_turbines': np.int64(10),
+        'turbine_rating_MW': 2.5,
+        'season_construct': ['spring', 'summer'],
+        'road_distributed_wind': False,
+        'project_data': {
+            'components': pd.DataFrame({'Component': ['Tower', 'Nacelle'], 'Mass tonne': [100.5, 60.25]}),
+        },
+        'Lever arm m': np.array([55.5, 95.0]),
+        'weather_window': pd.DataFrame({'Speed m per s': np.arange(24, dtype=np.float32)}),
+    }
+
+
+def generate_output_dict(project_name, cost):
+    return {
+        'total_erection_cost': pd.DataFrame({'Cost USD': [cost]}),
+        'erection_module_type_operation': pd.DataFrame({'project_id_with_serial': [project_name],
+                                                        'cost_per_project': [cost]}),
+        'erection_csv': [{'project_id_with_serial': project_name, 'value': cost}],
+    }
+
+
+class TestProjectResultCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        ProjectResultCache.cache_dir = self.directory.name
+        ProjectResultCache.max_bytes = None
+        ProjectResultCache.version = None
+        ProjectResultCache.clear()
+
+    def tearDown(self):
+        ProjectResultCache.clear()
+        ProjectResultCache.cache_dir = None
+        ProjectResultCache.max_bytes = None
+        ProjectResultCache.version = None
+        self.directory.cleanup()
+
+    def test_key(self):
+        """
+        Tests that the key is the same for equal input dictionaries and
+        changes when any value, its type or the code version changes.
+        """
+        key = ProjectResultCache.key(generate_input_dict())
+        self.assertEqual(key, ProjectResultCache.key(generate_input_dict()))
+
+        input_dict = generate_input_dict()
+        input_dict['project_data']['components'].loc[0, 'Mass tonne'] = 101.5
+        self.assertNotEqual(key, ProjectResultCache.key(input_dict))
+
+        input_dict = generate_input_dict()
+        input_dict['weather_window'].loc[3, 'Speed m per s'] = 30.0
+        self.assertNotEqual(key, ProjectResultCache.key(input_dict))
+
+        input_dict = generate_input_dict()
+        input_dict['num_turbines'] = 10
+        self.assertNotEqual(key, ProjectResultCache.key(input_dict))
+
+        input_dict = generate_input_dict()
+        input_dict['Lever arm m'] = input_dict['Lever arm m'].astype(np.float32)
+        self.assertNotEqual(key, ProjectResultCache.key(input_dict))
+
+        ProjectResultCache.version = 'new modules'
+        self.assertNotEqual(key, ProjectResultCache.key(generate_input_dict()))
+
+        with self.assertRaises(TypeError):
+            ProjectResultCache.key({'manager': object()})
+
+    def test_save_and_load(self):
+        """
+        Tests that only the rows are stored and that they are relabeled
+        with the name of the project that loads them.
+        """
+        key = ProjectResultCache.key(generate_input_dict())
+        self.assertIsNone(ProjectResultCache.load(key, 'a'))
+        ProjectResultCache.save(key, generate_output_dict('a', 100.0))
+
+        rows = ProjectResultCache.load(key, 'b')
+        self.assertEqual(sorted(rows), ['erection_csv', 'erection_module_type_operation'])
+        pd.testing.assert_frame_equal(rows['erection_module_type_operation'],
+                                      pd.DataFrame({'project_id_with_serial': ['b'], 'cost_per_project': [100.0]}))
+        self.assertEqual(rows['erection_csv'], [{'project_id_with_serial': 'b', 'value': 100.0}])
+
+        stats = ProjectResultCache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['files']), (1, 1, 1))
+
+    def test_eviction(self):
+        """
+        Tests that the least recently used files are deleted when the cache
+        is too large.
+        """
+        keys = [f'{index:040x}' for index in range(4)]
+        for key in keys:
+            ProjectResultCache.save(key, generate_output_dict('a', 100.0))
+        file_bytes = os.path.getsize(ProjectResultCache.cache_filename(keys[0]))
+
+        # Make the files least recently used in order, then use the first.
+        for age, key in enumerate(keys):
+            mtime = time.time() - 100 + age
+            os.utime(ProjectResultCache.cache_filename(key), (mtime, mtime))
+        self.assertIsNotNone(ProjectResultCache.load(keys[0], 'a'))
+
+        ProjectResultCache.max_bytes = 3 * file_bytes
+        ProjectResultCache.save('f' * 40, generate_output_dict('a', 100.0))
+
+        self.assertTrue(os.path.exists(ProjectResultCache.cache_filename(keys[0])))
+        self.assertFalse(os.path.exists(ProjectResultCache.cache_filename(keys[1])))
+        self.assertFalse(os.path.exists(ProjectResultCache.cache_filename(keys[2])))
+        self.assertTrue(os.path.exists(ProjectResultCache.cache_filename(keys[3])))
+        self.assertEqual(ProjectResultCache.stats()['files'], 3)
+
+    def test_manager_cache_hit(self):
+        """
+        Tests that Manager returns the cached rows without running the
+        modules. The input dictionary is not complete, so the modules
+        would fail if they ran.
+        """
+        input_dict = generate_input_dict()
+        ProjectResultCache.save(ProjectResultCache.key(input_dict), generate_output_dict('a', 100.0))
+
+        output_dict = dict()
+        status = Manager(input_dict=input_dict, output_dict=output_dict).execute_landbosse(project_name='b')
+        self.assertEqual(status, 0)
+        self.assertEqual(output_dict['erection_csv'], [{'project_id_with_serial': 'b', 'value': 100.0}])
+        self.assertNotIn('total_erection_cost', output_dict)
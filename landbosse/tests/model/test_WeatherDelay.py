@@ -105,6 +105,38 @@ def generate_a_year(num_delays,
     return df
 
 
+def delay_durations_by_loop(wind_delays):
+    """
+    This is the hour-by-hour loop that WeatherDelay originally used to find
+    the durations of contiguous wind delays. It is kept here as the reference
+    implementation for the run-length encoding in WeatherDelay.delay_durations.
+
+    Parameters
+    ----------
+    wind_delays : np.ndarray
+        Array of booleans, True for each hour of wind delay.
+
+    Returns
+    -------
+    list
+        Durations in hours of each delay that ends inside the array.
+    """
+    delay_durations = []
+    current_delay_duration = 0
+    iterating_through_wind_delay = False
+    for wind_delay in np.nditer(wind_delays):
+        if wind_delay:
+            if not iterating_through_wind_delay:
+                current_delay_duration = 1
+                iterating_through_wind_delay = True
+            else:
+                current_delay_duration += 1
+        elif iterating_through_wind_delay:
+            delay_durations.append(current_delay_duration)
+            iterating_through_wind_delay = False
+    return delay_durations
+
+
 class TestWeatherDelay(TestCase):
     def setUp(self):
         # Use all default parameters shown above, including the default
@@ -168,3 +200,55 @@ class TestWeatherDelay(TestCase):
         bad_input_dict['season_construct'] = ['winter', 'spring', 'summer', 'fall']
         output_dict = dict()
         self.assertRaises(ValueError, WeatherDelay, bad_input_dict, output_dict)
+
+    def test_delay_durations_match_loop(self):
+        """
+        Tests that the run-length encoding of delays gives the same durations
+        as the original loop, including delays at the start and at the end of
+        the window.
+        """
+        rng = np.random.default_rng(self.seed)
+        for length in [1, 2, 5, 100, 8760]:
+            for probability in [0.0, 0.05, 0.5, 0.95, 1.0]:
+                wind_delays = rng.random(length) < probability
+                expected = delay_durations_by_loop(wind_delays)
+                actual = WeatherDelay.delay_durations(wind_delays)
+                self.assertEqual(expected, actual, f'Mismatch for length {length}, probability {probability}')
+
+    def test_trailing_delay_not_counted(self):
+        """
+        Tests that a delay still in progress at the end of the mission is not
+        counted, the same as the original loop.
+        """
+        wind_delays = np.array([True, True, False, False, True, False, True, True, True])
+        self.assertEqual([2, 1], WeatherDelay.delay_durations(wind_delays))
+
+    def test_batch_matches_single(self):
+        """
+        Tests that the batched delay totals equal the totals computed one
+        row at a time with the "longer than 4 hours becomes 10 hours" rule.
+        """
+        critical_speeds = [2.0, 5.0, 6.0, 7.5, 9.0, 12.0]
+        heights = [10.0, 25.0, 80.0, 100.0, 150.0, 25.0]
+        wind_shear_exponent = 0.25
+        expected = []
+        for critical_speed, height in zip(critical_speeds, heights):
+            weather_delay_input_dict = dict()
+            weather_delay_input_dict['weather_window'] = self.weather_window
+            weather_delay_input_dict['start_delay_hours'] = 0
+            weather_delay_input_dict['mission_time_hours'] = len(self.weather_window)
+            weather_delay_input_dict['critical_wind_speed_m_per_s'] = critical_speed
+            weather_delay_input_dict['wind_height_of_interest_m'] = height
+            weather_delay_input_dict['wind_shear_exponent'] = wind_shear_exponent
+            output_dict = dict()
+            WeatherDelay(input_dict=weather_delay_input_dict, output_dict=output_dict)
+            wind_delay = np.array(output_dict['wind_delays'])
+            wind_delay[(wind_delay > 4)] = 10
+            expected.append(float(wind_delay.sum()))
+
+        actual = WeatherDelay.batch(weather_window=self.weather_window,
+                                    critical_speeds=critical_speeds,
+                                    heights=heights,
+                                    wind_shear_exponent=wind_shear_exponent,
+                                    max_cells_per_chunk=len(self.weather_window) * 4)
+        self.assertEqual(expected, actual.tolist(), 'Batched wind delays do not match single wind delays.')
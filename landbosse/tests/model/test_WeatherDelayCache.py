@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+import numpy as np
+
+from landbosse.model import WeatherDelay, WeatherDelayCache
+from landbosse.tests.model.test_WeatherDelay import generate_a_year
+
+
+class TestWeatherDelayCache(TestCase):
+    def setUp(self):
+        self.weather_window = generate_a_year(num_delays=7,
+                                              avg_hours_per_delay=20,
+                                              std_dev_hours_per_delay=5,
+                                              delay_speed_m_per_s=9,
+                                              seed=101)
+        self.original_maxsize = WeatherDelayCache.maxsize
+        WeatherDelayCache.clear()
+
+    def tearDown(self):
+        WeatherDelayCache.set_maxsize(self.original_maxsize)
+        WeatherDelayCache.clear()
+
+    def weather_delay_input_dict(self, critical_wind_speed_m_per_s=6.0):
+        weather_delay_input_dict = dict()
+        weather_delay_input_dict['weather_window'] = self.weather_window
+        weather_delay_input_dict['start_delay_hours'] = 0
+        weather_delay_input_dict['mission_time_hours'] = 8760
+        weather_delay_input_dict['critical_wind_speed_m_per_s'] = critical_wind_speed_m_per_s
+        weather_delay_input_dict['wind_height_of_interest_m'] = 25
+        weather_delay_input_dict['wind_shear_exponent'] = 0.25
+        return weather_delay_input_dict
+
+    def test_repeated_calculation_hits(self):
+        """
+        Tests that a repeated calculation on a copy of the same weather window
+        is a cache hit and returns the same delays.
+        """
+        first_output_dict = dict()
+        WeatherDelay(self.weather_delay_input_dict(), first_output_dict)
+        self.weather_window = self.weather_window.copy()
+        second_output_dict = dict()
+        WeatherDelay(self.weather_delay_input_dict(), second_output_dict)
+
+        self.assertEqual(first_output_dict['wind_delays'], second_output_dict['wind_delays'])
+        stats = WeatherDelayCache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['misses'])
+
+    def test_different_window_misses(self):
+        """
+        Tests that changing the wind speeds changes the fingerprint.
+        """
+        WeatherDelay(self.weather_delay_input_dict(), dict())
+        self.weather_window = self.weather_window.copy()
+        self.weather_window.loc[100, 'Speed m per s'] = 50.0
+        WeatherDelay(self.weather_delay_input_dict(), dict())
+        self.assertEqual(0, WeatherDelayCache.stats()['hits'])
+
+    def test_lru_eviction(self):
+        """
+        Tests that the cache holds no more than maxsize entries and evicts the
+        least recently used entry first.
+        """
+        WeatherDelayCache.set_maxsize(2)
+        for critical_wind_speed_m_per_s in [6.0, 7.0, 8.0]:
+            WeatherDelay(self.weather_delay_input_dict(critical_wind_speed_m_per_s), dict())
+        self.assertEqual(2, WeatherDelayCache.stats()['size'])
+
+        WeatherDelay(self.weather_delay_input_dict(8.0), dict())
+        WeatherDelay(self.weather_delay_input_dict(6.0), dict())
+        stats = WeatherDelayCache.stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(4, stats['misses'])
+
+    def test_batch_uses_cache(self):
+        """
+        Tests that rows of a batch calculated before are cache hits.
+        """
+        critical_speeds = np.array([5.0, 6.0, 7.0])
+        heights = np.array([25.0, 50.0, 100.0])
+        first = WeatherDelay.batch(self.weather_window, critical_speeds, heights, 0.25)
+        second = WeatherDelay.batch(self.weather_window, critical_speeds, heights, 0.25)
+        self.assertEqual(first.tolist(), second.tolist())
+        self.assertEqual(3, WeatherDelayCache.stats()['hits'])
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import WeatherDelay, WeatherDelayCache, WeatherWindowIndex
+from landbosse.tests.model.test_WeatherDelay import generate_a_year
+
+
+class TestWeatherWindowIndex(TestCase):
+    def setUp(self):
+        self.weather_window = generate_a_year(num_delays=40,
+                                              avg_hours_per_delay=6,
+                                              std_dev_hours_per_delay=3,
+                                              delay_speed_m_per_s=9,
+                                              seed=202)
+        self.index = WeatherWindowIndex(self.weather_window)
+        WeatherDelayCache.clear()
+
+    def tearDown(self):
+        WeatherDelayCache.clear()
+
+    def weather_delay_input_dict(self, start_delay_hours, mission_time_hours, critical_wind_speed_m_per_s):
+        weather_delay_input_dict = dict()
+        weather_delay_input_dict['weather_window'] = self.weather_window
+        weather_delay_input_dict['start_delay_hours'] = start_delay_hours
+        weather_delay_input_dict['mission_time_hours'] = mission_time_hours
+        weather_delay_input_dict['critical_wind_speed_m_per_s'] = critical_wind_speed_m_per_s
+        weather_delay_input_dict['wind_height_of_interest_m'] = 100
+        weather_delay_input_dict['wind_shear_exponent'] = 0.2
+        return weather_delay_input_dict
+
+    def test_queries_match_scan(self):
+        """
+        Tests that the index returns the same delays and delay times as
+        scanning the weather window for many starts, missions and thresholds,
+        including slices that begin or end in the middle of a delay.
+        """
+        rng = np.random.default_rng(7)
+        starts = rng.integers(0, 8760, 60).tolist() + [0, 8758, 8759, 8760]
+        for critical_wind_speed in [0.5, 6.0, 8.9, 9.5]:
+            for start in starts:
+                for mission in [start + 1, start + 30, start + 500, 8760]:
+                    if mission > 8760 or mission < start:
+                        continue
+                    input_dict = self.weather_delay_input_dict(start, mission, critical_wind_speed)
+                    expected = WeatherDelay(input_dict, dict()).calculate_wind_delay()
+                    actual = self.index.wind_delays(start, mission, critical_wind_speed, 100, 0.2)
+                    self.assertEqual(expected, actual, (critical_wind_speed, start, mission))
+
+                    expected_time = float(sum(10 if delay > 4 else delay for delay in expected))
+                    actual_time = self.index.wind_delay_time(start, mission, critical_wind_speed, 100, 0.2)
+                    self.assertEqual(expected_time, actual_time, (critical_wind_speed, start, mission))
+
+    def test_weather_delay_uses_index(self):
+        """
+        Tests that WeatherDelay answers from the index when the index was
+        built from its weather window, and ignores an index built from a
+        different window.
+        """
+        input_dict = self.weather_delay_input_dict(10, 4000, 6.0)
+        expected_output_dict = dict()
+        WeatherDelay(input_dict, expected_output_dict)
+
+        WeatherDelayCache.clear()
+        input_dict['weather_window_index'] = self.index
+        output_dict = dict()
+        weather_delay = WeatherDelay(input_dict, output_dict)
+        self.assertIs(weather_delay.weather_window_index(), self.index)
+        self.assertEqual(expected_output_dict['wind_delays'], output_dict['wind_delays'])
+
+        input_dict['weather_window_index'] = WeatherWindowIndex(self.weather_window.copy())
+        self.assertIsNone(WeatherDelay(input_dict, dict()).weather_window_index())
+
+    def test_mission_longer_than_window(self):
+        """
+        Tests that a mission longer than the window raises the same error as
+        WeatherDelay.
+        """
+        with self.assertRaises(ValueError):
+            self.index.wind_delays(0, 9000, 6.0, 100, 0.2)
+
+    def test_trailing_delay_not_counted(self):
+        """
+        Tests that a delay still in progress at the end of the window is
+        not counted, the same as WeatherDelay.
+        """
+        speeds = [1.0, 10.0, 10.0, 1.0, 10.0, 10.0, 10.0]
+        index = WeatherWindowIndex(pd.DataFrame({'Speed m per s': speeds}))
+        self.assertEqual(index.wind_delays(0, 6, 5.0, 100, 0.0), [2])
+        self.assertEqual(index.wind_delay_time(0, 6, 5.0, 100, 0.0), 2.0)
+        self.assertEqual(index.wind_delays(3, 6, 5.0, 100, 0.0), [])
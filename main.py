@@ -6,6 +6,9 @@ from landbosse.excelio import XlsxParallelManagerRunner
 from landbosse.excelio import XlsxGenerator
 from landbosse.excelio import XlsxValidator
 from landbosse.excelio import CsvGenerator
+from landbosse.excelio import CsvResultSink
+from landbosse.excelio import ListResultSink
+from landbosse.excelio import ArrowResultSink
 
 # LandBOSSE, small utility functions
 from landbosse.excelio import XlsxFileOperations
@@ -42,13 +45,53 @@ def main():
         file_ops.get_input_output_paths_from_argv_or_env()
     )
 
+    # The .csv outputs
+    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
+    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
+
+    # The Parquet and Feather outputs, if any, are always written as each
+    # project finishes.
+    output_formats, partition_by = file_ops.output_format_options()
+    arrow_sinks = [
+        ArrowResultSink(
+            costs_path=os.path.join(file_ops.landbosse_output_dir(),
+                                    f'landbosse-costs{ArrowResultSink.formats[output_format]}'),
+            details_path=os.path.join(file_ops.landbosse_output_dir(),
+                                      f'landbosse-details{ArrowResultSink.formats[output_format]}'),
+            output_format=output_format,
+            partition_by=partition_by,
+        )
+        for output_format in output_formats
+    ]
+
+    # If results are streamed, the .csv files are written as each project
+    # finishes, and only the cost rows are kept in memory for the .xlsx
+    # output and validation.
+    stream_results = file_ops.stream_results_enabled()
+    if stream_results:
+        result_sinks = [
+            ListResultSink(keep_details=False),
+            CsvResultSink(costs_csv=costs_csv_filename, details_csv=details_csv_filename),
+        ] + arrow_sinks
+    elif arrow_sinks:
+        result_sinks = [ListResultSink()] + arrow_sinks
+    else:
+        result_sinks = None
+
     # final_result aggregates all the results from all the projects.
-    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study)
+    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study, result_sinks)
 
     # Write the extended_project_list, which has all the parametric values.
     extended_project_list_path = os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
     extended_project_list = final_result['extended_project_list']
     extended_project_list.to_csv(extended_project_list_path, index=False)
+    for output_format in output_formats:
+        ArrowResultSink.write_dataframe(
+            extended_project_list,
+            os.path.join(file_ops.extended_project_list_path(),
+                         f'extended_project_list{ArrowResultSink.formats[output_format]}'),
+            output_format,
+        )
 
     # Run validation or not depending on whether validation was enabled.
     if validation_enabled:
@@ -63,7 +106,7 @@ def main():
         validator = XlsxValidator()
         validation_was_successful = validator.compare_expected_to_actual(
             expected_xlsx=expected_validation_data_path,
-            actual_module_type_operation_list=final_result['module_type_operation_list'],
+            actual_costs=final_result['costs_by_module_type_operation'],
             validation_output_xlsx=validation_result_path,
         )
         if validation_was_successful:
@@ -83,18 +126,18 @@ def main():
         print('Writing .xlsx file for backwards compatability.')
 
     with XlsxGenerator('landbosse-output', file_ops) as xlsx:
-        xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
+        xlsx.tab_costs_by_module_type_operation(rows=final_result['costs_by_module_type_operation'])
     file_ops.copy_input_data()
 
-    # Always write .csv versions of the output
-    csv_generator = CsvGenerator(file_ops)
+    # Always write .csv versions of the output. Streamed results have
+    # already been written.
+    if not stream_results:
+        csv_generator = CsvGenerator(file_ops)
 
-    costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
-    details = csv_generator.create_details_dataframe(final_result['details_list'])
-    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
-    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
-    costs.to_csv(costs_csv_filename, index=False)
-    details.to_csv(details_csv_filename, index=False)
+        costs = csv_generator.create_costs_dataframe(final_result['costs_by_module_type_operation'])
+        details = csv_generator.create_details_dataframe(final_result['details_list'])
+        costs.to_csv(costs_csv_filename, index=False)
+        details.to_csv(details_csv_filename, index=False)
 
     # Print end timestamp
     print(f'>>>>>>>> End run {datetime.now()} <<<<<<<<<<')